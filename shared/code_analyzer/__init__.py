@@ -11,6 +11,10 @@ Components:
     - score_merger: Combines custom scoring with CA findings
     - formatter: Terminal output formatting
     - live_query_plan: Real-time SOQL query plan analysis via REST API
+    - pattern_engine: Shared multi-pattern scanner for regex-based validators
+    - apex_lexer: Cached comment/string-aware lexical model of Apex source
+    - engine_pipeline: Concurrent engine runs collected against a deadline
+    - apex_symbol_index: Incremental project index of Apex classes and SObject fields
 
 Usage:
     from code_analyzer import CodeAnalyzerScanner, SkillType, ScoreMerger
@@ -33,6 +37,10 @@ from .score_merger import ScoreMerger, MergedScore
 from .parser import parse_ca_output, normalize_violation
 from .formatter import format_validation_output
 from .live_query_plan import LiveQueryPlanAnalyzer, QueryPlanResult, PlanNote
+from .pattern_engine import PatternEngine, PatternHit, mask_comments
+from .apex_lexer import ApexSource, ApexSpan, ApexToken, lex_apex
+from .engine_pipeline import EnginePipeline, EngineTask
+from .apex_symbol_index import ApexSymbolIndex, project_symbol_index
 
 __all__ = [
     # Scanner
@@ -53,6 +61,21 @@ __all__ = [
     "LiveQueryPlanAnalyzer",
     "QueryPlanResult",
     "PlanNote",
+    # Pattern scanning
+    "PatternEngine",
+    "PatternHit",
+    "mask_comments",
+    # Apex lexical model
+    "ApexSource",
+    "ApexSpan",
+    "ApexToken",
+    "lex_apex",
+    # Concurrent engines
+    "EnginePipeline",
+    "EngineTask",
+    # Project symbols
+    "ApexSymbolIndex",
+    "project_symbol_index",
 ]
 
 __version__ = "1.1.0"
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Apex Lexer - Shared lexical model of an Apex source file.
+
+Every Apex validator needs to know which characters are comments and which
+are string literals before it runs its own regexes. ``lex_apex()`` works that
+out once per file content and returns an ``ApexSource`` with:
+
+- ``code``: the source with ``//`` and ``/* */`` comments blanked out
+  (offsets and newlines preserved, string literals kept)
+- ``bare_code``: ``code`` with string literal contents blanked as well
+  (quotes kept), safe for brace matching and keyword searches
+- ``line_starts`` / ``line_of()``: offset-to-line lookup via bisect
+- ``tokens``: comment/string/ident/number/symbol token stream (lazy)
+- ``classes`` / ``methods``: declaration spans with their brace bodies (lazy)
+
+Models are cached by content hash, so the ApexValidator, LLMPatternValidator
+and SOQLExtractor running in one hook process share a single lexing pass.
+
+Usage:
+    from code_analyzer.apex_lexer import lex_apex
+
+    source = lex_apex(content)
+    for match in re.finditer(r"\\bfor\\s*\\(", source.bare_code):
+        method = source.method_at(match.start())
+        print(source.line_of(match.start()), method.name if method else "global")
+"""
+
+import hashlib
+import re
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional
+
+TOKEN_COMMENT = "comment"
+TOKEN_STRING = "string"
+TOKEN_IDENT = "ident"
+TOKEN_NUMBER = "number"
+TOKEN_SYMBOL = "symbol"
+
+CACHE_SIZE = 16
+
+# Comments and single-quoted strings; the leftmost match wins, so a quote
+# inside a comment (or // inside a string) is classified correctly.
+_TRIVIA_RE = re.compile(r"//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)|'(?:\\[\s\S]|[^'\\\n])*'?")
+
+_TOKEN_RE = re.compile(
+    r"(?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))"
+    r"|(?P<string>'(?:\\[\s\S]|[^'\\\n])*'?)"
+    r"|(?P<number>\d+(?:\.\d+)?[lLdD]?)"
+    r"|(?P<ident>[A-Za-z_]\w*)"
+    r"|(?P<symbol>[^\s\w])"
+)
+
+_TYPE_DECLARATION_RE = re.compile(r"\b(class|interface|enum)\s+(\w+)[^{;()]*\{", re.IGNORECASE)
+
+_METHOD_DECLARATION_RE = re.compile(
+    r"(?<![\w.])([\w.]+(?:\s*<[\w\s,.<>{}]*>)?(?:\s*\[\s*\])?)\s+(\w+)\s*\([^)]*\)\s*\{"
+)
+
+# Words that can precede "name(...) {" without it being a method declaration
+_NOT_A_TYPE = {
+    "new", "return", "else", "if", "for", "while", "catch", "switch", "when",
+    "throw", "on", "do", "try", "finally",
+}
+
+
+class ApexToken(NamedTuple):
+    kind: str
+    text: str
+    start: int
+    end: int
+    line: int
+
+
+class ApexSpan(NamedTuple):
+    """A declaration and its body, from the declaration start to the closing brace."""
+
+    kind: str
+    name: str
+    start: int
+    end: int
+    start_line: int
+    end_line: int
+
+
+def _blank(text: str) -> str:
+    return re.sub(r"[^\n]", " ", text)
+
+
+class ApexSource:
+    """Lexical model of one Apex file. Build through ``lex_apex()``."""
+
+    def __init__(self, content: str, content_hash: str = ""):
+        self.content = content
+        self.content_hash = content_hash or content_digest(content)
+        self.lines = content.split("\n")
+        self.line_starts = [0]
+        for line in self.lines[:-1]:
+            self.line_starts.append(self.line_starts[-1] + len(line) + 1)
+
+        code_parts: List[str] = []
+        bare_parts: List[str] = []
+        last = 0
+        for match in _TRIVIA_RE.finditer(content):
+            start, end = match.span()
+            text = match.group()
+            code_parts.append(content[last:start])
+            bare_parts.append(content[last:start])
+            if text[0] == "'":
+                code_parts.append(text)
+                closed = len(text) > 1 and text.endswith("'")
+                bare_parts.append("'" + _blank(text[1:-1] if closed else text[1:]) + ("'" if closed else ""))
+            else:
+                blank = _blank(text)
+                code_parts.append(blank)
+                bare_parts.append(blank)
+            last = end
+        code_parts.append(content[last:])
+        bare_parts.append(content[last:])
+        self.code = "".join(code_parts)
+        self.bare_code = "".join(bare_parts)
+
+        self._tokens: Optional[List[ApexToken]] = None
+        self._brace_pairs: Optional[Dict[int, int]] = None
+        self._classes: Optional[List[ApexSpan]] = None
+        self._methods: Optional[List[ApexSpan]] = None
+
+    def line_of(self, pos: int) -> int:
+        """1-based line number of a character offset."""
+        return bisect_right(self.line_starts, pos)
+
+    @property
+    def tokens(self) -> List[ApexToken]:
+        if self._tokens is None:
+            self._tokens = [
+                ApexToken(match.lastgroup, match.group(), match.start(), match.end(), self.line_of(match.start()))
+                for match in _TOKEN_RE.finditer(self.content)
+            ]
+        return self._tokens
+
+    def matching_brace(self, open_pos: int) -> int:
+        """Offset of the brace closing the one at ``open_pos`` (end of file if unbalanced)."""
+        if self._brace_pairs is None:
+            pairs: Dict[int, int] = {}
+            stack: List[int] = []
+            for match in re.finditer(r"[{}]", self.bare_code):
+                if match.group() == "{":
+                    stack.append(match.start())
+                elif stack:
+                    pairs[stack.pop()] = match.start()
+            self._brace_pairs = pairs
+        return self._brace_pairs.get(open_pos, len(self.content))
+
+    def _span(self, kind: str, name: str, start: int, open_pos: int) -> ApexSpan:
+        end = self.matching_brace(open_pos)
+        return ApexSpan(kind, name, start, end, self.line_of(start), self.line_of(end))
+
+    @property
+    def classes(self) -> List[ApexSpan]:
+        """Class, interface and enum declarations, outermost first."""
+        if self._classes is None:
+            self._classes = [
+                self._span(match.group(1).lower(), match.group(2), match.start(), match.end() - 1)
+                for match in _TYPE_DECLARATION_RE.finditer(self.bare_code)
+            ]
+        return self._classes
+
+    @property
+    def methods(self) -> List[ApexSpan]:
+        """Method and constructor declarations that have a body."""
+        if self._methods is None:
+            methods = []
+            for match in _METHOD_DECLARATION_RE.finditer(self.bare_code):
+                return_type, name = match.group(1), match.group(2)
+                if return_type.lower() in _NOT_A_TYPE or name.lower() in _NOT_A_TYPE:
+                    continue
+                methods.append(self._span("method", name, match.start(), match.end() - 1))
+            self._methods = methods
+        return self._methods
+
+    def method_at(self, pos: int) -> Optional[ApexSpan]:
+        """Innermost method whose span contains ``pos``."""
+        found = None
+        for span in self.methods:
+            if span.start <= pos <= span.end and (found is None or span.start >= found.start):
+                found = span
+        return found
+
+    def class_at(self, pos: int) -> Optional[ApexSpan]:
+        """Innermost class/interface/enum whose span contains ``pos``."""
+        found = None
+        for span in self.classes:
+            if span.start <= pos <= span.end and (found is None or span.start >= found.start):
+                found = span
+        return found
+
+
+def content_digest(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+_CACHE: "OrderedDict[str, ApexSource]" = OrderedDict()
+
+
+def lex_apex(content: str) -> ApexSource:
+    """Lexical model for ``content``, shared by every caller in this process."""
+    digest = content_digest(content)
+    source = _CACHE.get(digest)
+    if source is None:
+        source = ApexSource(content, digest)
+        _CACHE[digest] = source
+        if len(_CACHE) > CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    else:
+        _CACHE.move_to_end(digest)
+    return source
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Apex Symbol Index - Project-wide classes, methods, properties and SObject fields.
+
+Validators that only see one file cannot tell whether ``InvoiceService.post()``
+or ``Invoice__c.Total__c`` actually exist. ``project_symbol_index()`` finds the
+SFDX project around a file, walks its package directories (``force-app`` by
+default) and returns an ``ApexSymbolIndex`` built from local metadata:
+
+- ``*.cls``: classes, interfaces and enums (inner ones as ``Outer.Inner``),
+  their methods, properties and ``extends`` parent, via ``apex_lexer``
+- ``*.object-meta.xml`` / ``*.field-meta.xml``: SObjects and their fields
+
+The index is incremental. Each file's mtime, size and content hash are
+persisted with its symbols in ``~/.claude/cache/apex-symbols/`` (one JSON
+file per project), so a save re-parses only the files whose content changed.
+A cold build parses files in parallel worker processes. Lookups are dict and
+set membership tests.
+
+Usage:
+    from code_analyzer.apex_symbol_index import project_symbol_index
+
+    index = project_symbol_index("/path/to/force-app/main/default/classes/Foo.cls")
+    if index is not None:
+        index.has_method("InvoiceService", "post")      # True / False / None
+        index.has_field("Invoice__c", "Total__c")        # None if object unknown
+
+Environment:
+    SF_APEX_SYMBOL_INDEX        Set to 0 to disable the index
+    SF_APEX_SYMBOL_INDEX_DIR    Persisted index directory override
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .apex_lexer import lex_apex
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_DIR = Path.home() / ".claude" / "cache" / "apex-symbols"
+DEFAULT_PACKAGE_DIR = "force-app"
+PARALLEL_THRESHOLD = 64
+
+APEX_SUFFIX = ".cls"
+OBJECT_SUFFIX = ".object-meta.xml"
+FIELD_SUFFIX = ".field-meta.xml"
+SKIPPED_DIRS = {"node_modules", ".sfdx", ".sf", ".git", "__pycache__"}
+
+# Methods every class answers to, and the built-ins every enum adds
+OBJECT_METHODS = {"equals", "hashcode", "tostring"}
+ENUM_METHODS = {"values", "valueof", "name", "ordinal"}
+
+_EXTENDS_RE = re.compile(r"\bextends\s+([\w.]+)", re.IGNORECASE)
+
+_TYPE = r"[\w.]+(?:\s*<[\w\s,.<>]*>)?(?:\s*\[\s*\])?"
+
+# Bodiless (interface/abstract) method declarations
+_ABSTRACT_METHOD_RE = re.compile(rf"(?<![\w.])({_TYPE})\s+(\w+)\s*\([^)]*\)\s*;")
+
+# Class-level variable and property declarations
+_MEMBER_RE = re.compile(rf"(?<![\w.])({_TYPE})\s+(\w+)\s*(?=[;={{,])")
+
+_NOT_A_MEMBER_TYPE = {
+    "return", "new", "throw", "else", "class", "interface", "enum", "extends",
+    "implements", "sharing", "insert", "update", "delete", "upsert", "undelete",
+}
+
+
+def find_project_root(file_path: str) -> Optional[Path]:
+    """Nearest ancestor directory containing ``sfdx-project.json``."""
+    current = Path(file_path).resolve()
+    for candidate in [current, *current.parents]:
+        if (candidate / "sfdx-project.json").is_file():
+            return candidate
+    return None
+
+
+def package_directories(root: Path) -> List[Path]:
+    """Package directories declared in ``sfdx-project.json`` (``force-app`` if none)."""
+    paths: List[str] = []
+    try:
+        with (root / "sfdx-project.json").open("r", encoding="utf-8") as handle:
+            config = json.load(handle)
+        paths = [entry["path"] for entry in config.get("packageDirectories") or [] if entry.get("path")]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return [root / path for path in (paths or [DEFAULT_PACKAGE_DIR]) if (root / path).is_dir()]
+
+
+def _is_indexed(name: str) -> bool:
+    return name.endswith(APEX_SUFFIX) or name.endswith(OBJECT_SUFFIX) or name.endswith(FIELD_SUFFIX)
+
+
+def iter_metadata_files(root: Path) -> Iterable[Path]:
+    for package_dir in package_directories(root):
+        for dirpath, dirnames, filenames in os.walk(package_dir):
+            dirnames[:] = [name for name in dirnames if name not in SKIPPED_DIRS and not name.startswith(".")]
+            for name in filenames:
+                if _is_indexed(name):
+                    yield Path(dirpath) / name
+
+
+def parse_apex_symbols(content: str) -> Dict:
+    """Class/interface/enum declarations with their methods and properties."""
+    source = lex_apex(content)
+    code = source.bare_code
+    types = source.classes
+
+    def enclosing(pos: int, exclude=None):
+        found = None
+        for span in types:
+            if span is not exclude and span.start < pos <= span.end and (found is None or span.start >= found.start):
+                found = span
+        return found
+
+    qualified: Dict[int, str] = {}
+    entries: Dict[int, Dict] = {}
+    for span in types:
+        outer = enclosing(span.start, exclude=span)
+        name = f"{qualified[outer.start]}.{span.name}" if outer is not None and outer.start in qualified else span.name
+        qualified[span.start] = name
+        header = code[span.start:code.find("{", span.start)]
+        extends = _EXTENDS_RE.search(header)
+        entries[span.start] = {
+            "name": name,
+            "kind": span.kind,
+            "extends": extends.group(1) if extends else None,
+            "methods": [],
+            "properties": [],
+        }
+
+    def add(bucket: str, pos: int, name: str) -> None:
+        owner = source.class_at(pos)
+        if owner is None:
+            return
+        entry = entries[owner.start]
+        if name != owner.name and name not in entry[bucket]:
+            entry[bucket].append(name)
+
+    for span in source.methods:
+        add("methods", span.start, span.name)
+
+    for match in _ABSTRACT_METHOD_RE.finditer(code):
+        if match.group(1).lower() not in _NOT_A_MEMBER_TYPE and source.method_at(match.start()) is None:
+            add("methods", match.start(), match.group(2))
+
+    for match in _MEMBER_RE.finditer(code):
+        if match.group(1).lower() in _NOT_A_MEMBER_TYPE or source.method_at(match.start()) is not None:
+            continue
+        add("properties", match.start(), match.group(2))
+
+    return {"classes": list(entries.values())}
+
+
+def parse_metadata_symbols(path: Path) -> Dict:
+    """SObject (and field) named by a source-format metadata path."""
+    name = path.name
+    if name.endswith(FIELD_SUFFIX):
+        # objects/<Object>/fields/<Field>.field-meta.xml
+        return {"sobject": path.parent.parent.name, "field": name[: -len(FIELD_SUFFIX)]}
+    return {"sobject": name[: -len(OBJECT_SUFFIX)]}
+
+
+def is_namespaced(api_name: str) -> bool:
+    """True for managed-package API names such as ``ns__Score__c``."""
+    return api_name.count("__") >= 2
+
+
+def _file_digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def parse_file(path: str) -> Tuple[str, Dict]:
+    """Index entry (stat, hash, symbols) for one file. Runs in worker processes."""
+    file_path = Path(path)
+    stat = file_path.stat()
+    data = file_path.read_bytes()
+    entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "hash": _file_digest(data)}
+    if path.endswith(APEX_SUFFIX):
+        entry["symbols"] = parse_apex_symbols(data.decode("utf-8", "replace"))
+    else:
+        entry["symbols"] = parse_metadata_symbols(file_path)
+    return path, entry
+
+
+def _parser_fingerprint() -> str:
+    digest = hashlib.sha1(str(INDEX_VERSION).encode("utf-8"))
+    for module_path in (__file__, os.path.join(os.path.dirname(__file__), "apex_lexer.py")):
+        try:
+            with open(module_path, "rb") as handle:
+                digest.update(handle.read())
+        except OSError:
+            digest.update(module_path.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ApexSymbolIndex:
+    """Symbols of one SFDX project, refreshed incrementally from disk."""
+
+    def __init__(self, root: Path, index_dir: Optional[Path] = None):
+        self.root = Path(root).resolve()
+        self.index_dir = Path(os.environ.get("SF_APEX_SYMBOL_INDEX_DIR") or index_dir or DEFAULT_INDEX_DIR)
+        self.files: Dict[str, Dict] = {}
+        self.parsed_files = 0
+        self._classes: Dict[str, Dict] = {}
+        self._sobjects: Dict[str, Set[str]] = {}
+        self._defined_sobjects: Set[str] = set()
+
+    @property
+    def path(self) -> Path:
+        key = hashlib.sha1(str(self.root).encode("utf-8")).hexdigest()
+        return self.index_dir / f"{key}.json"
+
+    # ── Build ──────────────────────────────────────────────────
+
+    def refresh(self, workers: Optional[int] = None) -> "ApexSymbolIndex":
+        """Load the persisted index, re-parse changed files, and save if anything moved."""
+        fingerprint = _parser_fingerprint()
+        stored = self._load(fingerprint)
+
+        files: Dict[str, Dict] = {}
+        changed: List[str] = []
+        for file_path in iter_metadata_files(self.root):
+            key = str(file_path)
+            previous = stored.get(key)
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            if previous and previous.get("mtime_ns") == stat.st_mtime_ns and previous.get("size") == stat.st_size:
+                files[key] = previous
+                continue
+            if previous and key.endswith(APEX_SUFFIX):
+                # Touched but possibly unchanged: the content hash decides
+                try:
+                    digest = _file_digest(file_path.read_bytes())
+                except OSError:
+                    continue
+                if digest == previous.get("hash"):
+                    files[key] = dict(previous, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                    continue
+            changed.append(key)
+
+        for key, entry in self._parse_all(changed, workers):
+            files[key] = entry
+
+        dirty = bool(changed) or set(files) != set(stored) or any(files[key] is not stored.get(key) for key in files)
+        self.files = files
+        self.parsed_files = len(changed)
+        self._build_lookups()
+        if dirty:
+            self._save(fingerprint)
+        return self
+
+    def _parse_all(self, paths: List[str], workers: Optional[int]) -> List[Tuple[str, Dict]]:
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(paths) >= PARALLEL_THRESHOLD:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    return list(pool.map(parse_file, paths, chunksize=max(1, len(paths) // (workers * 4))))
+            except (OSError, RuntimeError, ImportError):
+                pass  # No worker processes available; parse inline
+        results = []
+        for path in paths:
+            try:
+                results.append(parse_file(path))
+            except OSError:
+                continue
+        return results
+
+    def _load(self, fingerprint: str) -> Dict[str, Dict]:
+        try:
+            with self.path.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(payload, dict) or payload.get("fingerprint") != fingerprint:
+            return {}
+        return payload.get("files") or {}
+
+    def _save(self, fingerprint: str) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=".apex-symbols-", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"fingerprint": fingerprint, "root": str(self.root), "files": self.files}, handle)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def _build_lookups(self) -> None:
+        classes: Dict[str, Dict] = {}
+        sobjects: Dict[str, Set[str]] = {}
+        defined: Set[str] = set()
+        for key, entry in self.files.items():
+            symbols = entry.get("symbols") or {}
+            for declared in symbols.get("classes", ()):
+                classes[declared["name"].lower()] = {
+                    "name": declared["name"],
+                    "kind": declared["kind"],
+                    "extends": declared.get("extends"),
+                    "methods": {name.lower(): name for name in declared["methods"]},
+                    "properties": {name.lower() for name in declared["properties"]},
+                    "file": key,
+                }
+            sobject = symbols.get("sobject")
+            if sobject:
+                fields = sobjects.setdefault(sobject.lower(), set())
+                if symbols.get("field"):
+                    fields.add(symbols["field"].lower())
+                else:
+                    defined.add(sobject.lower())
+
+        for name, declared in classes.items():
+            outer, _, inner = name.rpartition(".")
+            if outer in classes:
+                classes[outer].setdefault("inner", set()).add(inner)
+        self._classes = classes
+        self._sobjects = sobjects
+        self._defined_sobjects = defined
+
+    # ── Queries ────────────────────────────────────────────────
+
+    def has_class(self, name: str) -> bool:
+        return name.lower() in self._classes
+
+    def get_class(self, name: str) -> Optional[Dict]:
+        return self._classes.get(name.lower())
+
+    def has_method(self, class_name: str, method: str) -> Optional[bool]:
+        """Whether ``class_name`` (or a project superclass) declares ``method``.
+
+        None when it cannot be decided from local metadata: the class is not
+        in the project or inherits from a class that is not.
+        """
+        method = method.lower()
+        if method in OBJECT_METHODS:
+            return True
+        seen: Set[str] = set()
+        declared = self.get_class(class_name)
+        while declared is not None and declared["name"].lower() not in seen:
+            seen.add(declared["name"].lower())
+            if method in declared["methods"] or method in declared.get("inner", ()):
+                return True
+            if declared["kind"] == "enum" and method in ENUM_METHODS:
+                return True
+            if not declared["extends"]:
+                return False
+            declared = self.get_class(declared["extends"])
+        return None
+
+    def method_names(self, class_name: str) -> List[str]:
+        declared = self.get_class(class_name)
+        return sorted(declared["methods"].values()) if declared else []
+
+    def has_property(self, class_name: str, name: str) -> Optional[bool]:
+        declared = self.get_class(class_name)
+        return None if declared is None else name.lower() in declared["properties"]
+
+    def has_sobject(self, name: str) -> bool:
+        return name.lower() in self._sobjects
+
+    def sobject_fields(self, name: str) -> Set[str]:
+        """Lower-cased field API names defined locally for ``name``."""
+        return self._sobjects.get(name.lower(), set())
+
+    def defines_sobject(self, name: str) -> bool:
+        """Whether ``name`` is a project-owned custom object with its own
+        ``.object-meta.xml``, so its local fields are its complete field list.
+
+        Standard and managed-package objects are never complete locally.
+        """
+        lowered = name.lower()
+        return (
+            lowered in self._defined_sobjects
+            and lowered.endswith("__c")
+            and not is_namespaced(lowered)
+        )
+
+    def has_field(self, sobject: str, field: str) -> Optional[bool]:
+        """Whether ``field`` is defined on ``sobject``; None if the object has no local metadata."""
+        fields = self._sobjects.get(sobject.lower())
+        return None if fields is None else field.lower() in fields
+
+    @property
+    def class_count(self) -> int:
+        return len(self._classes)
+
+    @property
+    def sobject_count(self) -> int:
+        return len(self._sobjects)
+
+
+_INDEXES: Dict[str, ApexSymbolIndex] = {}
+
+
+def project_symbol_index(file_path: str, workers: Optional[int] = None) -> Optional[ApexSymbolIndex]:
+    """Refreshed index of the SFDX project containing ``file_path`` (None outside a project)."""
+    if os.environ.get("SF_APEX_SYMBOL_INDEX", "1") == "0":
+        return None
+    root = find_project_root(file_path)
+    if root is None:
+        return None
+    index = _INDEXES.get(str(root))
+    if index is None:
+        index = _INDEXES[str(root)] = ApexSymbolIndex(root).refresh(workers)
+    return index
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m code_analyzer.apex_symbol_index <project-dir>")
+        sys.exit(1)
+
+    project_root = find_project_root(sys.argv[1])
+    if project_root is None:
+        print(f"No sfdx-project.json at or above {sys.argv[1]}")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    built = ApexSymbolIndex(project_root).refresh()
+    print(
+        f"{project_root}: {built.class_count} classes, {built.sobject_count} SObjects, "
+        f"{len(built.files)} files ({built.parsed_files} parsed) in {time.perf_counter() - started:.2f}s"
+    )
+    print(f"Index: {built.path}")
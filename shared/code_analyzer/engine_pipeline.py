@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Engine Pipeline - Run slow validation engines concurrently under a deadline.
+
+Code Analyzer, the language servers and live org lookups each spend seconds
+waiting on a subprocess or the network. A hook starts them all as soon as it
+knows the file, runs its pure-Python checks meanwhile, and then collects
+whatever finished before a shared deadline:
+
+    pipeline = EnginePipeline(deadline_seconds=25)
+    pipeline.start("code_analyzer", scan_with_ca, file_path)
+    pipeline.start("lsp", validate_with_lsp, file_path)
+
+    custom_results = run_custom_checks(file_path)   # overlaps with engines
+
+    pipeline.wait()
+    ca = pipeline.result("code_analyzer")           # None if it failed/was late
+    late = pipeline.pending()                       # e.g. ["lsp"]
+
+Engines run on daemon threads, so one that overruns the deadline never holds
+the hook process open; its name is reported via ``pending()`` and the merged
+score is marked partial.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class EngineTask:
+    """One engine call running on a daemon thread."""
+
+    def __init__(self, name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any):
+        self.name = name
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.elapsed_ms = 0
+        self._done = threading.Event()
+        self._started = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run, args=(fn, args, kwargs), name=f"engine-{name}", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        try:
+            self.result = fn(*args, **kwargs)
+        except BaseException as e:  # Reported to the caller, never raised in the thread
+            self.error = e
+        finally:
+            self.elapsed_ms = int((time.monotonic() - self._started) * 1000)
+            self._done.set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        return self._done.wait(timeout)
+
+
+class EnginePipeline:
+    """Start engines immediately; collect them against one shared deadline."""
+
+    def __init__(self, deadline_seconds: float):
+        self.started_at = time.monotonic()
+        self.deadline = self.started_at + max(0.0, deadline_seconds)
+        self.tasks: Dict[str, EngineTask] = {}
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def start(self, name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> EngineTask:
+        task = EngineTask(name, fn, *args, **kwargs)
+        self.tasks[name] = task
+        return task
+
+    def wait(self, names: Optional[List[str]] = None) -> None:
+        """Block until the named engines (default: all) finish or the deadline passes."""
+        for name in names or list(self.tasks):
+            task = self.tasks.get(name)
+            if task is not None:
+                task.wait(self.remaining())
+
+    def result(self, name: str) -> Any:
+        """Engine return value, or None if it raised, is still running, or never started."""
+        task = self.tasks.get(name)
+        if task is None or not task.done or task.error is not None:
+            return None
+        return task.result
+
+    def error(self, name: str) -> Optional[BaseException]:
+        task = self.tasks.get(name)
+        return task.error if task is not None and task.done else None
+
+    def pending(self) -> List[str]:
+        return [name for name, task in self.tasks.items() if not task.done]
+
+    def elapsed_ms(self) -> int:
+        return int((time.monotonic() - self.started_at) * 1000)
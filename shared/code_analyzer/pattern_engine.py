@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Pattern Engine - Shared multi-pattern scanner for regex-based Apex validators.
+
+The sf-apex, sf-integration and sf-data validators each loop over their rule
+patterns and then over every line, running `re.search` per (rule, line) pair.
+This engine compiles every registered rule once and scans a file in two
+stages:
+
+1. A single case-insensitive prefilter pass finds the lines that contain each
+   rule's required literal (e.g. ``addmilliseconds`` for
+   ``\\.addMilliseconds\\s*\\(``), using one combined lookahead alternation.
+2. Each rule's full regex only runs on its candidate lines.
+
+Rules without a usable literal (pure character classes, top-level
+alternation) fall back to running on every line, so cost is O(lines) plus
+O(candidate lines) instead of O(rules x lines).
+
+Rules scan either the comment-masked code (``scope="code"``, the default) or
+the raw source (``scope="source"``, for checks that must also see comments,
+such as hardcoded credentials). Multiline rules run once over the whole text.
+
+Usage:
+    from code_analyzer.pattern_engine import PatternEngine
+
+    engine = PatternEngine()
+    engine.add("java_type:ArrayList", r"\\bArrayList\\s*<")
+    engine.add("stream", r"\\.stream\\s*\\(\\)", re.IGNORECASE)
+    engine.add("bearer", r"Authorization.*Bearer\\s+\\w{20,}", scope="source", first_match_only=True)
+
+    for hit in engine.scan(source):
+        print(hit.rule_id, hit.line, hit.span)
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, NamedTuple, Optional, Pattern, Set
+
+from .apex_lexer import lex_apex
+
+SCOPE_CODE = "code"
+SCOPE_SOURCE = "source"
+MIN_LITERAL_LENGTH = 3
+
+
+class PatternHit(NamedTuple):
+    """One rule match: 1-based line, character span within that line."""
+
+    rule_id: str
+    line: int
+    span: tuple
+    match: "re.Match"
+
+
+@dataclass
+class PatternRule:
+    """A registered rule and its prefilter literal."""
+
+    rule_id: str
+    regex: Pattern
+    scope: str = SCOPE_CODE
+    multiline: bool = False
+    first_match_only: bool = False
+    literal: Optional[str] = None
+    index: int = 0
+
+
+@dataclass
+class _ScopePlan:
+    rules: List[PatternRule] = field(default_factory=list)
+    prefilter: Optional[Pattern] = None
+    rules_for_literal: Dict[str, List[PatternRule]] = field(default_factory=dict)
+
+
+def required_literal(pattern: str) -> Optional[str]:
+    """Longest literal substring every match of ``pattern`` must contain.
+
+    Only characters outside groups and character classes, and not made
+    optional by a following quantifier, are considered. Patterns with a
+    top-level alternation have no required literal.
+    """
+    runs: List[str] = []
+    current: List[str] = []
+    depth = 0
+    i = 0
+
+    def end_run():
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            escaped = pattern[i + 1] if i + 1 < len(pattern) else ""
+            if escaped and not escaped.isalnum() and depth == 0:
+                current.append(escaped)
+            else:
+                end_run()
+            i += 2
+            continue
+        if ch == "[":
+            end_run()
+            i += 1
+            while i < len(pattern) and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+            continue
+        if ch == "(":
+            depth += 1
+            end_run()
+        elif ch == ")":
+            depth -= 1
+            end_run()
+        elif ch == "|":
+            if depth == 0:
+                return None
+            end_run()
+        elif ch in "*?{":
+            # Quantifier: the preceding char may be absent (or repeated)
+            if current:
+                current.pop()
+            end_run()
+            if ch == "{":
+                while i < len(pattern) and pattern[i] != "}":
+                    i += 1
+        elif ch in "+.^$":
+            end_run()
+        elif depth == 0:
+            current.append(ch)
+        i += 1
+    end_run()
+
+    best = max(runs, key=len, default="")
+    return best.lower() if len(best) >= MIN_LITERAL_LENGTH else None
+
+
+def mask_comments(source: str) -> str:
+    """Blank out Apex ``//`` and ``/* */`` comments, keeping offsets and newlines.
+
+    Single-quoted string literals are honoured, so ``'http://...'`` is not
+    mistaken for a comment. Served from the shared ``apex_lexer`` cache.
+    """
+    return lex_apex(source).code
+
+
+class PatternEngine:
+    """Registry of rule patterns with a combined, precompiled scanner."""
+
+    def __init__(self, rules: Iterable[tuple] = ()):
+        self._rules: List[PatternRule] = []
+        self._plans: Optional[Dict[str, _ScopePlan]] = None
+        for rule in rules:
+            self.add(*rule)
+
+    def add(
+        self,
+        rule_id: str,
+        pattern: str,
+        flags: int = 0,
+        scope: str = SCOPE_CODE,
+        multiline: bool = False,
+        first_match_only: bool = False,
+        literal: Optional[str] = None,
+    ) -> "PatternEngine":
+        """Register a rule.
+
+        ``first_match_only`` keeps the first match per line (per file for
+        multiline rules), matching ``re.search`` semantics. ``literal``
+        overrides the extracted prefilter literal.
+        """
+        if scope not in (SCOPE_CODE, SCOPE_SOURCE):
+            raise ValueError(f"Unknown scope: {scope}")
+        self._rules.append(PatternRule(
+            rule_id=rule_id,
+            regex=re.compile(pattern, flags),
+            scope=scope,
+            multiline=multiline,
+            first_match_only=first_match_only,
+            literal=(literal.lower() if literal else required_literal(pattern)),
+            index=len(self._rules),
+        ))
+        self._plans = None
+        return self
+
+    @property
+    def rules(self) -> List[PatternRule]:
+        return list(self._rules)
+
+    def _compile(self) -> Dict[str, _ScopePlan]:
+        plans: Dict[str, _ScopePlan] = {}
+        for rule in self._rules:
+            plan = plans.setdefault(rule.scope, _ScopePlan())
+            plan.rules.append(rule)
+
+        for plan in plans.values():
+            literals = sorted({rule.literal for rule in plan.rules if rule.literal}, key=len, reverse=True)
+            if not literals:
+                continue
+            # A literal found at a position also proves every literal it contains,
+            # since the alternation reports only the longest one starting there.
+            for literal in literals:
+                plan.rules_for_literal[literal] = [
+                    rule for rule in plan.rules if rule.literal and rule.literal in literal
+                ]
+            alternation = "|".join(re.escape(literal) for literal in literals)
+            plan.prefilter = re.compile(f"(?=({alternation}))", re.IGNORECASE)
+        return plans
+
+    def scan(self, source: str, code: Optional[str] = None) -> List[PatternHit]:
+        """Scan ``source`` once with every rule.
+
+        Args:
+            source: Raw file content.
+            code: Pre-masked code view of ``source``; taken from the shared
+                ``apex_lexer`` model when omitted and any rule needs it.
+
+        Returns:
+            Hits ordered by rule registration, then line, then column.
+        """
+        if self._plans is None:
+            self._plans = self._compile()
+
+        ordered = []
+        for scope, plan in self._plans.items():
+            if scope == SCOPE_CODE:
+                text = code if code is not None else mask_comments(source)
+            else:
+                text = source
+            ordered.extend(self._scan_scope(plan, text))
+
+        ordered.sort(key=lambda item: (item[0], item[1].line, item[1].span[0]))
+        return [hit for _, hit in ordered]
+
+    def _scan_scope(self, plan: _ScopePlan, text: str) -> List[tuple]:
+        lines = text.split("\n")
+        line_starts = [0]
+        for line in lines[:-1]:
+            line_starts.append(line_starts[-1] + len(line) + 1)
+
+        candidate_lines: Dict[int, Set[int]] = {}
+        present: Set[int] = set()
+        if plan.prefilter is not None:
+            for found in plan.prefilter.finditer(text):
+                line_number = bisect_right(line_starts, found.start())
+                for rule in plan.rules_for_literal[found.group(1).lower()]:
+                    present.add(rule.index)
+                    if not rule.multiline:
+                        candidate_lines.setdefault(rule.index, set()).add(line_number)
+
+        hits: List[tuple] = []
+        for rule in plan.rules:
+            if rule.literal and rule.index not in present:
+                continue
+            if rule.multiline:
+                for match in rule.regex.finditer(text):
+                    line_number = bisect_right(line_starts, match.start())
+                    offset = line_starts[line_number - 1]
+                    hits.append((rule.index, PatternHit(rule.rule_id, line_number, (match.start() - offset, match.end() - offset), match)))
+                    if rule.first_match_only:
+                        break
+                continue
+
+            numbers = sorted(candidate_lines.get(rule.index, ())) if rule.literal else range(1, len(lines) + 1)
+            for line_number in numbers:
+                for match in rule.regex.finditer(lines[line_number - 1]):
+                    hits.append((rule.index, PatternHit(rule.rule_id, line_number, match.span(), match)))
+                    if rule.first_match_only:
+                        break
+        return hits
+
+
+def group_hits(hits: Iterable[PatternHit]) -> Dict[str, List[PatternHit]]:
+    """Hits keyed by rule id, preserving scan order."""
+    grouped: Dict[str, List[PatternHit]] = {}
+    for hit in hits:
+        grouped.setdefault(hit.rule_id, []).append(hit)
+    return grouped
@@ -75,6 +75,12 @@ class MergedScore:
     deductions: List[ScoreDeduction]
     engines_used: List[str] = field(default_factory=list)
     engines_unavailable: List[str] = field(default_factory=list)
+    engines_pending: List[str] = field(default_factory=list)
+
+    @property
+    def partial(self) -> bool:
+        """True when an engine missed the deadline and its findings are not included."""
+        return bool(self.engines_pending)
 
 
 class ScoreMerger:
@@ -195,14 +201,18 @@ class ScoreMerger:
         ca_violations: List[Dict[str, Any]],
         engines_used: Optional[List[str]] = None,
         engines_unavailable: Optional[List[str]] = None,
+        engines_pending: Optional[List[str]] = None,
     ) -> MergedScore:
         """
         Merge Code Analyzer violations with custom scores.
 
         Args:
             ca_violations: List of normalized violations from CodeAnalyzerScanner
+                (or any engine producing the same rule/severity/line shape)
             engines_used: List of engines that ran
             engines_unavailable: List of engines that couldn't run
+            engines_pending: Engines still running at the deadline; the score
+                is partial and excludes their findings
 
         Returns:
             MergedScore with combined results
@@ -291,6 +301,7 @@ class ScoreMerger:
             deductions=self.deductions,
             engines_used=engines_used or [],
             engines_unavailable=engines_unavailable or [],
+            engines_pending=engines_pending or [],
         )
 
     def _calculate_rating(self, score: int, max_score: int) -> tuple:
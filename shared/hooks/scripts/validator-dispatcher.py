@@ -87,15 +87,7 @@ VALIDATOR_REGISTRY: List[tuple] = [
         DEFAULT_TIMEOUT,
     ),
 
-    # Apex class files (.cls) - LSP syntax validation
-    (
-        r"\.cls$",
-        "sf-apex",
-        "sf-apex/hooks/scripts/apex-lsp-validate.py",
-        HEAVY_TIMEOUT,
-    ),
-
-    # Apex class files (.cls) - 150-point scoring + Code Analyzer
+    # Apex class files (.cls) - 150-point scoring + Code Analyzer + LSP (run concurrently)
     (
         r"\.cls$",
         "sf-apex",
@@ -103,15 +95,7 @@ VALIDATOR_REGISTRY: List[tuple] = [
         HEAVY_TIMEOUT,
     ),
 
-    # Apex trigger files (.trigger) - LSP syntax validation
-    (
-        r"\.trigger$",
-        "sf-apex",
-        "sf-apex/hooks/scripts/apex-lsp-validate.py",
-        HEAVY_TIMEOUT,
-    ),
-
-    # Apex trigger files (.trigger) - 150-point scoring + Code Analyzer
+    # Apex trigger files (.trigger) - 150-point scoring + Code Analyzer + LSP (run concurrently)
     (
         r"\.trigger$",
         "sf-apex",
@@ -31,6 +31,8 @@ from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 
+from code_analyzer.apex_lexer import lex_apex
+
 
 class FileType(Enum):
     """File types for extraction."""
@@ -115,13 +117,6 @@ class SOQLExtractor:
         re.compile(r'\bdo\s*\{', re.IGNORECASE),
     ]
 
-    # Method/function pattern for context
-    METHOD_PATTERN = re.compile(
-        r'(?:public|private|protected|global|static|\s)+\s+'
-        r'(?:\w+(?:<[^>]+>)?)\s+(\w+)\s*\([^)]*\)\s*\{',
-        re.IGNORECASE
-    )
-
     def __init__(self, content: str, file_type: str = "apex"):
         """
         Initialize the extractor.
@@ -175,17 +170,16 @@ class SOQLExtractor:
         """Extract SOQL queries from Apex code."""
         queries = []
 
-        # Remove string literals that aren't SOQL to avoid false positives
-        cleaned_content = self._mask_non_soql_strings(self.content)
+        # Shared lexical model: comments masked in `code`, and string
+        # contents masked in `bare_code` too, both offset-preserving
+        self.source = lex_apex(self.content)
+        code = self.source.code
 
         # Build loop regions map
-        loop_regions = self._find_loop_regions(cleaned_content)
-
-        # Build method context map
-        method_contexts = self._find_method_contexts(self.content)
+        loop_regions = self._find_loop_regions(self.source.bare_code)
 
         # Extract inline SOQL
-        for match in self.INLINE_SOQL_PATTERN.finditer(self.content):
+        for match in self.INLINE_SOQL_PATTERN.finditer(code):
             query = match.group(1).strip()
             query = self._normalize_query(query)
 
@@ -194,7 +188,7 @@ class SOQLExtractor:
             end_line = self._position_to_line(match.end())
 
             in_loop = self._is_in_loop(pos, loop_regions)
-            context = self._get_context(pos, method_contexts)
+            context = self._get_context(pos)
 
             queries.append(ExtractedQuery(
                 query=query,
@@ -203,12 +197,12 @@ class SOQLExtractor:
                 in_loop=in_loop,
                 context=context,
                 query_type="inline",
-                raw_match=match.group(0),
+                raw_match=self.content[match.start():match.end()],
             ))
 
         # Extract dynamic SOQL
         for pattern in self.DYNAMIC_SOQL_PATTERNS:
-            for match in pattern.finditer(self.content):
+            for match in pattern.finditer(code):
                 captured = match.group(1)
 
                 # If it's a variable name (not a query), note it but skip analysis
@@ -223,7 +217,7 @@ class SOQLExtractor:
                         query=f"[Dynamic: {captured}]",
                         line=line,
                         in_loop=in_loop,
-                        context=self._get_context(pos, method_contexts),
+                        context=self._get_context(pos),
                         query_type="dynamic_variable",
                     ))
                 else:
@@ -235,7 +229,7 @@ class SOQLExtractor:
                         query=query,
                         line=line,
                         in_loop=self._is_in_loop(pos, loop_regions),
-                        context=self._get_context(pos, method_contexts),
+                        context=self._get_context(pos),
                         query_type="dynamic",
                     ))
 
@@ -253,92 +247,34 @@ class SOQLExtractor:
         text = re.sub(r'/\*[\s\S]*?\*/', '', text)
         return text
 
-    def _mask_non_soql_strings(self, content: str) -> str:
-        """
-        Mask string literals that aren't SOQL queries.
-
-        This prevents false positives from strings like 'SELECT' in error messages.
-        """
-        def replacer(match):
-            string_content = match.group(1)
-            # Keep SOQL strings, mask others
-            if 'SELECT' in string_content.upper() and 'FROM' in string_content.upper():
-                return match.group(0)
-            return "'MASKED'"
-
-        # Mask single-quoted strings
-        result = re.sub(r"'([^']*)'", replacer, content)
-        return result
-
-    def _find_loop_regions(self, content: str) -> List[tuple]:
+    def _find_loop_regions(self, bare_code: str) -> List[tuple]:
         """
         Find all loop regions in the code.
 
+        Args:
+            bare_code: Source with comments and string contents masked
+
         Returns:
             List of (start_pos, end_pos) tuples for each loop
         """
         regions = []
 
         for pattern in self.LOOP_PATTERNS:
-            for match in pattern.finditer(content):
+            for match in pattern.finditer(bare_code):
                 loop_start = match.start()
-                # Find the matching closing brace
-                loop_end = self._find_matching_brace(content, match.end())
+                # The loop body is the first brace block after the keyword
+                body_start = bare_code.find('{', match.end() - 1)
+                if body_start == -1:
+                    continue
+                loop_end = self.source.matching_brace(body_start)
                 if loop_end > loop_start:
                     regions.append((loop_start, loop_end))
 
         return regions
 
-    def _find_matching_brace(self, content: str, start: int) -> int:
-        """Find the position of the matching closing brace."""
-        depth = 0
-        in_string = False
-        string_char = None
-
-        for i in range(start, len(content)):
-            c = content[i]
-
-            # Handle string literals
-            if c in ('"', "'") and (i == 0 or content[i-1] != '\\'):
-                if not in_string:
-                    in_string = True
-                    string_char = c
-                elif c == string_char:
-                    in_string = False
-                continue
-
-            if in_string:
-                continue
-
-            if c == '{':
-                depth += 1
-            elif c == '}':
-                depth -= 1
-                if depth == 0:
-                    return i
-
-        return len(content)
-
-    def _find_method_contexts(self, content: str) -> List[tuple]:
-        """
-        Find method boundaries for context.
-
-        Returns:
-            List of (start_pos, end_pos, method_name) tuples
-        """
-        contexts = []
-
-        for match in self.METHOD_PATTERN.finditer(content):
-            method_name = match.group(1)
-            method_start = match.start()
-            method_end = self._find_matching_brace(content, match.end())
-            contexts.append((method_start, method_end, method_name))
-
-        return contexts
-
     def _position_to_line(self, pos: int) -> int:
         """Convert character position to line number (1-based)."""
-        return self.content[:pos].count('\n') + 1
+        return self.source.line_of(pos)
 
     def _is_in_loop(self, pos: int, loop_regions: List[tuple]) -> bool:
         """Check if position is inside a loop."""
@@ -347,12 +283,10 @@ class SOQLExtractor:
                 return True
         return False
 
-    def _get_context(self, pos: int, method_contexts: List[tuple]) -> str:
+    def _get_context(self, pos: int) -> str:
         """Get the method context for a position."""
-        for start, end, name in method_contexts:
-            if start <= pos <= end:
-                return name
-        return "global"
+        method = self.source.method_at(pos)
+        return method.name if method else "global"
 
     def _normalize_query(self, query: str) -> str:
         """Normalize a SOQL query for analysis."""
@@ -7,8 +7,10 @@ data from Salesforce Data Cloud.
 Modules:
     auth: JWT Bearer authentication for Data Cloud API
     datacloud_client: Data Cloud Query API client with pagination
+    async_client: Asyncio Query API client and blocking facade
     extractor: STDM (Session Tracing Data Model) extraction orchestrator
     models: Pydantic models and PyArrow schemas for STDM data
+    manifest: Append-only dataset manifest and partition compaction
     analyzer: Polars-based analysis helpers
     cli: Command-line interface
 """
@@ -32,6 +32,8 @@ import polars as pl
 from rich.console import Console
 from rich.table import Table
 
+from .manifest import DatasetManifest, dataset_files
+
 
 console = Console()
 
@@ -63,21 +65,38 @@ class STDMAnalyzer:
 
     def _get_parquet_path(self, entity: str) -> Path:
         """Get Parquet file path for entity."""
-        # Try direct file first
+        # Try direct file first (unless rolled into data-NNNNN.parquet parts)
         direct_path = self.data_dir / entity / "data.parquet"
-        if direct_path.exists():
+        if direct_path.exists() and not direct_path.with_name("data-00001.parquet").exists():
             return direct_path
 
         # Try partitioned directory
         partition_path = self.data_dir / entity
         if partition_path.exists() and partition_path.is_dir():
-            # Check for parquet files
-            parquet_files = list(partition_path.glob("**/*.parquet"))
+            # Check for parquet files (hidden temp and staging files don't count)
+            parquet_files = dataset_files(partition_path)
             if parquet_files:
                 return partition_path
 
         raise FileNotFoundError(f"No data found for {entity} in {self.data_dir}")
 
+    def _scan(self, entity: str) -> pl.LazyFrame:
+        """
+        Lazy frame for an entity.
+
+        Output of incremental (append-only) runs is listed in the dataset
+        manifest and may hold several versions of a record; those are
+        resolved to the latest version per ssot__Id__c.
+        """
+        manifest = DatasetManifest.load(self.data_dir)
+        if manifest.has_entity(entity):
+            return manifest.scan_latest(entity)
+        path = self._get_parquet_path(entity)
+        if path.is_dir():
+            # Explicit file list: polars would also pick up hidden temp files
+            return pl.scan_parquet(dataset_files(path), hive_partitioning=False)
+        return pl.scan_parquet(path)
+
     def load_sessions(self) -> pl.LazyFrame:
         """
         Load sessions as lazy frame.
@@ -85,8 +104,7 @@ class STDMAnalyzer:
         Returns:
             Polars LazyFrame for sessions
         """
-        path = self._get_parquet_path("sessions")
-        return pl.scan_parquet(path)
+        return self._scan("sessions")
 
     def load_interactions(self) -> pl.LazyFrame:
         """
@@ -95,8 +113,7 @@ class STDMAnalyzer:
         Returns:
             Polars LazyFrame for interactions
         """
-        path = self._get_parquet_path("interactions")
-        return pl.scan_parquet(path)
+        return self._scan("interactions")
 
     def load_steps(self) -> pl.LazyFrame:
         """
@@ -105,8 +122,7 @@ class STDMAnalyzer:
         Returns:
             Polars LazyFrame for steps
         """
-        path = self._get_parquet_path("steps")
-        return pl.scan_parquet(path)
+        return self._scan("steps")
 
     def load_messages(self) -> pl.LazyFrame:
         """
@@ -115,8 +131,7 @@ class STDMAnalyzer:
         Returns:
             Polars LazyFrame for messages
         """
-        path = self._get_parquet_path("messages")
-        return pl.scan_parquet(path)
+        return self._scan("messages")
 
     def session_summary(self) -> pl.DataFrame:
         """
@@ -779,8 +794,7 @@ class STDMAnalyzer:
         Returns:
             Polars LazyFrame for GenAIGeneration records
         """
-        path = self._get_parquet_path("generations")
-        return pl.scan_parquet(path)
+        return self._scan("generations")
 
     def load_content_quality(self) -> pl.LazyFrame:
         """
@@ -789,8 +803,7 @@ class STDMAnalyzer:
         Returns:
             Polars LazyFrame for GenAIContentQuality records
         """
-        path = self._get_parquet_path("content_quality")
-        return pl.scan_parquet(path)
+        return self._scan("content_quality")
 
     def load_content_categories(self) -> pl.LazyFrame:
         """
@@ -799,8 +812,7 @@ class STDMAnalyzer:
         Returns:
             Polars LazyFrame for GenAIContentCategory records
         """
-        path = self._get_parquet_path("content_categories")
-        return pl.scan_parquet(path)
+        return self._scan("content_categories")
 
     def find_toxic_responses(self, limit: int = 100) -> pl.DataFrame:
         """
@@ -0,0 +1,639 @@
+"""
+Asyncio variant of the Data 360 Query API client.
+
+AsyncData360Client has the same query surface as Data360Client, as
+coroutines, on one httpx.AsyncClient:
+
+- A semaphore caps requests in flight across all tasks
+- A 429 (honouring Retry-After) pauses every task on the client, not
+  just the one that was throttled
+- A 401 triggers one token refresh; concurrent tasks that hit it with
+  the same stale token wait for that refresh instead of starting their own
+
+BlockingData360Client runs an async client on a private event loop
+thread and exposes the synchronous methods STDMExtractor calls, so the
+extractor's threads share one async connection pool and rate limiter.
+
+Usage:
+    auth = Data360Auth("myorg", "consumer_key")
+
+    async with AsyncData360Client(auth, max_concurrency=16) as client:
+        async for record in client.query("SELECT * FROM ssot__AIAgentSession__dlm"):
+            print(record)
+
+        counts = await asyncio.gather(*(
+            client.query_to_parquet(sql, Path(f"./out/{i}.parquet"))
+            for i, sql in enumerate(queries)
+        ))
+
+    # Drop-in for STDMExtractor (wrapped automatically)
+    client = AsyncData360Client(auth)
+    extractor = STDMExtractor(client, Path("./stdm_data"))
+    ...
+    client.blocking().close()
+
+    # Tests: point it at a mock transport or local server
+    client = AsyncData360Client(auth, transport=httpx.MockTransport(handler))
+"""
+
+import asyncio
+import importlib.util
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+import pyarrow as pa
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+
+from .auth import DataCloudAuth
+from .datacloud_client import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_COMPRESSION,
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_FILE_BYTES,
+    DEFAULT_MAX_KEEPALIVE,
+    DEFAULT_ROW_GROUP_SIZE,
+    DEFAULT_TIMEOUT,
+    INITIAL_BACKOFF,
+    MAX_RETRIES,
+    ParquetStreamWriter,
+    QueryStats,
+    _ParquetOutput,
+    _decode_response,
+    _error_message,
+    parquet_parts,
+)
+
+
+# Requests in flight at once across all tasks sharing a client
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Seconds a token is reused before asking auth again (auth refreshes
+# TOKEN_REFRESH_BUFFER = 5 minutes before expiry, so this stays valid)
+TOKEN_RECHECK_INTERVAL = 60.0
+
+
+@dataclass
+class AsyncData360Client(_ParquetOutput):
+    """
+    Asyncio Data 360 Query API client.
+
+    Use from a single event loop. Parquet encoding and file writes run in
+    worker threads so they do not stall other requests.
+
+    Attributes:
+        auth: Data360Auth instance for authentication
+        api_version: Salesforce API version (default: v66.0)
+        batch_size: Records per API request (default: 2000)
+        timeout: Request timeout in seconds (default: 120)
+        max_concurrency: Requests in flight at once (default: 8)
+        max_connections: Connection pool size (default: 20)
+        max_keepalive_connections: Idle connections kept open (default: 10)
+        keepalive_expiry: Seconds an idle connection is kept (default: 30)
+        http2: Use HTTP/2; None enables it when the h2 package is installed
+        transport: Optional httpx transport (e.g. httpx.MockTransport in tests)
+        row_group_size: Rows per Parquet row group (default: 10000)
+        compression: Parquet compression codec (default: zstd)
+        max_file_bytes: Roll Parquet output to a new file above this size;
+            0 or None disables rolling (default: 512 MiB)
+
+    Example:
+        >>> async with AsyncData360Client(auth) as client:
+        ...     rows = await client.get_query_rows(query_id, offset=0, row_limit=5000)
+    """
+
+    auth: DataCloudAuth
+    api_version: str = "v66.0"
+    batch_size: int = DEFAULT_BATCH_SIZE
+    timeout: float = DEFAULT_TIMEOUT
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY
+    http2: Optional[bool] = None
+    transport: Optional[httpx.AsyncBaseTransport] = None
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE
+    compression: Optional[str] = DEFAULT_COMPRESSION
+    max_file_bytes: Optional[int] = DEFAULT_MAX_FILE_BYTES
+    _stats: QueryStats = field(default_factory=QueryStats)
+    _http: Optional[httpx.AsyncClient] = field(default=None, init=False, repr=False)
+    _semaphore: Optional[asyncio.Semaphore] = field(default=None, init=False, repr=False)
+    _auth_lock: Optional[asyncio.Lock] = field(default=None, init=False, repr=False)
+    _token: Optional[str] = field(default=None, init=False, repr=False)
+    _token_checked_at: float = field(default=0.0, init=False, repr=False)
+    _backoff_until: float = field(default=0.0, init=False, repr=False)
+    _blocking: Optional["BlockingData360Client"] = field(default=None, init=False, repr=False)
+
+    @property
+    def base_url(self) -> str:
+        """Get the Data 360 Query API base URL."""
+        return f"{self.auth.instance_url}/services/data/{self.api_version}"
+
+    @property
+    def query_url(self) -> str:
+        """Get the Data 360 Query SQL endpoint URL (v64.0+)."""
+        return f"{self.base_url}/ssot/query-sql"
+
+    @property
+    def stats(self) -> QueryStats:
+        """Get statistics from the last query."""
+        return self._stats
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client and task coordination, creating them on first use."""
+        if self._http is None or self._http.is_closed:
+            http2 = self.http2
+            if http2 is None:
+                http2 = importlib.util.find_spec("h2") is not None
+            self._http = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=http2,
+                transport=self.transport,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+            self._auth_lock = asyncio.Lock()
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close pooled connections. The client reopens them if used again."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def __aenter__(self) -> "AsyncData360Client":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    def blocking(self) -> "BlockingData360Client":
+        """Synchronous facade over this client (created once, reused after)."""
+        if self._blocking is None or self._blocking.closed:
+            self._blocking = BlockingData360Client(self)
+        return self._blocking
+
+    async def _get_token(self, stale: Optional[str] = None) -> str:
+        """
+        Current access token.
+
+        The token is kept on the client, so requests take no lock; auth is
+        consulted (off the event loop, one task at a time) only when no
+        token is held, TOKEN_RECHECK_INTERVAL has passed, or ``stale`` is
+        given. With ``stale`` the token is refreshed unless another task
+        already replaced it while this one waited for the lock.
+        """
+        if stale is None and self._token_is_fresh():
+            return self._token
+
+        async with self._auth_lock:
+            if stale is None:
+                if self._token_is_fresh():
+                    return self._token
+                token = await asyncio.to_thread(self.auth.get_token)
+            elif self._token != stale:
+                return self._token
+            else:
+                token = await asyncio.to_thread(self.auth.get_token, True)
+            self._token = token
+            self._token_checked_at = time.monotonic()
+            return token
+
+    def _token_is_fresh(self) -> bool:
+        return (
+            self._token is not None
+            and time.monotonic() - self._token_checked_at < TOKEN_RECHECK_INTERVAL
+        )
+
+    async def _wait_for_backoff(self) -> None:
+        """Sleep until a rate-limit backoff started by any task has passed."""
+        while True:
+            delay = self._backoff_until - time.monotonic()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    async def _execute_request(
+        self,
+        url: str,
+        method: str = "POST",
+        json_body: Optional[dict] = None,
+    ) -> dict:
+        """
+        Execute an HTTP request with retry logic and rate limit handling.
+
+        Args:
+            url: Request URL
+            method: HTTP method (GET, POST, DELETE)
+            json_body: Request body for POST requests
+
+        Returns:
+            Response JSON (empty dict for DELETE with 204)
+
+        Raises:
+            RuntimeError: If request fails after retries
+        """
+        http = self._get_http()
+        token: Optional[str] = None
+
+        for retry_count in range(MAX_RETRIES + 1):
+            async with self._semaphore:
+                # Checked once a slot is free, so tasks queued here do not
+                # send while a backoff started by another task is running
+                await self._wait_for_backoff()
+                token = await self._get_token()
+                headers = {
+                    "Authorization": f"Bearer {token}",
+                    "Content-Type": "application/json",
+                }
+
+                try:
+                    response = await http.request(
+                        method,
+                        url,
+                        headers=headers,
+                        json=json_body if method == "POST" else None,
+                    )
+                except httpx.TimeoutException:
+                    if retry_count < MAX_RETRIES:
+                        await asyncio.sleep(INITIAL_BACKOFF * (2 ** retry_count))
+                        continue
+                    raise RuntimeError(f"Request timed out after {MAX_RETRIES} retries")
+
+            # Rate limited: every task waits out the backoff before retrying
+            if response.status_code == 429:
+                if retry_count >= MAX_RETRIES:
+                    raise RuntimeError("Rate limit exceeded after max retries")
+
+                wait_time = INITIAL_BACKOFF * (2 ** retry_count)
+                retry_after = response.headers.get("Retry-After")
+                if retry_after:
+                    wait_time = max(wait_time, float(retry_after))
+
+                self._stats.rate_limit_waits += 1
+                self._backoff_until = max(self._backoff_until, time.monotonic() + wait_time)
+                continue
+
+            # Expired token: refresh once for all tasks that used it
+            if response.status_code == 401:
+                if retry_count >= MAX_RETRIES:
+                    raise RuntimeError("Authentication failed after token refresh")
+                await self._get_token(stale=token)
+                continue
+
+            if response.status_code >= 400:
+                raise RuntimeError(f"Query failed ({response.status_code}): {_error_message(response)}")
+
+            self._stats.bytes_transferred += len(response.content)
+            return _decode_response(response)
+
+        raise RuntimeError(f"Request failed after {MAX_RETRIES} retries")
+
+    async def query(self, sql: str, limit: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute Data 360 SQL and yield records.
+
+        Args:
+            sql: Data 360 SQL query
+            limit: Optional maximum records to return
+
+        Yields:
+            Individual record dictionaries
+
+        Example:
+            >>> async for record in client.query("SELECT * FROM ssot__AIAgentSession__dlm LIMIT 100"):
+            ...     print(record["ssot__Id__c"])
+        """
+        self._stats = QueryStats(start_time=datetime.now())
+        records_yielded = 0
+
+        async for column_names, raw_data in self._iter_pages(sql):
+            for row in raw_data:
+                if limit and records_yielded >= limit:
+                    self._stats.end_time = datetime.now()
+                    return
+
+                self._stats.records_fetched += 1
+                records_yielded += 1
+                yield dict(zip(column_names, row))
+
+        self._stats.end_time = datetime.now()
+
+    async def _iter_pages(self, sql: str) -> AsyncIterator[Tuple[List[str], List[list]]]:
+        """
+        Execute Data 360 SQL and yield one page of rows at a time.
+
+        Args:
+            sql: Data 360 SQL query
+
+        Yields:
+            (column_names, rows) per page
+        """
+        response = await self._execute_request(self.query_url, "POST", {"sql": sql})
+
+        metadata = response.get("metadata", [])
+        column_names = [col["name"] for col in metadata]
+
+        while True:
+            self._stats.batches_fetched += 1
+            yield column_names, response.get("data", [])
+
+            status = response.get("status", {})
+            if status.get("completionStatus", "") in ["Running", "MoreChunksAvailable"]:
+                query_id = status.get("queryId")
+                if query_id:
+                    response = await self._execute_request(f"{self.query_url}/{query_id}/rows", "GET")
+                    continue
+
+            next_url = response.get("nextRecordsUrl")
+            if not next_url:
+                break
+            if not next_url.startswith("http"):
+                next_url = f"{self.auth.instance_url}{next_url}"
+            response = await self._execute_request(next_url, "GET")
+
+    async def query_all(self, sql: str) -> List[Dict[str, Any]]:
+        """Execute query and return all records as a list."""
+        return [record async for record in self.query(sql)]
+
+    async def get_query_status(self, query_id: str) -> Dict[str, Any]:
+        """Get status of a running or completed query (see Data360Client.get_query_status)."""
+        return await self._execute_request(f"{self.query_url}/{query_id}", "GET")
+
+    async def get_query_rows(
+        self,
+        query_id: str,
+        offset: int = 0,
+        row_limit: int = 10000
+    ) -> Dict[str, Any]:
+        """
+        Get paginated results from a completed query.
+
+        Args:
+            query_id: The query ID from a completed query
+            offset: Number of rows to skip (for pagination)
+            row_limit: Maximum rows to return (default: 10000, max: 10000)
+
+        Returns:
+            Dict with metadata, data and status (see Data360Client.get_query_rows)
+        """
+        url = f"{self.query_url}/{query_id}/rows?offset={offset}&rowLimit={row_limit}"
+        return await self._execute_request(url, "GET")
+
+    async def cancel_query(self, query_id: str) -> bool:
+        """
+        Cancel a running query.
+
+        Args:
+            query_id: The query ID to cancel
+
+        Returns:
+            True if cancellation was successful
+        """
+        await self._execute_request(f"{self.query_url}/{query_id}", "DELETE")
+        return True
+
+    async def query_to_parquet(
+        self,
+        sql: str,
+        output_path: Path,
+        schema: Optional[pa.Schema] = None,
+        partition_cols: Optional[List[str]] = None,
+        show_progress: bool = True,
+        append: bool = False,
+        dedupe_key: Optional[str] = "ssot__Id__c",
+        on_page: Optional[Callable[[pa.Table], None]] = None,
+    ) -> int:
+        """
+        Execute query and stream results into Parquet.
+
+        Same output layout and arguments as Data360Client.query_to_parquet().
+
+        Returns:
+            Total number of records written
+        """
+        return await self.query_many_to_parquet(
+            [sql],
+            output_path,
+            schema=schema,
+            partition_cols=partition_cols,
+            show_progress=show_progress,
+            append=append,
+            dedupe_key=dedupe_key,
+            on_page=on_page,
+        )
+
+    async def query_many_to_parquet(
+        self,
+        sqls: Sequence[str],
+        output_path: Path,
+        schema: Optional[pa.Schema] = None,
+        partition_cols: Optional[List[str]] = None,
+        show_progress: bool = True,
+        append: bool = False,
+        dedupe_key: Optional[str] = "ssot__Id__c",
+        max_workers: Optional[int] = None,
+        on_page: Optional[Callable[[pa.Table], None]] = None,
+    ) -> int:
+        """
+        Execute several queries and stream all their rows into one output.
+
+        Queries run as concurrent tasks, limited by ``max_workers`` (if
+        given) and by the client's ``max_concurrency``. Page decoding and
+        row-group writes run in worker threads; writes are serialized.
+        ``on_page`` is a plain function, also called in a worker thread.
+
+        Args:
+            sqls: Data 360 SQL queries returning the same columns
+            output_path: Path to output Parquet file or directory (if partitioned)
+            schema: Optional PyArrow schema (auto-inferred if not provided)
+            partition_cols: Optional columns to partition by
+            show_progress: Show progress bar
+            append: If True and file exists, merge with existing data
+            dedupe_key: Column to deduplicate on when appending (default: ssot__Id__c)
+            max_workers: Maximum queries running at once (default: all)
+            on_page: Called with each page's table once it is written
+
+        Returns:
+            Total number of records written
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._stats = QueryStats(start_time=datetime.now())
+        records_written = 0
+        writer: Optional[ParquetStreamWriter] = None
+        write_lock = asyncio.Lock()
+        query_slots = asyncio.Semaphore(max_workers or len(sqls) or 1)
+
+        merge_existing = (
+            append and not partition_cols and bool(parquet_parts(output_path))
+        )
+        stream_path = (
+            output_path.with_name(f".{output_path.stem}.append.parquet")
+            if merge_existing else output_path
+        )
+
+        progress = None
+        task = None
+        if show_progress:
+            progress = Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                TaskProgressColumn(),
+                TextColumn("[cyan]{task.fields[records]} records"),
+            )
+            progress.start()
+            task = progress.add_task("Fetching...", total=len(sqls) if len(sqls) > 1 else None, records=0)
+
+        async def run(sql: str) -> None:
+            nonlocal writer, records_written
+            async with query_slots:
+                async for column_names, raw_data in self._iter_pages(sql):
+                    if not raw_data:
+                        continue
+
+                    async with write_lock:
+                        if writer is None:
+                            writer = self._open_writer(
+                                stream_path,
+                                schema or self._infer_schema(dict(zip(column_names, raw_data[0]))),
+                                None if merge_existing else partition_cols,
+                                max_file_bytes=0 if merge_existing else self.max_file_bytes,
+                            )
+                        target = writer.schema
+
+                    table = await asyncio.to_thread(self._page_to_table, column_names, raw_data, target)
+
+                    async with write_lock:
+                        await asyncio.to_thread(writer.write, table)
+                        records_written += len(raw_data)
+                        self._stats.records_fetched += len(raw_data)
+                        if progress and task is not None:
+                            progress.update(task, records=records_written)
+
+                    if on_page is not None:
+                        await asyncio.to_thread(on_page, table)
+
+            if progress and task is not None and len(sqls) > 1:
+                progress.advance(task)
+
+        tasks = [asyncio.ensure_future(run(sql)) for sql in sqls]
+        try:
+            await asyncio.gather(*tasks)
+
+            if writer is not None:
+                await asyncio.to_thread(writer.close)
+                if merge_existing:
+                    records_written = await asyncio.to_thread(
+                        self._merge_append, output_path, [stream_path], writer.schema, dedupe_key
+                    )
+
+        except BaseException:
+            for pending in tasks:
+                pending.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Keep whatever was on disk before this query
+            if writer is not None:
+                writer.abort()
+            raise
+
+        finally:
+            if merge_existing and stream_path.exists():
+                stream_path.unlink()
+            if progress:
+                progress.stop()
+
+        self._stats.end_time = datetime.now()
+        return records_written
+
+
+class BlockingData360Client:
+    """
+    Synchronous facade over an AsyncData360Client.
+
+    The async client runs on a private event loop thread. Each call blocks
+    the calling thread until its coroutine completes, so any number of
+    threads (e.g. STDMExtractor's pipeline stages) share the async
+    client's connection pool, concurrency limit, backoff and token refresh.
+
+    Obtain one through ``AsyncData360Client.blocking()``; close() shuts
+    down the loop thread and the async client's connections.
+    """
+
+    def __init__(self, client: AsyncData360Client):
+        self.client = client
+        self.closed = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="data360-async", daemon=True
+        )
+        self._thread.start()
+
+    def __getattr__(self, name: str) -> Any:
+        # Settings such as row_group_size and the local Parquet helpers
+        return getattr(self.client, name)
+
+    def _run(self, coro) -> Any:
+        if self.closed:
+            raise RuntimeError("BlockingData360Client is closed")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def query(self, sql: str, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Execute Data 360 SQL and yield records."""
+        records = self.client.query(sql, limit)
+        while True:
+            try:
+                yield self._run(records.__anext__())
+            except StopAsyncIteration:
+                return
+
+    def query_all(self, sql: str) -> List[Dict[str, Any]]:
+        """Execute query and return all records as a list."""
+        return self._run(self.client.query_all(sql))
+
+    def get_query_status(self, query_id: str) -> Dict[str, Any]:
+        """Get status of a running or completed query."""
+        return self._run(self.client.get_query_status(query_id))
+
+    def get_query_rows(self, query_id: str, offset: int = 0, row_limit: int = 10000) -> Dict[str, Any]:
+        """Get paginated results from a completed query."""
+        return self._run(self.client.get_query_rows(query_id, offset, row_limit))
+
+    def cancel_query(self, query_id: str) -> bool:
+        """Cancel a running query."""
+        return self._run(self.client.cancel_query(query_id))
+
+    def query_to_parquet(self, sql: str, output_path: Path, **kwargs) -> int:
+        """Execute query and stream results into Parquet."""
+        return self._run(self.client.query_to_parquet(sql, output_path, **kwargs))
+
+    def query_many_to_parquet(self, sqls: Sequence[str], output_path: Path, **kwargs) -> int:
+        """Execute several queries and stream all their rows into one output."""
+        return self._run(self.client.query_many_to_parquet(sqls, output_path, **kwargs))
+
+    def close(self) -> None:
+        """Close the async client's connections and stop the loop thread."""
+        if self.closed:
+            return
+        self._run(self.client.aclose())
+        self.closed = True
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> "BlockingData360Client":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
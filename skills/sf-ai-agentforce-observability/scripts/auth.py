@@ -28,14 +28,29 @@ Usage:
 
     token = auth.get_token()
     # Use token for Data 360 API requests
+
+Token Cache:
+    Access tokens and org info are cached on disk so separate CLI
+    invocations (extract, extract-quality, analyze, ...) reuse one login:
+
+    ~/.sf/jwt/cache/{org_alias}-{consumer_key hash}.token.json  (until expiry)
+    ~/.sf/jwt/cache/{org_alias}.org.json                        (ORG_INFO_TTL)
+
+    The directory is 0700 and files are 0600. Pass cache_dir=None to
+    disable the cache, or call auth.clear_cache() to force a new login.
 """
 
+import hashlib
 import json
+import os
+import re
+import tempfile
+import threading
 import time
 import subprocess
 from pathlib import Path
-from typing import Optional
-from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from dataclasses import asdict, dataclass, field
 
 import jwt
 import httpx
@@ -53,6 +68,14 @@ TEST_LOGIN_URL = "https://test.salesforce.com"
 # Token refresh buffer (refresh 5 minutes before expiry)
 TOKEN_REFRESH_BUFFER = 300
 
+# Lifetime assumed when the token response has no expires_in; conservative
+# against the shortest common session timeout (Salesforce default: 2 hours)
+DEFAULT_TOKEN_LIFETIME = 3600
+
+# On-disk token and org info cache
+DEFAULT_CACHE_DIR = DEFAULT_KEY_DIR / "cache"
+ORG_INFO_TTL = 12 * 3600  # seconds
+
 
 @dataclass
 class OrgInfo:
@@ -77,13 +100,18 @@ class Data360Auth:
     This class handles:
     - JWT assertion generation using X.509 certificates
     - Token exchange with Salesforce OAuth endpoint
-    - Token caching and automatic refresh
+    - Token caching (in memory and on disk) and automatic refresh
     - Integration with sf CLI for org discovery
 
     Attributes:
         org_alias: Salesforce CLI org alias
         consumer_key: Connected App consumer key (client ID)
         key_path: Path to private key file (default: ~/.sf/jwt/{org_alias}.key)
+        cache_dir: Directory for the token and org info cache
+            (default: ~/.sf/jwt/cache); None disables the disk cache
+        org_info_ttl: Seconds cached org info is reused (default: 12 hours)
+        transport: Optional httpx transport for the token exchange
+            (e.g. httpx.MockTransport in tests)
 
     Example:
         >>> auth = Data360Auth("prod", "3MVG9...")
@@ -94,9 +122,13 @@ class Data360Auth:
     org_alias: str
     consumer_key: Optional[str] = None
     key_path: Optional[Path] = None
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR
+    org_info_ttl: float = ORG_INFO_TTL
+    transport: Optional[httpx.BaseTransport] = field(default=None, repr=False)
     _token: Optional[str] = field(default=None, repr=False)
     _token_expiry: float = field(default=0, repr=False)
     _org_info: Optional[OrgInfo] = field(default=None, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
 
     def __post_init__(self):
         """Initialize key path and consumer key if not provided.
@@ -170,12 +202,94 @@ class Data360Auth:
             f"  3. Parameter: consumer_key='...'"
         )
 
+    def _cache_file(self, kind: str) -> Optional[Path]:
+        """
+        Cache file for this org ("org") or org and consumer key ("token").
+
+        Returns:
+            Path in cache_dir, or None if the disk cache is disabled
+        """
+        if self.cache_dir is None:
+            return None
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", self.org_alias)
+        if kind == "token":
+            key_hash = hashlib.sha256((self.consumer_key or "").encode()).hexdigest()[:16]
+            name = f"{name}-{key_hash}"
+        return Path(self.cache_dir).expanduser() / f"{name}.{kind}.json"
+
+    def _read_cache(self, kind: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a cache file, ignoring it if missing, unreadable, owned by
+        another user, or accessible to other users.
+        """
+        path = self._cache_file(kind)
+        if path is None:
+            return None
+        try:
+            st = path.stat()
+            if st.st_uid != os.getuid() or st.st_mode & 0o077:
+                return None
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _write_cache(self, kind: str, data: Dict[str, Any]):
+        """Atomically write a cache file with 0600 permissions (best effort)."""
+        path = self._cache_file(kind)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            # mkdir's mode does not apply to a directory that already exists
+            os.chmod(path.parent, 0o700)
+            # mkstemp creates the file 0600
+            fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}-")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            # A read-only home directory should not break authentication
+            pass
+
+    def clear_cache(self):
+        """Forget cached tokens and org info, in memory and on disk."""
+        with self._lock:
+            self._token = None
+            self._token_expiry = 0
+            self._org_info = None
+            for kind in ("token", "org"):
+                path = self._cache_file(kind)
+                if path is not None and path.exists():
+                    path.unlink()
+
+    def _set_org_info(self, org_info: OrgInfo):
+        """Remember org info in memory and in the disk cache."""
+        self._org_info = org_info
+        data = asdict(org_info)
+        data.pop("access_token", None)
+        self._write_cache("org", {"org_info": data, "expires_at": time.time() + self.org_info_ttl})
+
     @property
     def org_info(self) -> OrgInfo:
-        """Get org information from sf CLI (cached)."""
-        if self._org_info is None:
-            self._org_info = self._get_org_info()
-        return self._org_info
+        """Get org information (cached in memory, then on disk, then from sf CLI)."""
+        with self._lock:
+            if self._org_info is None:
+                cached = self._read_cache("org")
+                try:
+                    if cached and time.time() < cached["expires_at"]:
+                        self._org_info = OrgInfo(**cached["org_info"])
+                except (KeyError, TypeError):
+                    # Stale or foreign schema: treat as a cache miss
+                    self._org_info = None
+                if self._org_info is None:
+                    self._set_org_info(self._get_org_info())
+            return self._org_info
 
     def _get_org_info(self) -> OrgInfo:
         """
@@ -288,7 +402,7 @@ class Data360Auth:
             "assertion": assertion,
         }
 
-        with httpx.Client() as client:
+        with httpx.Client(transport=self.transport) as client:
             response = client.post(token_url, data=data)
 
             if response.status_code != 200:
@@ -298,11 +412,36 @@ class Data360Auth:
 
             return response.json()
 
+    def _token_expires_at(self, token_response: dict) -> float:
+        """
+        Absolute expiry time of a newly issued access token.
+
+        Uses ``expires_in`` from the token response when present. The JWT
+        Bearer flow usually omits it; the token is then assumed to live
+        DEFAULT_TOKEN_LIFETIME seconds from its ``issued_at`` time. A
+        token the org expires sooner is replaced when the API rejects it
+        (clients call get_token(force_refresh=True) on 401).
+        """
+        issued_at = time.time()
+        if token_response.get("issued_at"):
+            # Milliseconds since epoch
+            try:
+                issued_at = min(issued_at, int(token_response["issued_at"]) / 1000)
+            except (TypeError, ValueError):
+                pass
+
+        if token_response.get("expires_in"):
+            return issued_at + float(token_response["expires_in"])
+
+        return issued_at + DEFAULT_TOKEN_LIFETIME
+
     def get_token(self, force_refresh: bool = False) -> str:
         """
         Get or refresh the access token.
 
-        Tokens are cached and automatically refreshed before expiry.
+        Tokens are cached in memory and on disk (shared by later
+        processes for the same org and consumer key) and refreshed
+        TOKEN_REFRESH_BUFFER seconds before they expire.
 
         Args:
             force_refresh: Force token refresh even if current token is valid
@@ -316,29 +455,50 @@ class Data360Auth:
             >>> # Token is cached, subsequent calls are fast
             >>> token = auth.get_token()  # Returns cached token
         """
-        # Check if current token is still valid
-        if not force_refresh and self._token and time.time() < self._token_expiry:
-            return self._token
-
-        # Generate new JWT assertion
-        assertion = self._create_jwt_assertion()
-
-        # Exchange for access token
-        token_response = self._exchange_token(assertion)
-
-        self._token = token_response["access_token"]
-        # Salesforce tokens typically expire in 1-2 hours; refresh 5 min early
-        self._token_expiry = time.time() + 3600 - TOKEN_REFRESH_BUFFER
+        with self._lock:
+            # Check if current token is still valid
+            if not force_refresh and self._token and time.time() < self._token_expiry:
+                return self._token
+
+            # Reuse a token cached by an earlier process
+            if not force_refresh:
+                cached = self._read_cache("token")
+                try:
+                    expiry = float(cached["expires_at"]) - TOKEN_REFRESH_BUFFER if cached else 0
+                    token = cached["access_token"] if cached else None
+                except (KeyError, TypeError, ValueError):
+                    # Stale or foreign schema: treat as a cache miss
+                    expiry, token = 0, None
+                if isinstance(token, str) and token and time.time() < expiry:
+                    self._token = token
+                    self._token_expiry = expiry
+                    return self._token
+
+            # Generate new JWT assertion
+            assertion = self._create_jwt_assertion()
+
+            # Exchange for access token
+            token_response = self._exchange_token(assertion)
+
+            self._token = token_response["access_token"]
+            expires_at = self._token_expires_at(token_response)
+            self._token_expiry = expires_at - TOKEN_REFRESH_BUFFER
+
+            # Update instance URL if different
+            if token_response.get("instance_url") and token_response["instance_url"] != self.org_info.instance_url:
+                self._set_org_info(OrgInfo(
+                    instance_url=token_response["instance_url"],
+                    username=self.org_info.username,
+                    is_sandbox=self.org_info.is_sandbox
+                ))
+
+            self._write_cache("token", {
+                "access_token": self._token,
+                "expires_at": expires_at,
+                "instance_url": self.org_info.instance_url,
+            })
 
-        # Update instance URL if different
-        if token_response.get("instance_url"):
-            self._org_info = OrgInfo(
-                instance_url=token_response["instance_url"],
-                username=self.org_info.username,
-                is_sandbox=self.org_info.is_sandbox
-            )
-
-        return self._token
+            return self._token
 
     def get_headers(self) -> dict:
         """
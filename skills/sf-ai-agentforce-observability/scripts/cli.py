@@ -92,6 +92,12 @@ def cli():
 @click.option("--agent", multiple=True, help="Filter by agent API name (repeatable)")
 @click.option("--output", type=click.Path(), default="./stdm_data", help="Output directory")
 @click.option("--no-children", is_flag=True, help="Skip extracting child records")
+@click.option("--chunk-size", default=500, show_default=True, help="Parent IDs per child-record query")
+@click.option("--workers", default=4, show_default=True, help="Concurrent child-record queries per entity")
+@click.option("--shard", type=click.Choice(["day", "hour"]),
+              help="Split the range into day/hour windows written as date=YYYY-MM-DD partitions")
+@click.option("--parallel-windows", default=4, show_default=True, help="Windows extracted concurrently with --shard")
+@click.option("--resume", is_flag=True, help="Continue an interrupted extraction, skipping completed stages and chunks")
 @click.option("--verbose", is_flag=True, help="Show detailed progress")
 def extract(
     org: str,
@@ -103,6 +109,11 @@ def extract(
     agent: tuple,
     output: str,
     no_children: bool,
+    chunk_size: int,
+    workers: int,
+    shard: Optional[str],
+    parallel_windows: int,
+    resume: bool,
     verbose: bool,
 ):
     """
@@ -121,10 +132,16 @@ def extract(
 
         # Filter by agent
         stdm-extract extract --org prod --agent Customer_Support_Agent
+
+        # Backfill 90 days, 8 day-windows at a time
+        stdm-extract extract --org prod --days 90 --shard day --parallel-windows 8
+
+        # Pick up an interrupted extraction where it stopped
+        stdm-extract extract --org prod --days 90 --shard day --resume
     """
     from scripts.auth import DataCloudAuth
     from scripts.datacloud_client import DataCloudClient
-    from scripts.extractor import STDMExtractor
+    from scripts.extractor import STDMExtractor, pending_run
 
     # Determine date range
     if since:
@@ -134,6 +151,11 @@ def extract(
 
     end_date = until or datetime.utcnow()
 
+    # Without explicit dates, resume the interrupted run's exact range
+    interrupted = pending_run(Path(output)) if resume and not (since or until) else None
+    if interrupted:
+        start_date, end_date = interrupted["since"], interrupted["until"]
+
     # Get authentication
     auth = get_auth(org, consumer_key, key_path)
 
@@ -152,24 +174,39 @@ def extract(
         console.print("[green]✓ Connected to Data Cloud[/green]\n")
 
         # Create client and extractor
-        client = DataCloudClient(auth)
-        extractor = STDMExtractor(client, Path(output))
-
-        # Run extraction
-        result = extractor.extract_sessions(
-            since=start_date,
-            until=end_date,
-            agent_names=list(agent) if agent else None,
-            include_children=not no_children,
-            show_progress=True,
-        )
+        with DataCloudClient(auth) as client:
+            extractor = STDMExtractor(
+                client, Path(output), chunk_size=chunk_size, max_workers=workers
+            )
+
+            # Run extraction
+            if shard:
+                result = extractor.extract_sessions_sharded(
+                    since=start_date,
+                    until=end_date,
+                    window=shard,
+                    max_windows=parallel_windows,
+                    agent_names=list(agent) if agent else None,
+                    include_children=not no_children,
+                    show_progress=True,
+                    resume=resume,
+                )
+            else:
+                result = extractor.extract_sessions(
+                    since=start_date,
+                    until=end_date,
+                    agent_names=list(agent) if agent else None,
+                    include_children=not no_children,
+                    show_progress=True,
+                    resume=resume,
+                )
 
-        # Print summary
-        console.print("")
-        extractor.print_summary(result)
+            # Print summary
+            console.print("")
+            extractor.print_summary(result)
 
-        if result.errors:
-            sys.exit(1)
+            if result.errors:
+                sys.exit(1)
 
     except Exception as e:
         console.print(f"\n[red]Error: {e}[/red]")
@@ -185,6 +222,8 @@ def extract(
 @click.option("--key-path", type=click.Path(), help="Path to JWT private key")
 @click.option("--session-id", required=True, multiple=True, help="Session ID(s) to extract")
 @click.option("--output", type=click.Path(), default="./stdm_debug", help="Output directory")
+@click.option("--chunk-size", default=500, show_default=True, help="Parent IDs per child-record query")
+@click.option("--workers", default=4, show_default=True, help="Concurrent child-record queries per entity")
 @click.option("--verbose", is_flag=True, help="Show detailed progress")
 def extract_tree(
     org: str,
@@ -192,6 +231,8 @@ def extract_tree(
     key_path: Optional[str],
     session_id: tuple,
     output: str,
+    chunk_size: int,
+    workers: int,
     verbose: bool,
 ):
     """
@@ -219,16 +260,18 @@ def extract_tree(
     console.print("")
 
     try:
-        client = DataCloudClient(auth)
-        extractor = STDMExtractor(client, Path(output))
+        with DataCloudClient(auth) as client:
+            extractor = STDMExtractor(
+                client, Path(output), chunk_size=chunk_size, max_workers=workers
+            )
 
-        result = extractor.extract_session_tree(
-            session_ids=list(session_id),
-            show_progress=True,
-        )
+            result = extractor.extract_session_tree(
+                session_ids=list(session_id),
+                show_progress=True,
+            )
 
-        console.print("")
-        extractor.print_summary(result)
+            console.print("")
+            extractor.print_summary(result)
 
     except Exception as e:
         console.print(f"\n[red]Error: {e}[/red]")
@@ -281,16 +324,16 @@ def extract_quality(
         auth.test_connection()
         console.print("[green]✓ Connected to Data Cloud[/green]\n")
 
-        client = DataCloudClient(auth)
-        extractor = STDMExtractor(client, Path(data_dir))
+        with DataCloudClient(auth) as client:
+            extractor = STDMExtractor(client, Path(data_dir))
 
-        result = extractor.extract_quality(show_progress=True)
+            result = extractor.extract_quality(show_progress=True)
 
-        console.print("")
-        extractor.print_quality_summary(result)
+            console.print("")
+            extractor.print_quality_summary(result)
 
-        if result.errors:
-            sys.exit(1)
+            if result.errors:
+                sys.exit(1)
 
     except FileNotFoundError as e:
         console.print(f"\n[red]Error: {e}[/red]")
@@ -310,6 +353,9 @@ def extract_quality(
 @click.option("--key-path", type=click.Path(), help="Path to JWT private key")
 @click.option("--agent", multiple=True, help="Filter by agent API name")
 @click.option("--output", type=click.Path(), default="./stdm_data", help="Output directory")
+@click.option("--chunk-size", default=500, show_default=True, help="Parent IDs per child-record query")
+@click.option("--workers", default=4, show_default=True, help="Concurrent child-record queries per entity")
+@click.option("--no-compact", is_flag=True, help="Leave new run files uncompacted (see `compact`)")
 @click.option("--verbose", is_flag=True, help="Show detailed progress")
 def extract_incremental(
     org: str,
@@ -317,6 +363,9 @@ def extract_incremental(
     key_path: Optional[str],
     agent: tuple,
     output: str,
+    chunk_size: int,
+    workers: int,
+    no_compact: bool,
     verbose: bool,
 ):
     """
@@ -324,6 +373,8 @@ def extract_incremental(
 
     Reads the watermark file from previous extraction and extracts
     only new data. If no watermark exists, extracts last 24 hours.
+    New data is added as run files in the affected date partitions;
+    existing files are never rewritten outside compaction.
 
     Examples:
 
@@ -339,16 +390,19 @@ def extract_incremental(
     console.print("")
 
     try:
-        client = DataCloudClient(auth)
-        extractor = STDMExtractor(client, Path(output))
+        with DataCloudClient(auth) as client:
+            extractor = STDMExtractor(
+                client, Path(output), chunk_size=chunk_size, max_workers=workers
+            )
 
-        result = extractor.extract_incremental(
-            agent_names=list(agent) if agent else None,
-            show_progress=True,
-        )
+            result = extractor.extract_incremental(
+                agent_names=list(agent) if agent else None,
+                show_progress=True,
+                compact=not no_compact,
+            )
 
-        console.print("")
-        extractor.print_summary(result)
+            console.print("")
+            extractor.print_summary(result)
 
     except Exception as e:
         console.print(f"\n[red]Error: {e}[/red]")
@@ -358,6 +412,34 @@ def extract_incremental(
         sys.exit(1)
 
 
+@cli.command()
+@click.option("--data-dir", type=click.Path(exists=True), required=True, help="Data directory")
+@click.option("--partition", multiple=True, help="Only compact this partition, e.g. date=2026-01-15 (repeatable)")
+def compact(data_dir: str, partition: tuple):
+    """
+    Deduplicate incremental run files into one file per partition.
+
+    Keeps the latest version of each record (by ssot__Id__c) and
+    rewrites only partitions that hold more than one file.
+
+    Examples:
+
+        stdm-extract compact --data-dir ./stdm_data
+        stdm-extract compact --data-dir ./stdm_data --partition date=2026-01-15
+    """
+    from scripts.extractor import SESSION_ENTITIES
+    from scripts.manifest import DatasetManifest
+
+    try:
+        manifest = DatasetManifest.load(Path(data_dir))
+        compacted = manifest.compact(SESSION_ENTITIES, partitions=list(partition) or None)
+        console.print(f"[green]✓[/green] Compacted {compacted} partitions")
+
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        sys.exit(1)
+
+
 @cli.command()
 @click.option("--data-dir", type=click.Path(exists=True), required=True, help="Data directory")
 @click.option("--format", "output_format", type=click.Choice(["table", "json", "csv"]), default="table")
@@ -532,19 +614,19 @@ def count(org: str, consumer_key: Optional[str], key_path: Optional[str], entity
     timestamp_field = "ssot__StartTimestamp__c" if entity == "sessions" else None
 
     try:
-        client = DataCloudClient(auth)
-        dmo = DMO_NAMES[entity]
+        with DataCloudClient(auth) as client:
+            dmo = DMO_NAMES[entity]
 
-        where_clause = None
-        if timestamp_field:
-            where_clause = f"{timestamp_field} >= '{since.strftime('%Y-%m-%dT%H:%M:%S.000Z')}'"
+            where_clause = None
+            if timestamp_field:
+                where_clause = f"{timestamp_field} >= '{since.strftime('%Y-%m-%dT%H:%M:%S.000Z')}'"
 
-        record_count = client.count(dmo, where_clause)
+            record_count = client.count(dmo, where_clause)
 
-        console.print(f"\n[bold cyan]Record Count[/bold cyan]")
-        console.print(f"Entity: {entity}")
-        console.print(f"Period: Last {days} days")
-        console.print(f"Count: [green]{record_count:,}[/green]")
+            console.print(f"\n[bold cyan]Record Count[/bold cyan]")
+            console.print(f"Entity: {entity}")
+            console.print(f"Period: Last {days} days")
+            console.print(f"Count: [green]{record_count:,}[/green]")
 
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -6,15 +6,16 @@ and direct Parquet writing for memory efficiency.
 
 Features:
 - Cursor-based pagination (nextRecordsUrl)
-- Rate limit handling with exponential backoff
+- Pooled keep-alive connections (optional HTTP/2), shared across threads
+- Rate limit handling with exponential backoff, shared across threads
 - Streaming iterator for memory efficiency
 - Configurable batch size (default 2000)
-- Direct-to-Parquet writing
+- Streaming Parquet writes (row groups as pages arrive, rolling files)
 - Async query support (status, rows, cancel endpoints)
 
 Usage:
     auth = Data360Auth("myorg", "consumer_key")
-    client = Data360Client(auth)
+    client = Data360Client(auth)  # or: with Data360Client(auth) as client:
 
     # Iterate over results
     for record in client.query("SELECT * FROM ssot__AIAgentSession__dlm"):
@@ -31,12 +32,21 @@ Usage:
     status = client.get_query_status(query_id)
     rows = client.get_query_rows(query_id, offset=0, row_limit=1000)
     client.cancel_query(query_id)
+
+    # Release pooled connections when done
+    client.close()
 """
 
+import importlib.util
 import json
+import os
+import shutil
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Iterator, Dict, Any, Optional, List
+from typing import Callable, Iterator, Dict, Any, Optional, List, Sequence, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -47,6 +57,11 @@ from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskPr
 
 from .auth import DataCloudAuth
 
+try:
+    import orjson  # Optional: faster decoding of large query pages
+except ImportError:
+    orjson = None
+
 
 # Default configuration
 DEFAULT_BATCH_SIZE = 2000
@@ -54,6 +69,16 @@ DEFAULT_TIMEOUT = 120.0  # seconds
 MAX_RETRIES = 3
 INITIAL_BACKOFF = 1.0  # seconds
 
+# Connection pool defaults (one pool per client, shared by worker threads)
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0  # seconds
+
+# Streaming Parquet output
+DEFAULT_ROW_GROUP_SIZE = 10000  # rows; one /rows page at most
+DEFAULT_COMPRESSION = "zstd"
+DEFAULT_MAX_FILE_BYTES = 512 * 1024 * 1024  # roll to a new file above this
+
 
 @dataclass
 class QueryStats:
@@ -81,32 +106,480 @@ class QueryStats:
         return 0.0
 
 
+def parquet_part_path(output_path: Path, index: int) -> Path:
+    """
+    Path of the ``index``-th rolled file for ``output_path``.
+
+    Part 0 is ``output_path`` itself; later parts are numbered siblings,
+    e.g. ``data.parquet``, ``data-00001.parquet``, ``data-00002.parquet``.
+    """
+    output_path = Path(output_path)
+    if index == 0:
+        return output_path
+    return output_path.with_name(f"{output_path.stem}-{index:05d}{output_path.suffix}")
+
+
+def parquet_parts(output_path: Path) -> List[Path]:
+    """
+    All existing files written for ``output_path``, in part order.
+
+    Args:
+        output_path: Base path passed to query_to_parquet()
+
+    Returns:
+        Existing part files (empty if nothing has been written)
+    """
+    parts = []
+    index = 0
+    while True:
+        path = parquet_part_path(output_path, index)
+        if not path.exists():
+            return parts
+        parts.append(path)
+        index += 1
+
+
+def _error_message(response: httpx.Response) -> str:
+    """Best-effort error message from a failed Data 360 response."""
+    error_msg = response.text
+    try:
+        error_data = response.json()
+        if isinstance(error_data, list) and error_data:
+            error_msg = error_data[0].get("message", error_msg)
+        elif isinstance(error_data, dict):
+            error_msg = error_data.get("message", error_data.get("error", error_msg))
+    except json.JSONDecodeError:
+        pass
+    return error_msg
+
+
+def _decode_response(response: httpx.Response) -> dict:
+    """JSON body of a successful response (empty dict for 204 No Content)."""
+    if response.status_code == 204:
+        return {}
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+class ParquetStreamWriter:
+    """
+    Incremental Parquet writer with row-group buffering and file rolling.
+
+    Tables passed to write() are buffered only until ``row_group_size``
+    rows are pending, then written as one row group. When the current
+    file passes ``max_file_bytes`` the next row group starts a new part
+    (see parquet_part_path). With ``partition_cols`` each row group is
+    written into a hive-partitioned dataset under ``output_path`` instead.
+
+    Parts are written to hidden temp files next to their final names and
+    renamed into place by close(), so an interrupted write never replaces
+    existing output with a partial file; abort() discards them instead.
+    Partitioned output is staged the same way, in a hidden directory under
+    ``output_path`` whose files close() moves into the dataset.
+
+    Example:
+        >>> writer = ParquetStreamWriter(Path("./steps/data.parquet"), STEP_SCHEMA)
+        >>> for table in pages:
+        ...     writer.write(table)
+        >>> paths = writer.close()
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        schema: pa.Schema,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: Optional[str] = DEFAULT_COMPRESSION,
+        max_file_bytes: Optional[int] = DEFAULT_MAX_FILE_BYTES,
+        partition_cols: Optional[List[str]] = None,
+    ):
+        self.output_path = Path(output_path)
+        self.schema = schema
+        self.row_group_size = max(1, row_group_size)
+        self.compression = compression
+        self.max_file_bytes = max_file_bytes
+        self.partition_cols = partition_cols
+        self.paths: List[Path] = []
+        self._temp_paths: List[Path] = []
+        self.rows_written = 0
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._pending: List[pa.Table] = []
+        self._pending_rows = 0
+        self._groups_written = 0
+        # Keeps partitioned file names unique across writers to one dataset
+        self._run_id = uuid.uuid4().hex[:12]
+        self._staging_dir = self.output_path / f".staging-{self._run_id}"
+        self._closed = False
+
+    def write(self, table: pa.Table) -> None:
+        """Buffer ``table`` and write every complete row group."""
+        if self._closed:
+            raise ValueError("ParquetStreamWriter is closed")
+        if table.num_rows == 0:
+            return
+        self._pending.append(table)
+        self._pending_rows += table.num_rows
+        while self._pending_rows >= self.row_group_size:
+            self._flush(self.row_group_size)
+
+    def _flush(self, rows: Optional[int] = None) -> None:
+        """Write ``rows`` pending rows (all of them if None) as one row group."""
+        pending = pa.concat_tables(self._pending)
+        if rows is None or rows >= pending.num_rows:
+            chunk, rest = pending, None
+        else:
+            chunk, rest = pending.slice(0, rows), pending.slice(rows)
+        self._pending = [rest] if rest is not None else []
+        self._pending_rows = rest.num_rows if rest is not None else 0
+
+        if self.partition_cols:
+            pq.write_to_dataset(
+                chunk,
+                root_path=str(self._staging_dir),
+                partition_cols=self.partition_cols,
+                basename_template=f"part-{self._run_id}-{self._groups_written:05d}-{{i}}.parquet",
+                compression=self.compression,
+            )
+        else:
+            if self._writer is None:
+                path = parquet_part_path(self.output_path, len(self.paths))
+                temp_path = path.with_name(f".{path.name}.tmp")
+                self._writer = pq.ParquetWriter(
+                    str(temp_path), self.schema, compression=self.compression
+                )
+                self.paths.append(path)
+                self._temp_paths.append(temp_path)
+            self._writer.write_table(chunk, row_group_size=self.row_group_size)
+            if self.max_file_bytes and self._temp_paths[-1].stat().st_size >= self.max_file_bytes:
+                self._writer.close()
+                self._writer = None
+
+        self._groups_written += 1
+        self.rows_written += chunk.num_rows
+
+    def close(self) -> List[Path]:
+        """
+        Flush the last partial row group and publish the written parts.
+
+        Parts left over from an earlier, larger write to the same path
+        are removed. Safe to call more than once.
+
+        Returns:
+            Files written (empty for partitioned output)
+        """
+        if self._closed:
+            return self.paths
+        self._closed = True
+        try:
+            if self._pending_rows:
+                self._flush()
+        except BaseException:
+            self._discard()
+            raise
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+        for temp_path, path in zip(self._temp_paths, self.paths):
+            os.replace(temp_path, path)
+        self._temp_paths = []
+        self._publish_partitions()
+
+        if self.paths:
+            index = len(self.paths)
+            while True:
+                stale = parquet_part_path(self.output_path, index)
+                if not stale.exists():
+                    break
+                stale.unlink()
+                index += 1
+        return self.paths
+
+    def _publish_partitions(self) -> None:
+        """Move staged partition files into the dataset under ``output_path``."""
+        if not self._staging_dir.is_dir():
+            return
+        for staged in sorted(self._staging_dir.rglob("*.parquet")):
+            target = self.output_path / staged.relative_to(self._staging_dir)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged, target)
+        shutil.rmtree(self._staging_dir, ignore_errors=True)
+
+    def abort(self) -> None:
+        """Discard everything written so far, leaving existing output untouched."""
+        if self._closed:
+            return
+        self._closed = True
+        self._discard()
+
+    def _discard(self) -> None:
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception:
+                pass
+            self._writer = None
+        for temp_path in self._temp_paths:
+            if temp_path.exists():
+                temp_path.unlink()
+        self._temp_paths = []
+        self.paths = []
+        shutil.rmtree(self._staging_dir, ignore_errors=True)
+
+
+class _ParquetOutput:
+    """
+    Local Parquet output shared by the sync and async clients.
+
+    Expects ``row_group_size``, ``compression`` and ``max_file_bytes``
+    attributes on the client. Nothing here touches the network.
+    """
+
+    def _open_writer(
+        self,
+        output_path: Path,
+        schema: pa.Schema,
+        partition_cols: Optional[List[str]] = None,
+        max_file_bytes: Optional[int] = None,
+    ) -> "ParquetStreamWriter":
+        """Create a stream writer using this client's Parquet settings."""
+        return ParquetStreamWriter(
+            output_path,
+            schema,
+            row_group_size=self.row_group_size,
+            compression=self.compression,
+            max_file_bytes=self.max_file_bytes if max_file_bytes is None else max_file_bytes,
+            partition_cols=partition_cols,
+        )
+
+    def write_parquet_files(
+        self,
+        input_paths: Sequence[Path],
+        output_path: Path,
+        schema: pa.Schema,
+        append: bool = False,
+        dedupe_key: Optional[str] = "ssot__Id__c",
+    ) -> int:
+        """
+        Combine local Parquet files into one output, like query_to_parquet().
+
+        Inputs are streamed batch by batch into a new output (same row
+        group, compression and rolling settings), or merged into the
+        existing output when ``append`` is set.
+
+        Args:
+            input_paths: Parquet files to combine, in order
+            output_path: Path to output Parquet file
+            schema: PyArrow schema of the output
+            append: If True and output exists, merge with existing data
+            dedupe_key: Column to deduplicate on when appending (default: ssot__Id__c)
+
+        Returns:
+            Total number of records written
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if not input_paths:
+            return 0
+        if append and parquet_parts(output_path):
+            return self._merge_append(output_path, input_paths, schema, dedupe_key)
+
+        writer = self._open_writer(output_path, schema)
+        try:
+            for path in input_paths:
+                for batch in pq.ParquetFile(str(path)).iter_batches(batch_size=self.row_group_size):
+                    writer.write(pa.Table.from_batches([batch]).cast(schema))
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+        return writer.rows_written
+
+    def _merge_append(
+        self,
+        output_path: Path,
+        new_paths: Sequence[Path],
+        schema: pa.Schema,
+        dedupe_key: Optional[str],
+    ) -> int:
+        """
+        Merge newly fetched rows into existing Parquet output.
+
+        Rows from ``new_paths`` win over existing rows with the same
+        ``dedupe_key``. Unlike the fetch itself, the merge materializes
+        the deduplicated result before rewriting it.
+
+        Returns:
+            Total number of records after the merge
+        """
+        import polars as pl
+
+        frame = pl.scan_parquet(
+            [str(p) for p in parquet_parts(output_path)] + [str(p) for p in new_paths]
+        )
+        if dedupe_key and dedupe_key in schema.names:
+            frame = frame.unique(subset=[dedupe_key], keep="last", maintain_order=True)
+        merged = frame.collect().to_arrow().cast(schema)
+
+        writer = self._open_writer(output_path, schema)
+        try:
+            writer.write(merged)
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+        return merged.num_rows
+
+    def _infer_schema(self, record: Dict[str, Any]) -> pa.Schema:
+        """
+        Infer PyArrow schema from a sample record.
+
+        Args:
+            record: Sample record dictionary
+
+        Returns:
+            Inferred PyArrow schema
+        """
+        fields = []
+
+        for key, value in record.items():
+            if value is None:
+                # Default to string for null values
+                fields.append(pa.field(key, pa.string()))
+            elif isinstance(value, bool):
+                fields.append(pa.field(key, pa.bool_()))
+            elif isinstance(value, int):
+                fields.append(pa.field(key, pa.int64()))
+            elif isinstance(value, float):
+                fields.append(pa.field(key, pa.float64()))
+            elif isinstance(value, str):
+                # Check if it looks like a timestamp
+                if "Timestamp" in key or "Date" in key:
+                    fields.append(pa.field(key, pa.string()))  # Keep as string for flexibility
+                else:
+                    fields.append(pa.field(key, pa.string()))
+            elif isinstance(value, dict):
+                fields.append(pa.field(key, pa.string()))  # Serialize nested objects
+            elif isinstance(value, list):
+                fields.append(pa.field(key, pa.string()))  # Serialize arrays
+            else:
+                fields.append(pa.field(key, pa.string()))
+
+        return pa.schema(fields)
+
+    def _page_to_table(
+        self,
+        column_names: List[str],
+        rows: List[list],
+        schema: pa.Schema
+    ) -> pa.Table:
+        """
+        Convert one page of array rows to a PyArrow table.
+
+        Rows are transposed once and each column is handed to Arrow as a
+        whole, matched to the schema by column index, instead of building
+        a dict per row.
+
+        Args:
+            column_names: Column names from the query metadata
+            rows: Page rows (v66.0 array-of-arrays format)
+            schema: PyArrow schema
+
+        Returns:
+            PyArrow table
+        """
+        positions = {name: i for i, name in enumerate(column_names)}
+        columns = list(zip(*rows))
+
+        arrays = []
+        for field in schema:
+            index = positions.get(field.name)
+            if index is None or index >= len(columns):
+                arrays.append(pa.nulls(len(rows), type=field.type))
+            else:
+                arrays.append(self._column_to_array(columns[index], field.type))
+
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    @staticmethod
+    def _column_to_array(values: tuple, target: pa.DataType) -> pa.Array:
+        """
+        Build an Arrow array of type ``target`` from one column of values.
+
+        Tries a direct conversion, then an Arrow cast from the inferred
+        type (e.g. numbers into a string column); nested objects and
+        arrays are serialized to JSON as a last resort.
+        """
+        try:
+            return pa.array(values, type=target)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+
+        try:
+            return pa.array(values).cast(target)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass
+
+        # Serialize complex types (and, for string columns, mixed scalars)
+        if pa.types.is_string(target) or pa.types.is_large_string(target):
+            values = [v if v is None or isinstance(v, str) else json.dumps(v) for v in values]
+        else:
+            values = [json.dumps(v) if isinstance(v, (dict, list)) else v for v in values]
+        return pa.array(values, type=target)
+
+
 @dataclass
-class Data360Client:
+class Data360Client(_ParquetOutput):
     """
     Data 360 Query API client with streaming support.
 
     Provides efficient querying of Data 360 DMOs with automatic
     pagination and optional direct-to-Parquet writing.
 
+    All requests go through one long-lived httpx.Client, so the pages of
+    a query (and concurrent queries from extractor threads) reuse
+    keep-alive connections instead of paying a TCP+TLS handshake each.
+    Call close() or use the client as a context manager when done.
+
     Attributes:
         auth: Data360Auth instance for authentication
         api_version: Salesforce API version (default: v66.0)
         batch_size: Records per API request (default: 2000)
         timeout: Request timeout in seconds (default: 120)
+        max_connections: Connection pool size (default: 20)
+        max_keepalive_connections: Idle connections kept open (default: 10)
+        keepalive_expiry: Seconds an idle connection is kept (default: 30)
+        http2: Use HTTP/2; None enables it when the h2 package is installed
+        row_group_size: Rows per Parquet row group (default: 10000)
+        compression: Parquet compression codec (default: zstd)
+        max_file_bytes: Roll Parquet output to a new file above this size;
+            0 or None disables rolling (default: 512 MiB)
+        transport: Optional httpx transport (e.g. httpx.MockTransport in tests)
 
     Example:
         >>> auth = Data360Auth("prod", "3MVG9...")
-        >>> client = Data360Client(auth)
-        >>> for record in client.query("SELECT Id FROM ssot__AIAgentSession__dlm"):
-        ...     print(record["ssot__Id__c"])
+        >>> with Data360Client(auth) as client:
+        ...     for record in client.query("SELECT Id FROM ssot__AIAgentSession__dlm"):
+        ...         print(record["ssot__Id__c"])
     """
 
     auth: DataCloudAuth
     api_version: str = "v66.0"
     batch_size: int = DEFAULT_BATCH_SIZE
     timeout: float = DEFAULT_TIMEOUT
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY
+    http2: Optional[bool] = None
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE
+    compression: Optional[str] = DEFAULT_COMPRESSION
+    max_file_bytes: Optional[int] = DEFAULT_MAX_FILE_BYTES
+    transport: Optional[httpx.BaseTransport] = None
     _stats: QueryStats = field(default_factory=QueryStats)
+    _http: Optional[httpx.Client] = field(default=None, init=False, repr=False)
+    _http_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _backoff_until: float = field(default=0.0, init=False, repr=False)
 
     @property
     def base_url(self) -> str:
@@ -123,6 +596,47 @@ class Data360Client:
         """Get statistics from the last query."""
         return self._stats
 
+    def _get_http(self) -> httpx.Client:
+        """
+        Get the pooled HTTP client, creating it on first use.
+
+        httpx.Client is safe to share between threads; the lock only
+        guards its creation so concurrent first requests build one pool.
+        """
+        http = self._http
+        if http is not None and not http.is_closed:
+            return http
+
+        with self._http_lock:
+            if self._http is None or self._http.is_closed:
+                http2 = self.http2
+                if http2 is None:
+                    http2 = importlib.util.find_spec("h2") is not None
+                self._http = httpx.Client(
+                    timeout=self.timeout,
+                    http2=http2,
+                    transport=self.transport,
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_keepalive_connections,
+                        keepalive_expiry=self.keepalive_expiry,
+                    ),
+                )
+            return self._http
+
+    def close(self) -> None:
+        """Close pooled connections. The client reopens them if used again."""
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+
+    def __enter__(self) -> "Data360Client":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
     def _execute_request(
         self,
         url: str,
@@ -145,68 +659,61 @@ class Data360Client:
         Raises:
             RuntimeError: If request fails after retries
         """
-        with httpx.Client(timeout=self.timeout) as client:
-            try:
-                if method == "POST":
-                    response = client.post(
-                        url,
-                        headers=self.auth.get_headers(),
-                        json=json_body
-                    )
-                elif method == "DELETE":
-                    response = client.delete(url, headers=self.auth.get_headers())
-                else:
-                    response = client.get(url, headers=self.auth.get_headers())
-
-                # Handle rate limiting
-                if response.status_code == 429:
-                    if retry_count >= MAX_RETRIES:
-                        raise RuntimeError("Rate limit exceeded after max retries")
-
-                    wait_time = INITIAL_BACKOFF * (2 ** retry_count)
-                    retry_after = response.headers.get("Retry-After")
-                    if retry_after:
-                        wait_time = max(wait_time, float(retry_after))
+        client = self._get_http()
 
-                    self._stats.rate_limit_waits += 1
-                    time.sleep(wait_time)
+        # Honour a rate-limit backoff started by any thread using this client
+        delay = self._backoff_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
 
-                    return self._execute_request(url, method, json_body, retry_count + 1)
+        try:
+            if method == "POST":
+                response = client.post(
+                    url,
+                    headers=self.auth.get_headers(),
+                    json=json_body
+                )
+            elif method == "DELETE":
+                response = client.delete(url, headers=self.auth.get_headers())
+            else:
+                response = client.get(url, headers=self.auth.get_headers())
 
-                # Handle authentication errors
-                if response.status_code == 401:
-                    # Force token refresh and retry
-                    self.auth.get_token(force_refresh=True)
-                    if retry_count < MAX_RETRIES:
-                        return self._execute_request(url, method, json_body, retry_count + 1)
-                    raise RuntimeError("Authentication failed after token refresh")
-
-                # Handle other errors
-                if response.status_code >= 400:
-                    error_msg = response.text
-                    try:
-                        error_data = response.json()
-                        if isinstance(error_data, list) and error_data:
-                            error_msg = error_data[0].get("message", error_msg)
-                        elif isinstance(error_data, dict):
-                            error_msg = error_data.get("message", error_data.get("error", error_msg))
-                    except json.JSONDecodeError:
-                        pass
-                    raise RuntimeError(f"Query failed ({response.status_code}): {error_msg}")
+            # Handle rate limiting
+            if response.status_code == 429:
+                if retry_count >= MAX_RETRIES:
+                    raise RuntimeError("Rate limit exceeded after max retries")
 
-                self._stats.bytes_transferred += len(response.content)
+                wait_time = INITIAL_BACKOFF * (2 ** retry_count)
+                retry_after = response.headers.get("Retry-After")
+                if retry_after:
+                    wait_time = max(wait_time, float(retry_after))
 
-                # Handle 204 No Content (e.g., DELETE success)
-                if response.status_code == 204:
-                    return {}
+                self._stats.rate_limit_waits += 1
+                self._backoff_until = max(self._backoff_until, time.monotonic() + wait_time)
+                time.sleep(wait_time)
 
-                return response.json()
+                return self._execute_request(url, method, json_body, retry_count + 1)
 
-            except httpx.TimeoutException:
+            # Handle authentication errors
+            if response.status_code == 401:
+                # Force token refresh and retry
+                self.auth.get_token(force_refresh=True)
                 if retry_count < MAX_RETRIES:
-                    time.sleep(INITIAL_BACKOFF * (2 ** retry_count))
                     return self._execute_request(url, method, json_body, retry_count + 1)
-                raise RuntimeError(f"Request timed out after {MAX_RETRIES} retries")
+                raise RuntimeError("Authentication failed after token refresh")
+
+            # Handle other errors
+            if response.status_code >= 400:
+                raise RuntimeError(f"Query failed ({response.status_code}): {_error_message(response)}")
+
+            self._stats.bytes_transferred += len(response.content)
+            return _decode_response(response)
+
+        except httpx.TimeoutException:
+            if retry_count < MAX_RETRIES:
+                time.sleep(INITIAL_BACKOFF * (2 ** retry_count))
+                return self._execute_request(url, method, json_body, retry_count + 1)
+            raise RuntimeError(f"Request timed out after {MAX_RETRIES} retries")
 
     def query(self, sql: str, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
         """
@@ -229,20 +736,7 @@ class Data360Client:
         self._stats = QueryStats(start_time=datetime.now())
         records_yielded = 0
 
-        # v66.0 Query SQL API - just send the SQL, no pageSize
-        request_body = {"sql": sql}
-
-        response = self._execute_request(self.query_url, "POST", request_body)
-
-        # Extract column names from metadata for converting arrays to dicts
-        metadata = response.get("metadata", [])
-        column_names = [col["name"] for col in metadata]
-
-        while True:
-            # v66.0 returns data as array of arrays, not array of dicts
-            raw_data = response.get("data", [])
-            self._stats.batches_fetched += 1
-
+        for column_names, raw_data in self._iter_pages(sql):
             for row in raw_data:
                 if limit and records_yielded >= limit:
                     self._stats.end_time = datetime.now()
@@ -255,6 +749,33 @@ class Data360Client:
                 records_yielded += 1
                 yield record
 
+        self._stats.end_time = datetime.now()
+
+    def _iter_pages(self, sql: str) -> Iterator[Tuple[List[str], List[list]]]:
+        """
+        Execute Data 360 SQL and yield one page of rows at a time.
+
+        v66.0 returns ``data`` as an array of arrays; column names come from
+        the ``metadata`` of the first response.
+
+        Args:
+            sql: Data 360 SQL query
+
+        Yields:
+            (column_names, rows) per page
+        """
+        # v66.0 Query SQL API - just send the SQL, no pageSize
+        request_body = {"sql": sql}
+
+        response = self._execute_request(self.query_url, "POST", request_body)
+
+        metadata = response.get("metadata", [])
+        column_names = [col["name"] for col in metadata]
+
+        while True:
+            self._stats.batches_fetched += 1
+            yield column_names, response.get("data", [])
+
             # Check for more pages via status
             status = response.get("status", {})
             completion_status = status.get("completionStatus", "")
@@ -278,8 +799,6 @@ class Data360Client:
 
             response = self._execute_request(next_url, "GET")
 
-        self._stats.end_time = datetime.now()
-
     def query_all(self, sql: str) -> List[Dict[str, Any]]:
         """
         Execute query and return all records as a list.
@@ -396,12 +915,17 @@ class Data360Client:
         partition_cols: Optional[List[str]] = None,
         show_progress: bool = True,
         append: bool = False,
-        dedupe_key: Optional[str] = "ssot__Id__c"
+        dedupe_key: Optional[str] = "ssot__Id__c",
+        on_page: Optional[Callable[[pa.Table], None]] = None,
     ) -> int:
         """
-        Execute query and write results directly to Parquet file.
+        Execute query and stream results into Parquet.
 
-        Streams data in batches to avoid memory issues with large datasets.
+        Pages are written as row groups while they arrive, so memory holds
+        at most one page plus one pending row group. Output rolls over to
+        ``data-00001.parquet``, ``data-00002.parquet``, ... next to
+        ``output_path`` once a file passes ``max_file_bytes``; use
+        parquet_parts() to list them.
 
         Args:
             sql: Data 360 SQL query
@@ -411,6 +935,8 @@ class Data360Client:
             show_progress: Show progress bar
             append: If True and file exists, merge with existing data
             dedupe_key: Column to deduplicate on when appending (default: ssot__Id__c)
+            on_page: Called with each page's table once it is written, e.g.
+                to hand IDs to a downstream query without re-reading the file
 
         Returns:
             Total number of records written
@@ -422,13 +948,76 @@ class Data360Client:
             ... )
             >>> print(f"Wrote {count} records")
         """
+        return self.query_many_to_parquet(
+            [sql],
+            output_path,
+            schema=schema,
+            partition_cols=partition_cols,
+            show_progress=show_progress,
+            append=append,
+            dedupe_key=dedupe_key,
+            on_page=on_page,
+        )
+
+    def query_many_to_parquet(
+        self,
+        sqls: Sequence[str],
+        output_path: Path,
+        schema: Optional[pa.Schema] = None,
+        partition_cols: Optional[List[str]] = None,
+        show_progress: bool = True,
+        append: bool = False,
+        dedupe_key: Optional[str] = "ssot__Id__c",
+        max_workers: int = 1,
+        on_page: Optional[Callable[[pa.Table], None]] = None,
+    ) -> int:
+        """
+        Execute several queries and stream all their rows into one output.
+
+        Queries run on up to ``max_workers`` threads over the shared
+        connection pool. Fetching and decoding happen in parallel; only
+        the row-group writes are serialized. Same output layout and
+        append behaviour as query_to_parquet().
+
+        Args:
+            sqls: Data 360 SQL queries returning the same columns
+            output_path: Path to output Parquet file or directory (if partitioned)
+            schema: Optional PyArrow schema (auto-inferred if not provided)
+            partition_cols: Optional columns to partition by
+            show_progress: Show progress bar
+            append: If True and file exists, merge with existing data
+            dedupe_key: Column to deduplicate on when appending (default: ssot__Id__c)
+            max_workers: Maximum queries in flight at once
+            on_page: Called with each page's table once it is written; a
+                slow callback holds back further paging of that query
+
+        Returns:
+            Total number of records written
+
+        Example:
+            >>> count = client.query_many_to_parquet(
+            ...     [f"SELECT ... WHERE ssot__AiAgentSessionId__c IN ({ids})" for ids in chunks],
+            ...     Path("./interactions/data.parquet"),
+            ...     schema=SCHEMAS["interactions"],
+            ...     max_workers=4,
+            ... )
+        """
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         self._stats = QueryStats(start_time=datetime.now())
         records_written = 0
-        batches = []
-        inferred_schema = schema
+        writer: Optional[ParquetStreamWriter] = None
+        write_lock = threading.Lock()
+
+        # Appends are streamed to a scratch file and merged afterwards
+        merge_existing = (
+            append and not partition_cols and bool(parquet_parts(output_path))
+        )
+        stream_path = (
+            output_path.with_name(f".{output_path.stem}.append.parquet")
+            if merge_existing else output_path
+        )
 
         # Set up progress display
         progress = None
@@ -442,168 +1031,77 @@ class Data360Client:
                 TextColumn("[cyan]{task.fields[records]} records"),
             )
             progress.start()
-            task = progress.add_task("Fetching...", total=None, records=0)
-
-        try:
-            # v66.0 Query SQL API - just send the SQL, no pageSize
-            request_body = {"sql": sql}
-
-            response = self._execute_request(self.query_url, "POST", request_body)
+            task = progress.add_task("Fetching...", total=len(sqls) if len(sqls) > 1 else None, records=0)
 
-            # Extract column names from metadata for converting arrays to dicts
-            metadata = response.get("metadata", [])
-            column_names = [col["name"] for col in metadata]
-
-            while True:
-                # v66.0 returns data as array of arrays
-                raw_data = response.get("data", [])
-                self._stats.batches_fetched += 1
-
-                if raw_data:
-                    # Convert array rows to dicts using column names
-                    data = [dict(zip(column_names, row)) for row in raw_data]
-
-                    # Infer schema from first batch if not provided
-                    if inferred_schema is None:
-                        inferred_schema = self._infer_schema(data[0])
-
-                    # Convert batch to PyArrow table
-                    batch_table = self._records_to_table(data, inferred_schema)
-                    batches.append(batch_table)
-                    records_written += len(data)
-                    self._stats.records_fetched += len(data)
+        def run(sql: str) -> None:
+            nonlocal writer, records_written
+            for column_names, raw_data in self._iter_pages(sql):
+                if not raw_data:
+                    continue
 
+                with write_lock:
+                    if writer is None:
+                        # Infer schema from first row if not provided
+                        writer = self._open_writer(
+                            stream_path,
+                            schema or self._infer_schema(dict(zip(column_names, raw_data[0]))),
+                            None if merge_existing else partition_cols,
+                            max_file_bytes=0 if merge_existing else self.max_file_bytes,
+                        )
+                    target = writer.schema
+
+                table = self._page_to_table(column_names, raw_data, target)
+
+                with write_lock:
+                    writer.write(table)
+                    records_written += len(raw_data)
+                    self._stats.records_fetched += len(raw_data)
                     if progress and task is not None:
                         progress.update(task, records=records_written)
 
-                # Check for more pages via status (v66.0)
-                status = response.get("status", {})
-                completion_status = status.get("completionStatus", "")
-
-                if completion_status in ["Running", "MoreChunksAvailable"]:
-                    query_id = status.get("queryId")
-                    if query_id:
-                        next_url = f"{self.query_url}/{query_id}/rows"
-                        response = self._execute_request(next_url, "GET")
-                        continue
+                if on_page is not None:
+                    on_page(table)
 
-                # Legacy pagination fallback
-                next_url = response.get("nextRecordsUrl")
-                if not next_url:
-                    break
+            if progress and task is not None and len(sqls) > 1:
+                progress.advance(task)
 
-                if not next_url.startswith("http"):
-                    next_url = f"{self.auth.instance_url}{next_url}"
-
-                response = self._execute_request(next_url, "GET")
-
-            # Combine all batches and write
-            if batches:
-                combined_table = pa.concat_tables(batches)
-
-                # Handle append mode: read existing, concat, dedupe
-                if append and output_path.exists() and not partition_cols:
-                    existing_table = pq.read_table(str(output_path))
-                    combined_table = pa.concat_tables([existing_table, combined_table])
-
-                    # Deduplicate by key using PyArrow
-                    if dedupe_key and dedupe_key in combined_table.column_names:
-                        import polars as pl
-                        # Use Polars for deduplication (more efficient)
-                        df = pl.from_arrow(combined_table)
-                        df = df.unique(subset=[dedupe_key], keep="last")
-                        combined_table = df.to_arrow()
-                        records_written = len(df)
-
-                if partition_cols:
-                    pq.write_to_dataset(
-                        combined_table,
-                        root_path=str(output_path),
-                        partition_cols=partition_cols
+        try:
+            if max_workers > 1 and len(sqls) > 1:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(sqls))) as executor:
+                    futures = [executor.submit(run, sql) for sql in sqls]
+                    try:
+                        for future in as_completed(futures):
+                            future.result()
+                    except BaseException:
+                        for future in futures:
+                            future.cancel()
+                        raise
+            else:
+                for sql in sqls:
+                    run(sql)
+
+            if writer is not None:
+                writer.close()
+                if merge_existing:
+                    records_written = self._merge_append(
+                        output_path, [stream_path], writer.schema, dedupe_key
                     )
-                else:
-                    pq.write_table(combined_table, str(output_path))
+
+        except BaseException:
+            # Keep whatever was on disk before this query
+            if writer is not None:
+                writer.abort()
+            raise
 
         finally:
+            if merge_existing and stream_path.exists():
+                stream_path.unlink()
             if progress:
                 progress.stop()
 
         self._stats.end_time = datetime.now()
         return records_written
 
-    def _infer_schema(self, record: Dict[str, Any]) -> pa.Schema:
-        """
-        Infer PyArrow schema from a sample record.
-
-        Args:
-            record: Sample record dictionary
-
-        Returns:
-            Inferred PyArrow schema
-        """
-        fields = []
-
-        for key, value in record.items():
-            if value is None:
-                # Default to string for null values
-                fields.append(pa.field(key, pa.string()))
-            elif isinstance(value, bool):
-                fields.append(pa.field(key, pa.bool_()))
-            elif isinstance(value, int):
-                fields.append(pa.field(key, pa.int64()))
-            elif isinstance(value, float):
-                fields.append(pa.field(key, pa.float64()))
-            elif isinstance(value, str):
-                # Check if it looks like a timestamp
-                if "Timestamp" in key or "Date" in key:
-                    fields.append(pa.field(key, pa.string()))  # Keep as string for flexibility
-                else:
-                    fields.append(pa.field(key, pa.string()))
-            elif isinstance(value, dict):
-                fields.append(pa.field(key, pa.string()))  # Serialize nested objects
-            elif isinstance(value, list):
-                fields.append(pa.field(key, pa.string()))  # Serialize arrays
-            else:
-                fields.append(pa.field(key, pa.string()))
-
-        return pa.schema(fields)
-
-    def _records_to_table(
-        self,
-        records: List[Dict[str, Any]],
-        schema: pa.Schema
-    ) -> pa.Table:
-        """
-        Convert records to PyArrow table.
-
-        Args:
-            records: List of record dictionaries
-            schema: PyArrow schema
-
-        Returns:
-            PyArrow table
-        """
-        # Build column arrays
-        columns = {field.name: [] for field in schema}
-
-        for record in records:
-            for field in schema:
-                value = record.get(field.name)
-
-                # Serialize complex types
-                if isinstance(value, (dict, list)):
-                    value = json.dumps(value)
-
-                columns[field.name].append(value)
-
-        # Create arrays
-        arrays = []
-        for field in schema:
-            arr = pa.array(columns[field.name], type=field.type)
-            arrays.append(arr)
-
-        return pa.Table.from_arrays(arrays, schema=schema)
-
     def get_dmo_metadata(self, dmo_name: str) -> Dict[str, Any]:
         """
         Get metadata for a Data 360 Data Model Object.
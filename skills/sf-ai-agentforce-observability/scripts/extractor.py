@@ -10,6 +10,12 @@ Features:
 - Session tree extraction (all related records for specific sessions)
 - Incremental extraction with watermark tracking
 - Parquet output with date partitioning
+- Sharded extraction: day/hour windows run in parallel, resumable per window
+- Crash-safe checkpoints per stage and per child-query chunk; resume skips
+  completed work
+- Pipelined stages: child queries start while parent pages are still arriving
+- Append-only incremental runs: new files per run, listed in a manifest and
+  compacted per affected partition
 
 Usage:
     auth = DataCloudAuth("myorg", "consumer_key")
@@ -20,20 +26,33 @@ Usage:
     result = extractor.extract_sessions(
         since=datetime.now() - timedelta(days=7)
     )
+
+    # Backfill 90 days, 4 days at a time, into date=YYYY-MM-DD partitions
+    result = extractor.extract_sessions_sharded(
+        since=datetime.now() - timedelta(days=90),
+        max_windows=4,
+    )
 """
 
+import hashlib
 import json
+import os
+import shutil
+import tempfile
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
-from dataclasses import dataclass, field
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Dict, Any, Tuple
+from dataclasses import dataclass, field, replace
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 
-from .datacloud_client import DataCloudClient
+from .async_client import AsyncData360Client
+from .datacloud_client import DataCloudClient, parquet_parts
+from .manifest import DatasetManifest, dataset_files
 from .models import (
     SCHEMAS,
     DMO_NAMES,
@@ -46,6 +65,22 @@ from .models import (
 
 console = Console()
 
+# Parent IDs per child query; keeps each IN (...) list well under request limits
+DEFAULT_CHUNK_SIZE = 500
+# Child-query chunks in flight at once per entity
+DEFAULT_MAX_WORKERS = 4
+# Time windows extracted in parallel by extract_sessions_sharded
+DEFAULT_MAX_WINDOWS = 4
+WINDOW_SIZES = {"day": timedelta(days=1), "hour": timedelta(hours=1)}
+# Entity directories written by a session extraction window
+SESSION_ENTITIES = ("sessions", "interactions", "steps", "messages")
+# Child stages of a session extraction and the parent FK each is queried by
+CHILD_STAGES = {
+    "interactions": "ssot__AiAgentSessionId__c",
+    "messages": "ssot__AiAgentSessionId__c",  # Messages link to sessions, not interactions
+    "steps": "ssot__AiAgentInteractionId__c",
+}
+
 
 @dataclass
 class ExtractionResult:
@@ -136,6 +171,274 @@ class QualityExtractionResult:
         }
 
 
+def _write_json_atomic(path: Path, data: Dict[str, Any]):
+    """Write JSON to a temp file in the same directory, then rename it over ``path``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.stem}-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def pending_run(output_dir: Path) -> Optional[Dict[str, Any]]:
+    """
+    Range of the last extract run that did not finish cleanly, if any.
+
+    Returns:
+        Dict with ``since``/``until`` datetimes and ``agent_names``, or None
+    """
+    try:
+        with open(Path(output_dir) / "metadata" / "pending_run.json") as f:
+            run = json.load(f)
+        run["since"] = datetime.fromisoformat(run["since"])
+        run["until"] = datetime.fromisoformat(run["until"])
+    except (OSError, ValueError, KeyError):
+        return None
+    return run
+
+
+class ExtractionCheckpoint:
+    """
+    Per-stage, per-chunk progress of one extraction target.
+
+    Saved atomically after every completed chunk and stage, so an
+    interrupted extraction can be resumed without re-fetching finished
+    work. A checkpoint only applies to a run with the same ``scope``
+    (time range and filters).
+
+    Layout of the JSON file:
+        {"scope": {...}, "stages": {"steps": {"done": false, "rows": 0,
+         "chunks": {"<chunk key>": <rows>, ...}}, ...}}
+    """
+
+    def __init__(self, path: Path, scope: Dict[str, Any], resume: bool = False):
+        self.path = Path(path)
+        self.scope = scope
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        if resume:
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if data.get("scope") == scope:
+                self.stages = data.get("stages", {})
+
+    def _stage(self, name: str) -> Dict[str, Any]:
+        return self.stages.setdefault(name, {"done": False, "rows": 0, "chunks": {}})
+
+    def stage_rows(self, name: str) -> Optional[int]:
+        """Rows written by a completed stage, or None if it has not completed."""
+        with self._lock:
+            stage = self.stages.get(name)
+            return stage["rows"] if stage and stage["done"] else None
+
+    def chunk_rows(self, name: str, key: str) -> Optional[int]:
+        """Rows fetched by a completed chunk, or None if it has not completed."""
+        with self._lock:
+            return self.stages.get(name, {}).get("chunks", {}).get(key)
+
+    def complete_chunk(self, name: str, key: str, rows: int):
+        """Record a finished chunk of ``name``."""
+        with self._lock:
+            self._stage(name)["chunks"][key] = rows
+            self._save()
+
+    def complete_stage(self, name: str, rows: int):
+        """Record a finished stage (its chunk entries are kept for downstream stages)."""
+        with self._lock:
+            stage = self._stage(name)
+            stage["done"] = True
+            stage["rows"] = rows
+            self._save()
+
+    def discard(self):
+        """Remove the checkpoint once the extraction has completed."""
+        if self.path.exists():
+            self.path.unlink()
+
+    def _save(self):
+        _write_json_atomic(self.path, {
+            "scope": self.scope,
+            "updated_at": datetime.now().isoformat(),
+            "stages": self.stages,
+        })
+
+
+class _BoundedExecutor:
+    """
+    Thread pool whose submit() blocks while its backlog is full.
+
+    At most ``max_workers`` tasks run and as many again wait; a producer
+    submitting beyond that is held back until a task finishes.
+    """
+
+    def __init__(self, max_workers: int):
+        max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(max_workers * 2)
+        self._futures: List[Future] = []
+
+    def submit(self, fn, *args) -> Future:
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+        return future
+
+    def drain(self) -> List[BaseException]:
+        """Wait for every submitted task; return the exceptions they raised."""
+        self._executor.shutdown(wait=True)
+        return [f.exception() for f in self._futures if f.exception() is not None]
+
+
+class _ChildPipeline:
+    """
+    Producer/consumer fetch of interactions, messages and steps.
+
+    Session IDs are fed in as session pages arrive; every ``chunk_size``
+    of them is queued to the interaction and message stages at once, and
+    each finished interaction chunk queues its interaction IDs to the
+    step stage. Each stage runs on its own bounded pool, so a saturated
+    stage pushes back on the one feeding it, down to session paging.
+
+    Chunk results are staged per chunk and recorded in the checkpoint;
+    finish() combines each stage's chunks into the entity output.
+    """
+
+    def __init__(
+        self,
+        extractor: "STDMExtractor",
+        checkpoint: ExtractionCheckpoint,
+        append: bool = False,
+    ):
+        self.extractor = extractor
+        self.checkpoint = checkpoint
+        self.append = append
+        self.pools = {entity: _BoundedExecutor(extractor.max_workers) for entity in CHILD_STAGES}
+        self.keys: Dict[str, Dict[str, None]] = {entity: {} for entity in CHILD_STAGES}
+        self._session_ids: List[str] = []
+        self._seen: set = set()
+        self._lock = threading.Lock()
+
+    def add_session_ids(self, ids: List[str]):
+        """Queue session IDs; each full chunk starts interaction and message fetches."""
+        for id in ids:
+            if id and id not in self._seen:
+                self._seen.add(id)
+                self._session_ids.append(id)
+        size = max(1, self.extractor.chunk_size)
+        while len(self._session_ids) >= size:
+            chunk, self._session_ids = self._session_ids[:size], self._session_ids[size:]
+            self._submit_sessions(chunk)
+
+    def add_session_page(self, table):
+        """on_page callback for the session query."""
+        self.add_session_ids(table.column("ssot__Id__c").to_pylist())
+
+    def _submit_sessions(self, chunk: List[str]):
+        self._submit("interactions", chunk)
+        self._submit("messages", chunk)
+
+    def _submit(self, entity: str, chunk: List[str]):
+        if self.checkpoint.stage_rows(entity) is not None and (
+            entity != "interactions" or self.checkpoint.stage_rows("steps") is not None
+        ):
+            return  # Stage already combined and nothing downstream needs its IDs
+        key = self.extractor._chunk_key(chunk)
+        with self._lock:
+            self.keys[entity][key] = None
+        self.pools[entity].submit(self._fetch, entity, key, chunk)
+
+    def _fetch(self, entity: str, key: str, chunk: List[str]):
+        """Fetch one chunk (unless checkpointed); interactions then feed steps."""
+        import pyarrow.parquet as pq
+
+        staged = self.extractor._staging_dir(entity) / f"{key}.parquet"
+        ids: Optional[List[str]] = [] if entity == "interactions" else None
+
+        rows = self.checkpoint.chunk_rows(entity, key)
+        if rows is not None and (rows == 0 or staged.exists()):
+            if ids is not None and rows:
+                ids = pq.read_table(staged, columns=["ssot__Id__c"]).column("ssot__Id__c").to_pylist()
+        else:
+            rows = self.extractor.client.query_to_parquet(
+                self.extractor._build_child_query(entity, chunk, CHILD_STAGES[entity]),
+                staged,
+                schema=SCHEMAS[entity],
+                show_progress=False,
+                on_page=(
+                    (lambda table: ids.extend(table.column("ssot__Id__c").to_pylist()))
+                    if ids is not None else None
+                ),
+            )
+            self.checkpoint.complete_chunk(entity, key, rows)
+
+        if ids:
+            # Sorted so step chunks come out the same on a resumed run
+            for step_chunk in self.extractor._chunk_ids(sorted(set(ids) - {None})):
+                self._submit("steps", step_chunk)
+
+    def finish(self) -> Tuple[Dict[str, int], Dict[str, BaseException]]:
+        """
+        Flush remaining session IDs, wait for all stages and combine their chunks.
+
+        A stage that failed, or whose parent stage failed, is not combined.
+
+        Returns:
+            (rows per combined stage, first error per failed stage)
+        """
+        if self._session_ids:
+            self._submit_sessions(self._session_ids)
+            self._session_ids = []
+
+        errors: Dict[str, BaseException] = {}
+        # Interactions first: they keep submitting steps until drained
+        for entity in ("interactions", "messages", "steps"):
+            failures = self.pools[entity].drain()
+            if failures:
+                errors[entity] = failures[0]
+
+        counts = {}
+        for entity in CHILD_STAGES:
+            if entity in errors or (entity == "steps" and "interactions" in errors):
+                continue
+            counts[entity] = self._combine(entity)
+        return counts, errors
+
+    def abort(self):
+        """Wait for queued work after the session stage failed."""
+        for entity in ("interactions", "messages", "steps"):
+            self.pools[entity].drain()
+
+    def _combine(self, entity: str) -> int:
+        rows = self.checkpoint.stage_rows(entity)
+        output_path = self.extractor._entity_path(entity)
+        if rows is not None and (rows == 0 or parquet_parts(output_path)):
+            return rows
+
+        staging_dir = self.extractor._staging_dir(entity)
+        staged = [staging_dir / f"{key}.parquet" for key in self.keys[entity]]
+        rows = self.extractor.client.write_parquet_files(
+            [path for path in staged if path.exists()],
+            output_path,
+            SCHEMAS[entity],
+            append=self.append,
+        )
+        self.checkpoint.complete_stage(entity, rows)
+        return rows
+
+
 @dataclass
 class STDMExtractor:
     """
@@ -147,9 +450,24 @@ class STDMExtractor:
     Supports both full extraction (by date range) and targeted extraction
     (by session IDs).
 
+    Child records are fetched by parent ID in chunks of ``chunk_size`` IDs;
+    up to ``max_workers`` chunk queries per entity run concurrently and
+    stream into that entity's Parquet output.
+
+    Date-range extractions checkpoint each stage and child-query chunk
+    under ``metadata/checkpoints/``; chunks are staged under
+    ``metadata/staging/``, outside the entity directories readers scan,
+    and combined into the entity output once the stage completes, so a
+    resumed run re-fetches only unfinished chunks.
+
     Attributes:
         client: Configured DataCloudClient instance
         output_dir: Base directory for output files
+        chunk_size: Parent IDs per child query (default: 500)
+        max_workers: Concurrent chunk queries per entity (default: 4)
+        partition: Hive partition directory under each entity, e.g.
+            ``date=2026-01-15`` (set per window by sharded extraction)
+        part_name: Output file stem within the entity/partition directory
 
     Example:
         >>> extractor = STDMExtractor(client, Path("./data"))
@@ -159,9 +477,16 @@ class STDMExtractor:
 
     client: DataCloudClient
     output_dir: Path
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    max_workers: int = DEFAULT_MAX_WORKERS
+    partition: Optional[str] = None
+    part_name: str = "data"
 
     def __post_init__(self):
         """Ensure output directory exists."""
+        if isinstance(self.client, AsyncData360Client):
+            # Pipeline threads call the client synchronously
+            self.client = self.client.blocking()
         self.output_dir = Path(self.output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -169,6 +494,13 @@ class STDMExtractor:
         """Format datetime for Data Cloud SQL."""
         return dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
 
+    def _entity_path(self, entity_type: str) -> Path:
+        """Base Parquet path for an entity (rolled parts sit next to it)."""
+        entity_dir = self.output_dir / entity_type
+        if self.partition:
+            entity_dir = entity_dir / self.partition
+        return entity_dir / f"{self.part_name}.parquet"
+
     def _build_session_query(
         self,
         since: datetime,
@@ -240,6 +572,76 @@ class STDMExtractor:
 
         return query
 
+    def _chunk_ids(self, parent_ids: List[str]) -> List[List[str]]:
+        """Split unique, non-null parent IDs into chunks of ``chunk_size``."""
+        unique_ids = list(dict.fromkeys(id for id in parent_ids if id))
+        size = max(1, self.chunk_size)
+        return [unique_ids[i:i + size] for i in range(0, len(unique_ids), size)]
+
+    def _extract_children(
+        self,
+        entity_type: str,
+        parent_ids: List[str],
+        parent_field: str,
+        show_progress: bool = True,
+        append: bool = False,
+    ) -> int:
+        """
+        Extract child records for ``parent_ids`` into ``{entity_type}/data.parquet``.
+
+        Issues one query per chunk of parent IDs, running up to
+        ``max_workers`` at once. Quality DMOs use their own query builder.
+
+        Args:
+            entity_type: Key into SCHEMAS / DMO_NAMES
+            parent_ids: Parent record IDs
+            parent_field: Field name containing parent FK
+            show_progress: Show progress bar
+            append: If True, merge with existing data instead of overwriting
+
+        Returns:
+            Number of records written
+        """
+        build = (
+            self._build_quality_query
+            if entity_type in ("generations", "content_quality", "content_categories")
+            else self._build_child_query
+        )
+        queries = [
+            build(entity_type, chunk, parent_field)
+            for chunk in self._chunk_ids(parent_ids)
+        ]
+        if not queries:
+            return 0
+
+        return self.client.query_many_to_parquet(
+            queries,
+            self._entity_path(entity_type),
+            schema=SCHEMAS[entity_type],
+            show_progress=show_progress,
+            append=append,
+            max_workers=self.max_workers,
+        )
+
+    @staticmethod
+    def _chunk_key(chunk: List[str]) -> str:
+        """Stable name for a chunk of parent IDs."""
+        return hashlib.sha1("\n".join(sorted(chunk)).encode()).hexdigest()[:16]
+
+    def _staging_dir(self, entity_type: str) -> Path:
+        """Directory holding an entity's staged chunk files (never under the entity tree)."""
+        staging_dir = self.output_dir / "metadata" / "staging"
+        if self.partition:
+            staging_dir = staging_dir / self.partition
+        return staging_dir / self.part_name / entity_type
+
+    def _checkpoint_path(self) -> Path:
+        """Checkpoint file for this extractor's partition and part name."""
+        checkpoint_dir = self.output_dir / "metadata" / "checkpoints"
+        if self.partition:
+            checkpoint_dir = checkpoint_dir / self.partition
+        return checkpoint_dir / f"{self.part_name}.json"
+
     def extract_sessions(
         self,
         since: datetime,
@@ -248,6 +650,7 @@ class STDMExtractor:
         include_children: bool = True,
         show_progress: bool = True,
         append: bool = False,
+        resume: bool = False,
     ) -> ExtractionResult:
         """
         Extract session data with optional child records.
@@ -259,143 +662,352 @@ class STDMExtractor:
             include_children: Whether to extract interactions, steps, messages
             show_progress: Show progress indicators
             append: If True, merge with existing data instead of overwriting
+            resume: Continue an interrupted run over the same range, skipping
+                stages and chunks its checkpoint lists as complete
 
         Returns:
             ExtractionResult with counts and metadata
         """
+        until = until or datetime.utcnow()
+        self._save_pending_run(since, until, agent_names)
+        result = self._extract_range(
+            since, until, agent_names, include_children, show_progress, append, resume
+        )
+        self._save_metadata(result, since, until, agent_names)
+        if not result.errors:
+            self._clear_pending_run()
+        return result
+
+    def _extract_range(
+        self,
+        since: datetime,
+        until: Optional[datetime] = None,
+        agent_names: Optional[List[str]] = None,
+        include_children: bool = True,
+        show_progress: bool = True,
+        append: bool = False,
+        resume: bool = False,
+    ) -> ExtractionResult:
+        """
+        Extract sessions in [since, until) and their child records.
+
+        Shared by extract_sessions() and each window of
+        extract_sessions_sharded(); does not write extraction metadata.
+        Child stages run as a pipeline (see _ChildPipeline), so the whole
+        range takes about as long as its slowest stage. Progress is
+        checkpointed per stage and chunk; the checkpoint is removed once
+        the range completes without errors.
+        """
+        until = until or datetime.utcnow()
         result = ExtractionResult(
             output_dir=self.output_dir,
             start_time=datetime.now()
         )
+        checkpoint = ExtractionCheckpoint(
+            self._checkpoint_path(),
+            {
+                "since": since.isoformat(),
+                "until": until.isoformat(),
+                "agent_names": agent_names,
+                "append": append,
+            },
+            resume=resume,
+        )
+
+        pipeline = _ChildPipeline(self, checkpoint, append) if include_children else None
 
         try:
-            # 1. Extract sessions
-            session_query = self._build_session_query(since, until, agent_names)
-            session_path = self.output_dir / "sessions"
+            # 1. Extract sessions; with children, each page feeds the pipeline
+            session_path = self._entity_path("sessions")
+            sessions_done = checkpoint.stage_rows("sessions")
 
-            if show_progress:
-                console.print("[cyan]Extracting sessions...[/cyan]")
+            if sessions_done is not None and (sessions_done == 0 or parquet_parts(session_path)):
+                result.sessions_count = sessions_done
+                if show_progress:
+                    console.print(f"  [dim]↷ {sessions_done} sessions (checkpoint)[/dim]")
+                if pipeline and sessions_done:
+                    pipeline.add_session_ids(self._get_session_ids(session_path))
+            else:
+                if show_progress:
+                    console.print(
+                        "[cyan]Extracting sessions"
+                        + (" → interactions, messages → steps (pipelined)" if pipeline else "")
+                        + "...[/cyan]"
+                    )
+
+                result.sessions_count = self.client.query_to_parquet(
+                    self._build_session_query(since, until, agent_names),
+                    session_path,
+                    schema=SCHEMAS["sessions"],
+                    show_progress=show_progress,
+                    append=append,
+                    on_page=pipeline.add_session_page if pipeline else None,
+                )
+                checkpoint.complete_stage("sessions", result.sessions_count)
 
-            result.sessions_count = self.client.query_to_parquet(
-                session_query,
-                session_path / "data.parquet",
-                schema=SCHEMAS["sessions"],
-                show_progress=show_progress,
-                append=append
-            )
+                if show_progress:
+                    console.print(f"  [green]✓[/green] {result.sessions_count} sessions")
 
+        except Exception as e:
+            result.errors.append(str(e))
             if show_progress:
-                console.print(f"  [green]✓[/green] {result.sessions_count} sessions")
-
-            if not include_children or result.sessions_count == 0:
-                result.end_time = datetime.now()
-                self._save_metadata(result, since, until, agent_names)
-                return result
+                console.print(f"[red]Error: {e}[/red]")
+            if pipeline:
+                pipeline.abort()
+            pipeline = None
+
+        # 2. Wait for the child stages and combine their staged chunks
+        if pipeline:
+            try:
+                counts, errors = pipeline.finish()
+            except Exception as e:
+                counts, errors = {}, {}
+                result.errors.append(str(e))
+                if show_progress:
+                    console.print(f"[red]Error: {e}[/red]")
+
+            result.interactions_count = counts.get("interactions", 0)
+            result.steps_count = counts.get("steps", 0)
+            result.messages_count = counts.get("messages", 0)
+            for entity in ("interactions", "steps", "messages"):
+                if entity in errors:
+                    result.errors.append(f"{entity}: {errors[entity]}")
+                    if show_progress:
+                        console.print(f"  [red]✗[/red] {entity}: {errors[entity]}")
+                elif entity in counts and show_progress:
+                    console.print(f"  [green]✓[/green] {counts[entity]} {entity}")
 
-            # 2. Get session IDs for child queries
-            session_ids = self._get_session_ids(session_path / "data.parquet")
+        if not result.errors:
+            checkpoint.discard()
+            for entity in CHILD_STAGES:
+                shutil.rmtree(self._staging_dir(entity), ignore_errors=True)
+        result.end_time = datetime.now()
+        return result
 
-            # 3. Extract interactions
-            if show_progress:
-                console.print("[cyan]Extracting interactions...[/cyan]")
+    def extract_sessions_sharded(
+        self,
+        since: datetime,
+        until: Optional[datetime] = None,
+        window: str = "day",
+        max_windows: int = DEFAULT_MAX_WINDOWS,
+        agent_names: Optional[List[str]] = None,
+        include_children: bool = True,
+        show_progress: bool = True,
+        resume: bool = False,
+        append: bool = False,
+        compact: bool = True,
+    ) -> ExtractionResult:
+        """
+        Extract a date range as independent day or hour windows in parallel.
+
+        Each window runs end-to-end (sessions → interactions → steps and
+        messages) on its own thread and writes a ``date=YYYY-MM-DD`` Hive
+        partition under every entity directory; hour windows share their
+        day's partition as ``hour-HH.parquet`` files. A completed window
+        records a marker under ``metadata/windows/``, so with ``resume``
+        a re-run skips windows that already finished for the same bounds.
+
+        With ``append`` nothing already on disk is rewritten: the run gets
+        a sequence number from the dataset manifest and writes
+        ``run-{seq}.parquet`` files next to the existing ones. Files of
+        completed windows are registered in the manifest, files of failed
+        windows are removed, and with ``compact`` only the partitions this
+        run touched are then deduplicated.
 
-            interaction_query = self._build_child_query(
-                "interactions",
-                session_ids,
-                "ssot__AiAgentSessionId__c"
-            )
-            interaction_path = self.output_dir / "interactions"
-
-            result.interactions_count = self.client.query_to_parquet(
-                interaction_query,
-                interaction_path / "data.parquet",
-                schema=SCHEMAS["interactions"],
-                show_progress=show_progress,
-                append=append
-            )
+        Args:
+            since: Start datetime for extraction
+            until: End datetime (defaults to now)
+            window: Window size, "day" or "hour"
+            max_windows: Windows extracted concurrently
+            agent_names: Optional list of agent API names to filter
+            include_children: Whether to extract interactions, steps, messages
+            show_progress: Show progress indicators
+            resume: Skip windows with a completion marker from an earlier run
+                and continue partial windows from their checkpoints
+            append: Add new run files instead of overwriting partitions
+            compact: After an append run, compact the partitions it wrote
 
-            if show_progress:
-                console.print(f"  [green]✓[/green] {result.interactions_count} interactions")
+        Returns:
+            ExtractionResult with counts summed over all windows
+        """
+        if window not in WINDOW_SIZES:
+            raise ValueError(f"Unknown window size: {window} (expected one of {', '.join(WINDOW_SIZES)})")
 
-            if result.interactions_count == 0:
-                result.end_time = datetime.now()
-                self._save_metadata(result, since, until, agent_names)
-                return result
+        until = until or datetime.utcnow()
+        result = ExtractionResult(
+            output_dir=self.output_dir,
+            start_time=datetime.now()
+        )
+        if not append:
+            self._save_pending_run(since, until, agent_names, window)
+
+        windows = self._iter_windows(since, until, window)
+        pending = []
+        for start, end in windows:
+            marker = self._load_window_marker(start, end, window) if resume else None
+            if marker is not None:
+                self._add_counts(result, marker.get("results", {}))
+            else:
+                pending.append((start, end))
+
+        if show_progress:
+            skipped = len(windows) - len(pending)
+            if pending:
+                console.print(
+                    f"[cyan]Extracting {len(pending)} {window} windows "
+                    f"({min(max_windows, len(pending))} in parallel)"
+                    + (f", {skipped} already complete" if skipped else "")
+                    + "...[/cyan]"
+                )
+            else:
+                console.print(f"[green]All {skipped} {window} windows already complete[/green]")
 
-            # 4. Get interaction IDs for step queries
-            interaction_ids = self._get_interaction_ids(interaction_path / "data.parquet")
+        manifest = DatasetManifest.load(self.output_dir) if append else None
+        seq = manifest.next_sequence() if manifest and pending else 0
 
-            # 5. Extract steps and messages in PARALLEL
-            # Steps depend on interaction_ids, Messages depend on session_ids
-            # Since we have both, we can run them concurrently for better performance
-            if show_progress:
-                console.print("[cyan]Extracting steps + messages (parallel)...[/cyan]")
+        def window_extractor(start: datetime) -> "STDMExtractor":
+            part_name = f"run-{seq:06d}" if manifest else "data"
+            if window == "hour":
+                part_name = f"{part_name}-hour-{start:%H}" if manifest else f"hour-{start:%H}"
+            return replace(self, partition=f"date={start:%Y-%m-%d}", part_name=part_name)
 
-            step_query = self._build_child_query(
-                "steps",
-                interaction_ids,
-                "ssot__AiAgentInteractionId__c"
+        def run_window(start: datetime, end: datetime) -> ExtractionResult:
+            return window_extractor(start)._extract_range(
+                start, end, agent_names, include_children, show_progress=False, resume=resume
             )
-            step_path = self.output_dir / "steps"
 
-            message_query = self._build_child_query(
-                "messages",
-                session_ids,  # Messages link to sessions, not interactions
-                "ssot__AiAgentSessionId__c"  # Note: lowercase 'i' in AiAgent
-            )
-            message_path = self.output_dir / "messages"
+        touched = set()
 
-            # Run both extractions in parallel using ThreadPoolExecutor
-            with ThreadPoolExecutor(max_workers=2) as executor:
-                # Submit both extraction tasks
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_windows, len(pending)))) as executor:
                 futures = {
-                    executor.submit(
-                        self.client.query_to_parquet,
-                        step_query,
-                        step_path / "data.parquet",
-                        SCHEMAS["steps"],  # schema
-                        None,  # partition_cols
-                        False,  # show_progress (disable per-task progress in parallel)
-                        append,
-                    ): "steps",
-                    executor.submit(
-                        self.client.query_to_parquet,
-                        message_query,
-                        message_path / "data.parquet",
-                        SCHEMAS["messages"],  # schema
-                        None,  # partition_cols
-                        False,  # show_progress (disable per-task progress in parallel)
-                        append,
-                    ): "messages",
+                    executor.submit(run_window, start, end): (start, end)
+                    for start, end in pending
                 }
 
-                # Collect results as they complete
                 for future in as_completed(futures):
-                    name = futures[future]
+                    start, end = futures[future]
+                    label = self._window_label(start, window)
                     try:
-                        count = future.result()
-                        if name == "steps":
-                            result.steps_count = count
-                            if show_progress:
-                                console.print(f"  [green]✓[/green] {count} steps")
-                        else:
-                            result.messages_count = count
-                            if show_progress:
-                                console.print(f"  [green]✓[/green] {count} messages")
+                        window_result = future.result()
                     except Exception as e:
-                        result.errors.append(f"{name}: {str(e)}")
+                        window_result = ExtractionResult(errors=[str(e)])
+
+                    self._add_counts(result, window_result.to_dict())
+                    if manifest:
+                        extractor = window_extractor(start)
+                        written = [
+                            part
+                            for entity in SESSION_ENTITIES
+                            for part in parquet_parts(extractor._entity_path(entity))
+                        ]
+                        if window_result.errors:
+                            # Drop the partial run so readers never see it; its
+                            # sequence is never reused, so neither is its checkpoint
+                            for part in written:
+                                part.unlink()
+                            for entity in SESSION_ENTITIES:
+                                shutil.rmtree(extractor._staging_dir(entity), ignore_errors=True)
+                            extractor._checkpoint_path().unlink(missing_ok=True)
+                        elif written:
+                            manifest.register(written, seq)
+                            touched.add(extractor.partition)
+
+                    if window_result.errors:
+                        result.errors.extend(f"{label}: {error}" for error in window_result.errors)
+                        if show_progress:
+                            console.print(f"  [red]✗[/red] {label}: {'; '.join(window_result.errors)}")
+                    else:
+                        self._save_window_marker(start, end, window, window_result)
                         if show_progress:
-                            console.print(f"  [red]✗[/red] {name}: {e}")
+                            console.print(
+                                f"  [green]✓[/green] {label}: {window_result.sessions_count} sessions, "
+                                f"{window_result.total_records} records"
+                            )
 
-        except Exception as e:
-            result.errors.append(str(e))
-            if show_progress:
-                console.print(f"[red]Error: {e}[/red]")
+        if manifest and compact and touched:
+            compacted = manifest.compact(SESSION_ENTITIES, partitions=touched)
+            if show_progress and compacted:
+                console.print(f"[dim]Compacted {compacted} partitions[/dim]")
 
         result.end_time = datetime.now()
         self._save_metadata(result, since, until, agent_names)
+        if not append and not result.errors:
+            self._clear_pending_run()
         return result
 
+    def _iter_windows(
+        self,
+        since: datetime,
+        until: datetime,
+        window: str,
+    ) -> List[Tuple[datetime, datetime]]:
+        """Split [since, until) at calendar day or hour boundaries."""
+        step = WINDOW_SIZES[window]
+        if window == "day":
+            boundary = since.replace(hour=0, minute=0, second=0, microsecond=0)
+        else:
+            boundary = since.replace(minute=0, second=0, microsecond=0)
+
+        windows = []
+        start = since
+        while start < until:
+            boundary += step
+            end = min(boundary, until)
+            windows.append((start, end))
+            start = end
+        return windows
+
+    def _window_label(self, start: datetime, window: str) -> str:
+        """Human-readable window name, e.g. 2026-01-15 or 2026-01-15T09h."""
+        return f"{start:%Y-%m-%d}" if window == "day" else f"{start:%Y-%m-%dT%H}h"
+
+    def _window_marker_path(self, start: datetime, window: str) -> Path:
+        """Completion marker for the window starting at ``start``."""
+        name = f"{start:%Y-%m-%d}" if window == "day" else f"{start:%Y-%m-%dT%H}"
+        return self.output_dir / "metadata" / "windows" / f"{name}.json"
+
+    def _load_window_marker(
+        self,
+        start: datetime,
+        end: datetime,
+        window: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Marker for a window completed with exactly these bounds, else None."""
+        path = self._window_marker_path(start, window)
+        try:
+            with open(path) as f:
+                marker = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if marker.get("since") != start.isoformat() or marker.get("until") != end.isoformat():
+            return None  # Earlier run covered only part of this window
+        return marker
+
+    def _save_window_marker(
+        self,
+        start: datetime,
+        end: datetime,
+        window: str,
+        window_result: ExtractionResult,
+    ):
+        """Atomically record a successfully extracted window."""
+        _write_json_atomic(self._window_marker_path(start, window), {
+            "since": start.isoformat(),
+            "until": end.isoformat(),
+            "window": window,
+            "completed_at": datetime.now().isoformat(),
+            "results": window_result.to_dict(),
+        })
+
+    @staticmethod
+    def _add_counts(result: ExtractionResult, counts: Dict[str, Any]):
+        """Add per-entity counts from a window result dict into ``result``."""
+        result.sessions_count += counts.get("sessions_count", 0)
+        result.interactions_count += counts.get("interactions_count", 0)
+        result.steps_count += counts.get("steps_count", 0)
+        result.messages_count += counts.get("messages_count", 0)
+
     def extract_session_tree(
         self,
         session_ids: List[str],
@@ -423,17 +1035,10 @@ class STDMExtractor:
             if show_progress:
                 console.print("[cyan]Extracting sessions...[/cyan]")
 
-            session_query = self._build_child_query(
+            result.sessions_count = self._extract_children(
                 "sessions",
                 session_ids,
-                "ssot__Id__c"
-            )
-            session_path = self.output_dir / "sessions"
-
-            result.sessions_count = self.client.query_to_parquet(
-                session_query,
-                session_path / "data.parquet",
-                schema=SCHEMAS["sessions"],
+                "ssot__Id__c",
                 show_progress=show_progress
             )
 
@@ -444,17 +1049,10 @@ class STDMExtractor:
             if show_progress:
                 console.print("[cyan]Extracting interactions...[/cyan]")
 
-            interaction_query = self._build_child_query(
+            result.interactions_count = self._extract_children(
                 "interactions",
                 session_ids,
-                "ssot__AiAgentSessionId__c"
-            )
-            interaction_path = self.output_dir / "interactions"
-
-            result.interactions_count = self.client.query_to_parquet(
-                interaction_query,
-                interaction_path / "data.parquet",
-                schema=SCHEMAS["interactions"],
+                "ssot__AiAgentSessionId__c",
                 show_progress=show_progress
             )
 
@@ -462,43 +1060,27 @@ class STDMExtractor:
                 console.print(f"  [green]✓[/green] {result.interactions_count} interactions")
 
             if result.interactions_count > 0:
-                interaction_ids = self._get_interaction_ids(interaction_path / "data.parquet")
+                interaction_ids = self._get_interaction_ids(self._entity_path("interactions"))
 
                 # 3. Extract steps and messages in PARALLEL
                 if show_progress:
                     console.print("[cyan]Extracting steps + messages (parallel)...[/cyan]")
 
-                step_query = self._build_child_query(
-                    "steps",
-                    interaction_ids,
-                    "ssot__AiAgentInteractionId__c"
-                )
-                step_path = self.output_dir / "steps"
-
-                message_query = self._build_child_query(
-                    "messages",
-                    session_ids,  # Messages link to sessions, not interactions
-                    "ssot__AiAgentSessionId__c"  # Note: lowercase 'i' in AiAgent
-                )
-                message_path = self.output_dir / "messages"
-
                 # Run both extractions in parallel using ThreadPoolExecutor
                 with ThreadPoolExecutor(max_workers=2) as executor:
                     futures = {
                         executor.submit(
-                            self.client.query_to_parquet,
-                            step_query,
-                            step_path / "data.parquet",
-                            SCHEMAS["steps"],
-                            None,  # partition_cols
+                            self._extract_children,
+                            "steps",
+                            interaction_ids,
+                            "ssot__AiAgentInteractionId__c",
                             False,  # show_progress
                         ): "steps",
                         executor.submit(
-                            self.client.query_to_parquet,
-                            message_query,
-                            message_path / "data.parquet",
-                            SCHEMAS["messages"],
-                            None,  # partition_cols
+                            self._extract_children,
+                            "messages",
+                            session_ids,  # Messages link to sessions, not interactions
+                            "ssot__AiAgentSessionId__c",  # Note: lowercase 'i' in AiAgent
                             False,  # show_progress
                         ): "messages",
                     }
@@ -533,21 +1115,27 @@ class STDMExtractor:
         self,
         agent_names: Optional[List[str]] = None,
         show_progress: bool = True,
+        compact: bool = True,
     ) -> ExtractionResult:
         """
         Perform incremental extraction from last watermark.
 
         Reads the watermark file to determine the last extraction time
-        and extracts only new data.
+        and extracts only new data. The run is append-only: it adds new
+        files to the day partitions it covers, registers them in the
+        dataset manifest and compacts just those partitions, so its cost
+        follows the new data rather than the size of the dataset.
 
         Args:
             agent_names: Optional list of agent API names to filter
             show_progress: Show progress indicators
+            compact: Compact the partitions this run wrote
 
         Returns:
             ExtractionResult with counts and metadata
         """
         watermark_file = self.output_dir / "metadata" / "watermark.json"
+        until = datetime.utcnow()
 
         # Determine start time from watermark
         if watermark_file.exists():
@@ -556,23 +1144,32 @@ class STDMExtractor:
                 since = datetime.fromisoformat(watermark["last_extraction"])
         else:
             # Default to 24 hours ago if no watermark
-            since = datetime.utcnow() - timedelta(hours=24)
+            since = until - timedelta(hours=24)
             if show_progress:
                 console.print(
                     f"[yellow]No watermark found, extracting from {since.isoformat()}[/yellow]"
                 )
 
-        # Run extraction with append=True to merge with existing data
-        result = self.extract_sessions(
+        result = self.extract_sessions_sharded(
             since=since,
+            until=until,
+            window="day",
             agent_names=agent_names,
             show_progress=show_progress,
-            append=True
+            resume=True,
+            append=True,
+            compact=compact,
         )
 
-        # Update watermark if successful
-        if not result.errors:
-            self._update_watermark()
+        # Advance the watermark past every window completed in order, so a
+        # failed run still keeps the days before its first failure
+        completed = since
+        for start, end in self._iter_windows(since, until, "day"):
+            if self._load_window_marker(start, end, "day") is None:
+                break
+            completed = end
+        if completed > since:
+            self._update_watermark(completed)
 
         return result
 
@@ -599,14 +1196,14 @@ class STDMExtractor:
         )
 
         try:
-            # Get generation IDs from existing steps
-            step_path = self.output_dir / "steps" / "data.parquet"
-            if not step_path.exists():
+            # Get generation IDs from existing steps (plain or date-partitioned)
+            step_dir = self.output_dir / "steps"
+            if not self._dataset_files(step_dir):
                 raise FileNotFoundError(
                     "Steps not found. Run extract first, then extract-quality."
                 )
 
-            generation_ids = self._get_generation_ids(step_path)
+            generation_ids = self._get_generation_ids(step_dir)
 
             if not generation_ids:
                 if show_progress:
@@ -621,17 +1218,10 @@ class STDMExtractor:
             if show_progress:
                 console.print("[cyan]Extracting generations...[/cyan]")
 
-            generation_query = self._build_quality_query(
+            result.generations_count = self._extract_children(
                 "generations",
                 generation_ids,
-                "generationId__c"
-            )
-            generation_path = self.output_dir / "generations"
-
-            result.generations_count = self.client.query_to_parquet(
-                generation_query,
-                generation_path / "data.parquet",
-                schema=SCHEMAS["generations"],
+                "generationId__c",
                 show_progress=show_progress
             )
 
@@ -646,17 +1236,10 @@ class STDMExtractor:
             if show_progress:
                 console.print("[cyan]Extracting content quality...[/cyan]")
 
-            quality_query = self._build_quality_query(
+            result.content_quality_count = self._extract_children(
                 "content_quality",
                 generation_ids,
-                "parent__c"
-            )
-            quality_path = self.output_dir / "content_quality"
-
-            result.content_quality_count = self.client.query_to_parquet(
-                quality_query,
-                quality_path / "data.parquet",
-                schema=SCHEMAS["content_quality"],
+                "parent__c",
                 show_progress=show_progress
             )
 
@@ -666,7 +1249,7 @@ class STDMExtractor:
             # Get quality IDs for category lookup
             quality_ids = []
             if result.content_quality_count > 0:
-                quality_ids = self._get_quality_ids(quality_path / "data.parquet")
+                quality_ids = self._get_quality_ids(self._entity_path("content_quality"))
 
             # 3. Extract content categories (parent = generation OR quality)
             if show_progress:
@@ -674,17 +1257,10 @@ class STDMExtractor:
 
             # Categories can link to either generations or quality records
             all_parent_ids = list(set(generation_ids + quality_ids))
-            category_query = self._build_quality_query(
+            result.content_categories_count = self._extract_children(
                 "content_categories",
                 all_parent_ids,
-                "parent__c"
-            )
-            category_path = self.output_dir / "content_categories"
-
-            result.content_categories_count = self.client.query_to_parquet(
-                category_query,
-                category_path / "data.parquet",
-                schema=SCHEMAS["content_categories"],
+                "parent__c",
                 show_progress=show_progress
             )
 
@@ -724,27 +1300,38 @@ class STDMExtractor:
 
         return query
 
-    def _get_generation_ids(self, parquet_path: Path) -> List[str]:
-        """Extract unique generation IDs from steps Parquet file."""
+    def _dataset_files(self, path: Path) -> List[Path]:
+        """
+        Parquet files behind ``path``.
+
+        A directory yields every non-hidden ``*.parquet`` below it (plain
+        or Hive-partitioned output); a file path yields it and its rolled
+        parts.
+        """
+        path = Path(path)
+        if path.is_dir():
+            return dataset_files(path)
+        return parquet_parts(path)
+
+    def _read_column(self, parquet_path: Path, column: str) -> List[Any]:
+        """Read one column from a Parquet output, its rolled parts or a dataset directory."""
         import pyarrow.parquet as pq
 
-        if not parquet_path.exists():
-            return []
+        values: List[Any] = []
+        for part in self._dataset_files(parquet_path):
+            table = pq.read_table(part, columns=[column])
+            values.extend(table.column(column).to_pylist())
+        return values
 
-        table = pq.read_table(parquet_path, columns=["ssot__GenerationId__c"])
+    def _get_generation_ids(self, parquet_path: Path) -> List[str]:
+        """Extract unique generation IDs from steps Parquet file."""
         # Filter out None values and get unique
-        ids = [id for id in table.column("ssot__GenerationId__c").to_pylist() if id]
+        ids = [id for id in self._read_column(parquet_path, "ssot__GenerationId__c") if id]
         return list(set(ids))
 
     def _get_quality_ids(self, parquet_path: Path) -> List[str]:
         """Extract quality record IDs from Parquet file."""
-        import pyarrow.parquet as pq
-
-        if not parquet_path.exists():
-            return []
-
-        table = pq.read_table(parquet_path, columns=["id__c"])
-        return table.column("id__c").to_pylist()
+        return self._read_column(parquet_path, "id__c")
 
     def _save_quality_metadata(self, result: "QualityExtractionResult"):
         """Save quality extraction metadata to file."""
@@ -788,23 +1375,11 @@ class STDMExtractor:
 
     def _get_session_ids(self, parquet_path: Path) -> List[str]:
         """Extract session IDs from Parquet file."""
-        import pyarrow.parquet as pq
-
-        if not parquet_path.exists():
-            return []
-
-        table = pq.read_table(parquet_path, columns=["ssot__Id__c"])
-        return table.column("ssot__Id__c").to_pylist()
+        return self._read_column(parquet_path, "ssot__Id__c")
 
     def _get_interaction_ids(self, parquet_path: Path) -> List[str]:
         """Extract interaction IDs from Parquet file."""
-        import pyarrow.parquet as pq
-
-        if not parquet_path.exists():
-            return []
-
-        table = pq.read_table(parquet_path, columns=["ssot__Id__c"])
-        return table.column("ssot__Id__c").to_pylist()
+        return self._read_column(parquet_path, "ssot__Id__c")
 
     def _save_metadata(
         self,
@@ -832,13 +1407,33 @@ class STDMExtractor:
         with open(metadata_dir / "extraction.json", "w") as f:
             json.dump(metadata, f, indent=2)
 
-    def _update_watermark(self):
-        """Update watermark file with current time."""
+    def _save_pending_run(
+        self,
+        since: datetime,
+        until: datetime,
+        agent_names: Optional[List[str]] = None,
+        window: Optional[str] = None,
+    ):
+        """Record the range of a starting run until it completes (see pending_run())."""
+        _write_json_atomic(self.output_dir / "metadata" / "pending_run.json", {
+            "since": since.isoformat(),
+            "until": until.isoformat(),
+            "agent_names": agent_names,
+            "window": window,
+            "started_at": datetime.now().isoformat(),
+        })
+
+    def _clear_pending_run(self):
+        """Forget the pending run once it has completed without errors."""
+        (self.output_dir / "metadata" / "pending_run.json").unlink(missing_ok=True)
+
+    def _update_watermark(self, until: Optional[datetime] = None):
+        """Update watermark file with the end of the extracted range (default: now)."""
         metadata_dir = self.output_dir / "metadata"
         metadata_dir.mkdir(parents=True, exist_ok=True)
 
         watermark = {
-            "last_extraction": datetime.utcnow().isoformat(),
+            "last_extraction": (until or datetime.utcnow()).isoformat(),
             "updated_at": datetime.now().isoformat(),
         }
 
@@ -0,0 +1,277 @@
+"""
+Append-only dataset manifest for STDM Parquet output.
+
+Incremental extraction never rewrites existing files. Each run writes new
+files into the ``date=YYYY-MM-DD`` partitions it touches and registers
+them here under a run sequence number; higher sequences are newer.
+Readers keep the newest version of each record, and compaction folds the
+files of a partition into one deduplicated file.
+
+Layout:
+    {data_dir}/metadata/manifest.json
+    {data_dir}/{entity}/date=2026-01-15/run-000003.parquet
+    {data_dir}/{entity}/date=2026-01-15/compacted-000003.parquet
+
+Files on disk that the manifest does not list (e.g. a full extraction's
+``data.parquet``) are treated as sequence 0, older than any run.
+
+Usage:
+    manifest = DatasetManifest.load(Path("./stdm_data"))
+
+    # Lazy frame with one row per ssot__Id__c (latest version wins)
+    sessions = manifest.scan_latest("sessions")
+
+    # Deduplicate the partitions a run touched
+    manifest.compact(["sessions"], partitions=["date=2026-01-15"])
+"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import polars as pl
+
+
+MANIFEST_VERSION = 1
+DEFAULT_KEY = "ssot__Id__c"
+
+# Temporary column carrying each file's sequence while deduplicating
+VERSION_COLUMN = "__stdm_seq"
+
+
+def dataset_files(root: Path, recursive: bool = True) -> List[Path]:
+    """
+    Non-hidden ``*.parquet`` files under ``root``.
+
+    Hidden files and directories (scratch and temp files) are skipped.
+    """
+    root = Path(root)
+    if not root.is_dir():
+        return []
+    candidates = root.rglob("*.parquet") if recursive else root.glob("*.parquet")
+    return sorted(
+        p for p in candidates
+        if p.is_file() and not any(part.startswith(".") for part in p.relative_to(root).parts)
+    )
+
+
+class DatasetManifest:
+    """
+    Registry of append-only Parquet files and their run sequence.
+
+    Build through ``DatasetManifest.load()``. Methods are safe to call from
+    the worker threads of one extraction; concurrent extraction processes
+    writing the same directory are not supported.
+    """
+
+    def __init__(self, data_dir: Path, data: Optional[Dict[str, Any]] = None):
+        self.data_dir = Path(data_dir)
+        data = data or {}
+        self.last_seq: int = data.get("last_seq", 0)
+        self.files: Dict[str, Dict[str, Any]] = data.get("files", {})
+        self._lock = threading.RLock()
+
+    @property
+    def path(self) -> Path:
+        """Location of manifest.json."""
+        return self.data_dir / "metadata" / "manifest.json"
+
+    @classmethod
+    def load(cls, data_dir: Path) -> "DatasetManifest":
+        """Read the manifest for ``data_dir`` (empty if none exists yet)."""
+        manifest = cls(data_dir)
+        try:
+            with open(manifest.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+        if data.get("version") == MANIFEST_VERSION:
+            manifest = cls(data_dir, data)
+        return manifest
+
+    def save(self):
+        """Atomically write manifest.json."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            data = {
+                "version": MANIFEST_VERSION,
+                "updated_at": datetime.now().isoformat(),
+                "last_seq": self.last_seq,
+                "files": self.files,
+            }
+            fd, tmp = tempfile.mkstemp(dir=str(self.path.parent), prefix=".manifest-")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f, indent=2, sort_keys=True)
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+
+    def next_sequence(self) -> int:
+        """Reserve the sequence number for a new run."""
+        with self._lock:
+            self.last_seq += 1
+            self.save()
+            return self.last_seq
+
+    def _relative(self, path: Path) -> str:
+        return Path(path).resolve().relative_to(self.data_dir.resolve()).as_posix()
+
+    def register(self, paths: Iterable[Path], seq: int):
+        """
+        Record files written by run ``seq``.
+
+        The entity and partition are taken from the path:
+        ``{entity}/{partition}/{file}.parquet``.
+        """
+        import pyarrow.parquet as pq
+
+        with self._lock:
+            for path in paths:
+                rel = self._relative(path)
+                parts = rel.split("/")
+                self.files[rel] = {
+                    "entity": parts[0],
+                    "partition": "/".join(parts[1:-1]),
+                    "seq": seq,
+                    "rows": pq.read_metadata(str(path)).num_rows,
+                }
+            self.save()
+
+    def has_entity(self, entity: str) -> bool:
+        """True if any registered file belongs to ``entity``."""
+        return any(entry["entity"] == entity for entry in self.files.values())
+
+    def entity_files(
+        self,
+        entity: str,
+        partition: Optional[str] = None,
+    ) -> List[Tuple[Path, int]]:
+        """
+        (path, seq) for every Parquet file of an entity, oldest first.
+
+        Args:
+            entity: Entity directory name, e.g. "sessions"
+            partition: Only files directly in this partition directory;
+                None for the whole entity
+
+        Returns:
+            Files with their run sequence (0 if not registered)
+        """
+        root = self.data_dir / entity
+        if partition is None:
+            paths = dataset_files(root)
+        else:
+            paths = dataset_files(root / partition, recursive=False)
+
+        files = []
+        for path in paths:
+            entry = self.files.get(self._relative(path))
+            files.append((path, entry["seq"] if entry else 0))
+        return sorted(files, key=lambda item: (item[1], str(item[0])))
+
+    def _scan_files(self, files: List[Tuple[Path, int]], key: str) -> pl.LazyFrame:
+        """Lazy frame over ``files`` keeping the newest row per ``key``."""
+        if len(files) == 1:
+            return pl.scan_parquet(files[0][0], hive_partitioning=False)
+
+        frame = pl.concat(
+            [
+                pl.scan_parquet(path, hive_partitioning=False)
+                .with_columns(pl.lit(seq, dtype=pl.Int64).alias(VERSION_COLUMN))
+                for path, seq in files
+            ],
+            how="diagonal_relaxed",
+        )
+        if key in frame.collect_schema().names():
+            frame = frame.sort(VERSION_COLUMN, maintain_order=True).unique(
+                subset=[key], keep="last", maintain_order=True
+            )
+        return frame.drop(VERSION_COLUMN)
+
+    def scan_latest(self, entity: str, key: str = DEFAULT_KEY) -> pl.LazyFrame:
+        """
+        Lazily read an entity with one row per ``key``, newest run winning.
+
+        Raises:
+            FileNotFoundError: If the entity has no Parquet files
+        """
+        files = self.entity_files(entity)
+        if not files:
+            raise FileNotFoundError(f"No data found for {entity} in {self.data_dir}")
+        return self._scan_files(files, key)
+
+    def compact(
+        self,
+        entities: Iterable[str],
+        partitions: Optional[Iterable[str]] = None,
+        key: str = DEFAULT_KEY,
+    ) -> int:
+        """
+        Merge each partition's files into one deduplicated file.
+
+        Only partition directories holding more than one file are rewritten;
+        files at the entity root (full extractions) are left alone. The new
+        ``compacted-{seq}.parquet`` takes the newest input sequence, so
+        later runs still override it; it is written to a temp file and
+        renamed into place before the inputs are removed.
+
+        Args:
+            entities: Entity directory names to compact
+            partitions: Partition names (e.g. "date=2026-01-15") to limit
+                compaction to; None compacts every partition
+            key: Record key used for deduplication
+
+        Returns:
+            Number of partitions compacted
+        """
+        wanted = set(partitions) if partitions is not None else None
+        compacted = 0
+
+        for entity in entities:
+            root = self.data_dir / entity
+            if not root.is_dir():
+                continue
+
+            found = {
+                path.parent.relative_to(root).as_posix()
+                for path in dataset_files(root)
+                if path.parent != root
+            }
+            for partition in sorted(found):
+                if wanted is not None and partition not in wanted:
+                    continue
+                files = self.entity_files(entity, partition)
+                if len(files) > 1:
+                    self._compact_partition(root / partition, files, key)
+                    compacted += 1
+
+        return compacted
+
+    def _compact_partition(self, part_dir: Path, files: List[Tuple[Path, int]], key: str):
+        seq = max(s for _, s in files)
+        target = part_dir / f"compacted-{seq:06d}.parquet"
+
+        fd, tmp = tempfile.mkstemp(dir=str(part_dir), prefix=".compact-", suffix=".parquet")
+        os.close(fd)
+        try:
+            self._scan_files(files, key).sink_parquet(tmp)
+            os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+        with self._lock:
+            for path, _ in files:
+                self.files.pop(self._relative(path), None)
+            self.register([target], seq)
+
+        for path, _ in files:
+            if path != target and path.exists():
+                path.unlink()
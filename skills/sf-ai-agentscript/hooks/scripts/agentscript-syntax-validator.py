@@ -15,9 +15,30 @@ import os
 import re
 import subprocess
 import sys
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
+# Add script directory to path for the sibling tokenizer/AST and org cache modules
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from agentscript_ast import Node, Token, indent_width, parse  # noqa: E402
+from agentscript_incremental import (  # noqa: E402
+    ValidationStateStore,
+    block_map,
+    changed_groups,
+    locate_line,
+    relocate_line,
+    validator_fingerprint,
+)
+from agentscript_org_cache import (  # noqa: E402
+    OrgFactCache,
+    is_positive_result,
+    query_cache_key,
+    run_composite_queries,
+)
+
 
 class AgentScriptValidator:
     """Validates Agent Script syntax and common production gotchas."""
@@ -104,10 +125,164 @@ class AgentScriptValidator:
         "actions": 40,
     }
 
+    BOOLEAN_ASSIGNMENT_PATTERN = re.compile(r"^\s*[A-Za-z_][A-Za-z0-9_:\- ]*\s*[:=]\s*(true|false)\s*(?:#.*)?$", re.IGNORECASE)
+    MUTABLE_LINKED_PATTERN = re.compile(r"mutable\s+linked|linked\s+mutable", re.IGNORECASE)
+    EXECUTABLE_PREFIXES = ("|", "if ", "set ", "run ", "with ", "available when", "transition to ")
+    VARIABLE_REF_PATTERN = re.compile(r"@variables\.([A-Za-z_][A-Za-z0-9_]*)")
+    TOPIC_REF_PATTERN = re.compile(r"@topic\.([A-Za-z][A-Za-z0-9_]*)")
+    EMPTY_LIST_COMPARE_PATTERN = re.compile(r"^\s*if\s+.*(?:==|!=)\s*\[\]\s*:?\s*(?:#.*)?$")
+    EMPTY_LIST_SET_PATTERN = re.compile(r"^\s*set\s+.+?=\s*\[\]\s*(?:#.*)?$")
+    INPUTS_IN_SET_PATTERN = re.compile(r"^\s*set\s+@variables\.[^=]+\s*=\s*@inputs\.")
+    BARE_RUN_PATTERN = re.compile(r"^\s*run\s+([A-Za-z_][A-Za-z0-9_]*)\s*(?:#.*)?$")
+    RUN_ACTION_PATTERN = re.compile(r"^\s*run\s+@actions\.([A-Za-z_][A-Za-z0-9_]*)\b")
+    STRING_METHOD_PATTERN = re.compile(r"\b(contains|startswith|endswith)\b")
+    OUTPUT_ASSIGNMENT_PATTERN = re.compile(
+        r"^\s*set\s+@variables\.([A-Za-z_][A-Za-z0-9_]*)\s*=\s*@outputs\.([A-Za-z_][A-Za-z0-9_]*)(?![\.\[])",
+    )
+    ELSE_IF_PATTERN = re.compile(r"^\s*else\s+if\b")
+    CONDITIONAL_START_PATTERN = re.compile(r"^\s*(if\b.*:|else:)\s*(?:#.*)?$")
+    VALID_WITH_ELLIPSIS_PATTERN = re.compile(r"^\s*with\s+(?:\"[^\"]+\"|[A-Za-z_][A-Za-z0-9_]*)\s*=\s*\.\.\.\s*(?:#.*)?$")
+    INVALID_ELLIPSIS_PATTERN = re.compile(r"(?:=|:)\s*\.\.\.\s*(?:#.*)?$")
+
+    # Every check in report order. Only the names listed in LINE_RULES share
+    # the single token traversal (_scan_lines, via _visit_<name>). Every other
+    # check is a separate _check_<name> pass over the structures collected by
+    # _parse_structure (variables, actions, topics, connections); those passes
+    # do not re-read the token stream but are not merged into the traversal.
+    CHECK_ORDER = (
+        "mixed_indentation",
+        "boolean_case",
+        "required_blocks",
+        "config_fields",
+        "start_agent_count",
+        "name_collisions",
+        "naming_rules",
+        "invalid_connections_wrapper",
+        "invalid_top_level_actions",
+        "mutable_linked_conflict",
+        "reserved_variable_names",
+        "reserved_field_names",
+        "linked_variable_defaults",
+        "linked_variable_types",
+        "undefined_variables",
+        "undefined_topics",
+        "multiline_descriptions",
+        "topic_system_override_syntax",
+        "lifecycle_instruction_wrappers",
+        "lifecycle_pipe_content",
+        "lifecycle_run_portability",
+        "lifecycle_arithmetic_null_guard",
+        "post_action_position",
+        "empty_list_literals",
+        "inputs_in_set",
+        "bare_run_actions",
+        "run_resolution_to_definition_scope",
+        "action_metadata_context",
+        "target_action_io_completeness",
+        "multiple_available_when",
+        "confirmation_runtime_gap",
+        "prompt_output_displayability",
+        "prompt_hidden_outputs_need_planner",
+        "date_type_in_action_io",
+        "filter_planner_conflict",
+        "is_required_advisories",
+        "user_input_string_matching",
+        "string_method_portability",
+        "structured_output_scalar_assignment",
+        "invalid_else_if",
+        "nested_if_blocks",
+        "empty_conditional_bodies",
+        "ellipsis_misuse",
+        "connection_block_completeness",
+        "agent_type_specific_patterns",
+        "service_agent_user_in_org",
+        "apex_target_existence",
+        "service_agent_target_permissions",
+        "connection_route_flow_readiness",
+        "large_file_risk",
+        "duplicate_descriptions",
+        "transition_naming_conventions",
+        "sensitive_actions_without_guards",
+        "welcome_error_patterns",
+        "escalation_fallback_heuristic",
+        "platform_guardrail_topic_conflict",
+    )
+    # Line-level rules and the tokens they need to see: "*" for every token,
+    # otherwise the possible first characters of the stripped line.
+    LINE_RULES = {
+        "mixed_indentation": "*",
+        "boolean_case": "*",
+        "required_blocks": "sc",
+        "invalid_connections_wrapper": "c",
+        "mutable_linked_conflict": "*",
+        "undefined_variables": "|isrwat",
+        "undefined_topics": "*",
+        "post_action_position": "|iatsb",
+        "empty_list_literals": "is",
+        "inputs_in_set": "s",
+        "bare_run_actions": "r",
+        "run_resolution_to_definition_scope": "r",
+        "user_input_string_matching": "ia",
+        "string_method_portability": "ia",
+        "structured_output_scalar_assignment": "s",
+        "invalid_else_if": "e",
+        "nested_if_blocks": "*",
+        "empty_conditional_bodies": "*",
+        "ellipsis_misuse": "*",
+    }
+    # Block groups each check reads (see agentscript_incremental.BLOCK_GROUPS).
+    # Checks not listed here, line-level rules, cross-reference checks such as
+    # undefined topics/variables, and checks whose messages quote line numbers
+    # read the whole file and re-run on any change.
+    CHECK_INPUTS = {
+        "config_fields": ("config",),
+        "start_agent_count": ("topics",),
+        "name_collisions": ("topics",),
+        "naming_rules": ("config", "topics", "variables"),
+        "reserved_variable_names": ("variables",),
+        "reserved_field_names": ("topics", "variables"),
+        "linked_variable_defaults": ("variables",),
+        "linked_variable_types": ("variables",),
+        "multiline_descriptions": ("topics",),
+        "topic_system_override_syntax": ("topics",),
+        "lifecycle_instruction_wrappers": ("topics",),
+        "lifecycle_pipe_content": ("topics",),
+        "lifecycle_run_portability": ("topics",),
+        "lifecycle_arithmetic_null_guard": ("topics", "variables"),
+        "action_metadata_context": ("topics",),
+        "target_action_io_completeness": ("topics",),
+        "multiple_available_when": ("topics",),
+        "confirmation_runtime_gap": ("topics",),
+        "prompt_output_displayability": ("topics",),
+        "prompt_hidden_outputs_need_planner": ("topics",),
+        "date_type_in_action_io": ("topics",),
+        "filter_planner_conflict": ("topics",),
+        "is_required_advisories": ("topics",),
+        "connection_block_completeness": ("connections",),
+        "agent_type_specific_patterns": ("config", "connections", "variables"),
+        "service_agent_user_in_org": ("config",),
+        "apex_target_existence": ("topics",),
+        "service_agent_target_permissions": ("config", "topics"),
+        "connection_route_flow_readiness": ("connections",),
+        "duplicate_descriptions": ("topics",),
+        "transition_naming_conventions": ("topics",),
+        "sensitive_actions_without_guards": ("topics",),
+        "welcome_error_patterns": ("system",),
+    }
+    # Checks that also depend on org state: their stored findings are reused
+    # only when they were clean and the org facts behind them are still fresh.
+    ORG_CHECKS = frozenset({
+        "service_agent_user_in_org",
+        "apex_target_existence",
+        "service_agent_target_permissions",
+        "connection_route_flow_readiness",
+    })
+
     def __init__(self, content: str, file_path: str):
         self.content = content
         self.file_path = file_path
-        self.lines = content.split("\n")
+        self.document = parse(content)
+        self.tokens: List[Token] = self.document.tokens
         self.errors: List[Tuple[int, str, str]] = []
         self.warnings: List[Tuple[int, str, str]] = []
 
@@ -132,22 +307,23 @@ class AgentScriptValidator:
         self.lifecycle_arithmetic_lines: List[Tuple[int, str, str, str]] = []  # (line, lifecycle_name, var_name, owner)
         self.lifecycle_null_guards: List[Tuple[int, str, str, str]] = []  # (line, lifecycle_name, var_name, owner)
         self.topic_inline_system_lines: List[Tuple[int, str]] = []
-        self.line_owner: Dict[int, str] = {}
+        self.line_owner: Dict[int, str] = self.document.owners
         self.welcome_error_inline_interpolation_lines: List[Tuple[int, str]] = []
         self.welcome_error_folded_scalar_lines: List[Tuple[int, str]] = []
         self.default_agent_user_comment_lines: List[int] = []
         self.top_level_actions_lines: List[int] = []
 
+        self._org_cache = OrgFactCache()
         self.validation_org = self._resolve_validation_org()
         self._query_cache: Dict[str, Dict] = {}
+        self._fetched_queries: Set[str] = set()
         self._user_query_cache: Dict[str, Dict] = {}
 
         self._parse_structure()
 
     @staticmethod
     def _indent(raw_line: str) -> int:
-        expanded = raw_line.expandtabs(4)
-        return len(expanded) - len(expanded.lstrip(" "))
+        return indent_width(raw_line)
 
     @staticmethod
     def _strip_quotes(value: str) -> str:
@@ -157,6 +333,8 @@ class AgentScriptValidator:
         return value
 
     def _strip_inline_comment(self, value: str) -> str:
+        if "#" not in value:
+            return value.rstrip()
         in_single = False
         in_double = False
         escaped = False
@@ -243,11 +421,22 @@ class AgentScriptValidator:
         return None
 
     def _resolve_validation_org(self) -> Optional[str]:
+        if os.environ.get("AGENTSCRIPT_SKIP_ORG_CHECKS") == "1":
+            return None
         for env_name in ("AGENTSCRIPT_VALIDATION_ORG", "SF_TARGET_ORG", "TARGET_ORG"):
             value = os.environ.get(env_name)
             if value:
                 return value.strip()
-        return self._resolve_sf_target_org(self._project_root_for_file())
+
+        project_root = self._project_root_for_file()
+        cache_key = f"target-org\n{project_root}"
+        cached = self._org_cache.get(cache_key)
+        if cached:
+            return cached
+        org = self._resolve_sf_target_org(project_root)
+        if org:
+            self._org_cache.put(cache_key, org)
+        return org
 
     def _effective_agent_type(self) -> Optional[str]:
         agent_type = self.config_fields.get("agent_type")
@@ -267,6 +456,7 @@ class AgentScriptValidator:
             self._query_cache[soql] = result
             return result
 
+        self._fetched_queries.add(soql)
         try:
             proc = subprocess.run(
                 ["sf", "data", "query", "--query", soql, "-o", self.validation_org, "--json"],
@@ -300,25 +490,60 @@ class AgentScriptValidator:
         self._query_cache[soql] = result
         return result
 
+    def _soql_user(self, username: str) -> str:
+        return (
+            "SELECT Username, IsActive, UserType, Profile.Name "
+            f"FROM User WHERE Username = '{self._sql_quote(username)}' LIMIT 1"
+        )
+
+    def _soql_permission_set_assignments(self, username: str) -> str:
+        return (
+            "SELECT PermissionSetId, PermissionSet.Name "
+            f"FROM PermissionSetAssignment WHERE Assignee.Username = '{self._sql_quote(username)}'"
+        )
+
+    def _soql_permission_set(self, permset_name: str) -> str:
+        return f"SELECT Id, Name FROM PermissionSet WHERE Name = '{self._sql_quote(permset_name)}' LIMIT 1"
+
+    def _soql_apex_classes(self, names: List[str]) -> str:
+        quoted = ", ".join(f"'{self._sql_quote(name)}'" for name in names)
+        return f"SELECT Id, Name FROM ApexClass WHERE Name IN ({quoted})"
+
+    def _soql_setup_entity_access(self, permset_name: str, names: List[str]) -> str:
+        # Semi-joins instead of resolved Ids, so the query can be planned (and
+        # batched) before the permission set and class lookups have returned.
+        quoted = ", ".join(f"'{self._sql_quote(name)}'" for name in names)
+        return (
+            "SELECT SetupEntityId, SetupEntityType FROM SetupEntityAccess "
+            f"WHERE ParentId IN (SELECT Id FROM PermissionSet WHERE Name = '{self._sql_quote(permset_name)}') "
+            f"AND SetupEntityType = 'ApexClass' AND SetupEntityId IN (SELECT Id FROM ApexClass WHERE Name IN ({quoted}))"
+        )
+
+    def _soql_active_flows(self, names: List[str]) -> str:
+        quoted = ", ".join(f"'{self._sql_quote(name)}'" for name in names)
+        return f"SELECT ApiName, ActiveVersionId FROM FlowDefinitionView WHERE ApiName IN ({quoted})"
+
+    @staticmethod
+    def _unique_names(names: List[str]) -> List[str]:
+        return sorted({name for name in names if name})
+
     def _query_user_in_org(self, username: str) -> Dict:
         if username in self._user_query_cache:
             return self._user_query_cache[username]
 
-        soql = (
-            "SELECT Username, IsActive, UserType, Profile.Name "
-            f"FROM User WHERE Username = '{self._sql_quote(username)}' LIMIT 1"
-        )
-        query = self._run_soql_query(soql)
+        query = self._run_soql_query(self._soql_user(username))
+        result = self._classify_user_query(query)
+        self._user_query_cache[username] = result
+        return result
+
+    @staticmethod
+    def _classify_user_query(query: Dict) -> Dict:
         if not query.get("ok"):
-            result = {"ok": False, "reason": query.get("reason"), "detail": query.get("detail")}
-            self._user_query_cache[username] = result
-            return result
+            return {"ok": False, "reason": query.get("reason"), "detail": query.get("detail")}
 
         records = query.get("records") or []
         if not records:
-            result = {"ok": False, "reason": "missing"}
-            self._user_query_cache[username] = result
-            return result
+            return {"ok": False, "reason": "missing"}
 
         record = records[0]
         is_active = record.get("IsActive") is True
@@ -326,54 +551,127 @@ class AgentScriptValidator:
         profile_name = ((record.get("Profile") or {}).get("Name"))
 
         if not is_active:
-            result = {"ok": False, "reason": "inactive", "record": record}
-        elif user_type == "AutomatedProcess":
-            result = {"ok": False, "reason": "automated_process", "record": record}
-        elif profile_name != "Einstein Agent User":
-            result = {"ok": False, "reason": "wrong_profile", "record": record}
-        else:
-            result = {"ok": True, "reason": "valid", "record": record}
-
-        self._user_query_cache[username] = result
-        return result
+            return {"ok": False, "reason": "inactive", "record": record}
+        if user_type == "AutomatedProcess":
+            return {"ok": False, "reason": "automated_process", "record": record}
+        if profile_name != "Einstein Agent User":
+            return {"ok": False, "reason": "wrong_profile", "record": record}
+        return {"ok": True, "reason": "valid", "record": record}
 
     def _query_permission_set_assignments(self, username: str) -> Dict:
-        soql = (
-            "SELECT PermissionSetId, PermissionSet.Name "
-            f"FROM PermissionSetAssignment WHERE Assignee.Username = '{self._sql_quote(username)}'"
-        )
-        return self._run_soql_query(soql)
+        return self._run_soql_query(self._soql_permission_set_assignments(username))
 
     def _query_permission_set(self, permset_name: str) -> Dict:
-        soql = f"SELECT Id, Name FROM PermissionSet WHERE Name = '{self._sql_quote(permset_name)}' LIMIT 1"
-        return self._run_soql_query(soql)
+        return self._run_soql_query(self._soql_permission_set(permset_name))
 
     def _query_apex_classes(self, class_names: List[str]) -> Dict:
-        names = sorted({name for name in class_names if name})
+        names = self._unique_names(class_names)
         if not names:
             return {"ok": True, "records": []}
-        quoted = ", ".join(f"'{self._sql_quote(name)}'" for name in names)
-        return self._run_soql_query(f"SELECT Id, Name FROM ApexClass WHERE Name IN ({quoted})")
+        return self._run_soql_query(self._soql_apex_classes(names))
 
-    def _query_setup_entity_access(self, parent_id: str, setup_entity_ids: List[str], setup_entity_type: str = "ApexClass") -> Dict:
-        ids = sorted({entity_id for entity_id in setup_entity_ids if entity_id})
-        if not ids:
+    def _query_setup_entity_access(self, permset_name: str, class_names: List[str]) -> Dict:
+        names = self._unique_names(class_names)
+        if not names:
             return {"ok": True, "records": []}
-        quoted = ", ".join(f"'{entity_id}'" for entity_id in ids)
-        soql = (
-            "SELECT SetupEntityId, SetupEntityType "
-            f"FROM SetupEntityAccess WHERE ParentId = '{parent_id}' "
-            f"AND SetupEntityType = '{setup_entity_type}' AND SetupEntityId IN ({quoted})"
-        )
-        return self._run_soql_query(soql)
+        return self._run_soql_query(self._soql_setup_entity_access(permset_name, names))
 
     def _query_active_flows(self, flow_names: List[str]) -> Dict:
-        names = sorted({name for name in flow_names if name})
+        names = self._unique_names(flow_names)
         if not names:
             return {"ok": True, "records": []}
-        quoted = ", ".join(f"'{self._sql_quote(name)}'" for name in names)
-        soql = f"SELECT ApiName, ActiveVersionId FROM FlowDefinitionView WHERE ApiName IN ({quoted})"
-        return self._run_soql_query(soql)
+        return self._run_soql_query(self._soql_active_flows(names))
+
+    def _planned_org_queries(self) -> List[Tuple[str, object]]:
+        """SOQL the org-aware checks will issue, with a per-query cacheability test.
+
+        Mirrors the preconditions of the ASV-ORG-* checks so every lookup can
+        be sent in one batch up front. Planning a query the checks end up not
+        needing only costs a sub-request in that batch.
+        """
+        if not self.validation_org:
+            return []
+
+        def all_present(expected: int):
+            return lambda result: is_positive_result(result, expected)
+
+        planned: List[Tuple[str, object]] = []
+        targets = self._collect_targets()
+        apex_names = self._unique_names([name for name, _, _ in targets["apex"]])
+        flow_names = self._unique_names([name for name, _, _ in targets["flow"]])
+        if apex_names:
+            planned.append((self._soql_apex_classes(apex_names), all_present(len(apex_names))))
+
+        default_agent_user = self.config_fields.get("default_agent_user")
+        if (
+            self._effective_agent_type() == "AgentforceServiceAgent"
+            and default_agent_user
+            and not self._is_demo_user_value(default_agent_user[0])
+        ):
+            username = default_agent_user[0]
+            planned.append((self._soql_user(username), lambda result: self._classify_user_query(result).get("ok")))
+            if apex_names or flow_names or targets["other"]:
+                agent_identifier = self._agent_identifier()
+                custom_permset_name = f"{agent_identifier}_Access" if agent_identifier else None
+
+                def assignments_complete(result, needs_custom=bool(apex_names or flow_names)):
+                    if not result.get("ok"):
+                        return False
+                    assigned = {((record.get("PermissionSet") or {}).get("Name")) or "" for record in result.get("records") or []}
+                    if not any("AgentforceServiceAgentUser" in name for name in assigned):
+                        return False
+                    return not needs_custom or custom_permset_name in assigned
+
+                planned.append((self._soql_permission_set_assignments(username), assignments_complete))
+                if custom_permset_name and apex_names:
+                    planned.append((self._soql_permission_set(custom_permset_name), all_present(1)))
+                    planned.append((self._soql_setup_entity_access(custom_permset_name, apex_names), all_present(len(apex_names))))
+                if flow_names:
+                    planned.append((self._soql_active_flows(flow_names), all_present(len(flow_names))))
+
+        route_names = self._unique_names([
+            flow_name for flow_name, _, raw_target in self._collect_connection_route_targets()
+            if not self._is_placeholder_value(flow_name) and not self._is_placeholder_value(raw_target)
+        ])
+        if route_names:
+            planned.append((self._soql_active_flows(route_names), all_present(len(route_names))))
+
+        unique: Dict[str, object] = {}
+        for soql, is_cacheable in planned:
+            unique.setdefault(soql, is_cacheable)
+        return list(unique.items())
+
+    def _prefetch_org_facts(self, planned: List[Tuple[str, object]]):
+        """Fill the query cache from the cross-process cache, then one batched call."""
+        missing = []
+        for soql, _ in planned:
+            if soql in self._query_cache:
+                continue
+            cached = self._org_cache.get(query_cache_key(self.validation_org, soql))
+            if cached is not None:
+                self._query_cache[soql] = cached
+            else:
+                missing.append(soql)
+
+        # A single query gains nothing from the Composite envelope; anything the
+        # batch could not answer falls back to per-query sf data query lazily.
+        if len(missing) > 1:
+            for soql, result in run_composite_queries(self.validation_org, missing).items():
+                self._query_cache[soql] = result
+                self._fetched_queries.add(soql)
+
+    def seed_org_facts(self, results: Dict[str, Dict]):
+        """Preload query results fetched elsewhere (see prefetch_shared_org_facts)."""
+        for soql, result in results.items():
+            self._query_cache.setdefault(soql, result)
+
+    def _store_org_facts(self, planned: List[Tuple[str, object]]):
+        """Persist freshly fetched, fully positive org facts for later validations."""
+        for soql, is_cacheable in planned:
+            result = self._query_cache.get(soql)
+            if soql in self._fetched_queries and result is not None and is_cacheable(result):
+                self._org_cache.put(query_cache_key(self.validation_org, soql), {"ok": True, "records": result.get("records") or []})
+        self._org_cache.flush()
 
     def _agent_identifier(self) -> Optional[str]:
         if "developer_name" in self.config_fields:
@@ -422,11 +720,135 @@ class AgentScriptValidator:
             self.action_definitions.append(current_action)
 
     def _parse_structure(self):
-        current_top: Optional[str] = None
-        current_block_name: Optional[str] = None
-        current_action: Optional[Dict] = None
+        """Populate the collected structures from the top-level blocks of the AST."""
+        for block in self.document.blocks():
+            i = block.start_line
+
+            if block.kind == "actions":
+                self.top_level_actions_lines.append(i)
+            elif block.kind == "connection":
+                if block.name == "messaging":
+                    self.connection_messaging_lines.append(i)
+            elif block.kind in {"topic", "start_agent"}:
+                if block.kind == "topic":
+                    self.topic_names.setdefault(block.name, i)
+                else:
+                    self.start_agent_names.setdefault(block.name, i)
+                self.defined_topics.add(block.name)
+
+            parser = self._BLOCK_PARSERS.get(block.kind)
+            if parser:
+                parser(self, block)
+
+    def _parse_config_block(self, block: Node):
+        for node in block.walk():
+            i, stripped = node.start_line, node.text
+            field_match = self.KEY_VALUE_PATTERN.match(stripped)
+            if field_match:
+                field, raw_value = field_match.groups()
+                self.config_raw_fields[field] = (raw_value, i)
+                cleaned = self._clean_scalar_value(raw_value)
+                self.config_fields[field] = (cleaned, i)
+                if field == "default_agent_user" and self._strip_inline_comment(raw_value).strip() != raw_value.strip():
+                    self.default_agent_user_comment_lines.append(i)
+
+    def _parse_variables_block(self, block: Node):
         current_variable: Optional[Dict] = None
-        current_connection: Optional[Dict] = None
+
+        for node in block.walk():
+            i, indent, stripped = node.start_line, node.indent, node.text
+
+            if current_variable and indent <= current_variable["indent"]:
+                current_variable = None
+
+            commentless = self._strip_inline_comment(stripped)
+            var_match = self.VARIABLE_DECL_PATTERN.match(commentless)
+            if var_match:
+                name, modifier, var_type, default_value = var_match.groups()
+                definition = {
+                    "name": name,
+                    "modifier": modifier.lower(),
+                    "type": var_type,
+                    "line": i,
+                    "indent": indent,
+                    "default": default_value.strip() if default_value else None,
+                    "source": None,
+                    "source_line": None,
+                }
+                self.variable_names.setdefault(name, i)
+                self.variable_definitions.append(definition)
+                self.variable_by_name[name] = definition
+                current_variable = definition
+                if name in self.RESERVED_FIELD_NAMES:
+                    # Report later in dedicated rule.
+                    pass
+                continue
+
+            # Multi-line variable declaration: "Name:" on its own line,
+            # with type/modifier/default on subsequent indented lines.
+            # This captures the variable name for reserved-name checks
+            # even when the full single-line pattern doesn't match.
+            multiline_var_match = re.match(r"^([A-Za-z][A-Za-z0-9_]*)\s*:\s*$", commentless)
+            if multiline_var_match:
+                name = multiline_var_match.group(1)
+                definition = {
+                    "name": name,
+                    "modifier": "",
+                    "type": "",
+                    "line": i,
+                    "indent": indent,
+                    "default": None,
+                    "source": None,
+                    "source_line": None,
+                }
+                self.variable_names.setdefault(name, i)
+                self.variable_definitions.append(definition)
+                self.variable_by_name[name] = definition
+                current_variable = definition
+                continue
+
+            if current_variable and indent > current_variable["indent"]:
+                field_match = self.KEY_VALUE_PATTERN.match(stripped)
+                if field_match:
+                    field, raw_value = field_match.groups()
+                    cleaned = self._clean_scalar_value(raw_value)
+                    if field == "type" and not current_variable.get("type"):
+                        current_variable["type"] = cleaned
+                    elif field == "default" and current_variable.get("default") is None:
+                        current_variable["default"] = cleaned
+                    elif field == "source":
+                        current_variable["source"] = cleaned
+                        current_variable["source_line"] = i
+                        if "@MessagingSession." in cleaned or "@MessagingEndUser." in cleaned:
+                            self.messaging_linked_var_lines.append(i)
+                        if cleaned.startswith("@context."):
+                            self.context_linked_var_lines.append(i)
+                continue
+
+    def _parse_connection_block(self, block: Node):
+        connection = {"channel": block.name, "line": block.start_line, "fields": {}}
+        for node in block.walk():
+            field_match = self.KEY_VALUE_PATTERN.match(node.text)
+            if field_match:
+                field, raw_value = field_match.groups()
+                connection["fields"][field] = (self._clean_scalar_value(raw_value), node.start_line)
+        self.connection_blocks.append(connection)
+
+    def _parse_system_block(self, block: Node):
+        # Simple heuristics for welcome/error message guidance
+        for node in block.walk():
+            i, stripped = node.start_line, node.text
+            lower = stripped.lower()
+            if "welcome" in lower or "error" in lower:
+                kind = "welcome" if "welcome" in lower else "error"
+                if "{!" in stripped:
+                    self.welcome_error_inline_interpolation_lines.append((i, kind))
+                if re.search(r":\s*>[-+]?\s*$", stripped):
+                    self.welcome_error_folded_scalar_lines.append((i, kind))
+
+    def _parse_owner_block(self, block: Node):
+        """Walk a topic/start_agent body tracking actions, I/O fields and lifecycle hooks."""
+        current_action: Optional[Dict] = None
         actions_mode: Optional[str] = None
         actions_indent: Optional[int] = None
         reasoning_indent: Optional[int] = None
@@ -434,18 +856,8 @@ class AgentScriptValidator:
         current_io_field: Optional[Dict] = None
         lifecycle_block: Optional[Dict] = None
 
-        for i, raw_line in enumerate(self.lines, 1):
-            indent = self._indent(raw_line)
-            stripped = raw_line.strip()
-
-            if current_top in {"topic", "start_agent"} and current_block_name:
-                self.line_owner[i] = current_block_name
-
-            if not stripped:
-                continue
-
-            if stripped.startswith("#"):
-                continue
+        for node in block.walk():
+            i, indent, stripped = node.start_line, node.indent, node.text
 
             # Close nested contexts when indentation decreases
             if lifecycle_block and indent <= lifecycle_block["indent"]:
@@ -468,9 +880,6 @@ class AgentScriptValidator:
                 current_io = None
                 current_io_field = None
 
-            if current_variable and (current_top != "variables" or indent <= current_variable["indent"]):
-                current_variable = None
-
             if actions_mode and actions_indent is not None and indent <= actions_indent:
                 actions_mode = None
                 actions_indent = None
@@ -478,356 +887,200 @@ class AgentScriptValidator:
             if reasoning_indent is not None and indent <= reasoning_indent:
                 reasoning_indent = None
 
-            if indent == 0 and current_connection and not stripped.startswith("connection "):
-                self.connection_blocks.append(current_connection)
-                current_connection = None
-
-            # Top-level blocks
-            if indent == 0:
-                current_top = None
-                current_block_name = None
-                lifecycle_block = None
-
-                if stripped == "config:":
-                    current_top = "config"
-                    continue
-                if stripped == "variables:":
-                    current_top = "variables"
-                    continue
-                if stripped == "knowledge:":
-                    current_top = "knowledge"
-                    continue
-                if stripped == "language:":
-                    current_top = "language"
-                    continue
-                if stripped == "system:":
-                    current_top = "system"
-                    continue
-                if stripped == "connections:":
-                    current_top = "connections"
-                    continue
-                if stripped == "actions:":
-                    self.top_level_actions_lines.append(i)
-                    current_top = "actions"
-                    continue
-
-                connection_match = self.CONNECTION_BLOCK_PATTERN.match(stripped)
-                if connection_match:
-                    if current_connection:
-                        self.connection_blocks.append(current_connection)
-                    channel = connection_match.group(1)
-                    current_top = "connection"
-                    current_connection = {"channel": channel, "line": i, "fields": {}}
-                    if channel == "messaging":
-                        self.connection_messaging_lines.append(i)
-                    continue
-
-                block_match = self.BLOCK_NAME_PATTERN.match(stripped)
-                if block_match:
-                    kind, name = block_match.groups()
-                    current_top = kind
-                    current_block_name = name
-                    self.line_owner[i] = name
-                    if kind == "topic":
-                        self.topic_names.setdefault(name, i)
-                    else:
-                        self.start_agent_names.setdefault(name, i)
-                    self.defined_topics.add(name)
-                    continue
-
-            # config block
-            if current_top == "config" and indent > 0:
-                field_match = self.KEY_VALUE_PATTERN.match(stripped)
-                if field_match:
-                    field, raw_value = field_match.groups()
-                    self.config_raw_fields[field] = (raw_value, i)
-                    cleaned = self._clean_scalar_value(raw_value)
-                    self.config_fields[field] = (cleaned, i)
-                    if field == "default_agent_user" and self._strip_inline_comment(raw_value).strip() != raw_value.strip():
-                        self.default_agent_user_comment_lines.append(i)
+            # lifecycle tracking
+            if stripped in {"before_reasoning:", "after_reasoning:"}:
+                lifecycle_block = {"name": stripped[:-1], "indent": indent, "owner": block.name}
                 continue
 
-            # variables block
-            if current_top == "variables" and indent > 0:
-                commentless = self._strip_inline_comment(stripped)
-                var_match = self.VARIABLE_DECL_PATTERN.match(commentless)
-                if var_match:
-                    name, modifier, var_type, default_value = var_match.groups()
-                    definition = {
-                        "name": name,
-                        "modifier": modifier.lower(),
-                        "type": var_type,
-                        "line": i,
-                        "indent": indent,
-                        "default": default_value.strip() if default_value else None,
-                        "source": None,
-                        "source_line": None,
-                    }
-                    self.variable_names.setdefault(name, i)
-                    self.variable_definitions.append(definition)
-                    self.variable_by_name[name] = definition
-                    current_variable = definition
-                    if name in self.RESERVED_FIELD_NAMES:
-                        # Report later in dedicated rule.
-                        pass
-                    continue
-
-                # Multi-line variable declaration: "Name:" on its own line,
-                # with type/modifier/default on subsequent indented lines.
-                # This captures the variable name for reserved-name checks
-                # even when the full single-line pattern doesn't match.
-                multiline_var_match = re.match(r"^([A-Za-z][A-Za-z0-9_]*)\s*:\s*$", commentless)
-                if multiline_var_match:
-                    name = multiline_var_match.group(1)
-                    definition = {
-                        "name": name,
-                        "modifier": "",
-                        "type": "",
-                        "line": i,
-                        "indent": indent,
-                        "default": None,
-                        "source": None,
-                        "source_line": None,
-                    }
-                    self.variable_names.setdefault(name, i)
-                    self.variable_definitions.append(definition)
-                    self.variable_by_name[name] = definition
-                    current_variable = definition
-                    continue
-
-                if current_variable and indent > current_variable["indent"]:
-                    field_match = self.KEY_VALUE_PATTERN.match(stripped)
-                    if field_match:
-                        field, raw_value = field_match.groups()
-                        cleaned = self._clean_scalar_value(raw_value)
-                        if field == "type" and not current_variable.get("type"):
-                            current_variable["type"] = cleaned
-                        elif field == "default" and current_variable.get("default") is None:
-                            current_variable["default"] = cleaned
-                        elif field == "source":
-                            current_variable["source"] = cleaned
-                            current_variable["source_line"] = i
-                            if "@MessagingSession." in cleaned or "@MessagingEndUser." in cleaned:
-                                self.messaging_linked_var_lines.append(i)
-                            if cleaned.startswith("@context."):
-                                self.context_linked_var_lines.append(i)
-                    continue
-
-            # connection block
-            if current_top == "connection" and current_connection and indent > 0:
-                field_match = self.KEY_VALUE_PATTERN.match(stripped)
-                if field_match:
-                    field, raw_value = field_match.groups()
-                    current_connection["fields"][field] = (self._clean_scalar_value(raw_value), i)
+            if lifecycle_block and indent > lifecycle_block["indent"]:
+                if stripped.startswith("instructions:"):
+                    self.lifecycle_instruction_wrappers.append((i, lifecycle_block["name"]))
+                if stripped.startswith("|"):
+                    self.lifecycle_pipe_lines.append((i, lifecycle_block["name"]))
+                run_match = re.match(r"^run\s+@actions\.([A-Za-z_][A-Za-z0-9_]*)\b", stripped)
+                if run_match:
+                    self.lifecycle_run_lines.append((i, lifecycle_block["name"], run_match.group(1)))
+                # Detect arithmetic on variables: set @variables.X = @variables.X + N
+                arith_match = re.match(
+                    r"^set\s+@variables\.([A-Za-z_][A-Za-z0-9_]*)\s*=\s*@variables\.\1\s*[+\-]\s*\d+",
+                    stripped,
+                )
+                if arith_match:
+                    self.lifecycle_arithmetic_lines.append((i, lifecycle_block["name"], arith_match.group(1), lifecycle_block.get("owner") or ""))
+                # Detect null guards: if @variables.X is None:
+                null_match = re.match(r"^if\s+@variables\.([A-Za-z_][A-Za-z0-9_]*)\s+is\s+None\s*:", stripped)
+                if null_match:
+                    self.lifecycle_null_guards.append((i, lifecycle_block["name"], null_match.group(1), lifecycle_block.get("owner") or ""))
+                # keep parsing deeper structures too
+
+            if stripped == "reasoning:":
+                reasoning_indent = indent
                 continue
 
-            # system block (simple heuristics for welcome/error message guidance)
-            if current_top == "system" and indent > 0:
-                lower = stripped.lower()
-                if "welcome" in lower or "error" in lower:
-                    kind = "welcome" if "welcome" in lower else "error"
-                    if "{!" in stripped:
-                        self.welcome_error_inline_interpolation_lines.append((i, kind))
-                    if re.search(r":\s*>[-+]?\s*$", stripped):
-                        self.welcome_error_folded_scalar_lines.append((i, kind))
+            if stripped == "actions:":
+                if reasoning_indent is not None and indent > reasoning_indent:
+                    actions_mode = "reasoning"
+                else:
+                    actions_mode = "definition"
+                actions_indent = indent
                 continue
 
-            # topic/start_agent internals
-            if current_top in {"topic", "start_agent"} and indent > 0:
-                # lifecycle tracking
-                if stripped in {"before_reasoning:", "after_reasoning:"}:
-                    lifecycle_block = {"name": stripped[:-1], "indent": indent, "owner": current_block_name}
-                    continue
-
-                if lifecycle_block and indent > lifecycle_block["indent"]:
-                    if stripped.startswith("instructions:"):
-                        self.lifecycle_instruction_wrappers.append((i, lifecycle_block["name"]))
-                    if stripped.startswith("|"):
-                        self.lifecycle_pipe_lines.append((i, lifecycle_block["name"]))
-                    run_match = re.match(r"^run\s+@actions\.([A-Za-z_][A-Za-z0-9_]*)\b", stripped)
-                    if run_match:
-                        self.lifecycle_run_lines.append((i, lifecycle_block["name"], run_match.group(1)))
-                    # Detect arithmetic on variables: set @variables.X = @variables.X + N
-                    arith_match = re.match(
-                        r"^set\s+@variables\.([A-Za-z_][A-Za-z0-9_]*)\s*=\s*@variables\.\1\s*[+\-]\s*\d+",
-                        stripped,
-                    )
-                    if arith_match:
-                        self.lifecycle_arithmetic_lines.append((i, lifecycle_block["name"], arith_match.group(1), lifecycle_block.get("owner") or ""))
-                    # Detect null guards: if @variables.X is None:
-                    null_match = re.match(r"^if\s+@variables\.([A-Za-z_][A-Za-z0-9_]*)\s+is\s+None\s*:", stripped)
-                    if null_match:
-                        self.lifecycle_null_guards.append((i, lifecycle_block["name"], null_match.group(1), lifecycle_block.get("owner") or ""))
-                    # keep parsing deeper structures too
-
-                if stripped == "reasoning:":
-                    reasoning_indent = indent
-                    continue
-
-                if stripped == "actions:":
-                    if reasoning_indent is not None and indent > reasoning_indent:
-                        actions_mode = "reasoning"
-                    else:
-                        actions_mode = "definition"
-                    actions_indent = indent
-                    continue
-
-                if actions_mode in {"definition", "reasoning"} and actions_indent is not None and indent > actions_indent:
-                    if current_action is None or indent == current_action["indent"]:
-                        action_match = self.ACTION_DECL_PATTERN.match(stripped)
-                        if action_match:
-                            name, remainder = action_match.groups()
-                            if name not in {"inputs", "outputs", "target", "description", "label", "source", "system", "reasoning"}:
-                                current_action = {
-                                    "name": name,
-                                    "line": i,
-                                    "indent": indent,
-                                    "owner": current_block_name,
-                                    "scope": actions_mode,
-                                    "kind": "definition" if actions_mode == "definition" else "reasoning",
-                                    "inline": remainder.strip(),
-                                    "target": None,
-                                    "target_line": None,
-                                    "description": None,
-                                    "description_line": None,
-                                    "has_available_when": False,
-                                    "available_when_count": 0,
-                                    "has_inputs_block": False,
-                                    "has_outputs_block": False,
-                                    "io_fields": [],
-                                    "invalid_transition_properties": [],
-                                    "required_input_lines": [],
-                                    "prompt_output_display_lines": [],
-                                    "date_io_lines": [],
-                                    "require_user_confirmation_lines": [],
-                                    "reserved_io_field_lines": [],
-                                    "filter_planner_conflict_lines": [],
-                                }
-                                inline = remainder.strip()
-                                if inline.startswith("@utils.transition"):
-                                    current_action["kind"] = "utility_transition"
-                                elif inline.startswith("@topic."):
-                                    current_action["kind"] = "delegation"
-                                elif inline.startswith("@utils."):
-                                    current_action["kind"] = "utility"
-                                elif inline.startswith("target:"):
-                                    target_value = self._clean_scalar_value(inline.split(":", 1)[1].strip())
-                                    current_action["target"] = target_value
-                                    current_action["target_line"] = i
-                                continue
-
-                    if current_action is not None and indent > current_action["indent"]:
-                        if stripped.startswith("target:"):
-                            target = self._clean_scalar_value(stripped.split(":", 1)[1].strip())
-                            current_action["target"] = target
-                            current_action["target_line"] = i
+            if actions_mode in {"definition", "reasoning"} and actions_indent is not None and indent > actions_indent:
+                if current_action is None or indent == current_action["indent"]:
+                    action_match = self.ACTION_DECL_PATTERN.match(stripped)
+                    if action_match:
+                        name, remainder = action_match.groups()
+                        if name not in {"inputs", "outputs", "target", "description", "label", "source", "system", "reasoning"}:
+                            current_action = {
+                                "name": name,
+                                "line": i,
+                                "indent": indent,
+                                "owner": block.name,
+                                "scope": actions_mode,
+                                "kind": "definition" if actions_mode == "definition" else "reasoning",
+                                "inline": remainder.strip(),
+                                "target": None,
+                                "target_line": None,
+                                "description": None,
+                                "description_line": None,
+                                "has_available_when": False,
+                                "available_when_count": 0,
+                                "has_inputs_block": False,
+                                "has_outputs_block": False,
+                                "io_fields": [],
+                                "invalid_transition_properties": [],
+                                "required_input_lines": [],
+                                "prompt_output_display_lines": [],
+                                "date_io_lines": [],
+                                "require_user_confirmation_lines": [],
+                                "reserved_io_field_lines": [],
+                                "filter_planner_conflict_lines": [],
+                            }
+                            inline = remainder.strip()
+                            if inline.startswith("@utils.transition"):
+                                current_action["kind"] = "utility_transition"
+                            elif inline.startswith("@topic."):
+                                current_action["kind"] = "delegation"
+                            elif inline.startswith("@utils."):
+                                current_action["kind"] = "utility"
+                            elif inline.startswith("target:"):
+                                target_value = self._clean_scalar_value(inline.split(":", 1)[1].strip())
+                                current_action["target"] = target_value
+                                current_action["target_line"] = i
                             continue
 
-                        if stripped.startswith("description:"):
-                            current_action["description"] = self._clean_scalar_value(stripped.split(":", 1)[1].strip())
-                            current_action["description_line"] = i
-                            continue
+                if current_action is not None and indent > current_action["indent"]:
+                    if stripped.startswith("target:"):
+                        target = self._clean_scalar_value(stripped.split(":", 1)[1].strip())
+                        current_action["target"] = target
+                        current_action["target_line"] = i
+                        continue
 
-                        if stripped.startswith("available when"):
-                            current_action["has_available_when"] = True
-                            current_action["available_when_count"] += 1
-                            continue
+                    if stripped.startswith("description:"):
+                        current_action["description"] = self._clean_scalar_value(stripped.split(":", 1)[1].strip())
+                        current_action["description_line"] = i
+                        continue
 
-                        if stripped == "inputs:":
-                            current_action["has_inputs_block"] = True
-                            current_io = {"name": "inputs", "indent": indent}
-                            current_io_field = None
-                            continue
+                    if stripped.startswith("available when"):
+                        current_action["has_available_when"] = True
+                        current_action["available_when_count"] += 1
+                        continue
 
-                        if stripped == "outputs:":
-                            current_action["has_outputs_block"] = True
-                            current_io = {"name": "outputs", "indent": indent}
-                            current_io_field = None
-                            continue
+                    if stripped == "inputs:":
+                        current_action["has_inputs_block"] = True
+                        current_io = {"name": "inputs", "indent": indent}
+                        current_io_field = None
+                        continue
 
-                        if stripped.startswith("require_user_confirmation:"):
-                            value = self._clean_scalar_value(stripped.split(":", 1)[1].strip())
-                            if value == "True":
-                                current_action["require_user_confirmation_lines"].append(i)
-                            continue
+                    if stripped == "outputs:":
+                        current_action["has_outputs_block"] = True
+                        current_io = {"name": "outputs", "indent": indent}
+                        current_io_field = None
+                        continue
 
-                        if current_io and indent > current_io["indent"]:
-                            if current_io_field is None or indent == current_io_field["indent"]:
-                                field_match = self.IO_FIELD_PATTERN.match(self._strip_inline_comment(stripped))
-                                if field_match:
-                                    quoted_field_name, plain_field_name, field_type = field_match.groups()
-                                    field_name = quoted_field_name or plain_field_name
-                                    current_io_field = {
-                                        "name": field_name,
-                                        "type": field_type,
-                                        "indent": indent,
-                                        "section": current_io["name"],
-                                        "line": i,
-                                        "has_filter_from_agent": False,
-                                        "filter_from_agent_value": None,
-                                        "has_is_displayable": False,
-                                        "is_displayable_value": None,
-                                        "has_is_used_by_planner": False,
-                                        "is_used_by_planner_value": None,
-                                        "filter_from_agent_line": None,
-                                        "is_displayable_line": None,
-                                        "is_used_by_planner_line": None,
-                                    }
-                                    current_action["io_fields"].append(current_io_field)
-                                    if field_type == "date":
-                                        current_action["date_io_lines"].append((i, field_name, current_io["name"]))
-                                    if field_name in self.RESERVED_FIELD_NAMES:
-                                        current_action["reserved_io_field_lines"].append((i, field_name, current_io["name"]))
-                                    continue
-
-                            if current_io_field and indent > current_io_field["indent"]:
-                                if stripped.startswith("is_displayable:"):
-                                    value = self._clean_scalar_value(stripped.split(":", 1)[1].strip())
-                                    current_io_field["has_is_displayable"] = True
-                                    current_io_field["is_displayable_value"] = value
-                                    current_io_field["is_displayable_line"] = i
-                                    if value == "True":
-                                        current_action["prompt_output_display_lines"].append((i, current_io_field["name"]))
-                                if stripped.startswith("is_required:") and self._clean_scalar_value(stripped.split(":", 1)[1].strip()) == "True":
-                                    current_action["required_input_lines"].append((i, current_io_field["name"]))
-                                if stripped.startswith("filter_from_agent:"):
-                                    value = self._clean_scalar_value(stripped.split(":", 1)[1].strip())
-                                    current_io_field["has_filter_from_agent"] = True
-                                    current_io_field["filter_from_agent_value"] = value
-                                    current_io_field["filter_from_agent_line"] = i
-                                if stripped.startswith("is_used_by_planner:"):
-                                    value = self._clean_scalar_value(stripped.split(":", 1)[1].strip())
-                                    current_io_field["has_is_used_by_planner"] = True
-                                    current_io_field["is_used_by_planner_value"] = value
-                                    current_io_field["is_used_by_planner_line"] = i
+                    if stripped.startswith("require_user_confirmation:"):
+                        value = self._clean_scalar_value(stripped.split(":", 1)[1].strip())
+                        if value == "True":
+                            current_action["require_user_confirmation_lines"].append(i)
+                        continue
+
+                    if current_io and indent > current_io["indent"]:
+                        if current_io_field is None or indent == current_io_field["indent"]:
+                            field_match = self.IO_FIELD_PATTERN.match(self._strip_inline_comment(stripped))
+                            if field_match:
+                                quoted_field_name, plain_field_name, field_type = field_match.groups()
+                                field_name = quoted_field_name or plain_field_name
+                                current_io_field = {
+                                    "name": field_name,
+                                    "type": field_type,
+                                    "indent": indent,
+                                    "section": current_io["name"],
+                                    "line": i,
+                                    "has_filter_from_agent": False,
+                                    "filter_from_agent_value": None,
+                                    "has_is_displayable": False,
+                                    "is_displayable_value": None,
+                                    "has_is_used_by_planner": False,
+                                    "is_used_by_planner_value": None,
+                                    "filter_from_agent_line": None,
+                                    "is_displayable_line": None,
+                                    "is_used_by_planner_line": None,
+                                }
+                                current_action["io_fields"].append(current_io_field)
+                                if field_type == "date":
+                                    current_action["date_io_lines"].append((i, field_name, current_io["name"]))
+                                if field_name in self.RESERVED_FIELD_NAMES:
+                                    current_action["reserved_io_field_lines"].append((i, field_name, current_io["name"]))
                                 continue
 
-                        if current_action["kind"] == "utility_transition":
-                            property_name = stripped.split(":", 1)[0].strip()
-                            if property_name in self.INVALID_TRANSITION_PROPERTIES:
-                                current_action["invalid_transition_properties"].append((i, property_name))
+                        if current_io_field and indent > current_io_field["indent"]:
+                            if stripped.startswith("is_displayable:"):
+                                value = self._clean_scalar_value(stripped.split(":", 1)[1].strip())
+                                current_io_field["has_is_displayable"] = True
+                                current_io_field["is_displayable_value"] = value
+                                current_io_field["is_displayable_line"] = i
+                                if value == "True":
+                                    current_action["prompt_output_display_lines"].append((i, current_io_field["name"]))
+                            if stripped.startswith("is_required:") and self._clean_scalar_value(stripped.split(":", 1)[1].strip()) == "True":
+                                current_action["required_input_lines"].append((i, current_io_field["name"]))
+                            if stripped.startswith("filter_from_agent:"):
+                                value = self._clean_scalar_value(stripped.split(":", 1)[1].strip())
+                                current_io_field["has_filter_from_agent"] = True
+                                current_io_field["filter_from_agent_value"] = value
+                                current_io_field["filter_from_agent_line"] = i
+                            if stripped.startswith("is_used_by_planner:"):
+                                value = self._clean_scalar_value(stripped.split(":", 1)[1].strip())
+                                current_io_field["has_is_used_by_planner"] = True
+                                current_io_field["is_used_by_planner_value"] = value
+                                current_io_field["is_used_by_planner_line"] = i
                             continue
 
-                # topic/start-level descriptions/system overrides outside action contexts
-                if actions_mode is None and current_action is None:
-                    if stripped.startswith("description:"):
-                        desc_value = stripped.split(":", 1)[1].strip()
-                        if desc_value in {"", "|", ">", "|-", ">-", "|+", ">+"}:
-                            self.multiline_description_issues.append((i, current_top))
-                        else:
-                            self.block_descriptions.append(
-                                {
-                                    "name": current_block_name,
-                                    "kind": current_top,
-                                    "line": i,
-                                    "description": self._clean_scalar_value(desc_value),
-                                }
-                            )
+                    if current_action["kind"] == "utility_transition":
+                        property_name = stripped.split(":", 1)[0].strip()
+                        if property_name in self.INVALID_TRANSITION_PROPERTIES:
+                            current_action["invalid_transition_properties"].append((i, property_name))
                         continue
 
-                    if stripped.startswith("system:") and stripped != "system:":
-                        self.topic_inline_system_lines.append((i, current_block_name or current_top))
-                        continue
+            # topic/start-level descriptions/system overrides outside action contexts
+            if actions_mode is None and current_action is None:
+                if stripped.startswith("description:"):
+                    desc_value = stripped.split(":", 1)[1].strip()
+                    if desc_value in {"", "|", ">", "|-", ">-", "|+", ">+"}:
+                        self.multiline_description_issues.append((i, block.kind))
+                    else:
+                        self.block_descriptions.append(
+                            {
+                                "name": block.name,
+                                "kind": block.kind,
+                                "line": i,
+                                "description": self._clean_scalar_value(desc_value),
+                            }
+                        )
+                    continue
+
+                if stripped.startswith("system:") and stripped != "system:":
+                    self.topic_inline_system_lines.append((i, block.name or block.kind))
+                    continue
 
         # Check last IO field for filter/planner conflict before flush
         if current_io_field and current_io_field.get("has_filter_from_agent") and current_io_field.get("has_is_used_by_planner") and current_action:
@@ -835,66 +1088,61 @@ class AgentScriptValidator:
                 (current_io_field["is_used_by_planner_line"], current_io_field["name"], current_io_field["section"])
             )
         self._flush_action(current_action)
-        if current_connection:
-            self.connection_blocks.append(current_connection)
-
-    def validate(self) -> dict:
-        self._check_mixed_indentation()
-        self._check_boolean_case()
-        self._check_required_blocks()
-        self._check_config_fields()
-        self._check_start_agent_count()
-        self._check_name_collisions()
-        self._check_naming_rules()
-        self._check_invalid_connections_wrapper()
-        self._check_invalid_top_level_actions()
-        self._check_mutable_linked_conflict()
-        self._check_reserved_variable_names()
-        self._check_reserved_field_names()
-        self._check_linked_variable_defaults()
-        self._check_linked_variable_types()
-        self._check_undefined_variables()
-        self._check_undefined_topics()
-        self._check_multiline_descriptions()
-        self._check_topic_system_override_syntax()
-        self._check_lifecycle_instruction_wrappers()
-        self._check_lifecycle_pipe_content()
-        self._check_lifecycle_run_portability()
-        self._check_lifecycle_arithmetic_null_guard()
-        self._check_post_action_position()
-        self._check_empty_list_literals()
-        self._check_inputs_in_set()
-        self._check_bare_run_actions()
-        self._check_run_resolution_to_definition_scope()
-        self._check_action_metadata_context()
-        self._check_target_action_io_completeness()
-        self._check_multiple_available_when()
-        self._check_confirmation_runtime_gap()
-        self._check_prompt_output_displayability()
-        self._check_prompt_hidden_outputs_need_planner()
-        self._check_date_type_in_action_io()
-        self._check_filter_planner_conflict()
-        self._check_is_required_advisories()
-        self._check_user_input_string_matching()
-        self._check_string_method_portability()
-        self._check_structured_output_scalar_assignment()
-        self._check_invalid_else_if()
-        self._check_nested_if_blocks()
-        self._check_empty_conditional_bodies()
-        self._check_ellipsis_misuse()
-        self._check_connection_block_completeness()
-        self._check_agent_type_specific_patterns()
-        self._check_service_agent_user_in_org()
-        self._check_apex_target_existence()
-        self._check_service_agent_target_permissions()
-        self._check_connection_route_flow_readiness()
-        self._check_large_file_risk()
-        self._check_duplicate_descriptions()
-        self._check_transition_naming_conventions()
-        self._check_sensitive_actions_without_guards()
-        self._check_welcome_error_patterns()
-        self._check_escalation_fallback_heuristic()
-        self._check_platform_guardrail_topic_conflict()
+
+    _BLOCK_PARSERS = {
+        "config": _parse_config_block,
+        "variables": _parse_variables_block,
+        "connection": _parse_connection_block,
+        "system": _parse_system_block,
+        "topic": _parse_owner_block,
+        "start_agent": _parse_owner_block,
+    }
+
+    def validate(self, previous_state: Optional[Dict] = None) -> dict:
+        """Run every check, replaying findings from ``previous_state`` where the
+        blocks a check reads are unchanged. ``self.incremental_state`` holds the
+        state to persist for the next run."""
+        blocks = block_map(self.document)
+        reusable = self._reusable_findings(previous_state, blocks)
+        pending = [check for check in self.CHECK_ORDER if check not in reusable]
+
+        planned_queries = self._planned_org_queries() if self.ORG_CHECKS.intersection(pending) else []
+        if planned_queries:
+            self._prefetch_org_facts(planned_queries)
+
+        self._line_findings = {}
+        if any(check in self.LINE_RULES for check in pending):
+            self._scan_lines()
+
+        findings: Dict[str, List] = {}
+        for check in self.CHECK_ORDER:
+            errors_before, warnings_before = len(self.errors), len(self.warnings)
+            if check in reusable:
+                for severity, block_key, offset, message in reusable[check]:
+                    issues = self.errors if severity == "error" else self.warnings
+                    issues.append((relocate_line(blocks, block_key, offset), severity, message))
+            elif check in self._line_findings:
+                for severity, line_num, message, rule_id in self._line_findings[check]:
+                    if severity == "error":
+                        self._add_error(line_num, message, rule_id)
+                    else:
+                        self._add_warning(line_num, message, rule_id)
+            else:
+                getattr(self, f"_check_{check}")()
+
+            findings[check] = [
+                [severity, *locate_line(blocks, line_num), message]
+                for line_num, severity, message in self.errors[errors_before:] + self.warnings[warnings_before:]
+            ]
+
+        self._store_org_facts(planned_queries)
+        self.reused_checks = sorted(reusable)
+        self.incremental_state = {
+            "blocks": blocks,
+            "org": self.validation_org,
+            "checked_at": time.time(),
+            "findings": findings,
+        }
 
         return {
             "success": len(self.errors) == 0,
@@ -904,63 +1152,397 @@ class AgentScriptValidator:
             "checklist": self._build_checklist(),
         }
 
-    def _check_mixed_indentation(self):
-        has_tabs = False
-        has_spaces = False
-        tab_line = None
-        space_line = None
+    def _reusable_findings(self, previous_state: Optional[Dict], blocks: Dict[str, Dict]) -> Dict[str, List]:
+        """Stored findings for checks whose input blocks did not change."""
+        if not previous_state:
+            return {}
+        previous_blocks = previous_state.get("blocks") or {}
+        # File-level findings are reported on line 1; keep them there by only
+        # reusing findings while line 1 still opens the same block.
+        if locate_line(previous_blocks, 1) != locate_line(blocks, 1):
+            return {}
+        stored = previous_state.get("findings") or {}
+        changed = changed_groups(previous_blocks, blocks)
+        org_fresh = (
+            previous_state.get("org") == self.validation_org
+            and time.time() - previous_state.get("checked_at", 0) < self._org_cache.ttl_seconds
+        )
 
-        for i, line in enumerate(self.lines, 1):
-            leading = len(line) - len(line.lstrip())
-            if leading <= 0:
+        reusable: Dict[str, List] = {}
+        for check in self.CHECK_ORDER:
+            if check not in stored:
                 continue
-            leading_chars = line[:leading]
-            if "\t" in leading_chars:
-                has_tabs = True
-                if tab_line is None:
-                    tab_line = i
-            if " " in leading_chars:
-                has_spaces = True
-                if space_line is None:
-                    space_line = i
-
-        if has_tabs and has_spaces:
-            self._add_error(
-                tab_line or 1,
-                f"Mixed tabs and spaces detected. Tabs first seen on line {tab_line}, spaces first seen on line {space_line}. Use consistent indentation (all tabs OR all spaces).",
+            inputs = self.CHECK_INPUTS.get(check)
+            changed_inputs = changed if inputs is None else changed.intersection(inputs)
+            if changed_inputs:
+                continue
+            if check in self.ORG_CHECKS and (stored[check] or not org_fresh):
+                continue
+            reusable[check] = stored[check]
+        return reusable
+
+    def _scan_lines(self):
+        """Run the LINE_RULES visitors in one traversal of the token stream.
+
+        Structural _check_* methods are not part of this traversal. Findings
+        are buffered per rule and replayed by validate() in check order, so
+        issue ordering is independent of the traversal.
+        """
+        self._line_findings = {rule: [] for rule in self.LINE_RULES}
+        self._prepare_line_rules()
+
+        every_token = []
+        by_first_char: Dict[str, List] = {}
+        for rule, trigger in self.LINE_RULES.items():
+            visit = getattr(self, f"_visit_{rule}")
+            if trigger == "*":
+                every_token.append(visit)
+            else:
+                for char in trigger:
+                    by_first_char.setdefault(char, []).append(visit)
+
+        for token in self.tokens:
+            for visit in every_token:
+                visit(token)
+            if token.text:
+                for visit in by_first_char.get(token.text[0], ()):
+                    visit(token)
+
+        self._finish_line_rules()
+
+    def _line_issue(self, rule: str, severity: str, line_num: int, message: str, rule_id: str):
+        self._line_findings[rule].append((severity, line_num, message, rule_id))
+
+    def _prepare_line_rules(self):
+        # mixed_indentation
+        self._tab_line: Optional[int] = None
+        self._space_line: Optional[int] = None
+        # required_blocks
+        self._required_blocks = {"system": False, "config": False, "start_agent": False}
+        # post_action_position
+        self._in_instructions = False
+        self._seen_pipe_text = False
+        self._warned_in_block = False
+        # nested_if_blocks / empty_conditional_bodies
+        self._nested_if_stack: List[Dict] = []
+        self._open_conditionals: List[Dict] = []
+
+        # run_resolution_to_definition_scope
+        self._definition_actions: Dict[str, Dict[str, Dict]] = {}
+        self._reasoning_actions: Dict[str, Dict[str, Dict]] = {}
+        for action in self.action_definitions:
+            owner = action.get("owner") or ""
+            if action.get("scope") == "definition":
+                self._definition_actions.setdefault(owner, {})[action["name"]] = action
+            elif action.get("scope") == "reasoning":
+                self._reasoning_actions.setdefault(owner, {})[action["name"]] = action
+
+        # structured_output_scalar_assignment
+        self._structured_outputs_by_owner: Dict[str, Dict[str, List[Dict]]] = {}
+        for action in self.action_definitions:
+            if action.get("scope") != "definition":
+                continue
+            owner = action.get("owner") or ""
+            for field in action.get("io_fields", []):
+                if field.get("section") != "outputs":
+                    continue
+                field_type = (field.get("type") or "").lower()
+                if field_type == "object" or field_type.startswith("list["):
+                    self._structured_outputs_by_owner.setdefault(owner, {}).setdefault(field.get("name") or "", []).append(field)
+
+    def _finish_line_rules(self):
+        if self._tab_line is not None and self._space_line is not None:
+            self._line_issue(
+                "mixed_indentation",
+                "error",
+                self._tab_line or 1,
+                f"Mixed tabs and spaces detected. Tabs first seen on line {self._tab_line}, spaces first seen on line {self._space_line}. Use consistent indentation (all tabs OR all spaces).",
                 "ASV-STR-001",
             )
 
-    def _check_boolean_case(self):
-        assignment_pattern = re.compile(r"^\s*[A-Za-z_][A-Za-z0-9_:\- ]*\s*[:=]\s*(true|false)\s*(?:#.*)?$", re.IGNORECASE)
-        for i, line in enumerate(self.lines, 1):
-            match = assignment_pattern.match(line)
-            if not match:
-                continue
-            value = match.group(1)
-            if value.lower() == "true" and value != "True":
-                self._add_error(i, f"Boolean must be capitalized: use 'True' instead of '{value}'.", "ASV-STR-002")
-            elif value.lower() == "false" and value != "False":
-                self._add_error(i, f"Boolean must be capitalized: use 'False' instead of '{value}'.", "ASV-STR-002")
-
-    def _check_required_blocks(self):
-        required = {"system": False, "config": False, "start_agent": False}
-        for line in self.lines:
-            stripped = line.strip()
-            if stripped.startswith("system:"):
-                required["system"] = True
-            elif stripped.startswith("config:"):
-                required["config"] = True
-            elif stripped.startswith("start_agent "):
-                required["start_agent"] = True
-        missing = [name for name, present in required.items() if not present]
+        missing = [name for name, present in self._required_blocks.items() if not present]
         if missing:
-            self._add_error(
+            self._line_issue(
+                "required_blocks",
+                "error",
                 1,
                 f"Missing required blocks: {', '.join(missing)}. Every agent needs config, system, and exactly one start_agent.",
                 "ASV-STR-003",
             )
 
+        while self._open_conditionals:
+            self._close_conditional(self._open_conditionals.pop())
+
+    def _visit_mixed_indentation(self, token: Token):
+        raw = token.raw
+        leading = len(raw) - len(raw.lstrip())
+        if leading <= 0:
+            return
+        leading_chars = raw[:leading]
+        if self._tab_line is None and "\t" in leading_chars:
+            self._tab_line = token.line
+        if self._space_line is None and " " in leading_chars:
+            self._space_line = token.line
+
+    def _visit_boolean_case(self, token: Token):
+        match = self.BOOLEAN_ASSIGNMENT_PATTERN.match(token.raw)
+        if not match:
+            return
+        value = match.group(1)
+        if value.lower() == "true" and value != "True":
+            self._line_issue("boolean_case", "error", token.line, f"Boolean must be capitalized: use 'True' instead of '{value}'.", "ASV-STR-002")
+        elif value.lower() == "false" and value != "False":
+            self._line_issue("boolean_case", "error", token.line, f"Boolean must be capitalized: use 'False' instead of '{value}'.", "ASV-STR-002")
+
+    def _visit_required_blocks(self, token: Token):
+        stripped = token.text
+        if stripped.startswith("system:"):
+            self._required_blocks["system"] = True
+        elif stripped.startswith("config:"):
+            self._required_blocks["config"] = True
+        elif stripped.startswith("start_agent "):
+            self._required_blocks["start_agent"] = True
+
+    def _visit_invalid_connections_wrapper(self, token: Token):
+        if token.text == "connections:":
+            self._line_issue("invalid_connections_wrapper", "error", token.line, "Invalid top-level block 'connections:'. Use 'connection messaging:' (singular) instead.", "ASV-STR-007")
+
+    def _visit_mutable_linked_conflict(self, token: Token):
+        if self.MUTABLE_LINKED_PATTERN.search(token.raw):
+            self._line_issue(
+                "mutable_linked_conflict",
+                "error",
+                token.line,
+                "Variable cannot be both 'mutable' AND 'linked'. Use 'mutable' for changeable state and 'linked' for external read-only data.",
+                "ASV-STR-008",
+            )
+
+    def _visit_undefined_variables(self, token: Token):
+        stripped = token.text
+        if not stripped.startswith(self.EXECUTABLE_PREFIXES):
+            return
+        for name in self.VARIABLE_REF_PATTERN.findall(stripped):
+            if name not in self.variable_names:
+                self._line_issue("undefined_variables", "error", token.line, f"Reference to undefined variable '@variables.{name}'. Declare it in the variables block first.", "ASV-STR-010")
+
+    def _visit_undefined_topics(self, token: Token):
+        if "@topic." not in token.raw:
+            return
+        for name in self.TOPIC_REF_PATTERN.findall(token.raw):
+            if name not in self.defined_topics:
+                self._line_issue("undefined_topics", "error", token.line, f"Reference to undefined topic '@topic.{name}'. Define the topic or fix the reference.", "ASV-STR-011")
+
+    def _visit_post_action_position(self, token: Token):
+        stripped = token.text
+        if stripped.startswith("instructions:"):
+            self._in_instructions = True
+            self._seen_pipe_text = False
+            self._warned_in_block = False
+            return
+        if not self._in_instructions:
+            return
+        if stripped.startswith(("actions:", "topic ", "start_agent ", "before_reasoning:", "after_reasoning:")):
+            self._in_instructions = False
+            self._warned_in_block = False
+            return
+        if stripped.startswith("|"):
+            self._seen_pipe_text = True
+        if not self._warned_in_block and self._seen_pipe_text and stripped.startswith("if ") and "@variables." in stripped:
+            if any(token_name in stripped for token_name in ["_status", "_done", "_complete", "_processed"]):
+                self._line_issue(
+                    "post_action_position",
+                    "warning",
+                    token.line,
+                    "Post-action check appears after LLM instructions. Consider moving it to the top of instructions so it triggers on topic re-entry after action completion.",
+                    "ASV-QLT-005",
+                )
+                self._warned_in_block = True
+
+    def _visit_empty_list_literals(self, token: Token):
+        if "[]" not in token.raw:
+            return
+        if self.EMPTY_LIST_COMPARE_PATTERN.search(token.raw):
+            self._line_issue("empty_list_literals", "error", token.line, "Empty list literal '[]' is not supported in expressions. Use len(@variables.list) == 0 instead.", "ASV-RUN-001")
+        elif self.EMPTY_LIST_SET_PATTERN.search(token.raw):
+            self._line_issue("empty_list_literals", "error", token.line, "Resetting with 'set ... = []' is a known parser gotcha. Use a temporary empty variable workaround instead.", "ASV-RUN-001")
+
+    def _visit_inputs_in_set(self, token: Token):
+        if self.INPUTS_IN_SET_PATTERN.search(token.raw):
+            self._line_issue("inputs_in_set", "warning", token.line, "Using @inputs in set is a deploy-breaking anti-pattern. Capture input with @utils.setVariables or bind from @variables instead.", "ASV-RUN-002")
+
+    def _visit_bare_run_actions(self, token: Token):
+        match = self.BARE_RUN_PATTERN.search(token.raw)
+        if match:
+            self._line_issue("bare_run_actions", "error", token.line, f"Bare action name '{match.group(1)}' in run. Use '@actions.{match.group(1)}' explicitly.", "ASV-RUN-003")
+
+    def _visit_run_resolution_to_definition_scope(self, token: Token):
+        match = self.RUN_ACTION_PATTERN.match(token.text)
+        if not match:
+            return
+        i = token.line
+        action_name = match.group(1)
+        owner = self.line_owner.get(i)
+        if not owner:
+            return
+
+        definition_action = self._definition_actions.get(owner, {}).get(action_name)
+        reasoning_action = self._reasoning_actions.get(owner, {}).get(action_name)
+
+        if definition_action:
+            if not definition_action.get("target"):
+                kind = definition_action.get("kind") or "action"
+                self._line_issue(
+                    "run_resolution_to_definition_scope",
+                    "error",
+                    i,
+                    f"run @actions.{action_name} resolves to a non-target-backed '{kind}' action in '{owner}'. Deterministic 'run' only works for topic-level action definitions that declare 'target:'. Use direct 'set' / 'transition to', or let reasoning.actions invoke the utility/delegation instead.",
+                    "ASV-RUN-014",
+                )
+            return
+
+        if reasoning_action:
+            self._line_issue(
+                "run_resolution_to_definition_scope",
+                "error",
+                i,
+                f"run @actions.{action_name} resolves to a reasoning-only utility/delegation in '{owner}'. Deterministic 'run' only works for topic-level action definitions that declare 'target:'.",
+                "ASV-RUN-014",
+            )
+            return
+
+        available_targets = sorted(
+            action["name"]
+            for action in self._definition_actions.get(owner, {}).values()
+            if action.get("target")
+        )
+        available_suffix = (
+            f" Available deterministic targets in '{owner}': {', '.join(available_targets)}."
+            if available_targets
+            else ""
+        )
+        self._line_issue(
+            "run_resolution_to_definition_scope",
+            "error",
+            i,
+            f"run @actions.{action_name} does not resolve to a topic-level target-backed action definition in '{owner}'. Deterministic 'run' requires a topic-level action with 'target:'.{available_suffix}",
+            "ASV-RUN-014",
+        )
+
+    def _visit_user_input_string_matching(self, token: Token):
+        stripped = token.text
+        if not (stripped.startswith("if ") or stripped.startswith("available when")):
+            return
+        if "@system_variables.user_input" not in stripped:
+            return
+        if self.STRING_METHOD_PATTERN.search(stripped):
+            self._line_issue(
+                "user_input_string_matching",
+                "warning",
+                token.line,
+                "Raw '@system_variables.user_input' substring/prefix matching is brittle for deterministic routing. Normalize the utterance with Flow/Apex/classifier logic first, then branch on an explicit boolean or enum.",
+                "ASV-RUN-023",
+            )
+
+    def _visit_string_method_portability(self, token: Token):
+        stripped = token.text
+        if not (stripped.startswith("if ") or stripped.startswith("available when")):
+            return
+        if "@system_variables.user_input" in stripped:
+            return
+        if self.STRING_METHOD_PATTERN.search(stripped):
+            self._line_issue(
+                "string_method_portability",
+                "warning",
+                token.line,
+                "String-method guards (`contains` / `startswith` / `endswith`) are not portable enough for control-flow-critical validation. Prefer a Flow/Apex/classifier action that returns an explicit scalar when routing or policy depends on the result.",
+                "ASV-RUN-024",
+            )
+
+    def _visit_structured_output_scalar_assignment(self, token: Token):
+        match = self.OUTPUT_ASSIGNMENT_PATTERN.match(token.raw)
+        if not match:
+            return
+        i = token.line
+        variable_name, output_name = match.groups()
+        owner = self.line_owner.get(i)
+        if not owner:
+            return
+
+        structured_fields = self._structured_outputs_by_owner.get(owner, {}).get(output_name, [])
+        if not structured_fields:
+            return
+
+        variable_def = self.variable_by_name.get(variable_name)
+        if not variable_def:
+            return
+        variable_type = (variable_def.get("type") or "").lower()
+        if variable_type == "object" or variable_type.startswith("list["):
+            return
+
+        structured_type = structured_fields[0].get("type") or "object"
+        self._line_issue(
+            "structured_output_scalar_assignment",
+            "warning",
+            i,
+            f"@outputs.{output_name} is declared as '{structured_type}' in '{owner}', but it is being assigned directly to scalar variable '@variables.{variable_name}' ({variable_type}). Do not assume structured outputs are scalars; access a concrete field (for example '@outputs.{output_name}.value' only if the schema exposes 'value') or flatten the output in Flow/Apex first.",
+            "ASV-RUN-026",
+        )
+
+    def _visit_invalid_else_if(self, token: Token):
+        if self.ELSE_IF_PATTERN.search(token.raw):
+            self._line_issue("invalid_else_if", "error", token.line, "'else if' is not supported. Use a compound condition or flatten the logic into sequential if blocks.", "ASV-STR-015")
+
+    def _visit_nested_if_blocks(self, token: Token):
+        if not token.is_code:
+            return
+        stack = self._nested_if_stack
+        indent = token.indent
+        while stack and indent <= stack[-1]["indent"]:
+            stack.pop()
+        if self.CONDITIONAL_START_PATTERN.match(token.raw):
+            if stack and indent > stack[-1]["indent"]:
+                self._line_issue("nested_if_blocks", "error", token.line, "Nested 'if' blocks are not supported in Agent Script. Use compound predicates or flatten the logic.", "ASV-STR-016")
+            stack.append({"indent": indent, "line": token.line})
+
+    def _close_conditional(self, block: Dict):
+        if not block["has_body"]:
+            self._line_issue(
+                "empty_conditional_bodies",
+                "error",
+                block["line"],
+                f"{block['kind']} block has no executable body. Add '|' text, 'set', 'run', or 'transition to' under the block.",
+                "ASV-STR-014",
+            )
+
+    def _visit_empty_conditional_bodies(self, token: Token):
+        blocks = self._open_conditionals
+        stripped = token.text
+        indent = token.indent
+
+        while blocks and indent <= blocks[-1]["indent"] and stripped:
+            self._close_conditional(blocks.pop())
+
+        if not token.is_code:
+            return
+
+        if self.CONDITIONAL_START_PATTERN.match(token.raw):
+            kind = "else" if stripped.startswith("else:") else "if"
+            blocks.append({"line": token.line, "indent": indent, "kind": kind, "has_body": False})
+            return
+
+        for block in blocks:
+            if indent > block["indent"]:
+                block["has_body"] = True
+
+    def _visit_ellipsis_misuse(self, token: Token):
+        if "..." not in token.raw:
+            return
+        stripped = token.text
+        if self.VALID_WITH_ELLIPSIS_PATTERN.match(stripped):
+            return
+        if self.INVALID_ELLIPSIS_PATTERN.search(stripped):
+            self._line_issue("ellipsis_misuse", "error", token.line, "'...' is slot-filling syntax only. Use it in 'with param=...' bindings, not in variable declarations or general expressions.", "ASV-STR-020")
+
     def _check_config_fields(self):
         developer_name = self.config_fields.get("developer_name")
         legacy_agent_name = self.config_fields.get("agent_name")
@@ -1096,25 +1678,10 @@ class AgentScriptValidator:
         for name, line in self.variable_names.items():
             self._check_name_rules(name, line, "variable name")
 
-    def _check_invalid_connections_wrapper(self):
-        for i, line in enumerate(self.lines, 1):
-            if line.strip() == "connections:":
-                self._add_error(i, "Invalid top-level block 'connections:'. Use 'connection messaging:' (singular) instead.", "ASV-STR-007")
-
     def _check_invalid_top_level_actions(self):
         for line in self.top_level_actions_lines:
             self._add_error(line, "Top-level 'actions:' blocks are not valid. Define actions inside a topic or start_agent block only.", "ASV-STR-017")
 
-    def _check_mutable_linked_conflict(self):
-        pattern = re.compile(r"mutable\s+linked|linked\s+mutable", re.IGNORECASE)
-        for i, line in enumerate(self.lines, 1):
-            if pattern.search(line):
-                self._add_error(
-                    i,
-                    "Variable cannot be both 'mutable' AND 'linked'. Use 'mutable' for changeable state and 'linked' for external read-only data.",
-                    "ASV-STR-008",
-                )
-
     def _check_reserved_variable_names(self):
         for name, line in self.variable_names.items():
             if name in self.RESERVED_CONTEXT_VARIABLE_NAMES:
@@ -1162,24 +1729,6 @@ class AgentScriptValidator:
                     "ASV-STR-019",
                 )
 
-    def _check_undefined_variables(self):
-        ref_pattern = re.compile(r"@variables\.([A-Za-z_][A-Za-z0-9_]*)")
-        executable_prefixes = ("|", "if ", "set ", "run ", "with ", "available when", "transition to ")
-        for i, line in enumerate(self.lines, 1):
-            stripped = line.strip()
-            if not stripped.startswith(executable_prefixes):
-                continue
-            for name in ref_pattern.findall(stripped):
-                if name not in self.variable_names:
-                    self._add_error(i, f"Reference to undefined variable '@variables.{name}'. Declare it in the variables block first.", "ASV-STR-010")
-
-    def _check_undefined_topics(self):
-        ref_pattern = re.compile(r"@topic\.([A-Za-z][A-Za-z0-9_]*)")
-        for i, line in enumerate(self.lines, 1):
-            for name in ref_pattern.findall(line):
-                if name not in self.defined_topics:
-                    self._add_error(i, f"Reference to undefined topic '@topic.{name}'. Define the topic or fix the reference.", "ASV-STR-011")
-
     def _check_multiline_descriptions(self):
         for line, block_kind in self.multiline_description_issues:
             self._add_warning(
@@ -1239,112 +1788,6 @@ class AgentScriptValidator:
                         "ASV-RUN-021",
                     )
 
-    def _check_post_action_position(self):
-        in_instructions = False
-        seen_pipe_text = False
-        warned_in_block = False
-        for i, line in enumerate(self.lines, 1):
-            stripped = line.strip()
-            if stripped.startswith("instructions:"):
-                in_instructions = True
-                seen_pipe_text = False
-                warned_in_block = False
-                continue
-            if in_instructions:
-                if stripped.startswith(("actions:", "topic ", "start_agent ", "before_reasoning:", "after_reasoning:")):
-                    in_instructions = False
-                    warned_in_block = False
-                    continue
-                if stripped.startswith("|"):
-                    seen_pipe_text = True
-                if not warned_in_block and seen_pipe_text and stripped.startswith("if ") and "@variables." in stripped:
-                    if any(token in stripped for token in ["_status", "_done", "_complete", "_processed"]):
-                        self._add_warning(
-                            i,
-                            "Post-action check appears after LLM instructions. Consider moving it to the top of instructions so it triggers on topic re-entry after action completion.",
-                            "ASV-QLT-005",
-                        )
-                        warned_in_block = True
-
-    def _check_empty_list_literals(self):
-        compare_pattern = re.compile(r"^\s*if\s+.*(?:==|!=)\s*\[\]\s*:?\s*(?:#.*)?$")
-        set_pattern = re.compile(r"^\s*set\s+.+?=\s*\[\]\s*(?:#.*)?$")
-        for i, line in enumerate(self.lines, 1):
-            if compare_pattern.search(line):
-                self._add_error(i, "Empty list literal '[]' is not supported in expressions. Use len(@variables.list) == 0 instead.", "ASV-RUN-001")
-            elif set_pattern.search(line):
-                self._add_error(i, "Resetting with 'set ... = []' is a known parser gotcha. Use a temporary empty variable workaround instead.", "ASV-RUN-001")
-
-    def _check_inputs_in_set(self):
-        pattern = re.compile(r"^\s*set\s+@variables\.[^=]+\s*=\s*@inputs\.")
-        for i, line in enumerate(self.lines, 1):
-            if pattern.search(line):
-                self._add_warning(i, "Using @inputs in set is a deploy-breaking anti-pattern. Capture input with @utils.setVariables or bind from @variables instead.", "ASV-RUN-002")
-
-    def _check_bare_run_actions(self):
-        pattern = re.compile(r"^\s*run\s+([A-Za-z_][A-Za-z0-9_]*)\s*(?:#.*)?$")
-        for i, line in enumerate(self.lines, 1):
-            match = pattern.search(line)
-            if match:
-                self._add_error(i, f"Bare action name '{match.group(1)}' in run. Use '@actions.{match.group(1)}' explicitly.", "ASV-RUN-003")
-
-    def _check_run_resolution_to_definition_scope(self):
-        definition_actions: Dict[str, Dict[str, Dict]] = {}
-        reasoning_actions: Dict[str, Dict[str, Dict]] = {}
-        for action in self.action_definitions:
-            owner = action.get("owner") or ""
-            if action.get("scope") == "definition":
-                definition_actions.setdefault(owner, {})[action["name"]] = action
-            elif action.get("scope") == "reasoning":
-                reasoning_actions.setdefault(owner, {})[action["name"]] = action
-
-        pattern = re.compile(r"^\s*run\s+@actions\.([A-Za-z_][A-Za-z0-9_]*)\b")
-        for i, line in enumerate(self.lines, 1):
-            match = pattern.match(line.strip())
-            if not match:
-                continue
-            action_name = match.group(1)
-            owner = self.line_owner.get(i)
-            if not owner:
-                continue
-
-            definition_action = definition_actions.get(owner, {}).get(action_name)
-            reasoning_action = reasoning_actions.get(owner, {}).get(action_name)
-
-            if definition_action:
-                if not definition_action.get("target"):
-                    kind = definition_action.get("kind") or "action"
-                    self._add_error(
-                        i,
-                        f"run @actions.{action_name} resolves to a non-target-backed '{kind}' action in '{owner}'. Deterministic 'run' only works for topic-level action definitions that declare 'target:'. Use direct 'set' / 'transition to', or let reasoning.actions invoke the utility/delegation instead.",
-                        "ASV-RUN-014",
-                    )
-                continue
-
-            if reasoning_action:
-                self._add_error(
-                    i,
-                    f"run @actions.{action_name} resolves to a reasoning-only utility/delegation in '{owner}'. Deterministic 'run' only works for topic-level action definitions that declare 'target:'.",
-                    "ASV-RUN-014",
-                )
-                continue
-
-            available_targets = sorted(
-                action["name"]
-                for action in definition_actions.get(owner, {}).values()
-                if action.get("target")
-            )
-            available_suffix = (
-                f" Available deterministic targets in '{owner}': {', '.join(available_targets)}."
-                if available_targets
-                else ""
-            )
-            self._add_error(
-                i,
-                f"run @actions.{action_name} does not resolve to a topic-level target-backed action definition in '{owner}'. Deterministic 'run' requires a topic-level action with 'target:'.{available_suffix}",
-                "ASV-RUN-014",
-            )
-
     def _check_action_metadata_context(self):
         for action in self.action_definitions:
             if action["kind"] != "utility_transition":
@@ -1453,148 +1896,6 @@ class AgentScriptValidator:
                     "ASV-RUN-007",
                 )
 
-    def _check_user_input_string_matching(self):
-        for i, line in enumerate(self.lines, 1):
-            stripped = line.strip()
-            if not (stripped.startswith("if ") or stripped.startswith("available when")):
-                continue
-            if "@system_variables.user_input" not in stripped:
-                continue
-            if re.search(r"\b(contains|startswith|endswith)\b", stripped):
-                self._add_warning(
-                    i,
-                    "Raw '@system_variables.user_input' substring/prefix matching is brittle for deterministic routing. Normalize the utterance with Flow/Apex/classifier logic first, then branch on an explicit boolean or enum.",
-                    "ASV-RUN-023",
-                )
-
-    def _check_string_method_portability(self):
-        for i, line in enumerate(self.lines, 1):
-            stripped = line.strip()
-            if not (stripped.startswith("if ") or stripped.startswith("available when")):
-                continue
-            if "@system_variables.user_input" in stripped:
-                continue
-            if re.search(r"\b(contains|startswith|endswith)\b", stripped):
-                self._add_warning(
-                    i,
-                    "String-method guards (`contains` / `startswith` / `endswith`) are not portable enough for control-flow-critical validation. Prefer a Flow/Apex/classifier action that returns an explicit scalar when routing or policy depends on the result.",
-                    "ASV-RUN-024",
-                )
-
-    def _check_structured_output_scalar_assignment(self):
-        structured_outputs_by_owner: Dict[str, Dict[str, List[Dict]]] = {}
-        for action in self.action_definitions:
-            if action.get("scope") != "definition":
-                continue
-            owner = action.get("owner") or ""
-            for field in action.get("io_fields", []):
-                if field.get("section") != "outputs":
-                    continue
-                field_type = (field.get("type") or "").lower()
-                if field_type == "object" or field_type.startswith("list["):
-                    structured_outputs_by_owner.setdefault(owner, {}).setdefault(field.get("name") or "", []).append(field)
-
-        assignment_pattern = re.compile(
-            r"^\s*set\s+@variables\.([A-Za-z_][A-Za-z0-9_]*)\s*=\s*@outputs\.([A-Za-z_][A-Za-z0-9_]*)(?![\.\[])",
-        )
-
-        for i, line in enumerate(self.lines, 1):
-            match = assignment_pattern.match(line)
-            if not match:
-                continue
-            variable_name, output_name = match.groups()
-            owner = self.line_owner.get(i)
-            if not owner:
-                continue
-
-            structured_fields = structured_outputs_by_owner.get(owner, {}).get(output_name, [])
-            if not structured_fields:
-                continue
-
-            variable_def = self.variable_by_name.get(variable_name)
-            if not variable_def:
-                continue
-            variable_type = (variable_def.get("type") or "").lower()
-            if variable_type == "object" or variable_type.startswith("list["):
-                continue
-
-            structured_type = structured_fields[0].get("type") or "object"
-            self._add_warning(
-                i,
-                f"@outputs.{output_name} is declared as '{structured_type}' in '{owner}', but it is being assigned directly to scalar variable '@variables.{variable_name}' ({variable_type}). Do not assume structured outputs are scalars; access a concrete field (for example '@outputs.{output_name}.value' only if the schema exposes 'value') or flatten the output in Flow/Apex first.",
-                "ASV-RUN-026",
-            )
-
-    def _check_invalid_else_if(self):
-        pattern = re.compile(r"^\s*else\s+if\b")
-        for i, line in enumerate(self.lines, 1):
-            if pattern.search(line):
-                self._add_error(i, "'else if' is not supported. Use a compound condition or flatten the logic into sequential if blocks.", "ASV-STR-015")
-
-    def _check_nested_if_blocks(self):
-        stack: List[Dict] = []
-        conditional_start = re.compile(r"^\s*(if\b.*:|else:)\s*(?:#.*)?$")
-        for i, line in enumerate(self.lines, 1):
-            stripped = line.strip()
-            if not stripped or stripped.startswith("#"):
-                continue
-            indent = self._indent(line)
-            while stack and indent <= stack[-1]["indent"]:
-                stack.pop()
-            if conditional_start.match(line):
-                if stack and indent > stack[-1]["indent"]:
-                    self._add_error(i, "Nested 'if' blocks are not supported in Agent Script. Use compound predicates or flatten the logic.", "ASV-STR-016")
-                stack.append({"indent": indent, "line": i})
-
-    def _check_empty_conditional_bodies(self):
-        blocks: List[Dict] = []
-        conditional_start = re.compile(r"^\s*(if\b.*:|else:)\s*(?:#.*)?$")
-        for i, line in enumerate(self.lines, 1):
-            stripped = line.strip()
-            indent = self._indent(line)
-
-            while blocks and indent <= blocks[-1]["indent"] and stripped:
-                block = blocks.pop()
-                if not block["has_body"]:
-                    self._add_error(
-                        block["line"],
-                        f"{block['kind']} block has no executable body. Add '|' text, 'set', 'run', or 'transition to' under the block.",
-                        "ASV-STR-014",
-                    )
-
-            if not stripped or stripped.startswith("#"):
-                continue
-
-            if conditional_start.match(line):
-                kind = "else" if stripped.startswith("else:") else "if"
-                blocks.append({"line": i, "indent": indent, "kind": kind, "has_body": False})
-                continue
-
-            for block in blocks:
-                if indent > block["indent"]:
-                    block["has_body"] = True
-
-        while blocks:
-            block = blocks.pop()
-            if not block["has_body"]:
-                self._add_error(
-                    block["line"],
-                    f"{block['kind']} block has no executable body. Add '|' text, 'set', 'run', or 'transition to' under the block.",
-                    "ASV-STR-014",
-                )
-
-    def _check_ellipsis_misuse(self):
-        valid_with_pattern = re.compile(r"^\s*with\s+(?:\"[^\"]+\"|[A-Za-z_][A-Za-z0-9_]*)\s*=\s*\.\.\.\s*(?:#.*)?$")
-        invalid_pattern = re.compile(r"(?:=|:)\s*\.\.\.\s*(?:#.*)?$")
-        for i, line in enumerate(self.lines, 1):
-            if "..." not in line:
-                continue
-            stripped = line.strip()
-            if valid_with_pattern.match(stripped):
-                continue
-            if invalid_pattern.search(stripped):
-                self._add_error(i, "'...' is slot-filling syntax only. Use it in 'with param=...' bindings, not in variable declarations or general expressions.", "ASV-STR-020")
-
     def _check_connection_block_completeness(self):
         for block in self.connection_blocks:
             channel = block.get("channel")
@@ -1784,7 +2085,7 @@ class AgentScriptValidator:
             if apex_targets and permset_id:
                 apex_query = self._query_apex_classes([name for name, _, _ in apex_targets])
                 apex_by_name = {record.get("Name"): record for record in (apex_query.get("records") or [])} if apex_query.get("ok") else {}
-                access_query = self._query_setup_entity_access(permset_id, [record.get("Id") for record in apex_by_name.values()], "ApexClass") if apex_by_name else {"ok": True, "records": []}
+                access_query = self._query_setup_entity_access(custom_permset_name, [name for name, _, _ in apex_targets]) if apex_by_name else {"ok": True, "records": []}
                 access_by_id = {record.get("SetupEntityId"): record for record in (access_query.get("records") or [])} if access_query.get("ok") else {}
                 for apex_name, line, raw_target in apex_targets:
                     apex_record = apex_by_name.get(apex_name)
@@ -1864,10 +2165,10 @@ class AgentScriptValidator:
                 self._add_error(line, f"Connection route Flow '{raw_target}' exists in '{self.validation_org}' but has no active version. Activate it before publish.", "ASV-ORG-007")
 
     def _check_large_file_risk(self):
-        if len(self.lines) > self.LARGE_FILE_LIMITS["lines"] or len(self.topic_names) > self.LARGE_FILE_LIMITS["topics"] or len(self.action_definitions) > self.LARGE_FILE_LIMITS["actions"]:
+        if len(self.tokens) > self.LARGE_FILE_LIMITS["lines"] or len(self.topic_names) > self.LARGE_FILE_LIMITS["topics"] or len(self.action_definitions) > self.LARGE_FILE_LIMITS["actions"]:
             self._add_warning(
                 1,
-                f"Agent size is high ({len(self.lines)} lines, {len(self.topic_names)} topics, {len(self.action_definitions)} actions). Large/complex .agent files are more likely to hit parser instability or authoring drift.",
+                f"Agent size is high ({len(self.tokens)} lines, {len(self.topic_names)} topics, {len(self.action_definitions)} actions). Large/complex .agent files are more likely to hit parser instability or authoring drift.",
                 "ASV-RUN-019",
             )
 
@@ -1979,14 +2280,6 @@ class AgentScriptValidator:
                 if pattern in topic_lower:
                     conflicting_topics.append((topic_name, line_num, platform_name))
 
-        # Also check for transition actions in start_agent that route to guardrail topics
-        guardrail_transitions = []
-        for i, line in enumerate(self.lines, 1):
-            stripped = line.strip()
-            for pattern in platform_guardrail_patterns:
-                if f"@topic." in stripped and pattern in stripped.lower() and "transition" in stripped.lower():
-                    guardrail_transitions.append((i, stripped))
-
         if conflicting_topics:
             topic_list = ", ".join(f"'{t[0]}' (line {t[1]}, conflicts with {t[2]})" for t in conflicting_topics)
             self._add_warning(
@@ -2076,6 +2369,31 @@ class AgentScriptValidator:
         ]
 
 
+def prefetch_shared_org_facts(validators: List[AgentScriptValidator]) -> Dict[str, Dict[str, Dict]]:
+    """Run each distinct org lookup needed by many files once per org.
+
+    Returns query results keyed by org then SOQL, ready for
+    ``AgentScriptValidator.seed_org_facts()`` in the validating process.
+    """
+    by_org: Dict[str, Tuple[AgentScriptValidator, Dict[str, object]]] = {}
+    for validator in validators:
+        if not validator.validation_org:
+            continue
+        _, planned = by_org.setdefault(validator.validation_org, (validator, {}))
+        for soql, is_cacheable in validator._planned_org_queries():
+            planned.setdefault(soql, is_cacheable)
+
+    facts: Dict[str, Dict[str, Dict]] = {}
+    for org, (lead, planned) in by_org.items():
+        items = list(planned.items())
+        lead._prefetch_org_facts(items)
+        for soql, _ in items:
+            lead._run_soql_query(soql)
+        lead._store_org_facts(items)
+        facts[org] = {soql: lead._query_cache[soql] for soql, _ in items}
+    return facts
+
+
 def format_output(result: dict) -> str:
     lines = []
     file_name = Path(result["file_path"]).name
@@ -2157,8 +2475,14 @@ def main():
         print(f"⚠️ Could not read {file_path}: {exc}")
         sys.exit(0)
 
+    state_store = ValidationStateStore()
+    fingerprint = validator_fingerprint(
+        os.path.abspath(__file__),
+        os.path.join(SCRIPT_DIR, "agentscript_ast.py"),
+    )
     validator = AgentScriptValidator(content, file_path)
-    result = validator.validate()
+    result = validator.validate(previous_state=state_store.load(file_path, fingerprint))
+    state_store.save(file_path, fingerprint, validator.incremental_state)
     output = format_output(result)
     if output:
         print(output)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Agent Script Tokenizer and AST
+==============================
+
+Single-pass lexical model for .agent files. ``parse()`` tokenizes the source
+once (line number, raw text, expanded indent, stripped text, token kind) and
+builds an indentation tree of typed nodes with source spans on top of it.
+
+The syntax validator consumes this model instead of re-splitting and
+re-indenting ``content`` in every check, and other tooling that needs Agent
+Script structure without the LSP (asset profiling, bulk validation) can import
+it directly:
+
+    from agentscript_ast import parse
+    document = parse(content)
+    for topic in document.blocks("topic"):
+        print(topic.name, topic.start_line, topic.end_line)
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+TOKEN_BLANK = "blank"
+TOKEN_COMMENT = "comment"
+TOKEN_CODE = "code"
+
+# Exact top-level headers recognised by the compiler (trailing text such as an
+# inline comment makes the header unrecognised, matching compiler behaviour).
+TOP_LEVEL_HEADERS = {
+    "config:": "config",
+    "variables:": "variables",
+    "knowledge:": "knowledge",
+    "language:": "language",
+    "system:": "system",
+    "connections:": "connections",
+    "actions:": "actions",
+}
+
+CONNECTION_HEADER_PATTERN = re.compile(r"^connection\s+([A-Za-z_][A-Za-z0-9_]*)\s*:")
+BLOCK_HEADER_PATTERN = re.compile(r"^(topic|start_agent)\s+([A-Za-z][A-Za-z0-9_]*)\s*:")
+
+# Nested header kinds, checked in order against the stripped line.
+NESTED_HEADERS = {
+    "reasoning:": "reasoning",
+    "actions:": "actions",
+    "inputs:": "inputs",
+    "outputs:": "outputs",
+    "before_reasoning:": "before_reasoning",
+    "after_reasoning:": "after_reasoning",
+    "else:": "else",
+}
+STATEMENT_PREFIXES = (
+    ("|", "pipe"),
+    ("if ", "if"),
+    ("run ", "run"),
+    ("set ", "set"),
+    ("transition to ", "transition"),
+    ("with ", "with"),
+    ("available when", "available_when"),
+    ("instructions:", "instructions"),
+)
+KEY_VALUE_PATTERN = re.compile(r"^([A-Za-z_][A-Za-z0-9_:]*)\s*:\s*(.*)$")
+
+OWNER_KINDS = {"topic", "start_agent"}
+
+
+class Token(NamedTuple):
+    """One source line with its indentation resolved."""
+
+    line: int
+    raw: str
+    indent: int
+    text: str
+    kind: str
+
+    @property
+    def is_code(self) -> bool:
+        return self.kind == TOKEN_CODE
+
+
+@dataclass
+class Node:
+    """A code line and everything indented beneath it."""
+
+    kind: str
+    token: Optional[Token]
+    name: Optional[str] = None
+    start_line: int = 0
+    end_line: int = 0
+    parent: Optional["Node"] = field(default=None, repr=False)
+    children: List["Node"] = field(default_factory=list, repr=False)
+
+    @property
+    def text(self) -> str:
+        return self.token.text if self.token else ""
+
+    @property
+    def indent(self) -> int:
+        return self.token.indent if self.token else -1
+
+    def walk(self) -> Iterator["Node"]:
+        """Pre-order traversal of this node's descendants (excluding itself)."""
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def ancestors(self) -> Iterator["Node"]:
+        node = self.parent
+        while node is not None and node.token is not None:
+            yield node
+            node = node.parent
+
+
+@dataclass
+class AgentScriptDocument:
+    """Tokens plus the indentation tree for one .agent file."""
+
+    tokens: List[Token]
+    root: Node
+    owners: Dict[int, str]
+
+    def blocks(self, kind: Optional[str] = None) -> List[Node]:
+        """Top-level (column 0) blocks, optionally filtered by kind.
+
+        Indented lines with no enclosing top-level header, as found in partial
+        snippets, hang off the root too but are not blocks.
+        """
+        return [
+            node for node in self.root.children
+            if node.indent == 0 and (kind is None or node.kind == kind)
+        ]
+
+    def owner_of(self, line: int) -> Optional[str]:
+        """Name of the topic/start_agent block enclosing a line, if any."""
+        return self.owners.get(line)
+
+
+def indent_width(raw_line: str) -> int:
+    expanded = raw_line.expandtabs(4)
+    return len(expanded) - len(expanded.lstrip(" "))
+
+
+def tokenize(content: str) -> List[Token]:
+    tokens: List[Token] = []
+    for number, raw in enumerate(content.split("\n"), 1):
+        text = raw.strip()
+        if not text:
+            kind = TOKEN_BLANK
+        elif text.startswith("#"):
+            kind = TOKEN_COMMENT
+        else:
+            kind = TOKEN_CODE
+        tokens.append(Token(number, raw, indent_width(raw), text, kind))
+    return tokens
+
+
+def _classify_top_level(text: str) -> tuple:
+    if text in TOP_LEVEL_HEADERS:
+        return TOP_LEVEL_HEADERS[text], None
+    connection_match = CONNECTION_HEADER_PATTERN.match(text)
+    if connection_match:
+        return "connection", connection_match.group(1)
+    block_match = BLOCK_HEADER_PATTERN.match(text)
+    if block_match:
+        return block_match.group(1), block_match.group(2)
+    return "unknown", None
+
+
+def _classify_nested(text: str) -> str:
+    if text in NESTED_HEADERS:
+        return NESTED_HEADERS[text]
+    for prefix, kind in STATEMENT_PREFIXES:
+        if text.startswith(prefix):
+            return kind
+    if KEY_VALUE_PATTERN.match(text):
+        return "key_value"
+    return "statement"
+
+
+def build_tree(tokens: List[Token]) -> AgentScriptDocument:
+    """Build the indentation tree and line-owner map in one pass over tokens."""
+    root = Node(kind="document", token=None, start_line=1, end_line=len(tokens))
+    stack: List[Node] = [root]
+    owners: Dict[int, str] = {}
+    current_owner: Optional[str] = None
+    last_code_line = 0
+
+    for token in tokens:
+        if token.is_code:
+            while len(stack) > 1 and token.indent <= stack[-1].indent:
+                stack.pop().end_line = last_code_line
+
+            if token.indent == 0:
+                kind, name = _classify_top_level(token.text)
+                current_owner = name if kind in OWNER_KINDS else None
+            else:
+                kind, name = _classify_nested(token.text), None
+
+            parent = stack[-1]
+            node = Node(kind=kind, token=token, name=name, start_line=token.line, parent=parent)
+            parent.children.append(node)
+            stack.append(node)
+            last_code_line = token.line
+
+        if current_owner:
+            owners[token.line] = current_owner
+
+    while len(stack) > 1:
+        stack.pop().end_line = last_code_line
+
+    return AgentScriptDocument(tokens=tokens, root=root, owners=owners)
+
+
+def parse(content: str) -> AgentScriptDocument:
+    return build_tree(tokenize(content))
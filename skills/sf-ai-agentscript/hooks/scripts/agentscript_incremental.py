@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Agent Script Incremental Validation State
+=========================================
+
+Per-file block map persisted between validator runs so a save that touches
+one topic only re-runs the checks that read it.
+
+``block_map()`` splits a parsed document into its top-level blocks (config,
+variables, system, each connection, each topic/start_agent) with a content
+hash per block. The validator declares which block groups each check reads;
+when none of those groups changed since the previous run, the check's stored
+findings are replayed, with line numbers moved along with their block.
+
+State lives in ``~/.claude/cache/agentscript-blocks/`` as one JSON file per
+.agent path and is invalidated whenever the validator source changes.
+
+Environment:
+    AGENTSCRIPT_INCREMENTAL     Set to 0 to always run every check
+    AGENTSCRIPT_STATE_DIR       State directory override
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+STATE_VERSION = 1
+DEFAULT_STATE_DIR = Path.home() / ".claude" / "cache" / "agentscript-blocks"
+PREAMBLE_KEY = "(preamble)"
+
+# Block kinds folded into the groups checks declare as inputs.
+BLOCK_GROUPS = {
+    "config": "config",
+    "variables": "variables",
+    "system": "system",
+    "topic": "topics",
+    "start_agent": "topics",
+    "connection": "connections",
+    "connections": "connections",
+}
+
+
+def block_group(kind: str) -> str:
+    return BLOCK_GROUPS.get(kind, "other")
+
+
+def block_map(document) -> Dict[str, Dict]:
+    """Top-level blocks keyed by kind/name, with line spans and content hashes.
+
+    A block spans from its header to the line before the next top-level
+    header, so trailing comments and blank lines belong to it.
+    """
+    tokens = document.tokens
+    blocks = document.blocks()
+    spans: List[Tuple[str, str, int, int]] = []
+    first_start = blocks[0].start_line if blocks else len(tokens) + 1
+    if first_start > 1:
+        spans.append((PREAMBLE_KEY, "preamble", 1, first_start - 1))
+
+    seen: Dict[str, int] = {}
+    for index, block in enumerate(blocks):
+        key = f"{block.kind}:{block.name}" if block.name else block.kind
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] > 1:
+            key = f"{key}#{seen[key]}"
+        end = blocks[index + 1].start_line - 1 if index + 1 < len(blocks) else len(tokens)
+        spans.append((key, block.kind, block.start_line, end))
+
+    result: Dict[str, Dict] = {}
+    for key, kind, start, end in spans:
+        digest = hashlib.sha1()
+        for token in tokens[start - 1:end]:
+            digest.update(token.raw.encode("utf-8"))
+            digest.update(b"\n")
+        result[key] = {"kind": kind, "start": start, "end": end, "hash": digest.hexdigest()}
+    return result
+
+
+def group_signatures(blocks: Dict[str, Dict]) -> Dict[str, str]:
+    """One hash per block group, covering block identity and content."""
+    members: Dict[str, List[str]] = {}
+    for key, block in blocks.items():
+        members.setdefault(block_group(block["kind"]), []).append(f"{key}={block['hash']}")
+    return {
+        group: hashlib.sha1("\n".join(sorted(entries)).encode("utf-8")).hexdigest()
+        for group, entries in members.items()
+    }
+
+
+def changed_groups(previous: Dict[str, Dict], current: Dict[str, Dict]) -> set:
+    before = group_signatures(previous)
+    after = group_signatures(current)
+    return {group for group in set(before) | set(after) if before.get(group) != after.get(group)}
+
+
+def locate_line(blocks: Dict[str, Dict], line: int) -> Tuple[Optional[str], int]:
+    """Express a line as (block key, offset) so it survives blocks moving."""
+    for key, block in blocks.items():
+        if block["start"] <= line <= block["end"]:
+            return key, line - block["start"]
+    return None, line
+
+
+def relocate_line(blocks: Dict[str, Dict], key: Optional[str], offset: int) -> int:
+    if key is None or key not in blocks:
+        return offset
+    return blocks[key]["start"] + offset
+
+
+def validator_fingerprint(*paths: str) -> str:
+    """Hash of the validator sources; any rule change invalidates stored state."""
+    digest = hashlib.sha1()
+    for path in paths:
+        try:
+            with open(path, "rb") as handle:
+                digest.update(handle.read())
+        except OSError:
+            digest.update(path.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ValidationStateStore:
+    """One JSON state file per .agent path."""
+
+    def __init__(self, state_dir: Optional[Path] = None):
+        self.state_dir = Path(os.environ.get("AGENTSCRIPT_STATE_DIR") or state_dir or DEFAULT_STATE_DIR)
+        self.enabled = os.environ.get("AGENTSCRIPT_INCREMENTAL", "1") != "0"
+
+    def _path_for(self, file_path: str) -> Path:
+        resolved = str(Path(file_path).resolve())
+        return self.state_dir / f"{hashlib.sha1(resolved.encode('utf-8')).hexdigest()}.json"
+
+    def load(self, file_path: str, fingerprint: str) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+        try:
+            with self._path_for(file_path).open("r", encoding="utf-8") as handle:
+                state = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if state.get("version") != STATE_VERSION or state.get("fingerprint") != fingerprint:
+            return None
+        return state
+
+    def save(self, file_path: str, fingerprint: str, state: Dict) -> None:
+        if not self.enabled:
+            return
+        target = self._path_for(file_path)
+        payload = dict(state, version=STATE_VERSION, fingerprint=fingerprint)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(target.parent), prefix=".state-", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle)
+            os.replace(tmp_path, target)
+        except OSError:
+            pass
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Agent Script Org Fact Cache
+===========================
+
+Org lookups for the Agent Script validator's org-aware checks (ASV-ORG-*).
+
+- ``run_composite_queries()`` sends every SOQL a validation needs as a single
+  REST Composite request through one ``sf api request rest`` call, instead of
+  one ``sf data query`` subprocess per query.
+- ``OrgFactCache`` persists query results (and the resolved target org per
+  project) across processes in ``~/.claude/cache/`` with a TTL, so re-saving
+  the same .agent file does not pay the CLI round-trips again.
+
+Only fully positive answers are cached (every expected record present, no
+empty/false fields), so a class deployed or a user activated after a failed
+check is picked up on the very next validation.
+
+Environment:
+    AGENTSCRIPT_ORG_CACHE_TTL   Seconds to keep org facts (default 300, 0 disables)
+    AGENTSCRIPT_ORG_CACHE_PATH  Cache file location override
+"""
+
+import json
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+API_VERSION = "62.0"
+COMPOSITE_LIMIT = 25  # Max subrequests per Composite request
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_CACHE_PATH = Path.home() / ".claude" / "cache" / "agentscript-org-facts.json"
+CACHE_VERSION = 1
+
+
+def _ttl_from_env() -> int:
+    try:
+        return max(0, int(os.environ.get("AGENTSCRIPT_ORG_CACHE_TTL", DEFAULT_TTL_SECONDS)))
+    except ValueError:
+        return DEFAULT_TTL_SECONDS
+
+
+def is_positive_result(result: Dict, expected_records: Optional[int]) -> bool:
+    """True when a query result contains no negative facts worth re-checking soon."""
+    if not result.get("ok"):
+        return False
+    records = result.get("records") or []
+    if expected_records is not None and len(records) < expected_records:
+        return False
+    for record in records:
+        for key, value in record.items():
+            if key != "attributes" and value in (None, False, ""):
+                return False
+    return True
+
+
+class OrgFactCache:
+    """Small JSON-file TTL cache shared by every validator process."""
+
+    def __init__(self, path: Optional[Path] = None, ttl_seconds: Optional[int] = None):
+        self.path = Path(os.environ.get("AGENTSCRIPT_ORG_CACHE_PATH") or path or DEFAULT_CACHE_PATH)
+        self.ttl_seconds = _ttl_from_env() if ttl_seconds is None else ttl_seconds
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._dirty = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            self._entries = {}
+            if self.enabled:
+                try:
+                    with self.path.open("r", encoding="utf-8") as handle:
+                        payload = json.load(handle)
+                    if payload.get("version") == CACHE_VERSION:
+                        self._entries = payload.get("entries") or {}
+                except (OSError, ValueError, AttributeError):
+                    self._entries = {}
+        return self._entries
+
+    def get(self, key: str):
+        if not self.enabled:
+            return None
+        entry = self._load().get(key)
+        if not entry or time.time() - entry.get("at", 0) > self.ttl_seconds:
+            return None
+        return entry.get("value")
+
+    def put(self, key: str, value) -> None:
+        if not self.enabled:
+            return
+        self._load()[key] = {"at": time.time(), "value": value}
+        self._dirty = True
+
+    def flush(self) -> None:
+        """Write pending entries atomically, dropping expired ones."""
+        if not self.enabled or not self._dirty:
+            return
+        now = time.time()
+        # Merge with whatever other processes wrote since we loaded
+        merged: Dict[str, Dict] = {}
+        try:
+            with self.path.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+            if payload.get("version") == CACHE_VERSION:
+                merged.update(payload.get("entries") or {})
+        except (OSError, ValueError, AttributeError):
+            pass
+        merged.update(self._entries or {})
+        merged = {key: entry for key, entry in merged.items() if now - entry.get("at", 0) <= self.ttl_seconds}
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=".org-facts-", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"version": CACHE_VERSION, "entries": merged}, handle)
+            os.replace(tmp_path, self.path)
+            self._entries = merged
+            self._dirty = False
+        except OSError:
+            pass
+
+
+def query_cache_key(org: str, soql: str) -> str:
+    return f"soql\n{org}\n{soql}"
+
+
+def run_composite_queries(org: str, soqls: List[str], timeout: int = 60) -> Dict[str, Dict]:
+    """Run SOQL queries as REST Composite requests against an org.
+
+    Returns results keyed by SOQL in the same shape as the validator's
+    per-query results ({"ok", "records"} or {"ok": False, "reason", "detail"}).
+    Queries missing from the returned dict could not be run this way (for
+    example an older sf CLI without ``sf api request rest``); callers fall
+    back to ``sf data query`` for those.
+    """
+    results: Dict[str, Dict] = {}
+    for start in range(0, len(soqls), COMPOSITE_LIMIT):
+        chunk = soqls[start:start + COMPOSITE_LIMIT]
+        body = {
+            "allOrNone": False,
+            "compositeRequest": [
+                {
+                    "method": "GET",
+                    "url": f"/services/data/v{API_VERSION}/query?q={quote(soql)}",
+                    "referenceId": f"q{index}",
+                }
+                for index, soql in enumerate(chunk)
+            ],
+        }
+        try:
+            proc = subprocess.run(
+                [
+                    "sf", "api", "request", "rest",
+                    f"/services/data/v{API_VERSION}/composite",
+                    "--method", "POST",
+                    "--body", json.dumps(body),
+                    "--target-org", org,
+                ],
+                text=True,
+                capture_output=True,
+                timeout=timeout,
+            )
+        except Exception:
+            return results
+        if proc.returncode != 0:
+            return results
+        try:
+            payload = json.loads(proc.stdout or "{}")
+        except ValueError:
+            return results
+
+        for response in payload.get("compositeResponse") or []:
+            reference = str(response.get("referenceId") or "")
+            if not reference.startswith("q") or not reference[1:].isdigit():
+                continue
+            index = int(reference[1:])
+            if index >= len(chunk):
+                continue
+            soql = chunk[index]
+            response_body = response.get("body")
+            if response.get("httpStatusCode") == 200 and isinstance(response_body, dict):
+                results[soql] = {
+                    "ok": True,
+                    "payload": response_body,
+                    "records": response_body.get("records") or [],
+                }
+            else:
+                errors = response_body if isinstance(response_body, list) else []
+                detail = "; ".join(str((error or {}).get("message")) for error in errors if isinstance(error, dict)) or "composite subrequest failed"
+                results[soql] = {"ok": False, "reason": "query_failed", "detail": detail}
+    return results
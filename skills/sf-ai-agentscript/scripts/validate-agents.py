@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""Validate many Agent Script files at once.
+
+The write/edit hook validates one `.agent` file per save. This CLI runs the
+same validator over whole trees (every `aiAuthoringBundles` agent in a
+project, the skill's own assets, ...) in a process pool and emits one
+aggregate report:
+
+    python3 validate-agents.py force-app/                # text summary
+    python3 validate-agents.py force-app/ --format json  # machine-readable
+    python3 validate-agents.py . --format sarif -o agentscript.sarif
+    python3 validate-agents.py --benchmark               # throughput check
+
+Org-aware checks (ASV-ORG-*) are planned for every file up front, so each
+distinct org lookup runs once for the whole batch and the workers read the
+results instead of calling the sf CLI themselves.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+VALIDATOR_PATH = ROOT / "hooks/scripts/agentscript-syntax-validator.py"
+SKIP_DIRS = {".git", "node_modules", ".sfdx", ".sf", "__pycache__"}
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+INLINE_THRESHOLD = 4  # Below this many files a process pool costs more than it saves
+
+# Benchmark fixture set: the skill's own assets (real-world mix of full agents
+# and partial snippets) plus synthetic agents at fixed sizes, so throughput
+# numbers stay comparable across validator changes.
+BENCHMARK_ASSET_DIR = ROOT / "assets"
+BENCHMARK_SYNTHETIC_TOPICS = (10, 50, 200)
+
+_VALIDATOR_MODULE = None
+_ORG_FACTS: Dict[str, Dict[str, Dict]] = {}
+
+
+def load_validator_module():
+    global _VALIDATOR_MODULE
+    if _VALIDATOR_MODULE is None:
+        spec = spec_from_file_location("agentscript_validator", VALIDATOR_PATH)
+        module = module_from_spec(spec)
+        assert spec.loader is not None
+        spec.loader.exec_module(module)
+        _VALIDATOR_MODULE = module
+    return _VALIDATOR_MODULE
+
+
+def extract_rule_id(message: str) -> Optional[str]:
+    if message.startswith("[") and "]" in message:
+        return message[1 : message.index("]")]
+    return None
+
+
+def find_agent_files(paths: Iterable[str]) -> List[Path]:
+    files = set()
+    for raw in paths:
+        path = Path(raw)
+        if path.is_file() and path.suffix == ".agent":
+            files.add(path.resolve())
+        elif path.is_dir():
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = [name for name in dirnames if name not in SKIP_DIRS]
+                for filename in filenames:
+                    if filename.endswith(".agent"):
+                        files.add((Path(dirpath) / filename).resolve())
+    return sorted(files)
+
+
+def _init_worker(org_facts: Dict[str, Dict[str, Dict]]) -> None:
+    global _ORG_FACTS
+    _ORG_FACTS = org_facts
+    load_validator_module()
+
+
+def _issue(line: int, message: str) -> Dict:
+    rule_id = extract_rule_id(message)
+    text = message[len(rule_id) + 3 :] if rule_id else message
+    return {"line": line, "rule_id": rule_id, "message": text}
+
+
+def validate_content(content: str, file_path: str) -> Dict:
+    """Validate one file's content; runs in the worker processes."""
+    module = load_validator_module()
+    started = time.perf_counter()
+    validator = module.AgentScriptValidator(content, file_path)
+    validator.seed_org_facts(_ORG_FACTS.get(validator.validation_org) or {})
+    result = validator.validate()
+    return {
+        "file": file_path,
+        "success": result["success"],
+        "errors": [_issue(line, message) for line, _, message in result["errors"]],
+        "warnings": [_issue(line, message) for line, _, message in result["warnings"]],
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+def _validate_path(file_path: str) -> Dict:
+    try:
+        content = Path(file_path).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as exc:
+        return {"file": file_path, "success": False, "read_error": str(exc), "errors": [], "warnings": [], "elapsed_ms": 0.0}
+    return validate_content(content, file_path)
+
+
+def plan_org_facts(files: List[Path]) -> Dict[str, Dict[str, Dict]]:
+    """Fetch the org lookups for every file once, grouped by target org."""
+    module = load_validator_module()
+    validators = []
+    for path in files:
+        try:
+            validators.append(module.AgentScriptValidator(path.read_text(encoding="utf-8"), str(path)))
+        except (OSError, UnicodeDecodeError):
+            continue
+    return module.prefetch_shared_org_facts(validators)
+
+
+def validate_files(files: List[Path], workers: Optional[int] = None, org_checks: bool = True) -> List[Dict]:
+    org_facts = plan_org_facts(files) if org_checks else {}
+    paths = [str(path) for path in files]
+    workers = workers or os.cpu_count() or 1
+
+    if workers <= 1 or len(paths) < INLINE_THRESHOLD:
+        _init_worker(org_facts)
+        return [_validate_path(path) for path in paths]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(org_facts,)) as pool:
+        return list(pool.map(_validate_path, paths, chunksize=max(1, len(paths) // (workers * 4))))
+
+
+def build_report(results: List[Dict], elapsed: float, workers: int, root: Path) -> Dict:
+    for entry in results:
+        try:
+            entry["file"] = str(Path(entry["file"]).relative_to(root))
+        except ValueError:
+            pass
+    return {
+        "summary": {
+            "files": len(results),
+            "failed_files": sum(1 for entry in results if not entry["success"]),
+            "errors": sum(len(entry["errors"]) for entry in results),
+            "warnings": sum(len(entry["warnings"]) for entry in results),
+            "workers": workers,
+            "elapsed_seconds": round(elapsed, 3),
+            "files_per_second": round(len(results) / elapsed, 1) if elapsed > 0 else None,
+        },
+        "files": results,
+    }
+
+
+def to_sarif(report: Dict) -> Dict:
+    rule_ids = sorted({
+        issue["rule_id"]
+        for entry in report["files"]
+        for issue in entry["errors"] + entry["warnings"]
+        if issue["rule_id"]
+    })
+    sarif_results = []
+    for entry in report["files"]:
+        for level, issues in (("error", entry["errors"]), ("warning", entry["warnings"])):
+            for issue in issues:
+                sarif_results.append({
+                    "ruleId": issue["rule_id"] or "ASV",
+                    "level": level,
+                    "message": {"text": issue["message"]},
+                    "locations": [{
+                        "physicalLocation": {
+                            "artifactLocation": {"uri": Path(entry["file"]).as_posix()},
+                            "region": {"startLine": max(1, issue["line"])},
+                        }
+                    }],
+                })
+    return {
+        "$schema": SARIF_SCHEMA,
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {
+                "driver": {
+                    "name": "agentscript-syntax-validator",
+                    "informationUri": "https://github.com/Jaganpro/sf-skills",
+                    "rules": [{"id": rule_id, "name": rule_id} for rule_id in rule_ids],
+                }
+            },
+            "results": sarif_results,
+        }],
+    }
+
+
+def format_text(report: Dict) -> str:
+    lines = []
+    for entry in report["files"]:
+        if entry.get("read_error"):
+            lines.append(f"❌ {entry['file']}: could not read file ({entry['read_error']})")
+            continue
+        if not entry["errors"] and not entry["warnings"]:
+            continue
+        marker = "❌" if entry["errors"] else "⚠️"
+        lines.append(f"{marker} {entry['file']}: {len(entry['errors'])} blocking, {len(entry['warnings'])} warnings")
+        for issue in entry["errors"]:
+            lines.append(f"    ❌ Line {issue['line']}: [{issue['rule_id']}] {issue['message']}")
+        for issue in entry["warnings"]:
+            lines.append(f"    ⚠️ Line {issue['line']}: [{issue['rule_id']}] {issue['message']}")
+
+    summary = report["summary"]
+    lines.append("")
+    lines.append(
+        f"📊 {summary['files']} files, {summary['failed_files']} with blocking issues, "
+        f"{summary['errors']} blocking, {summary['warnings']} warnings "
+        f"({summary['elapsed_seconds']}s, {summary['workers']} workers)"
+    )
+    return "\n".join(lines)
+
+
+def synthetic_agent(topic_count: int) -> str:
+    """A complete Employee Agent with ``topic_count`` routed topics."""
+    lines = [
+        "config:",
+        f'    developer_name: "Benchmark_{topic_count}_Topics"',
+        f'    description: "Synthetic benchmark agent with {topic_count} topics"',
+        '    agent_type: "AgentforceEmployeeAgent"',
+        "",
+        "variables:",
+        '    order_id: mutable string = ""',
+        "    retries: mutable number = 0",
+        "    verified: mutable boolean = False",
+        "",
+        "system:",
+        "    messages:",
+        '        welcome: "Hi, how can I help?"',
+        '        error: "Something went wrong."',
+        '    instructions: "You are a helpful assistant."',
+        "",
+        "start_agent router:",
+        '    description: "Routes requests to the right topic"',
+        "    reasoning:",
+        "        instructions: ->",
+        "            | Pick the topic that matches the request.",
+        "        actions:",
+    ]
+    for index in range(topic_count):
+        lines.append(f"            go_topic_{index}: @utils.transition to @topic.topic_{index}")
+        lines.append(f'                description: "Handle requests of kind {index}"')
+    for index in range(topic_count):
+        lines.extend([
+            "",
+            f"topic topic_{index}:",
+            f'    description: "Handles request kind {index}"',
+            "    actions:",
+            f"        lookup_{index}:",
+            f'            description: "Looks up records for kind {index}"',
+            f'            target: "flow://Lookup_Kind_{index}"',
+            "            inputs:",
+            "                order_id: string",
+            '                    description: "Order identifier"',
+            "            outputs:",
+            "                status: string",
+            '                    description: "Order status"',
+            "    reasoning:",
+            "        instructions: ->",
+            "            if @variables.verified == True:",
+            f"                | Help with request kind {index} for order {{!@variables.order_id}}.",
+            "            else:",
+            "                | Ask the user to verify first.",
+            "        actions:",
+            f"            lookup: @actions.lookup_{index}",
+            "                with order_id=@variables.order_id",
+            "                set @variables.retries = @variables.retries + 1",
+            "            back: @utils.transition to @topic.router",
+            '                description: "Return to routing"',
+        ])
+    return "\n".join(lines) + "\n"
+
+
+def benchmark_corpus() -> List[tuple]:
+    corpus = [
+        (str(path.relative_to(ROOT)), path.read_text(encoding="utf-8"))
+        for path in sorted(BENCHMARK_ASSET_DIR.rglob("*.agent"))
+    ]
+    corpus.extend((f"<synthetic-{count}-topics>.agent", synthetic_agent(count)) for count in BENCHMARK_SYNTHETIC_TOPICS)
+    return corpus
+
+
+def run_benchmark(rounds: int) -> Dict:
+    """Time the validator (org checks off) over the benchmark fixture set."""
+    os.environ["AGENTSCRIPT_SKIP_ORG_CHECKS"] = "1"
+    load_validator_module()
+    corpus = benchmark_corpus()
+    timings: Dict[str, List[float]] = {name: [] for name, _ in corpus}
+    sizes = {name: content.count("\n") + 1 for name, content in corpus}
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for name, content in corpus:
+            timings[name].append(validate_content(content, name)["elapsed_ms"])
+    elapsed = time.perf_counter() - started
+
+    total_lines = sum(sizes.values()) * rounds
+    return {
+        "files": len(corpus),
+        "rounds": rounds,
+        "elapsed_seconds": round(elapsed, 3),
+        "files_per_second": round(len(corpus) * rounds / elapsed, 1),
+        "lines_per_second": round(total_lines / elapsed),
+        "slowest": [
+            {"file": name, "lines": sizes[name], "median_ms": round(statistics.median(values), 3)}
+            for name, values in sorted(timings.items(), key=lambda item: -statistics.median(item[1]))[:5]
+        ],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate Agent Script (.agent) files in bulk.")
+    parser.add_argument("paths", nargs="*", default=["."], help="Files or directories to scan (default: current directory)")
+    parser.add_argument("--format", choices=("text", "json", "sarif"), default="text", help="Report format")
+    parser.add_argument("-o", "--output", help="Write the report to this file instead of stdout")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--org", help="Target org alias/username for org-aware checks")
+    parser.add_argument("--skip-org-checks", action="store_true", help="Skip org-aware (ASV-ORG-*) checks")
+    parser.add_argument("--fail-on", choices=("error", "warning", "never"), default="error", help="Exit non-zero on these findings")
+    parser.add_argument("--benchmark", action="store_true", help="Measure validator throughput on the benchmark fixture set")
+    parser.add_argument("--rounds", type=int, default=5, help="Benchmark rounds (with --benchmark)")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        print(json.dumps(run_benchmark(max(1, args.rounds)), indent=2))
+        return 0
+
+    # Workers inherit the environment, so set org selection before the pool starts
+    if args.skip_org_checks:
+        os.environ["AGENTSCRIPT_SKIP_ORG_CHECKS"] = "1"
+    elif args.org:
+        os.environ["AGENTSCRIPT_VALIDATION_ORG"] = args.org
+
+    files = find_agent_files(args.paths)
+    if not files:
+        print("No .agent files found.", file=sys.stderr)
+        return 0
+
+    workers = args.workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    results = validate_files(files, workers=workers, org_checks=not args.skip_org_checks)
+    report = build_report(results, time.perf_counter() - started, workers, Path.cwd())
+
+    if args.format == "json":
+        rendered = json.dumps(report, indent=2)
+    elif args.format == "sarif":
+        rendered = json.dumps(to_sarif(report), indent=2)
+    else:
+        rendered = format_text(report)
+
+    if args.output:
+        Path(args.output).write_text(rendered + "\n", encoding="utf-8")
+    else:
+        print(rendered)
+
+    summary = report["summary"]
+    if args.fail_on == "error" and summary["failed_files"]:
+        return 1
+    if args.fail_on == "warning" and (summary["failed_files"] or summary["warnings"]):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Locate the shared code_analyzer package for sf-apex hook scripts.
+
+Validators in this directory import ``code_analyzer`` modules (apex_lexer,
+pattern_engine, apex_symbol_index, ...). Import this module first; it puts
+the package's parent directory on sys.path, trying the installed path
+(~/.claude/code_analyzer) before the dev repo path (shared/code_analyzer).
+
+Usage:
+    import code_analyzer_path  # noqa: F401
+    from code_analyzer.apex_lexer import lex_apex  # noqa: E402
+"""
+
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CODE_ANALYZER_CANDIDATES = (
+    os.path.join(os.path.expanduser("~"), ".claude", "code_analyzer"),  # Installed path
+    os.path.join(SCRIPT_DIR, "..", "..", "..", "..", "shared", "code_analyzer"),  # Dev repo
+)
+
+
+def add_code_analyzer_path():
+    """Put the first code_analyzer found on sys.path; return its directory or None."""
+    for candidate in CODE_ANALYZER_CANDIDATES:
+        candidate = os.path.normpath(candidate)
+        if os.path.isdir(candidate):
+            # Parent so "from code_analyzer import" works
+            parent = os.path.dirname(candidate)
+            if parent not in sys.path:
+                sys.path.insert(0, parent)
+            return candidate
+    return None
+
+
+CODE_ANALYZER_DIR = add_code_analyzer_path()
@@ -8,15 +8,29 @@ Detects common mistakes that LLMs make when generating Salesforce Apex code:
 3. Unsafe Map access (Map.get() without null checks)
 4. Missing SOQL fields (accessing fields not in query)
 
+Inside an SFDX project, checks 2 and 4 also consult the project's Apex symbol
+index (code_analyzer.apex_symbol_index): calls like ``InvoiceService.post()``
+are checked against the methods the project class actually declares, and
+custom fields in SELECT clauses against the local object metadata.
+
 This validator is ADVISORY - it provides warnings but does not block operations.
 
 Source: https://salesforcediaries.com/2026/01/16/llm-mistakes-in-apex-lwc-salesforce-code-generation-rules/
 """
 
+import difflib
 import re
 import os
+import sys
 from typing import Dict, List, Tuple, Set
 
+# Puts the shared code_analyzer package on sys.path
+import code_analyzer_path  # noqa: F401
+
+from code_analyzer.apex_lexer import lex_apex  # noqa: E402
+from code_analyzer.pattern_engine import PatternEngine, group_hits  # noqa: E402
+from code_analyzer.apex_symbol_index import is_namespaced, project_symbol_index  # noqa: E402
+
 
 class LLMPatternValidator:
     """Detects LLM-specific anti-patterns in Apex code."""
@@ -93,6 +107,28 @@ class LLMPatternValidator:
         r'(\w+)\.get\s*\([^)]+\)\s*\.\s*\w+\s*[^?]',  # map.get(key).property (not safe nav)
     ]
 
+    MAP_GET_PATTERN = r'(\w+)\.get\s*\(([^)]+)\)\s*\.(?!\s*\?)'
+    SOQL_PATTERN = r'\[\s*SELECT\s+([^F][^\]]+?)\s+FROM\s+(\w+)'
+    # ClassName.method( — resolved against the project symbol index
+    CLASS_CALL_PATTERN = r'(?<![\w.])([A-Z]\w*)\s*\.\s*(\w+)\s*\('
+
+    _engine = None
+
+    @classmethod
+    def pattern_engine(cls) -> PatternEngine:
+        """All line patterns compiled into one shared scanner (built once per process)."""
+        if cls._engine is None:
+            engine = PatternEngine()
+            for java_type in cls.JAVA_TYPES:
+                engine.add(f'java_type:{java_type}', rf'\b{java_type}\s*<', first_match_only=True)
+            for index, (pattern, _) in enumerate(cls.HALLUCINATED_METHODS):
+                engine.add(f'hallucinated_method:{index}', pattern, re.IGNORECASE, first_match_only=True)
+            engine.add('map_get', cls.MAP_GET_PATTERN)
+            engine.add('soql', cls.SOQL_PATTERN, re.IGNORECASE)
+            engine.add('class_call', cls.CLASS_CALL_PATTERN)
+            cls._engine = engine
+        return cls._engine
+
     def __init__(self, file_path: str):
         """
         Initialize the validator with an Apex file.
@@ -103,12 +139,16 @@ class LLMPatternValidator:
         self.file_path = file_path
         self.content = ""
         self.lines = []
+        self.source = None
         self.issues = []
+        self.hits = {}
+        self.symbols = None
 
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 self.content = f.read()
-                self.lines = self.content.split('\n')
+            self.source = lex_apex(self.content)
+            self.lines = self.source.lines
         except Exception as e:
             self.issues.append({
                 'severity': 'ERROR',
@@ -131,6 +171,13 @@ class LLMPatternValidator:
                 'issue_count': len(self.issues)
             }
 
+        # One scan of the comment-masked source feeds every pattern check
+        self.hits = group_hits(self.pattern_engine().scan(self.content, code=self.source.code))
+        try:
+            self.symbols = project_symbol_index(self.file_path)
+        except Exception:
+            self.symbols = None  # Project checks are best-effort
+
         # Run all checks
         self._check_java_types()
         self._check_hallucinated_methods()
@@ -146,129 +193,146 @@ class LLMPatternValidator:
     def _check_java_types(self):
         """Check for Java collection types that don't exist in Apex."""
         for java_type, apex_alternative in self.JAVA_TYPES.items():
-            # Pattern: JavaType<...> or new JavaType<...>
-            pattern = rf'\b{java_type}\s*<'
-
-            for i, line in enumerate(self.lines, 1):
-                # Skip comments
-                stripped = line.strip()
-                if stripped.startswith('//') or stripped.startswith('*'):
-                    continue
-
-                if re.search(pattern, line):
-                    self.issues.append({
-                        'severity': 'CRITICAL',
-                        'category': 'java_type',
-                        'message': f'Java type "{java_type}" does not exist in Apex',
-                        'line': i,
-                        'fix': f'Use {apex_alternative} instead',
-                        'source': 'llm-pattern-validator'
-                    })
+            for hit in self.hits.get(f'java_type:{java_type}', ()):
+                self.issues.append({
+                    'severity': 'CRITICAL',
+                    'category': 'java_type',
+                    'message': f'Java type "{java_type}" does not exist in Apex',
+                    'line': hit.line,
+                    'fix': f'Use {apex_alternative} instead',
+                    'source': 'llm-pattern-validator'
+                })
 
     def _check_hallucinated_methods(self):
         """Check for methods that LLMs commonly hallucinate."""
-        for pattern, message in self.HALLUCINATED_METHODS:
-            for i, line in enumerate(self.lines, 1):
-                # Skip comments
-                stripped = line.strip()
-                if stripped.startswith('//') or stripped.startswith('*'):
-                    continue
-
-                if re.search(pattern, line, re.IGNORECASE):
-                    self.issues.append({
-                        'severity': 'CRITICAL',
-                        'category': 'hallucinated_method',
-                        'message': message,
-                        'line': i,
-                        'source': 'llm-pattern-validator'
-                    })
+        for index, (_, message) in enumerate(self.HALLUCINATED_METHODS):
+            for hit in self.hits.get(f'hallucinated_method:{index}', ()):
+                self.issues.append({
+                    'severity': 'CRITICAL',
+                    'category': 'hallucinated_method',
+                    'message': message,
+                    'line': hit.line,
+                    'source': 'llm-pattern-validator'
+                })
+
+        if self.symbols is None:
+            return
+
+        # Calls on project classes must name a method the class (or a project
+        # superclass) declares; classes outside the project are not judged.
+        reported = set()
+        for hit in self.hits.get('class_call', ()):
+            class_name, method = hit.match.group(1), hit.match.group(2)
+            declared = self.symbols.get_class(class_name)
+            # Apex is case-insensitive, but a differently-cased name is far
+            # more likely a variable than the class itself
+            if declared is None or declared['name'] != class_name:
+                continue
+            line_start = self.source.line_starts[hit.line - 1]
+            pos = line_start + hit.span[0]
+            # Skip string literal contents and constructor calls (new Outer.Inner())
+            if self.source.bare_code[pos] != self.source.code[pos]:
+                continue
+            if re.search(r'\bnew\s*$', self.source.code[line_start:pos]):
+                continue
+            if self.symbols.has_method(class_name, method) is not False or (class_name, method) in reported:
+                continue
+            reported.add((class_name, method))
+            suggestions = difflib.get_close_matches(method, self.symbols.method_names(class_name), n=1)
+            self.issues.append({
+                'severity': 'CRITICAL',
+                'category': 'hallucinated_method',
+                'message': f'{class_name}.{method}() is not declared in project class {class_name}',
+                'line': hit.line,
+                'fix': f'Did you mean {class_name}.{suggestions[0]}()?' if suggestions else f'Check the methods {class_name} declares',
+                'source': 'llm-pattern-validator'
+            })
 
     def _check_unsafe_map_access(self):
         """Check for Map.get() without null safety."""
         # More sophisticated check: look for Map.get() followed by . without ?
         # Skip if there's a containsKey check nearby or safe navigation
-
-        map_get_pattern = r'(\w+)\.get\s*\(([^)]+)\)\s*\.(?!\s*\?)'
-
-        for i, line in enumerate(self.lines, 1):
-            # Skip comments
-            stripped = line.strip()
-            if stripped.startswith('//') or stripped.startswith('*'):
-                continue
+        for hit in self.hits.get('map_get', ()):
+            i = hit.line
 
             # Skip lines with safe navigation operator
-            if '?.' in line:
+            if '?.' in self.lines[i - 1]:
                 continue
 
-            matches = re.finditer(map_get_pattern, line)
-            for match in matches:
-                map_var = match.group(1)
-                key_expr = match.group(2)
-
-                # Check if there's a containsKey check in the surrounding context
-                # Look at the previous 5 lines for a containsKey check
-                context_start = max(0, i - 6)
-                context = '\n'.join(self.lines[context_start:i])
-
-                # Also check if there's an if (map_var != null) check
-                has_null_check = (
-                    f'containsKey({key_expr})' in context or
-                    f'{map_var}.containsKey' in context or
-                    f'{map_var} != null' in context or
-                    f'{map_var} == null' in context or
-                    'if (' in self.lines[i-1] if i > 0 else False
-                )
-
-                if not has_null_check:
-                    self.issues.append({
-                        'severity': 'WARNING',
-                        'category': 'unsafe_map_access',
-                        'message': f'Potential NPE: {map_var}.get() used without null check',
-                        'line': i,
-                        'fix': f'Use {map_var}.get({key_expr})?.property or check containsKey() first',
-                        'source': 'llm-pattern-validator'
-                    })
+            map_var = hit.match.group(1)
+            key_expr = hit.match.group(2)
+
+            # Check if there's a containsKey check in the surrounding context
+            # Look at the previous 5 lines for a containsKey check
+            context_start = max(0, i - 6)
+            context = '\n'.join(self.lines[context_start:i])
+
+            # Also check if there's an if (map_var != null) check
+            has_null_check = (
+                f'containsKey({key_expr})' in context or
+                f'{map_var}.containsKey' in context or
+                f'{map_var} != null' in context or
+                f'{map_var} == null' in context or
+                'if (' in self.lines[i-1] if i > 0 else False
+            )
+
+            if not has_null_check:
+                self.issues.append({
+                    'severity': 'WARNING',
+                    'category': 'unsafe_map_access',
+                    'message': f'Potential NPE: {map_var}.get() used without null check',
+                    'line': i,
+                    'fix': f'Use {map_var}.get({key_expr})?.property or check containsKey() first',
+                    'source': 'llm-pattern-validator'
+                })
 
     def _check_soql_field_coverage(self):
         """
         Check for potential SOQL field coverage issues.
 
-        This is a simplified check that looks for common patterns where
-        fields might be accessed but not queried.
+        Without project metadata this is a simplified check that looks for
+        common patterns where fields might be accessed but not queried. When
+        the queried SObject has local metadata, custom fields are checked
+        exactly: selected fields must exist, and custom fields read after the
+        query must have been selected.
         """
         # Find SOQL queries and extract field lists
-        soql_pattern = r'\[\s*SELECT\s+([^F][^\]]+?)\s+FROM\s+(\w+)'
-
         soql_queries = []
-        for i, line in enumerate(self.lines, 1):
-            matches = re.finditer(soql_pattern, line, re.IGNORECASE)
-            for match in matches:
-                fields_str = match.group(1)
-                sobject = match.group(2)
-
-                # Parse field names (simplified)
-                fields = set()
-                for field in fields_str.split(','):
-                    field = field.strip()
-                    # Handle relationship fields like Account.Name
-                    if '(' not in field:  # Skip subqueries
-                        fields.add(field.lower())
-
-                soql_queries.append({
-                    'line': i,
-                    'sobject': sobject,
-                    'fields': fields
-                })
+        for hit in self.hits.get('soql', ()):
+            i, match = hit.line, hit.match
+            fields_str = match.group(1)
+            sobject = match.group(2)
+
+            # Parse field names (simplified)
+            fields = set()
+            selected = []
+            for field in fields_str.split(','):
+                field = field.strip()
+                # Handle relationship fields like Account.Name
+                if '(' not in field:  # Skip subqueries
+                    fields.add(field.lower())
+                    selected.append(field)
+
+            soql_queries.append({
+                'line': i,
+                'sobject': sobject,
+                'fields': fields,
+                'selected': selected
+            })
 
-        # This is a very simplified check - just warn if a query has very few fields
-        # and later code accesses many properties
         for query in soql_queries:
+            query_line = query['line']
+            following_lines = '\n'.join(self.lines[query_line:min(query_line + 20, len(self.lines))])
+
+            known_fields = self.symbols.sobject_fields(query['sobject']) if self.symbols else None
+            if known_fields:
+                self._check_custom_fields(query, known_fields, following_lines)
+                continue
+
+            # This is a very simplified check - just warn if a query has very few fields
+            # and later code accesses many properties
             if len(query['fields']) <= 2 and 'id' in query['fields']:
                 # Very minimal query - might be missing fields
-                # Check following lines for field access patterns
-                query_line = query['line']
-                following_lines = '\n'.join(self.lines[query_line:min(query_line + 20, len(self.lines))])
-
                 # Count distinct field accesses that look like sobject.Field
                 field_access_pattern = rf"\.([A-Z][a-zA-Z0-9_]+)(?:\s*[;,\)\]\}}=]|\s*!=|\s*==)"
                 accessed_fields = set(re.findall(field_access_pattern, following_lines))
@@ -284,6 +348,49 @@ class LLMPatternValidator:
                         'source': 'llm-pattern-validator'
                     })
 
+    def _check_custom_fields(self, query: Dict, known_fields: Set[str], following_lines: str):
+        """Check a query's custom fields against the SObject's local metadata.
+
+        Managed-package fields (ns__Field__c) are never checked. An unknown
+        field is CRITICAL only on a project-owned custom object; standard or
+        partially retrieved objects may have fields that are not local.
+        """
+        sobject = query['sobject']
+        complete = self.symbols.defines_sobject(sobject)
+        for field in query['selected']:
+            lowered = field.lower()
+            if not lowered.endswith('__c') or '.' in field or is_namespaced(lowered):
+                continue
+            if lowered not in known_fields:
+                message = f'{field} is not defined on {sobject} in project metadata'
+                if not complete:
+                    message += ' (object may not be fully retrieved)'
+                self.issues.append({
+                    'severity': 'CRITICAL' if complete else 'WARNING',
+                    'category': 'soql_unknown_field',
+                    'message': message,
+                    'line': query['line'],
+                    'fix': f'Check the field API name under objects/{sobject}/fields/',
+                    'source': 'llm-pattern-validator'
+                })
+
+        # Custom fields of this SObject read after the query but never selected
+        accessed = re.findall(r'\.(\w+__c)\b(?!\s*\()', following_lines)
+        missing = []
+        for field in accessed:
+            lowered = field.lower()
+            if lowered in known_fields and lowered not in query['fields'] and field not in missing:
+                missing.append(field)
+        if missing:
+            self.issues.append({
+                'severity': 'INFO',
+                'category': 'soql_field_coverage',
+                'message': f"SOQL on line {query['line']} does not select {', '.join(missing)} read by later code",
+                'line': query['line'],
+                'fix': f"Add {', '.join(missing)} to the SELECT clause",
+                'source': 'llm-pattern-validator'
+            })
+
 
 def validate_apex_llm_patterns(file_path: str) -> Dict:
     """
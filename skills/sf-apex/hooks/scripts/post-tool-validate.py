@@ -8,6 +8,15 @@ feedback for Salesforce Apex files (*.cls, *.trigger).
 Integrates:
 1. Custom 150-point scoring (8 categories)
 2. Salesforce Code Analyzer V5 (all available engines)
+3. Apex Language Server diagnostics (syntax / type resolution)
+4. Live query plans for extracted SOQL (when an org is connected)
+
+Code Analyzer, the LSP and live query plans start concurrently as soon as the
+file is known; the pure-Python checks run while they are in flight. Results
+are collected against one deadline (SF_APEX_PIPELINE_DEADLINE, default 25s,
+inside the dispatcher's 30s budget), so latency is bounded by the slowest
+engine rather than the sum. Engines still running at the deadline are
+reported and the score is marked partial.
 
 Hook Input (stdin): JSON with tool_input and tool_response
 Hook Output (stdout): JSON with optional output message
@@ -18,22 +27,14 @@ This hook is ADVISORY - it provides feedback but does not block operations.
 import sys
 import os
 import json
+import importlib.util
 
 # Add script directory to path for imports
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, SCRIPT_DIR)
 
 # Find shared modules — try installed path first, then dev repo path
-_CLAUDE_DIR = os.path.join(os.path.expanduser("~"), ".claude")
-_CODE_ANALYZER_CANDIDATES = [
-    os.path.join(_CLAUDE_DIR, "code_analyzer"),           # Installed path
-    os.path.join(SCRIPT_DIR, "..", "..", "..", "..", "shared", "code_analyzer"),  # Dev repo
-]
-for _ca_path in _CODE_ANALYZER_CANDIDATES:
-    _ca_path = os.path.normpath(_ca_path)
-    if os.path.isdir(_ca_path):
-        sys.path.insert(0, os.path.dirname(_ca_path))  # Parent so "from code_analyzer import" works
-        break
+import code_analyzer_path  # noqa: E402,F401
 
 # Also add shared dir for soql_extractor and other shared modules
 PLUGIN_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))  # sf-apex/
@@ -43,6 +44,142 @@ if os.path.isdir(SHARED_DIR):
     sys.path.insert(0, SHARED_DIR)
 
 
+# Engine budget; the dispatcher kills this hook at HEAVY_TIMEOUT (30s)
+try:
+    PIPELINE_DEADLINE_SECONDS = float(os.environ.get("SF_APEX_PIPELINE_DEADLINE", "25"))
+except ValueError:
+    PIPELINE_DEADLINE_SECONDS = 25.0
+
+# Live query plan: analyze at most this many queries per file
+LIVE_PLAN_QUERY_LIMIT = 5
+
+# LSP diagnostic severity -> Code Analyzer severity (1 critical .. 5 info)
+LSP_TO_CA_SEVERITY = {1: 1, 2: 3, 3: 5, 4: 5}
+CA_SEVERITY_LABELS = {1: "CRITICAL", 2: "HIGH", 3: "MODERATE", 4: "LOW", 5: "INFO"}
+
+
+def scan_with_code_analyzer(file_path: str, timeout_seconds: int) -> dict:
+    """Code Analyzer V5 scan (runs on an engine thread)."""
+    from code_analyzer.scanner import CodeAnalyzerScanner, SkillType
+
+    scanner = CodeAnalyzerScanner(timeout_seconds=max(1, timeout_seconds))
+    if not scanner.is_available():
+        return {"available": False, "engines_unavailable": ["sf CLI with Code Analyzer not installed"]}
+
+    scan_result = scanner.scan(file_path, SkillType.APEX)
+    if not scan_result.success:
+        return {
+            "available": True,
+            "engines_unavailable": ["Error: " + (scan_result.error_message or "Unknown")],
+        }
+    return {
+        "available": True,
+        "violations": scan_result.violations,
+        "engines_used": scan_result.engines_used,
+        "engines_unavailable": scan_result.engines_unavailable,
+        "scan_time_ms": scan_result.scan_time_ms,
+    }
+
+
+def _load_lsp_hook():
+    """Import apex-lsp-validate.py (hyphenated name) for its client setup and attempt tracking."""
+    spec = importlib.util.spec_from_file_location(
+        "apex_lsp_validate", os.path.join(SCRIPT_DIR, "apex-lsp-validate.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def validate_with_lsp(file_path: str) -> dict:
+    """Apex Language Server diagnostics (runs on an engine thread)."""
+    lsp_hook = _load_lsp_hook()
+    try:
+        from lsp_client import LSPClient
+    except ImportError:
+        return {"available": False}
+
+    apex_wrapper = lsp_hook.LSP_ENGINE_PATH / "apex_wrapper.sh"
+    if not apex_wrapper.exists():
+        return {"available": False}
+    client = LSPClient(wrapper_path=str(apex_wrapper), language_id="apex")
+    if not client.is_available():
+        return {"available": False}
+
+    # Same auto-fix loop guard as the standalone LSP hook
+    attempt = lsp_hook.increment_attempt_count(file_path)
+    if attempt > lsp_hook.MAX_ATTEMPTS:
+        lsp_hook.reset_attempt_count(file_path)
+        return {
+            "available": True,
+            "skipped": f"Maximum attempts ({lsp_hook.MAX_ATTEMPTS}) exceeded - manual review may be needed",
+        }
+
+    result = client.validate_file(file_path)
+    if result.get("success", False):
+        lsp_hook.reset_attempt_count(file_path)
+    result["available"] = True
+    result["attempt"] = attempt
+    result["max_attempts"] = lsp_hook.MAX_ATTEMPTS
+    return result
+
+
+def lsp_violations(diagnostics: list) -> list:
+    """LSP diagnostics in the normalized violation shape ScoreMerger consumes."""
+    violations = []
+    for diag in diagnostics:
+        severity = LSP_TO_CA_SEVERITY.get(diag.get("severity", 1), 5)
+        start = diag.get("range", {}).get("start", {})
+        violations.append({
+            "rule": "ApexCompileError" if severity == 1 else "ApexCompileWarning",
+            "engine": "apex-lsp",
+            "severity": severity,
+            "severity_label": CA_SEVERITY_LABELS[severity],
+            "line": start.get("line", 0) + 1,  # LSP is 0-indexed
+            "message": diag.get("message", "Unknown error"),
+        })
+    return violations
+
+
+def analyze_live_query_plans(file_path: str) -> dict:
+    """Live query plans for the file's SOQL (runs on an engine thread)."""
+    from code_analyzer.live_query_plan import LiveQueryPlanAnalyzer
+    from soql_extractor import SOQLExtractor
+
+    analyzer = LiveQueryPlanAnalyzer()
+    if not analyzer.is_org_available():
+        return {"available": False}
+
+    with open(file_path, 'r') as f:
+        file_content = f.read()
+
+    results = []
+    issues = []
+    for query_info in SOQLExtractor(file_content, "apex").extract()[:LIVE_PLAN_QUERY_LIMIT]:
+        # Skip dynamic variable queries
+        if query_info.query_type == 'dynamic_variable':
+            continue
+
+        plan_result = analyzer.analyze(query_info.query)
+        results.append({
+            'line': query_info.line,
+            'query': query_info.query[:60],
+            'in_loop': query_info.in_loop,
+            'plan': plan_result
+        })
+
+        # Add non-selective queries to issues
+        if plan_result.success and not plan_result.is_selective:
+            issues.append({
+                'severity': 'WARNING',
+                'line': query_info.line,
+                'message': f'Non-selective SOQL (cost: {plan_result.relative_cost:.1f}, op: {plan_result.leading_operation})',
+                'fix': 'Add indexed fields to WHERE clause or reduce result set'
+            })
+
+    return {"available": True, "org_name": analyzer.get_target_org(), "results": results, "issues": issues}
+
+
 def validate_apex_with_ca(file_path: str) -> dict:
     """
     Run comprehensive Apex validation combining custom scoring with Code Analyzer.
@@ -58,7 +195,21 @@ def validate_apex_with_ca(file_path: str) -> dict:
 
     try:
         # ═══════════════════════════════════════════════════════════════════
-        # PHASE 1: Custom 150-point validation
+        # PHASE 0: Start slow engines (Code Analyzer, LSP, live query plans)
+        # ═══════════════════════════════════════════════════════════════════
+        pipeline = None
+        try:
+            from code_analyzer.engine_pipeline import EnginePipeline
+
+            pipeline = EnginePipeline(PIPELINE_DEADLINE_SECONDS)
+            pipeline.start("code_analyzer", scan_with_code_analyzer, file_path, int(PIPELINE_DEADLINE_SECONDS))
+            pipeline.start("lsp", validate_with_lsp, file_path)
+            pipeline.start("live_plan", analyze_live_query_plans, file_path)
+        except ImportError:
+            pass  # code_analyzer package not available - custom scoring only
+
+        # ═══════════════════════════════════════════════════════════════════
+        # PHASE 1: Custom 150-point validation (overlaps with the engines)
         # ═══════════════════════════════════════════════════════════════════
         from validate_apex import ApexValidator
 
@@ -97,90 +248,54 @@ def validate_apex_with_ca(file_path: str) -> dict:
             pass  # Don't fail validation on LLM check errors
 
         # ═══════════════════════════════════════════════════════════════════
-        # PHASE 2: Code Analyzer V5 scanning (if available)
+        # PHASE 2: Collect engine results (whatever finished by the deadline)
         # ═══════════════════════════════════════════════════════════════════
         ca_violations = []
         ca_engines_used = []
         ca_engines_unavailable = []
         ca_available = False
         scan_time_ms = 0
-
-        try:
-            from code_analyzer.scanner import CodeAnalyzerScanner, SkillType
-            from code_analyzer.score_merger import ScoreMerger
-
-            scanner = CodeAnalyzerScanner()
-
-            if scanner.is_available():
-                ca_available = True
-                scan_result = scanner.scan(file_path, SkillType.APEX)
-
-                if scan_result.success:
-                    ca_violations = scan_result.violations
-                    ca_engines_used = scan_result.engines_used
-                    ca_engines_unavailable = scan_result.engines_unavailable
-                    scan_time_ms = scan_result.scan_time_ms
-                else:
-                    ca_engines_unavailable = ["Error: " + (scan_result.error_message or "Unknown")]
-            else:
-                ca_engines_unavailable = ["sf CLI with Code Analyzer not installed"]
-
-        except ImportError as e:
-            ca_engines_unavailable = [f"Module not available: {e}"]
-        except Exception as e:
-            ca_engines_unavailable = [f"Scanner error: {e}"]
-
-        # ═══════════════════════════════════════════════════════════════════
-        # PHASE 2.5: Live Query Plan Analysis (if org connected)
-        # ═══════════════════════════════════════════════════════════════════
+        lsp_result = None
+        lsp_diagnostics = []
         live_plan_results = []
         org_name = None
         live_plan_available = False
+        engines_pending = []
 
-        try:
-            from code_analyzer.live_query_plan import LiveQueryPlanAnalyzer
-            from soql_extractor import SOQLExtractor
+        if pipeline is None:
+            ca_engines_unavailable = ["Module not available: code_analyzer"]
+        else:
+            pipeline.wait()
+            engines_pending = pipeline.pending()
+
+            ca_result = pipeline.result("code_analyzer")
+            if ca_result is not None:
+                ca_available = ca_result.get("available", False)
+                ca_violations = ca_result.get("violations", [])
+                ca_engines_used = ca_result.get("engines_used", [])
+                ca_engines_unavailable = ca_result.get("engines_unavailable", [])
+                scan_time_ms = ca_result.get("scan_time_ms", 0)
+            elif "code_analyzer" not in engines_pending:
+                error = pipeline.error("code_analyzer")
+                if isinstance(error, ImportError):
+                    ca_engines_unavailable = [f"Module not available: {error}"]
+                else:
+                    ca_engines_unavailable = [f"Scanner error: {error}"]
 
-            # Read file content for SOQL extraction
-            with open(file_path, 'r') as f:
-                file_content = f.read()
+            lsp_result = pipeline.result("lsp")
+            if lsp_result and lsp_result.get("available") and not lsp_result.get("error"):
+                lsp_diagnostics = lsp_result.get("diagnostics", [])
 
-            analyzer = LiveQueryPlanAnalyzer()
-            if analyzer.is_org_available():
+            # Live query plan errors never fail validation
+            live_plan = pipeline.result("live_plan")
+            if live_plan and live_plan.get("available"):
                 live_plan_available = True
-                org_name = analyzer.get_target_org()
-
-                # Extract SOQL queries from Apex
-                extractor = SOQLExtractor(file_content, "apex")
-                queries = extractor.extract()
-
-                # Analyze each query (limit to first 5 to avoid timeout)
-                for query_info in queries[:5]:
-                    # Skip dynamic variable queries
-                    if query_info.query_type == 'dynamic_variable':
-                        continue
-
-                    plan_result = analyzer.analyze(query_info.query)
-                    live_plan_results.append({
-                        'line': query_info.line,
-                        'query': query_info.query[:60],
-                        'in_loop': query_info.in_loop,
-                        'plan': plan_result
-                    })
-
-                    # Add non-selective queries to issues
-                    if plan_result.success and not plan_result.is_selective:
-                        custom_issues.append({
-                            'severity': 'WARNING',
-                            'line': query_info.line,
-                            'message': f'Non-selective SOQL (cost: {plan_result.relative_cost:.1f}, op: {plan_result.leading_operation})',
-                            'fix': 'Add indexed fields to WHERE clause or reduce result set'
-                        })
+                org_name = live_plan.get("org_name")
+                live_plan_results = live_plan.get("results", [])
+                custom_issues.extend(live_plan.get("issues", []))
 
-        except ImportError:
-            pass  # Live analysis not available
-        except Exception as e:
-            pass  # Don't fail validation on live plan errors
+        engine_violations = [v if isinstance(v, dict) else v.__dict__ for v in ca_violations]
+        engine_violations.extend(lsp_violations(lsp_diagnostics))
 
         # ═══════════════════════════════════════════════════════════════════
         # PHASE 3: Merge scores (if CA results available)
@@ -192,16 +307,19 @@ def validate_apex_with_ca(file_path: str) -> dict:
         ca_deductions = 0
         deductions = []
 
-        if ca_violations and ca_available:
+        if engine_violations:
             try:
+                from code_analyzer.score_merger import ScoreMerger
+
                 merger = ScoreMerger(
                     custom_scores=custom_scores,
                     custom_max_scores=validator.scores
                 )
                 merged = merger.merge(
-                    [v if isinstance(v, dict) else v.__dict__ for v in ca_violations],
-                    engines_used=ca_engines_used,
+                    engine_violations,
+                    engines_used=ca_engines_used + (["apex-lsp"] if lsp_diagnostics else []),
                     engines_unavailable=ca_engines_unavailable,
+                    engines_pending=engines_pending,
                 )
                 final_score = merged.final_score
                 final_max = merged.final_max
@@ -242,6 +360,8 @@ def validate_apex_with_ca(file_path: str) -> dict:
         # Show CA deductions if any
         if ca_deductions > 0:
             output_parts.append(f"   (Custom: {custom_score}, CA deductions: -{ca_deductions})")
+        if engines_pending:
+            output_parts.append(f"   (Partial: {', '.join(engines_pending)} still running at the deadline)")
 
         # Category breakdown
         if custom_scores:
@@ -257,7 +377,9 @@ def validate_apex_with_ca(file_path: str) -> dict:
 
         # Code Analyzer status
         output_parts.append("")
-        if ca_engines_used:
+        if "code_analyzer" in engines_pending:
+            output_parts.append(f" Code Analyzer: Still running after {PIPELINE_DEADLINE_SECONDS:g}s (partial results)")
+        elif ca_engines_used:
             output_parts.append(f" Code Analyzer: {', '.join(ca_engines_used)}")
         elif ca_available:
             output_parts.append(" Code Analyzer: No engines ran")
@@ -271,6 +393,26 @@ def validate_apex_with_ca(file_path: str) -> dict:
         if scan_time_ms > 0:
             output_parts.append(f"    Scan time: {scan_time_ms}ms")
 
+        # Apex LSP status (silent when the LSP is not installed)
+        if "lsp" in engines_pending:
+            output_parts.append(f" Apex LSP: Still running after {PIPELINE_DEADLINE_SECONDS:g}s (partial results)")
+        elif lsp_result and lsp_result.get("available"):
+            if lsp_result.get("skipped"):
+                output_parts.append(f" Apex LSP: {lsp_result['skipped']}")
+            elif lsp_result.get("error"):
+                output_parts.append(f" Apex LSP: skipped ({lsp_result['error']})")
+            elif lsp_diagnostics:
+                error_count = sum(1 for d in lsp_diagnostics if d.get("severity", 1) == 1)
+                warning_count = sum(1 for d in lsp_diagnostics if d.get("severity", 1) == 2)
+                output_parts.append(
+                    f" Apex LSP: {error_count} error(s), {warning_count} warning(s)"
+                    f" (attempt {lsp_result.get('attempt', 1)}/{lsp_result.get('max_attempts', 3)})"
+                )
+                if error_count:
+                    output_parts.append("    ACTION REQUIRED: fix the compile errors below and save again")
+            else:
+                output_parts.append(" Apex LSP: Syntax, types and symbol references OK")
+
         # Live Query Plan section
         if live_plan_results:
             output_parts.append("")
@@ -304,16 +446,15 @@ def validate_apex_with_ca(file_path: str) -> dict:
                 'fix': issue.get('fix', ''),
             })
 
-        # Add CA violations
-        for v in ca_violations:
-            if isinstance(v, dict):
-                all_issues.append({
-                    'severity': v.get('severity_label', 'INFO'),
-                    'source': f"CA:{v.get('engine', '')}",
-                    'line': v.get('line', 0),
-                    'message': v.get('message', '')[:80],
-                    'rule': v.get('rule', ''),
-                })
+        # Add CA violations and LSP diagnostics
+        for v in engine_violations:
+            all_issues.append({
+                'severity': v.get('severity_label', 'INFO'),
+                'source': "LSP" if v.get('engine') == 'apex-lsp' else f"CA:{v.get('engine', '')}",
+                'line': v.get('line', 0),
+                'message': v.get('message', '')[:80],
+                'rule': v.get('rule', ''),
+            })
 
         if all_issues:
             output_parts.append("")
@@ -6,21 +6,50 @@ PostToolUse hook that runs prettier --write on .cls/.trigger files
 after Write/Edit operations. Ensures consistent code formatting
 before other validators run.
 
+Formatting goes through a persistent Node worker (prettier-worker.js) that
+keeps prettier and prettier-plugin-apex loaded between saves. The first save
+starts it on demand on a Unix socket next to the prettier runtime; it exits
+on its own after SF_PRETTIER_WORKER_IDLE_SECONDS (default 900) idle. Where
+the worker cannot run, each save falls back to the prettier CLI.
+
+Files whose content hash matches a previous prettier output are skipped
+without contacting prettier at all.
+
+Batch mode formats many files with one worker:
+    python3 prettier-format.py --batch force-app/main/default/classes Foo.trigger
+    python3 prettier-format.py --stop-worker
+
 Requires: npm install -g prettier prettier-plugin-apex
 Degrades gracefully if not installed.
 """
 
+import hashlib
 import json
 import os
 import shutil
+import socket
 import subprocess
 import sys
+import tempfile
+import time
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional
 
 APEX_EXTENSIONS = {".cls", ".trigger"}
 
 # Prettier runtime: local install at ~/.claude/prettier/ with prettier-plugin-apex
 PRETTIER_DIR = Path.home() / ".claude" / "prettier"
+PRETTIER_ARGS = ["--plugin=prettier-plugin-apex", "--tab-width=4", "--print-width=120"]
+
+WORKER_SCRIPT = Path(__file__).resolve().with_name("prettier-worker.js")
+WORKER_SOCKET = PRETTIER_DIR / "worker.sock"
+WORKER_START_SECONDS = 5
+REQUEST_TIMEOUT = 15
+CLI_BATCH_SIZE = 100
+
+# Content hashes of prettier output, so unchanged files skip the formatter
+FORMATTED_CACHE_PATH = Path.home() / ".claude" / "cache" / "prettier-formatted.json"
+FORMATTED_CACHE_MAX = 5000
 
 
 def is_prettier_available() -> bool:
@@ -29,59 +58,320 @@ def is_prettier_available() -> bool:
     return npx_path.exists()
 
 
-def format_file(file_path: str) -> dict:
-    """Run prettier on an Apex file and return the result."""
-    if not os.path.exists(file_path):
-        return {"formatted": False, "reason": "File not found"}
+def content_hash(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
 
-    ext = Path(file_path).suffix.lower()
-    if ext not in APEX_EXTENSIONS:
-        return {"formatted": False, "reason": "Not an Apex file"}
 
-    if not is_prettier_available():
-        return {"formatted": False, "reason": "prettier not installed (run sf-skills --update)"}
+def _runtime_fingerprint() -> str:
+    """Options plus installed prettier/plugin versions; an upgrade invalidates the cache."""
+    parts = list(PRETTIER_ARGS)
+    for package in ("prettier", "prettier-plugin-apex"):
+        try:
+            with (PRETTIER_DIR / "node_modules" / package / "package.json").open("r", encoding="utf-8") as f:
+                parts.append(f"{package}@{json.load(f).get('version')}")
+        except (OSError, ValueError, AttributeError):
+            parts.append(f"{package}@?")
+    return "|".join(parts)
 
-    # Read content before formatting
-    try:
-        with open(file_path, "r") as f:
-            before = f.read()
-    except Exception:
-        return {"formatted": False, "reason": "Cannot read file"}
 
-    # Run prettier from the runtime dir (where node_modules has the plugin)
+class FormattedCache:
+    """Hashes of file contents prettier has already produced."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or FORMATTED_CACHE_PATH
+        self.fingerprint = _runtime_fingerprint()
+        self.hashes: Dict[str, float] = {}
+        self._dirty = False
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                payload = json.load(f)
+            if payload.get("fingerprint") == self.fingerprint:
+                self.hashes = dict(payload.get("hashes") or {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self.hashes
+
+    def add(self, digest: Optional[str]) -> None:
+        if digest:
+            self.hashes[digest] = time.time()
+            self._dirty = True
+
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+        if len(self.hashes) > FORMATTED_CACHE_MAX:
+            newest = sorted(self.hashes.items(), key=lambda item: item[1])[-FORMATTED_CACHE_MAX:]
+            self.hashes = dict(newest)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=".prettier-", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"fingerprint": self.fingerprint, "hashes": self.hashes}, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError:
+            pass
+
+
+class PrettierWorker:
+    """Client for prettier-worker.js over newline-delimited JSON.
+
+    ``persistent=True`` talks to the shared socket worker (starting it if
+    needed) so it outlives this process; otherwise a private worker is driven
+    over stdin/stdout and stops with ``close()``.
+    """
+
+    def __init__(self, persistent: bool = True):
+        # Unix socket paths are limited to ~104 bytes on macOS
+        self.persistent = persistent and hasattr(socket, "AF_UNIX") and len(str(WORKER_SOCKET)) < 100
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._proc: Optional[subprocess.Popen] = None
+        self._next_id = 0
+
+    @staticmethod
+    def available() -> bool:
+        return WORKER_SCRIPT.exists() and shutil.which("node") is not None
+
+    def _connect_socket(self) -> bool:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(REQUEST_TIMEOUT)
+        try:
+            sock.connect(str(WORKER_SOCKET))
+        except OSError:
+            sock.close()
+            return False
+        self._sock = sock
+        self._reader = sock.makefile("r", encoding="utf-8")
+        return True
+
+    def _start(self) -> bool:
+        node = shutil.which("node")
+        if node is None or not WORKER_SCRIPT.exists():
+            return False
+        if not self.persistent:
+            self._proc = subprocess.Popen(
+                [node, str(WORKER_SCRIPT), str(PRETTIER_DIR), "--stdio"],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                text=True, encoding="utf-8", cwd=str(PRETTIER_DIR),
+            )
+            self._reader = self._proc.stdout
+            return True
+
+        if self._connect_socket():
+            return True
+        with open(os.devnull, "r") as devnull_in, open(os.devnull, "w") as devnull_out:
+            launched = subprocess.Popen(
+                [node, str(WORKER_SCRIPT), str(PRETTIER_DIR), "--socket", str(WORKER_SOCKET)],
+                stdin=devnull_in, stdout=devnull_out, stderr=devnull_out,
+                cwd=str(PRETTIER_DIR), start_new_session=True, close_fds=True,
+            )
+        deadline = time.monotonic() + WORKER_START_SECONDS
+        while time.monotonic() < deadline:
+            if self._connect_socket():
+                return True
+            if launched.poll() not in (None, 0):
+                return False  # Worker could not load prettier; use the CLI
+            time.sleep(0.05)
+        return False
+
+    def request(self, payload: dict) -> Optional[dict]:
+        """Send one request; None if the worker is unreachable or misbehaves."""
+        if self._reader is None and not self._start():
+            return None
+        self._next_id += 1
+        payload = dict(payload, id=self._next_id)
+        line = json.dumps(payload) + "\n"
+        try:
+            if self._sock is not None:
+                self._sock.sendall(line.encode("utf-8"))
+            else:
+                self._proc.stdin.write(line)
+                self._proc.stdin.flush()
+            response = json.loads(self._reader.readline() or "null")
+        except (OSError, ValueError):
+            self.close()
+            return None
+        if not isinstance(response, dict) or response.get("id") != payload["id"]:
+            self.close()
+            return None
+        return response
+
+    def format(self, paths: List[str]) -> Optional[List[dict]]:
+        response = self.request({"files": paths})
+        return response.get("results") if response else None
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+        if self._proc is not None:
+            try:
+                self._proc.stdin.close()
+                self._proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self._proc.kill()
+        self._sock = self._reader = self._proc = None
+
+
+def _run_cli(paths: List[str]) -> Optional[str]:
+    """Format files with the prettier CLI; returns an error reason or None."""
     prettier_bin = str(PRETTIER_DIR / "node_modules" / ".bin" / "prettier")
     try:
         result = subprocess.run(
-            [
-                prettier_bin, "--write",
-                "--plugin=prettier-plugin-apex",
-                "--tab-width=4",
-                "--print-width=120",
-                os.path.abspath(file_path)
-            ],
-            capture_output=True, text=True, timeout=15,
+            [prettier_bin, "--write", *PRETTIER_ARGS, *paths],
+            capture_output=True, text=True, timeout=REQUEST_TIMEOUT * max(1, len(paths) // 10),
             cwd=str(PRETTIER_DIR)
         )
+    except subprocess.TimeoutExpired:
+        return "prettier timed out"
+    except Exception as e:
+        return f"Error: {e}"
+    if result.returncode != 0:
+        return f"prettier error: {result.stderr.strip()[:100]}"
+    return None
 
-        if result.returncode != 0:
-            return {
-                "formatted": False,
-                "reason": f"prettier error: {result.stderr.strip()[:100]}"
-            }
 
-        # Read content after formatting
-        with open(file_path, "r") as f:
-            after = f.read()
+def _format_with_cli(paths: List[str], before: Dict[str, str], cache: FormattedCache) -> Dict[str, dict]:
+    results = {}
+    for start in range(0, len(paths), CLI_BATCH_SIZE):
+        chunk = paths[start:start + CLI_BATCH_SIZE]
+        error = _run_cli(chunk)
+        for path in chunk:
+            if error:
+                results[path] = {"formatted": False, "reason": error}
+                continue
+            try:
+                with open(path, "rb") as f:
+                    after = content_hash(f.read())
+            except OSError:
+                results[path] = {"formatted": False, "reason": "Cannot read file"}
+                continue
+            cache.add(after)
+            results[path] = _result(after != before[path])
+    return results
 
-        if before == after:
-            return {"formatted": False, "reason": "Already formatted"}
+
+def _result(formatted: bool) -> dict:
+    if formatted:
+        return {"formatted": True, "reason": "Auto-formatted by prettier"}
+    return {"formatted": False, "reason": "Already formatted"}
+
+
+def format_files(file_paths: Iterable[str], worker: Optional[PrettierWorker] = None) -> Dict[str, dict]:
+    """Format Apex files in one worker request; results keyed by the given path."""
+    results: Dict[str, dict] = {}
+    pending: Dict[str, str] = {}
+    before: Dict[str, str] = {}
+
+    for file_path in file_paths:
+        if not os.path.exists(file_path):
+            results[file_path] = {"formatted": False, "reason": "File not found"}
+        elif Path(file_path).suffix.lower() not in APEX_EXTENSIONS:
+            results[file_path] = {"formatted": False, "reason": "Not an Apex file"}
         else:
-            return {"formatted": True, "reason": "Auto-formatted by prettier"}
+            pending[os.path.abspath(file_path)] = file_path
+    if not pending:
+        return results
 
-    except subprocess.TimeoutExpired:
-        return {"formatted": False, "reason": "prettier timed out"}
-    except Exception as e:
-        return {"formatted": False, "reason": f"Error: {e}"}
+    if not is_prettier_available():
+        for file_path in pending.values():
+            results[file_path] = {"formatted": False, "reason": "prettier not installed (run sf-skills --update)"}
+        return results
+
+    cache = FormattedCache()
+    to_format = []
+    for abs_path, file_path in pending.items():
+        try:
+            with open(abs_path, "rb") as f:
+                before[abs_path] = content_hash(f.read())
+        except OSError:
+            results[file_path] = {"formatted": False, "reason": "Cannot read file"}
+            continue
+        if before[abs_path] in cache:
+            results[file_path] = {"formatted": False, "reason": "Already formatted (cached)"}
+        else:
+            to_format.append(abs_path)
+
+    if to_format:
+        owned = worker is None
+        worker = worker or PrettierWorker(persistent=True)
+        formatted = worker.format(to_format) if PrettierWorker.available() else None
+        if owned:
+            worker.close()
+
+        if formatted is not None and len(formatted) == len(to_format):
+            for abs_path, entry in zip(to_format, formatted):
+                if entry.get("error"):
+                    results[pending[abs_path]] = {"formatted": False, "reason": f"prettier error: {entry['error'][:100]}"}
+                else:
+                    cache.add(entry.get("hash"))
+                    results[pending[abs_path]] = _result(bool(entry.get("formatted")))
+        else:
+            for abs_path, entry in _format_with_cli(to_format, before, cache).items():
+                results[pending[abs_path]] = entry
+
+    cache.flush()
+    return results
+
+
+def format_file(file_path: str) -> dict:
+    """Run prettier on an Apex file and return the result."""
+    return format_files([file_path])[file_path]
+
+
+def stop_worker() -> bool:
+    """Ask the shared socket worker to exit; False if none was running."""
+    worker = PrettierWorker(persistent=True)
+    if not worker.persistent or not worker._connect_socket():
+        return False
+    response = worker.request({"op": "shutdown"})
+    worker.close()
+    return bool(response and response.get("ok"))
+
+
+def _expand(targets: List[str]) -> List[str]:
+    files = []
+    for target in targets:
+        if os.path.isdir(target):
+            for dirpath, dirnames, filenames in os.walk(target):
+                dirnames[:] = sorted(name for name in dirnames if name not in {"node_modules", ".sfdx", ".sf"} and not name.startswith("."))
+                files.extend(os.path.join(dirpath, name) for name in sorted(filenames) if Path(name).suffix.lower() in APEX_EXTENSIONS)
+        else:
+            files.append(target)
+    return files
+
+
+def batch_main(targets: List[str]) -> int:
+    """Format every .cls/.trigger under ``targets`` with one private worker."""
+    files = _expand(targets)
+    if not files:
+        print("No .cls or .trigger files found")
+        return 0
+
+    started = time.perf_counter()
+    worker = PrettierWorker(persistent=False)
+    try:
+        results = format_files(files, worker=worker)
+    finally:
+        worker.close()
+
+    formatted = [path for path, result in results.items() if result.get("formatted")]
+    cached = [path for path, result in results.items() if result.get("reason") == "Already formatted (cached)"]
+    failed = {
+        path: result["reason"] for path, result in results.items()
+        if not result.get("formatted") and not result.get("reason", "").startswith("Already formatted")
+    }
+    for path in formatted:
+        print(f"formatted  {path}")
+    for path, reason in failed.items():
+        print(f"failed     {path}: {reason}")
+    print(
+        f"{len(files)} files: {len(formatted)} formatted, {len(cached)} skipped (cached), "
+        f"{len(failed)} failed in {time.perf_counter() - started:.2f}s"
+    )
+    return 1 if failed else 0
 
 
 def main():
@@ -114,4 +404,9 @@ def main():
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        sys.exit(batch_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "--stop-worker":
+        print("Prettier worker stopped" if stop_worker() else "No prettier worker running")
+        sys.exit(0)
     main()
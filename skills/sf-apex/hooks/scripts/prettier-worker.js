@@ -0,0 +1,145 @@
+#!/usr/bin/env node
+/**
+ * Persistent prettier worker for the sf-apex format hook.
+ *
+ * Loads prettier + prettier-plugin-apex once and formats files on request,
+ * so a save costs one JSON round-trip instead of a Node start-up and plugin
+ * resolution. Requests and responses are newline-delimited JSON:
+ *
+ *   {"id": 1, "files": ["/abs/Foo.cls", "/abs/Bar.trigger"]}
+ *   {"id": 1, "results": [{"path": "...", "formatted": true, "hash": "<sha1>"}, ...]}
+ *
+ *   {"id": 2, "op": "ping"}      -> {"id": 2, "ok": true, "version": "3.x"}
+ *   {"id": 3, "op": "shutdown"}  -> {"id": 3, "ok": true}, then exit
+ *
+ * "hash" is the SHA-1 of the file content after formatting, so the caller
+ * can skip files it has already seen formatted.
+ *
+ * Usage:
+ *   node prettier-worker.js <prettier-dir> --stdio
+ *       Serve requests on stdin/stdout for the lifetime of the parent.
+ *   node prettier-worker.js <prettier-dir> --socket <path>
+ *       Serve requests on a Unix socket; exits after SF_PRETTIER_WORKER_IDLE_SECONDS
+ *       (default 900) without requests.
+ */
+"use strict";
+
+const crypto = require("crypto");
+const fs = require("fs");
+const net = require("net");
+const readline = require("readline");
+
+const [, , prettierDir, mode = "--stdio", socketPath] = process.argv;
+const IDLE_MS = Number(process.env.SF_PRETTIER_WORKER_IDLE_SECONDS || 900) * 1000;
+
+const prettier = require(require.resolve("prettier", { paths: [prettierDir] }));
+const OPTIONS = {
+  plugins: [require.resolve("prettier-plugin-apex", { paths: [prettierDir] })],
+  tabWidth: 4,
+  printWidth: 120,
+};
+
+function sha1(text) {
+  return crypto.createHash("sha1").update(text, "utf8").digest("hex");
+}
+
+async function formatFile(filePath) {
+  try {
+    const source = fs.readFileSync(filePath, "utf8");
+    const output = await prettier.format(source, { ...OPTIONS, filepath: filePath });
+    if (output !== source) {
+      fs.writeFileSync(filePath, output);
+    }
+    return { path: filePath, formatted: output !== source, hash: sha1(output) };
+  } catch (err) {
+    const message = String((err && err.message) || err).split("\n")[0];
+    return { path: filePath, formatted: false, error: message.slice(0, 200) };
+  }
+}
+
+async function handle(line) {
+  let request;
+  try {
+    request = JSON.parse(line);
+  } catch (err) {
+    return { id: null, error: "invalid JSON request" };
+  }
+  if (request.op === "ping") {
+    return { id: request.id, ok: true, version: prettier.version };
+  }
+  if (request.op === "shutdown") {
+    setImmediate(shutdown);
+    return { id: request.id, ok: true };
+  }
+  const results = [];
+  for (const filePath of request.files || []) {
+    results.push(await formatFile(filePath));
+  }
+  return { id: request.id, results };
+}
+
+// Serve one line-oriented stream; requests on a stream are answered in order
+function serve(input, output) {
+  let queue = Promise.resolve();
+  readline.createInterface({ input, crlfDelay: Infinity }).on("line", (line) => {
+    if (!line.trim()) return;
+    queue = queue.then(async () => {
+      touch();
+      output.write(JSON.stringify(await handle(line)) + "\n");
+    });
+  });
+  return () => queue;
+}
+
+let server = null;
+let idleTimer = null;
+
+function touch() {
+  if (!server) return;
+  clearTimeout(idleTimer);
+  idleTimer = setTimeout(shutdown, IDLE_MS);
+  idleTimer.unref();
+}
+
+function shutdown() {
+  if (server) {
+    server.close();
+    try {
+      fs.unlinkSync(socketPath);
+    } catch (err) {
+      // Already removed
+    }
+  }
+  process.exit(0);
+}
+
+function listen(retried) {
+  server = net.createServer((conn) => {
+    conn.on("error", () => conn.destroy()); // Hook gave up waiting; keep serving others
+    serve(conn, conn);
+  });
+  server.on("error", (err) => {
+    if (err.code !== "EADDRINUSE" || retried) {
+      process.exit(1);
+    }
+    // Another worker may own the socket; only take over a stale one
+    const probe = net.connect(socketPath, () => process.exit(0));
+    probe.on("error", () => {
+      try {
+        fs.unlinkSync(socketPath);
+      } catch (unlinkErr) {
+        // Raced with another worker's cleanup
+      }
+      listen(true);
+    });
+  });
+  server.listen(socketPath, touch);
+}
+
+if (mode === "--socket" && socketPath) {
+  process.on("SIGTERM", shutdown);
+  listen(false);
+} else {
+  const drained = serve(process.stdin, process.stdout);
+  process.stdin.on("end", () => drained().then(() => process.exit(0)));
+}
@@ -22,6 +22,24 @@ import sys
 import os
 from typing import Dict, List, Tuple
 
+# Puts the shared code_analyzer package on sys.path
+import code_analyzer_path  # noqa: F401
+
+from code_analyzer.apex_lexer import lex_apex  # noqa: E402
+from code_analyzer.pattern_engine import PatternEngine, group_hits  # noqa: E402
+
+# Match actual class declarations (with optional modifiers), not "class" in comments
+CLASS_PATTERN = r'^\s*(?:public|private|global|virtual|abstract|with\s+sharing|without\s+sharing|\s)*\s*class\s+(\w+)'
+
+# Line rules compiled once; class/catch rules scan comment-masked code
+PATTERNS = (
+    PatternEngine()
+    .add('class_declaration', CLASS_PATTERN, re.IGNORECASE, first_match_only=True)
+    .add('method_declaration', r'(public|private|protected|global)\s+(static\s+)?(\w+)\s+(\w+)\s*\(',
+         scope='source', first_match_only=True)
+    .add('empty_catch', r'catch\s*\([^)]+\)\s*\{\s*\}', first_match_only=True)
+)
+
 
 class ApexValidator:
     """Validates Apex code for best practices."""
@@ -36,7 +54,9 @@ class ApexValidator:
         self.file_path = file_path
         self.content = ""
         self.lines = []
+        self.source = None
         self.issues = []
+        self.hits = {}
         self.scores = {
             'testing': 25,
             'architecture': 20,
@@ -49,7 +69,8 @@ class ApexValidator:
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 self.content = f.read()
-                self.lines = self.content.split('\n')
+            self.source = lex_apex(self.content)
+            self.lines = self.source.lines
         except Exception as e:
             self.issues.append({
                 'severity': 'CRITICAL',
@@ -76,6 +97,7 @@ class ApexValidator:
 
         # Run checks (bulkification, security, documentation handled by Code Analyzer PMD)
         self._check_null_checks()
+        self.hits = group_hits(PATTERNS.scan(self.content, code=self.source.code))
         self._check_naming_conventions()
         self._check_error_handling()
 
@@ -123,59 +145,47 @@ class ApexValidator:
     def _check_naming_conventions(self):
         """Check for naming convention violations."""
         # Class names should be PascalCase
-        # Match actual class declarations (with optional modifiers), not "class" in comments
-        class_pattern = r'^\s*(?:public|private|global|virtual|abstract|with\s+sharing|without\s+sharing|\s)*\s*class\s+(\w+)'
-        for i, line in enumerate(self.lines, 1):
-            # Skip comment lines
-            stripped = line.strip()
-            if stripped.startswith('//') or stripped.startswith('*') or stripped.startswith('/*'):
-                continue
-            match = re.search(class_pattern, line, re.IGNORECASE)
-            if match:
-                class_name = match.group(1)
-                if not class_name[0].isupper():
+        for hit in self.hits.get('class_declaration', ()):
+            class_name = hit.match.group(1)
+            if not class_name[0].isupper():
+                self.issues.append({
+                    'severity': 'INFO',
+                    'category': 'clean_code',
+                    'message': f'Class name "{class_name}" should be PascalCase',
+                    'line': hit.line
+                })
+                self.scores['clean_code'] -= 2
+
+        # Method names should be camelCase
+        for hit in self.hits.get('method_declaration', ()):
+            i = hit.line
+            method_name = hit.match.group(4)
+            # Skip constructors and test methods
+            if method_name[0].isupper() and '@isTest' not in self.content[:i]:
+                if method_name not in {span.name for span in self.source.classes}:
                     self.issues.append({
                         'severity': 'INFO',
                         'category': 'clean_code',
-                        'message': f'Class name "{class_name}" should be PascalCase',
+                        'message': f'Method name "{method_name}" should be camelCase',
                         'line': i
                     })
                     self.scores['clean_code'] -= 2
 
-        # Method names should be camelCase
-        method_pattern = r'(public|private|protected|global)\s+(static\s+)?(\w+)\s+(\w+)\s*\('
-        for i, line in enumerate(self.lines, 1):
-            match = re.search(method_pattern, line)
-            if match:
-                method_name = match.group(4)
-                # Skip constructors and test methods
-                if method_name[0].isupper() and '@isTest' not in self.content[:i]:
-                    if method_name not in [m.group(1) for m in re.finditer(class_pattern, self.content)]:
-                        self.issues.append({
-                            'severity': 'INFO',
-                            'category': 'clean_code',
-                            'message': f'Method name "{method_name}" should be camelCase',
-                            'line': i
-                        })
-                        self.scores['clean_code'] -= 2
-
     def _check_error_handling(self):
         """Check for error handling patterns."""
         has_try = 'try {' in self.content or 'try{' in self.content
         has_catch = 'catch (' in self.content or 'catch(' in self.content
 
         # Check for empty catch blocks
-        empty_catch_pattern = r'catch\s*\([^)]+\)\s*\{\s*\}'
-        for i, line in enumerate(self.lines, 1):
-            if re.search(empty_catch_pattern, line):
-                self.issues.append({
-                    'severity': 'WARNING',
-                    'category': 'error_handling',
-                    'message': 'Empty catch block - exceptions are silently swallowed',
-                    'line': i,
-                    'fix': 'Log the exception or handle it appropriately'
-                })
-                self.scores['error_handling'] -= 5
+        for hit in self.hits.get('empty_catch', ()):
+            self.issues.append({
+                'severity': 'WARNING',
+                'category': 'error_handling',
+                'message': 'Empty catch block - exceptions are silently swallowed',
+                'line': hit.line,
+                'fix': 'Log the exception or handle it appropriately'
+            })
+            self.scores['error_handling'] -= 5
 
         # Check for generic exception catch without specific handling
         if 'catch (Exception e)' in self.content:
@@ -13,10 +13,64 @@ Validates data operation files against the 130-point scoring system:
 - Documentation (10 points)
 """
 
+import os
 import re
+import sys
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+# Shared code_analyzer package — try installed path first, then dev repo path
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+for _ca_path in (
+    os.path.join(os.path.expanduser("~"), ".claude", "code_analyzer"),
+    os.path.join(_SCRIPT_DIR, "..", "..", "..", "..", "shared", "code_analyzer"),
+):
+    _ca_path = os.path.normpath(_ca_path)
+    if os.path.isdir(_ca_path):
+        if os.path.dirname(_ca_path) not in sys.path:
+            sys.path.insert(0, os.path.dirname(_ca_path))
+        break
+
+from code_analyzer.apex_lexer import lex_apex  # noqa: E402
+from code_analyzer.pattern_engine import PatternEngine, group_hits  # noqa: E402
+
+PII_PATTERNS = [
+    ('pii_ssn', r'\b\d{3}-\d{2}-\d{4}\b', 'SSN pattern detected'),
+    ('pii_credit_card', r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', 'Credit card pattern detected'),
+    ('pii_personal_email', r'\b[A-Za-z0-9._%+-]+@(gmail|yahoo|hotmail|outlook)\.(com|net|org)\b',
+     'Personal email domain in test data'),
+]
+
+BULK_COUNT_PATTERNS = [
+    ('bulk_literal', r'(\d{3,})\s*[;,)]'),  # Numbers 100+
+    ('bulk_count', r'count\s*[=:]\s*(\d{3,})'),
+    ('bulk_record_count', r'recordCount\s*[=:]\s*(\d{3,})'),
+]
+
+
+def _build_apex_rules() -> PatternEngine:
+    """Whole-file .apex checks, compiled once and run in a single scan."""
+    engine = PatternEngine()
+    file_rule = dict(scope='source', multiline=True, first_match_only=True)
+    # Loop/query rules see comment-masked code; PII and doc rules see raw source
+    code_rule = dict(multiline=True, first_match_only=True)
+    engine.add('soql_in_loop', r'for\s*\([^)]*\)\s*\{[^}]*\[SELECT', re.IGNORECASE | re.DOTALL, **code_rule)
+    engine.add('hardcoded_id', r"'[a-zA-Z0-9]{15,18}'", **file_rule)
+    engine.add('select_star', r'SELECT\s+\*', re.IGNORECASE, **code_rule)
+    engine.add('dml_in_loop', r'for\s*\([^)]*\)\s*\{[^}]*(insert|update|delete|upsert)\s+',
+               re.IGNORECASE | re.DOTALL, **code_rule)
+    for rule_id, pattern, _ in PII_PATTERNS:
+        engine.add(rule_id, pattern, **file_rule)
+    for rule_id, pattern in BULK_COUNT_PATTERNS:
+        engine.add(rule_id, pattern, **file_rule)
+    engine.add('block_doc', r'/\*\*[\s\S]*?\*/', **file_rule)
+    engine.add('inline_doc', r'//.*description|//.*purpose|//.*usage', re.IGNORECASE, **file_rule)
+    return engine
+
+
+APEX_RULES = _build_apex_rules()
+
+
 class DataOperationValidator:
     """Validates data operation files."""
 
@@ -72,6 +126,7 @@ class DataOperationValidator:
         self.file_type = ''
         self.issues: List[Dict[str, Any]] = []
         self.recommendations: List[str] = []
+        self.hits: Dict[str, List[Any]] = {}
         self.categories = self._init_categories()
 
     def _init_categories(self) -> Dict[str, Dict[str, Any]]:
@@ -121,6 +176,7 @@ class DataOperationValidator:
     def _validate_apex(self):
         """Validate Apex data operation file."""
         content = self.content
+        self.hits = group_hits(APEX_RULES.scan(content, code=lex_apex(content).code))
 
         # Query Efficiency (25 points)
         self._check_query_efficiency(content)
@@ -231,25 +287,21 @@ class DataOperationValidator:
     def _check_query_efficiency(self, content: str):
         """Check for query efficiency issues."""
         # Check for queries in loops
-        if re.search(r'for\s*\([^)]*\)\s*\{[^}]*\[SELECT', content, re.IGNORECASE | re.DOTALL):
+        if 'soql_in_loop' in self.hits:
             self._deduct('query_efficiency', 10, 'SOQL query inside for loop (N+1 pattern)')
 
         # Check for hardcoded IDs
-        if re.search(r"'[a-zA-Z0-9]{15,18}'", content):
+        if 'hardcoded_id' in self.hits:
             self._deduct('query_efficiency', 5, 'Hardcoded Salesforce ID found')
 
         # Check for SELECT * equivalent (all fields)
-        if re.search(r'SELECT\s+\*', content, re.IGNORECASE):
+        if 'select_star' in self.hits:
             self._deduct('query_efficiency', 5, 'SELECT * is not valid in SOQL')
 
     def _check_bulk_safety(self, content: str):
         """Check for bulk safety issues."""
         # Check for DML in loops
-        dml_in_loop = re.search(
-            r'for\s*\([^)]*\)\s*\{[^}]*(insert|update|delete|upsert)\s+',
-            content, re.IGNORECASE | re.DOTALL
-        )
-        if dml_in_loop:
+        if 'dml_in_loop' in self.hits:
             self._deduct('bulk_safety', 10, 'DML operation inside for loop')
 
         # Check for single-record operations when bulk would be better
@@ -278,15 +330,8 @@ class DataOperationValidator:
     def _check_security(self, content: str):
         """Check for security issues."""
         # Check for PII patterns
-        pii_patterns = [
-            (r'\b\d{3}-\d{2}-\d{4}\b', 'SSN pattern detected'),
-            (r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', 'Credit card pattern detected'),
-            (r'\b[A-Za-z0-9._%+-]+@(gmail|yahoo|hotmail|outlook)\.(com|net|org)\b',
-             'Personal email domain in test data')
-        ]
-
-        for pattern, message in pii_patterns:
-            if re.search(pattern, content):
+        for rule_id, _, message in PII_PATTERNS:
+            if rule_id in self.hits:
                 self._deduct('security_fls', 10, message)
 
         # Check for WITH USER_MODE usage (good practice)
@@ -296,18 +341,11 @@ class DataOperationValidator:
     def _check_test_patterns(self, content: str):
         """Check for good test data patterns."""
         # Check for bulk record creation (200+)
-        bulk_patterns = [
-            r'(\d{3,})\s*[;,)]',  # Numbers 100+
-            r'count\s*[=:]\s*(\d{3,})',
-            r'recordCount\s*[=:]\s*(\d{3,})'
-        ]
-
         has_bulk = False
-        for pattern in bulk_patterns:
-            match = re.search(pattern, content)
-            if match:
+        for rule_id, _ in BULK_COUNT_PATTERNS:
+            if rule_id in self.hits:
                 try:
-                    num = int(match.group(1))
+                    num = int(self.hits[rule_id][0].match.group(1))
                     if num >= 200:
                         has_bulk = True
                 except ValueError:
@@ -343,9 +381,9 @@ class DataOperationValidator:
             self._deduct('documentation', 3, 'Missing file header documentation')
 
         # Check for method documentation
-        if re.search(r'/\*\*[\s\S]*?\*/', content):
+        if 'block_doc' in self.hits:
             pass  # Has JSDoc-style comments
-        elif re.search(r'//.*description|//.*purpose|//.*usage', content, re.IGNORECASE):
+        elif 'inline_doc' in self.hits:
             pass  # Has inline documentation
         else:
             self._deduct('documentation', 2, 'Consider adding method/section documentation')
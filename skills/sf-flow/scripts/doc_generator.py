@@ -7,38 +7,98 @@ by parsing flow XML and populating the documentation template.
 
 Usage:
     python doc_generator.py <path-to-flow.xml> [output-path.md]
+    python doc_generator.py --batch <flows-dir> [--output-dir DIR] [--workers N] [--force]
+
+Batch mode documents every flow under a directory in parallel. Output mirrors
+the source tree, so flows with the same name in different directories get
+separate files. The template is compiled once, and a manifest of source
+hashes in the output directory means only flows that changed since the last
+run are re-documented. Docs the manifest lists for flows that were deleted
+or renamed since are removed; other files in the output directory are left
+alone.
 """
 
 import xml.etree.ElementTree as ET
+import argparse
+import hashlib
+import json
 import os
 import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+SF_NAMESPACE = 'http://soap.sforce.com/2006/04/metadata'
+FLOW_SUFFIXES = ('.flow-meta.xml', '.flow')
+MANIFEST_NAME = '.flow-docs-manifest.json'
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TEMPLATE_PATH = os.path.join(_SCRIPT_DIR, '..', 'assets', 'flow-documentation-template.md')
+
+_PLACEHOLDER_RE = re.compile(r'\{\{([A-Za-z0-9_]+)\}\}')
+
+
+class CompiledTemplate:
+    """Documentation template split once into literal text and placeholder slots."""
+
+    def __init__(self, text: str):
+        self.digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        # Even indexes are literal text, odd indexes are placeholder names
+        self.segments: Tuple[str, ...] = tuple(_PLACEHOLDER_RE.split(text))
+
+    @classmethod
+    def from_file(cls, template_path: str) -> 'CompiledTemplate':
+        with open(template_path, 'r') as f:
+            return cls(f.read())
+
+    def render(self, data: Dict[str, str]) -> str:
+        """Fill placeholders in one pass; unknown placeholders are left as-is."""
+        parts = []
+        for i, segment in enumerate(self.segments):
+            if i % 2 == 0:
+                parts.append(segment)
+            elif segment in data:
+                parts.append(str(data[segment]))
+            else:
+                parts.append(f"{{{{{segment}}}}}")
+        return ''.join(parts)
+
 
 class FlowDocGenerator:
     """Generates documentation from flow XML."""
 
-    def __init__(self, flow_xml_path: str, template_path: str = None):
+    def __init__(
+        self,
+        flow_xml_path: str,
+        template_path: str = None,
+        template: Optional[CompiledTemplate] = None,
+    ):
         """
         Initialize the documentation generator.
 
         Args:
             flow_xml_path: Path to the flow XML file
             template_path: Path to template file (optional)
+            template: Pre-compiled template; takes precedence over template_path
         """
         self.flow_path = flow_xml_path
         self.tree = ET.parse(flow_xml_path)
         self.root = self.tree.getroot()
-        self.namespace = {'sf': 'http://soap.sforce.com/2006/04/metadata'}
+        self.namespace = {'sf': SF_NAMESPACE}
 
-        # Load template
-        if template_path is None:
-            # Use default template location
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            template_path = os.path.join(script_dir, '..', 'templates', 'flow-documentation-template.md')
+        # Index every element by local tag name in a single traversal so
+        # the section helpers below never re-walk the tree
+        self._index: Dict[str, List[ET.Element]] = defaultdict(list)
+        prefix = f'{{{SF_NAMESPACE}}}'
+        for elem in self.root.iter():
+            if elem is not self.root and elem.tag.startswith(prefix):
+                self._index[elem.tag[len(prefix):]].append(elem)
 
-        with open(template_path, 'r') as f:
-            self.template = f.read()
+        if template is None:
+            template = CompiledTemplate.from_file(template_path or DEFAULT_TEMPLATE_PATH)
+        self.template = template
 
     def generate(self) -> str:
         """
@@ -50,13 +110,7 @@ class FlowDocGenerator:
         # Extract all data from flow
         data = self._extract_flow_data()
 
-        # Replace all placeholders
-        doc = self.template
-        for key, value in data.items():
-            placeholder = f"{{{{{key}}}}}"
-            doc = doc.replace(placeholder, str(value))
-
-        return doc
+        return self.template.render(data)
 
     def _extract_flow_data(self) -> Dict[str, str]:
         """Extract all relevant data from flow XML."""
@@ -201,7 +255,9 @@ class FlowDocGenerator:
         # Check if record-triggered
         if self.root.find('sf:triggerType', self.namespace) is not None:
             trigger_type = self._get_text('triggerType', '')
-            object_name = self._get_text('.//sf:start/sf:object', '')
+            starts = self._elements('start')
+            start_object = starts[0].find('sf:object', self.namespace) if starts else None
+            object_name = start_object.text if start_object is not None else ''
             return f"Record-Triggered ({trigger_type} on {object_name})"
 
         type_map = {
@@ -215,7 +271,8 @@ class FlowDocGenerator:
     def _get_entry_criteria(self) -> str:
         """Get entry criteria for the flow."""
         # Check for record trigger
-        trigger_elem = self.root.find('.//sf:start', self.namespace)
+        starts = self._elements('start')
+        trigger_elem = starts[0] if starts else None
         if trigger_elem is not None:
             object_elem = trigger_elem.find('sf:object', self.namespace)
             trigger_type_elem = trigger_elem.find('sf:recordTriggerType', self.namespace)
@@ -229,7 +286,7 @@ class FlowDocGenerator:
 
     def _get_decision_points(self) -> str:
         """List all decision points."""
-        decisions = self.root.findall('.//sf:decisions', self.namespace)
+        decisions = self._elements('decisions')
         if not decisions:
             return "No decision points (linear flow)"
 
@@ -258,9 +315,13 @@ class FlowDocGenerator:
         else:
             return "Complex (multiple branches/subflows)"
 
+    def _elements(self, element_type: str) -> List[ET.Element]:
+        """Return all descendant elements of a type from the prebuilt index."""
+        return self._index.get(element_type, [])
+
     def _count_elements(self, element_type: str) -> int:
         """Count elements of a specific type."""
-        return len(self.root.findall(f'.//sf:{element_type}', self.namespace))
+        return len(self._elements(element_type))
 
     def _count_dml_operations(self) -> int:
         """Count all DML operations."""
@@ -284,7 +345,7 @@ class FlowDocGenerator:
 
     def _get_child_subflows(self) -> str:
         """List child subflows called."""
-        subflows = self.root.findall('.//sf:subflows', self.namespace)
+        subflows = self._elements('subflows')
         if not subflows:
             return "N/A - no child subflows"
 
@@ -313,10 +374,10 @@ class FlowDocGenerator:
     def _check_bulkification(self) -> str:
         """Check bulkification status."""
         # Check for DML in loops (anti-pattern)
-        loops = self.root.findall('.//sf:loops', self.namespace)
+        loops = self._elements('loops')
         for loop in loops:
             # This is a simplified check
-            if self.root.find('.//sf:recordCreates', self.namespace) is not None:
+            if self._elements('recordCreates'):
                 return "⚠️ Potential issue - verify no DML in loops"
 
         return "✅ Appears bulkified"
@@ -330,7 +391,7 @@ class FlowDocGenerator:
         # Count DML with fault paths
         dml_with_faults = 0
         for dml_type in ['recordCreates', 'recordUpdates', 'recordDeletes']:
-            for element in self.root.findall(f'.//sf:{dml_type}', self.namespace):
+            for element in self._elements(dml_type):
                 fault = element.find('sf:faultConnector', self.namespace)
                 if fault is not None:
                     dml_with_faults += 1
@@ -343,7 +404,7 @@ class FlowDocGenerator:
     def _detect_error_logging(self) -> str:
         """Detect error logging method."""
         # Check for Sub_LogError calls
-        for subflow in self.root.findall('.//sf:subflows', self.namespace):
+        for subflow in self._elements('subflows'):
             flow_name = subflow.find('sf:flowName', self.namespace)
             if flow_name is not None and 'LogError' in flow_name.text:
                 return "Sub_LogError (structured logging)"
@@ -353,7 +414,7 @@ class FlowDocGenerator:
     def _get_alert_mechanism(self) -> str:
         """Get alert mechanism."""
         # Check for email alerts
-        for action in self.root.findall('.//sf:actionCalls', self.namespace):
+        for action in self._elements('actionCalls'):
             action_name = action.find('sf:actionName', self.namespace)
             if action_name is not None and 'email' in action_name.text.lower():
                 return "Email notifications"
@@ -362,7 +423,7 @@ class FlowDocGenerator:
 
     def _get_subflows_used(self) -> str:
         """List subflows used."""
-        subflows = self.root.findall('.//sf:subflows', self.namespace)
+        subflows = self._elements('subflows')
         if not subflows:
             return "None"
 
@@ -382,7 +443,7 @@ class FlowDocGenerator:
     def _get_input_variables(self) -> str:
         """List input variables."""
         result = []
-        for var in self.root.findall('.//sf:variables', self.namespace):
+        for var in self._elements('variables'):
             is_input = var.find('sf:isInput', self.namespace)
             if is_input is not None and is_input.text == 'true':
                 name = var.find('sf:name', self.namespace)
@@ -396,7 +457,7 @@ class FlowDocGenerator:
     def _get_output_variables(self) -> str:
         """List output variables."""
         result = []
-        for var in self.root.findall('.//sf:variables', self.namespace):
+        for var in self._elements('variables'):
             is_output = var.find('sf:isOutput', self.namespace)
             if is_output is not None and is_output.text == 'true':
                 name = var.find('sf:name', self.namespace)
@@ -426,7 +487,7 @@ class FlowDocGenerator:
         objects = set()
 
         for elem_type in ['recordCreates', 'recordUpdates', 'recordDeletes', 'recordLookups']:
-            for element in self.root.findall(f'.//sf:{elem_type}', self.namespace):
+            for element in self._elements(elem_type):
                 obj = element.find('sf:object', self.namespace)
                 if obj is not None:
                     objects.add(obj.text)
@@ -455,7 +516,7 @@ class FlowDocGenerator:
         fields = set()
 
         # Extract fields from various operations
-        for elem in self.root.findall('.//sf:field', self.namespace):
+        for elem in self._elements('field'):
             if elem.text:
                 fields.add(elem.text)
 
@@ -474,7 +535,7 @@ class FlowDocGenerator:
 
     def _get_required_apex(self) -> str:
         """List required Apex classes."""
-        actions = self.root.findall('.//sf:actionCalls', self.namespace)
+        actions = self._elements('actionCalls')
         apex_classes = set()
 
         for action in actions:
@@ -531,20 +592,217 @@ def generate_documentation(flow_xml_path: str, output_path: str = None) -> str:
     return doc
 
 
-if __name__ == "__main__":
-    import sys
+# ═══════════════════════════════════════════════════════════════════════
+# Batch mode
+# ═══════════════════════════════════════════════════════════════════════
+
+@dataclass
+class BatchResult:
+    """Outcome of documenting a directory of flows."""
+    generated: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    pruned: List[str] = field(default_factory=list)
+
+
+def flow_name_from_path(flow_path: str) -> str:
+    """Strip the flow metadata suffix from a file name."""
+    base = os.path.basename(flow_path)
+    for suffix in FLOW_SUFFIXES:
+        if base.endswith(suffix):
+            return base[:-len(suffix)]
+    return os.path.splitext(base)[0]
+
+
+def find_flow_files(source_dir: str) -> List[str]:
+    """Find all flow metadata files under a directory, sorted for stable output."""
+    found = []
+    for dirpath, _dirnames, filenames in os.walk(source_dir):
+        for name in filenames:
+            if name.endswith(FLOW_SUFFIXES):
+                found.append(os.path.join(dirpath, name))
+    return sorted(found)
+
+
+def batch_output_path(output_dir: str, rel_path: str) -> str:
+    """Documentation path for a flow at rel_path under the batch source directory."""
+    rel_dir = os.path.dirname(rel_path)
+    return os.path.join(output_dir, rel_dir, f"{flow_name_from_path(rel_path)}_documentation.md")
+
+
+def _hash_file(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _load_manifest(output_dir: str) -> Dict:
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(output_dir: str, manifest: Dict) -> None:
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _prune_stale_docs(output_dir: str, stale: List[str]) -> List[str]:
+    """
+    Remove the docs of flows (rel paths) no longer in the batch source.
+
+    Subdirectories left empty are removed too, up to output_dir.
+    """
+    removed = []
+    root = os.path.abspath(output_dir)
+    for rel_path in sorted(stale):
+        doc_path = batch_output_path(output_dir, rel_path)
+        try:
+            os.remove(doc_path)
+        except FileNotFoundError:
+            continue
+        removed.append(doc_path)
+        parent = os.path.dirname(os.path.abspath(doc_path))
+        while parent != root and parent.startswith(root + os.sep):
+            try:
+                os.rmdir(parent)
+            except OSError:
+                break  # Not empty
+            parent = os.path.dirname(parent)
+    return removed
+
+
+# Set once per worker process by _init_worker so the template is not
+# re-read or re-compiled for every flow.
+_WORKER_TEMPLATE: Optional[CompiledTemplate] = None
+
+
+def _init_worker(template: CompiledTemplate) -> None:
+    global _WORKER_TEMPLATE
+    _WORKER_TEMPLATE = template
+
+
+def _document_one(flow_path: str, output_path: str) -> Tuple[str, Optional[str]]:
+    """Worker entry point: render one flow. Returns (flow_path, error)."""
+    try:
+        doc = FlowDocGenerator(flow_path, template=_WORKER_TEMPLATE).generate()
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        with open(output_path, 'w') as f:
+            f.write(doc)
+        return flow_path, None
+    except Exception as e:
+        return flow_path, str(e)
+
 
-    if len(sys.argv) < 2:
-        print("Usage: python doc_generator.py <path-to-flow.xml> [output-path.md]")
-        sys.exit(1)
+def generate_directory_docs(
+    source_dir: str,
+    output_dir: str,
+    template_path: str = None,
+    workers: Optional[int] = None,
+    force: bool = False,
+) -> BatchResult:
+    """
+    Document every flow under source_dir into output_dir.
+
+    Flows whose source hash (and the template hash) match the manifest from
+    the previous run are skipped unless force is set. Docs the manifest
+    lists for flows no longer under source_dir are deleted.
 
-    flow_path = sys.argv[1]
-    output_path = sys.argv[2] if len(sys.argv) > 2 else None
+    Args:
+        source_dir: Directory searched recursively for flow metadata files
+        output_dir: Directory receiving <FlowName>_documentation.md files,
+            in the same relative subdirectory as each flow
+        template_path: Path to template file (optional)
+        workers: Worker process count (default: CPU count)
+        force: Regenerate every flow regardless of the manifest
+
+    Returns:
+        BatchResult listing generated, skipped and failed flows, and
+        pruned doc paths
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    template = CompiledTemplate.from_file(template_path or DEFAULT_TEMPLATE_PATH)
+
+    manifest = _load_manifest(output_dir)
+    documented = manifest.get('flows', {})
+    previous = documented if manifest.get('template') == template.digest else {}
+    current: Dict[str, Optional[str]] = {}
+
+    result = BatchResult()
+    pending: List[Tuple[str, str]] = []
+    for flow_path in find_flow_files(source_dir):
+        rel_path = os.path.relpath(flow_path, source_dir)
+        output_path = batch_output_path(output_dir, rel_path)
+        digest = _hash_file(flow_path)
+        current[rel_path] = digest
+
+        if not force and previous.get(rel_path) == digest and os.path.exists(output_path):
+            result.skipped.append(flow_path)
+        else:
+            pending.append((flow_path, output_path))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(pending) <= 1:
+        _init_worker(template)
+        outcomes = [_document_one(*job) for job in pending]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(pending)),
+            initializer=_init_worker,
+            initargs=(template,),
+        ) as pool:
+            outcomes = list(pool.map(_document_one, *zip(*pending), chunksize=8))
+
+    for flow_path, error in outcomes:
+        if error is None:
+            result.generated.append(flow_path)
+        else:
+            result.failed[flow_path] = error
+            # Never record a hash for a flow we failed to document, but keep
+            # the entry so a stale doc is still pruned once the flow is gone
+            current[os.path.relpath(flow_path, source_dir)] = None
+
+    result.pruned = _prune_stale_docs(output_dir, [rel for rel in documented if rel not in current])
+    _save_manifest(output_dir, {'template': template.digest, 'flows': current})
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Generate documentation for Salesforce Flows')
+    parser.add_argument('flow_path', nargs='?', help='Path to a flow XML file')
+    parser.add_argument('output_path', nargs='?', help='Output markdown path')
+    parser.add_argument('--batch', metavar='DIR', help='Document every flow under DIR')
+    parser.add_argument('--output-dir', default='flow-docs', help='Batch output directory (default: flow-docs)')
+    parser.add_argument('--workers', type=int, default=None, help='Batch worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Regenerate docs even if the flow is unchanged')
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        result = generate_directory_docs(
+            args.batch, args.output_dir, workers=args.workers, force=args.force
+        )
+        print(f"✅ Generated: {len(result.generated)}  ⏭️ Unchanged: {len(result.skipped)}  "
+              f"🗑️ Removed: {len(result.pruned)}  ❌ Failed: {len(result.failed)}")
+        for flow_path, error in sorted(result.failed.items()):
+            print(f"   ❌ {flow_path}: {error}")
+        return 1 if result.failed else 0
+
+    if not args.flow_path:
+        parser.print_usage()
+        return 1
+
+    flow_path = args.flow_path
+    output_path = args.output_path
 
     # Auto-generate output path if not provided
     if output_path is None:
-        flow_name = os.path.splitext(os.path.basename(flow_path))[0]
-        output_path = f"{flow_name}_documentation.md"
+        output_path = f"{flow_name_from_path(flow_path)}_documentation.md"
 
     try:
         doc = generate_documentation(flow_path, output_path)
@@ -553,4 +811,11 @@ if __name__ == "__main__":
         print(f"   Lines: {len(doc.splitlines())}")
     except Exception as e:
         print(f"❌ Error generating documentation: {e}")
-        sys.exit(1)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(main())
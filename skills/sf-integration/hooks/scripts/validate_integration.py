@@ -19,6 +19,21 @@ import re
 import os
 from pathlib import Path
 
+# Shared code_analyzer package — try installed path first, then dev repo path
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+for _ca_path in (
+    os.path.join(os.path.expanduser("~"), ".claude", "code_analyzer"),
+    os.path.join(_SCRIPT_DIR, "..", "..", "..", "..", "shared", "code_analyzer"),
+):
+    _ca_path = os.path.normpath(_ca_path)
+    if os.path.isdir(_ca_path):
+        if os.path.dirname(_ca_path) not in sys.path:
+            sys.path.insert(0, os.path.dirname(_ca_path))
+        break
+
+from code_analyzer.apex_lexer import lex_apex  # noqa: E402
+from code_analyzer.pattern_engine import PatternEngine  # noqa: E402
+
 # Scoring configuration
 MAX_SCORE = 120
 CATEGORIES = {
@@ -35,23 +50,47 @@ APEX_PATTERN = re.compile(r'\.cls$|\.trigger$')
 XML_PATTERN = re.compile(r'\.xml$')
 NAMED_CRED_PATTERN = re.compile(r'namedCredential.*\.xml$', re.IGNORECASE)
 
+# Whole-file Apex checks, compiled once. The DOTALL loop rules only run when
+# their literal (e.g. "[select", ".send(") appears somewhere in the file, and
+# see comment-masked code; credential and ApexDoc rules see the raw source.
+APEX_RULES = (
+    PatternEngine()
+    .add('bearer_token', r'Authorization.*Bearer\s+[a-zA-Z0-9_\-]{20,}',
+         scope='source', multiline=True, first_match_only=True)
+    .add('api_key', r'api[_-]?key\s*=\s*[\'"][a-zA-Z0-9]{10,}', re.IGNORECASE,
+         scope='source', multiline=True, first_match_only=True)
+    .add('password', r'password\s*=\s*[\'"][^\'"]{5,}', re.IGNORECASE,
+         scope='source', multiline=True, first_match_only=True)
+    .add('soql_in_loop', r'for\s*\([^)]+\)\s*\{[^}]*\[SELECT', re.DOTALL | re.IGNORECASE,
+         multiline=True, first_match_only=True)
+    .add('dml_in_loop', r'for\s*\([^)]+\)\s*\{[^}]*(insert|update|delete)\s+', re.DOTALL | re.IGNORECASE,
+         multiline=True, first_match_only=True)
+    .add('callout_in_loop', r'for\s*\([^)]+\)\s*\{[^}]*\.send\(', re.DOTALL,
+         multiline=True, first_match_only=True)
+    .add('standard_http_method', r'setMethod\s*\(\s*[\'"](?:GET|POST|PUT|PATCH|DELETE)[\'"]\s*\)',
+         multiline=True, first_match_only=True)
+    .add('class_doc', r'/\*\*[\s\S]*?\*/\s*public\s+(with sharing\s+)?class',
+         scope='source', multiline=True, first_match_only=True)
+)
+
 
 def validate_apex_file(content: str, filename: str) -> None:
     """Validate Apex class/trigger for integration patterns."""
+    found = {hit.rule_id for hit in APEX_RULES.scan(content, code=lex_apex(content).code)}
 
     # Security checks (30 points)
     security_score = 30
 
     # Check for hardcoded credentials
-    if re.search(r'Authorization.*Bearer\s+[a-zA-Z0-9_\-]{20,}', content):
+    if 'bearer_token' in found:
         security_score -= 15
         CATEGORIES['security']['issues'].append('❌ Hardcoded Bearer token detected')
 
-    if re.search(r'api[_-]?key\s*=\s*[\'"][a-zA-Z0-9]{10,}', content, re.IGNORECASE):
+    if 'api_key' in found:
         security_score -= 15
         CATEGORIES['security']['issues'].append('❌ Hardcoded API key detected')
 
-    if re.search(r'password\s*=\s*[\'"][^\'"]{5,}', content, re.IGNORECASE):
+    if 'password' in found:
         security_score -= 15
         CATEGORIES['security']['issues'].append('❌ Hardcoded password detected')
 
@@ -104,17 +143,17 @@ def validate_apex_file(content: str, filename: str) -> None:
     bulk_score = 20
 
     # Check for SOQL in loops
-    if re.search(r'for\s*\([^)]+\)\s*\{[^}]*\[SELECT', content, re.DOTALL | re.IGNORECASE):
+    if 'soql_in_loop' in found:
         bulk_score -= 10
         CATEGORIES['bulkification']['issues'].append('❌ SOQL in loop')
 
     # Check for DML in loops
-    if re.search(r'for\s*\([^)]+\)\s*\{[^}]*(insert|update|delete)\s+', content, re.DOTALL | re.IGNORECASE):
+    if 'dml_in_loop' in found:
         bulk_score -= 10
         CATEGORIES['bulkification']['issues'].append('❌ DML in loop')
 
     # Check for HTTP callout in loops (expensive)
-    if re.search(r'for\s*\([^)]+\)\s*\{[^}]*\.send\(', content, re.DOTALL):
+    if 'callout_in_loop' in found:
         bulk_score -= 5
         CATEGORIES['bulkification']['issues'].append('⚠️ HTTP callout in loop (consider batching)')
 
@@ -153,7 +192,7 @@ def validate_apex_file(content: str, filename: str) -> None:
         CATEGORIES['best_practices']['issues'].append('⚠️ No debug logging')
 
     # Check for proper HTTP methods
-    if re.search(r'setMethod\s*\(\s*[\'"](?:GET|POST|PUT|PATCH|DELETE)[\'"]\s*\)', content):
+    if 'standard_http_method' in found:
         CATEGORIES['best_practices']['issues'].append('✅ Standard HTTP method used')
 
     CATEGORIES['best_practices']['score'] = max(0, bp_score)
@@ -169,7 +208,7 @@ def validate_apex_file(content: str, filename: str) -> None:
         CATEGORIES['documentation']['issues'].append('⚠️ Missing ApexDoc comments')
 
     # Check for class-level documentation
-    if re.search(r'/\*\*[\s\S]*?\*/\s*public\s+(with sharing\s+)?class', content):
+    if 'class_doc' in found:
         CATEGORIES['documentation']['issues'].append('✅ Class-level documentation')
 
     CATEGORIES['documentation']['score'] = max(0, doc_score)
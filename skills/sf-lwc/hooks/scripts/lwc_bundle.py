@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+LWC Bundle Validator - Cross-file checks over one component folder.
+
+The dispatcher validates ``lwc/<name>/<name>.html``, ``.js`` and ``.css``
+in separate runs, so no single run can see that a template binding has no
+matching property, or that a class toggled from JS is never styled.
+``load_bundle()`` reads every .html/.js/.css file in the folder once and
+extracts the facts those checks need:
+
+- template: root identifiers of simple ``{bindings}`` and ``on*`` handlers,
+  plus loop/slot variables in scope (``for:item``, ``iterator:*``, ...)
+- JS: members declared on the default-exported class and whether it
+  inherits from anything other than ``LightningElement``
+- CSS: class names used in selectors
+
+Facts are cached in ``~/.claude/cache/lwc-bundles/`` keyed by a hash of
+the folder's file names and contents, so the .html, .js and .css hooks
+of one component reuse a single parse until a file changes.
+
+Cross-file rules:
+1. Folder under ``lwc/`` without a matching ``<name>.js`` (or ``<name>.html``
+   when it has templates); such a bundle fails to deploy and rules 2-3
+   cannot find its files
+2. Template binding or handler not declared in the component class
+3. Class toggled through ``classList`` in JS but not defined in the CSS
+
+Environment:
+    SF_LWC_BUNDLE_CACHE_DIR     Cache directory override
+
+Usage:
+    python lwc_bundle.py force-app/main/default/lwc/myComponent
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from lwc_template import parse_template
+
+CACHE_VERSION = 2
+DEFAULT_CACHE_DIR = Path.home() / '.claude' / 'cache' / 'lwc-bundles'
+BUNDLE_EXTENSIONS = {'.html', '.js', '.css'}
+
+# Class bases whose members all come from the component itself
+PLAIN_BASES = {'LightningElement', 'NavigationMixin(LightningElement)'}
+
+_SIMPLE_BINDING_RE = re.compile(r'^\{\s*([A-Za-z_$][\w$]*)(?:\s*\.\s*[\w$]+)*\s*\}$')
+_CLASS_DECL_RE = re.compile(r'export\s+default\s+class\s+\w+\s+extends\s+([\w$.]+(?:\s*\(\s*[\w$.]+\s*\))?)\s*\{')
+_MEMBER_RE = re.compile(
+    r'(?:^|[;}\s])(?:(?:static|async|get|set)\s+)*\*?\s*#?([A-Za-z_$][\w$]*)\s*(?=[=;(\n])'
+)
+_CLASS_LIST_RE = re.compile(r'classList\s*\.\s*(?:add|remove|toggle|contains|replace)\s*\(([^)]*)\)')
+_STRING_RE = re.compile(r'''["']([^"'\s]+)["']''')
+_CSS_CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+
+def _mask_js_comments(source: str) -> str:
+    """Blank out // and /* */ comments, keeping strings and line breaks."""
+    out = []
+    i = 0
+    n = len(source)
+    while i < n:
+        ch = source[i]
+        if ch in '\'"`':
+            end = i + 1
+            while end < n and source[end] != ch:
+                end += 2 if source[end] == '\\' else 1
+            out.append(source[i:end + 1])
+            i = end + 1
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            end = n if end == -1 else end
+            i = end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            out.append('\n' * source.count('\n', i, end))
+            i = end
+        else:
+            out.append(ch)
+            i += 1
+    return ''.join(out)
+
+
+def _class_body_top_level(source: str, start: int) -> str:
+    """Text of the class body at member level, with nested blocks dropped."""
+    depth = 1
+    out = []
+    for ch in source[start:]:
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                break
+            if depth == 1:
+                out.append('}')
+        elif depth == 1:
+            out.append(ch)
+    return ''.join(out)
+
+
+def parse_js(source: str) -> Dict:
+    """Members of the default-exported component class and its classList usage."""
+    code = _mask_js_comments(source)
+    facts: Dict = {'found': False, 'inherits': False, 'members': [], 'class_uses': []}
+    declaration = _CLASS_DECL_RE.search(code)
+    if declaration:
+        base = re.sub(r'\s+', '', declaration.group(1))
+        body = _class_body_top_level(code, declaration.end())
+        facts['found'] = True
+        facts['inherits'] = base not in PLAIN_BASES
+        facts['members'] = sorted(set(_MEMBER_RE.findall(body)))
+    for match in _CLASS_LIST_RE.finditer(code):
+        line = code.count('\n', 0, match.start()) + 1
+        for cls in _STRING_RE.findall(match.group(1)):
+            facts['class_uses'].append([line, cls])
+    return facts
+
+
+def parse_css(source: str) -> List[str]:
+    """Class names used in the stylesheet's selectors."""
+    source = _CSS_COMMENT_RE.sub('', source)
+    classes = set()
+    # Only selector text: everything outside declaration blocks
+    for selector in re.split(r'\{[^{}]*\}', source):
+        classes.update(_CSS_CLASS_RE.findall(selector))
+    return sorted(classes)
+
+
+def parse_html(source: str) -> Dict:
+    """Root identifiers a template reads from the component, and its local names."""
+    template = parse_template(source)
+    scoped = set()
+    for tag in template.tags:
+        for attr in tag.attributes:
+            name = attr.name.lower()
+            if name in ('for:item', 'for:index', 'lwc:slot-data') and attr.value:
+                scoped.add(attr.value.strip())
+            elif name.startswith('iterator:'):
+                scoped.add(attr.name.split(':', 1)[1])
+    refs = []
+    for expr in template.expressions:
+        match = _SIMPLE_BINDING_RE.match(expr.text)
+        if match:
+            refs.append([expr.line, match.group(1), expr.attribute])
+    return {'refs': refs, 'scoped': sorted(scoped)}
+
+
+def bundle_hash(files: Dict[str, str]) -> str:
+    digest = hashlib.sha1(str(CACHE_VERSION).encode())
+    for name in sorted(files):
+        digest.update(name.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(hashlib.sha1(files[name].encode('utf-8', 'surrogatepass')).digest())
+    return digest.hexdigest()
+
+
+def _cache_path(folder: Path) -> Path:
+    cache_dir = Path(os.environ.get('SF_LWC_BUNDLE_CACHE_DIR') or DEFAULT_CACHE_DIR)
+    return cache_dir / (hashlib.sha1(str(folder).encode('utf-8')).hexdigest() + '.json')
+
+
+def _read_cache(path: Path, digest: str) -> Optional[Dict]:
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data.get('facts') if data.get('hash') == digest else None
+
+
+def _write_cache(path: Path, digest: str, facts: Dict) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix='.bundle-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'hash': digest, 'facts': facts}, f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass  # Cache is an optimisation only
+
+
+class LwcBundle:
+    """Facts extracted from one LWC folder. Build through ``load_bundle()``."""
+
+    def __init__(self, folder: Path, digest: str, facts: Dict):
+        self.folder = folder
+        self.name = folder.name
+        self.hash = digest
+        self.facts = facts
+
+    @property
+    def files(self) -> List[str]:
+        return self.facts['files']
+
+    @property
+    def templates(self) -> Dict[str, Dict]:
+        return self.facts['html']
+
+    @property
+    def js(self) -> Optional[Dict]:
+        return self.facts['js']
+
+    @property
+    def css_classes(self) -> Optional[List[str]]:
+        return self.facts['css']
+
+
+def _read_folder(folder: Path) -> Dict[str, str]:
+    files = {}
+    try:
+        entries = sorted(os.listdir(folder))
+    except OSError:
+        return files
+    for entry in entries:
+        if Path(entry).suffix.lower() not in BUNDLE_EXTENSIONS:
+            continue
+        try:
+            with open(folder / entry, 'r', encoding='utf-8') as f:
+                files[entry] = f.read()
+        except (OSError, UnicodeDecodeError):
+            continue
+    return files
+
+
+def _extract(name: str, files: Dict[str, str]) -> Dict:
+    return {
+        'files': sorted(files),
+        'html': {entry: parse_html(source) for entry, source in files.items() if entry.lower().endswith('.html')},
+        'js': parse_js(files[f'{name}.js']) if f'{name}.js' in files else None,
+        'css': parse_css(files[f'{name}.css']) if f'{name}.css' in files else None,
+    }
+
+
+_BUNDLES: Dict[str, LwcBundle] = {}
+
+
+def load_bundle(path: str) -> LwcBundle:
+    """The bundle for a component folder, or for the folder holding ``path``."""
+    folder = Path(path).resolve()
+    if not folder.is_dir():
+        folder = folder.parent
+    files = _read_folder(folder)
+    digest = bundle_hash(files)
+    bundle = _BUNDLES.get(str(folder))
+    if bundle is not None and bundle.hash == digest:
+        return bundle
+
+    cache_path = _cache_path(folder)
+    facts = _read_cache(cache_path, digest)
+    if facts is None:
+        facts = _extract(folder.name, files)
+        _write_cache(cache_path, digest, facts)
+    bundle = _BUNDLES[str(folder)] = LwcBundle(folder, digest, facts)
+    return bundle
+
+
+class LwcBundleValidator:
+    """Cross-file rules for one component, plus per-file template rules on request."""
+
+    def __init__(self, path: str):
+        self.bundle = load_bundle(path)
+        self.issues: List[Dict] = []
+
+    def validate(self, include_file_rules: bool = False) -> Dict:
+        if include_file_rules:
+            self._check_templates()
+        self._check_bundle_name()
+        self._check_template_members()
+        self._check_css_classes()
+        return {
+            'component': self.bundle.name,
+            'issues': self.issues,
+            'issue_count': len(self.issues)
+        }
+
+    def _check_templates(self):
+        """Per-file template rules, sharing the template parse with the bundle."""
+        from template_validator import LWCTemplateValidator
+
+        for entry in self.bundle.templates:
+            for issue in LWCTemplateValidator(str(self.bundle.folder / entry)).validate()['issues']:
+                self.issues.append(dict(issue, file=entry))
+
+    def _check_bundle_name(self):
+        """Component files must be named after their folder under lwc/."""
+        bundle = self.bundle
+        if bundle.folder.parent.name != 'lwc':
+            return
+        name = bundle.name
+        missing = []
+        if bundle.js is None:
+            missing.append(f'{name}.js')
+        if bundle.templates and f'{name}.html' not in bundle.templates:
+            missing.append(f'{name}.html')
+        if not missing:
+            return
+        others = [entry for entry in bundle.files if Path(entry).suffix.lower() in ('.js', '.html')]
+        message = f"Bundle folder {name} has no {' or '.join(missing)}"
+        if bundle.js is None:
+            message += '; cross-file checks skipped'
+        self.issues.append({
+            'severity': 'WARNING' if bundle.js is None else 'INFO',
+            'category': 'bundle',
+            'message': message,
+            'line': 1,
+            'file': others[0] if others else None,
+            'fix': f'Rename the component files to {name}.* (folder and file names must match to deploy)',
+            'source': 'lwc-bundle'
+        })
+
+    def _check_template_members(self):
+        """Template bindings and handlers must exist on the component class."""
+        js = self.bundle.js
+        # Inherited members can't be seen from this file
+        if not js or not js['found'] or js['inherits']:
+            return
+        members = set(js['members'])
+        for entry, template in self.bundle.templates.items():
+            scoped = set(template['scoped'])
+            reported = set()
+            for line, name, attribute in template['refs']:
+                if name in members or name in scoped or name in reported:
+                    continue
+                reported.add(name)
+                handler = bool(attribute) and attribute.lower().startswith('on')
+                self.issues.append({
+                    'severity': 'WARNING',
+                    'category': 'bundle',
+                    'message': f"{'Handler' if handler else 'Binding'} {{{name}}} is not declared in {self.bundle.name}.js",
+                    'line': line,
+                    'file': entry,
+                    'fix': f'Add a {name}(event) method' if handler else f'Add a property or getter named {name}',
+                    'source': 'lwc-bundle'
+                })
+
+    def _check_css_classes(self):
+        """Non-SLDS classes toggled from JS should be styled by the bundle CSS."""
+        js = self.bundle.js
+        css_classes = self.bundle.css_classes
+        if not js or css_classes is None:
+            return
+        defined = set(css_classes)
+        reported = set()
+        for line, cls in js['class_uses']:
+            if cls.startswith('slds-') or cls in defined or cls in reported:
+                continue
+            reported.add(cls)
+            self.issues.append({
+                'severity': 'INFO',
+                'category': 'bundle',
+                'message': f'Class {cls} is set from JS but not defined in {self.bundle.name}.css',
+                'line': line,
+                'file': f'{self.bundle.name}.js',
+                'fix': f'Add a .{cls} rule to {self.bundle.name}.css or use an SLDS class',
+                'source': 'lwc-bundle'
+            })
+
+
+def validate_bundle(path: str, include_file_rules: bool = False) -> Dict:
+    """Validate the LWC bundle containing ``path`` (a component folder or file)."""
+    return LwcBundleValidator(path).validate(include_file_rules)
+
+
+def format_output(results: Dict) -> str:
+    """Format bundle issues for display."""
+    issues = results.get('issues', [])
+    if not issues:
+        return ""
+
+    output_parts = ["", f"🧩 LWC Bundle Check: {results['component']}", "─" * 50]
+    for issue in issues[:10]:
+        output_parts.append(f"   {issue.get('file', '')}:L{issue['line']}: {issue['message']}")
+        if issue.get('fix'):
+            output_parts.append(f"      💡 {issue['fix']}")
+    if len(issues) > 10:
+        output_parts.append(f"   ... and {len(issues) - 10} more issues")
+    output_parts.append("─" * 50)
+    return "\n".join(output_parts)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python lwc_bundle.py <lwc component folder or file>")
+        sys.exit(0)
+
+    output = format_output(validate_bundle(sys.argv[1], include_file_rules=True))
+    print(output or f"✅ No bundle issues in {Path(sys.argv[1]).name}")
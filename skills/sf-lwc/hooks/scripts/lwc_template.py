@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+LWC Template Model - One tokenizer pass over an LWC HTML template.
+
+The template and SLDS validators both need the same facts about a template:
+which tags it uses, their attributes and directives, the ``{expressions}``
+bound in attributes and text, and the static ``class`` lists. ``parse_template()``
+scans the file once, skipping ``<!-- -->`` comments, and returns an
+``LwcTemplate`` holding:
+
+- ``tags``: every start tag with its attributes, line and parent element
+- ``expressions``: every balanced ``{...}`` binding, in attributes or text
+- ``class_lists``: (line, classes) for each static ``class="..."`` attribute
+
+Rules then run against these compact pieces instead of re-running regexes
+over every line. Models are cached by content hash, so the template
+validator and the SLDS validator in one hook process share a single parse.
+
+Usage:
+    from lwc_template import parse_template
+
+    template = parse_template(content)
+    for tag in template.tags:
+        if tag.name == "lightning-icon" and tag.attribute("alternative-text") is None:
+            print(tag.line, "missing alternative-text")
+"""
+
+import hashlib
+import re
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple
+
+CACHE_SIZE = 8
+
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+}
+
+# Elements whose content is raw text, not markup or bindings
+RAW_TEXT_ELEMENTS = {"script", "style"}
+
+# Comment openers, start/end tags, and text-level expressions
+_MARKUP_RE = re.compile(r"<!--|<(/?)([A-Za-z][\w:.-]*)|\{")
+# One attribute (or the end of the tag): name, then an optional quoted,
+# {expression} or unquoted value. Expression values are completed by
+# brace matching, since they may contain quotes and nested braces.
+_ATTRIBUTE_RE = re.compile(
+    r"""\s*(?:(/?>)|([^\s=>/"'{]+)(?:\s*=\s*("[^"]*"?|'[^']*'?|\{|[^\s>]*))?)"""
+)
+_UNQUOTED_RE = re.compile(r"[^\s>]*")
+
+
+class TemplateAttribute(NamedTuple):
+    name: str
+    value: Optional[str]  # Without quotes; None for boolean attributes
+    raw: str              # As written, e.g. 'if:true={isOpen}'
+    line: int
+    quote: str            # '"' or "'" when quoted, '' otherwise
+
+
+class TemplateExpression(NamedTuple):
+    text: str                 # Including the braces
+    line: int
+    attribute: Optional[str]  # Owning attribute, None for text bindings
+
+
+class TemplateTag:
+    """A start tag and its position in the element tree."""
+
+    __slots__ = ("name", "line", "attributes", "parent", "index", "self_closing")
+
+    def __init__(self, name: str, line: int, parent: Optional[int], index: int):
+        self.name = name
+        self.line = line
+        self.attributes: List[TemplateAttribute] = []
+        self.parent = parent
+        self.index = index
+        self.self_closing = False
+
+    def attribute(self, name: str) -> Optional[TemplateAttribute]:
+        name = name.lower()
+        for attr in self.attributes:
+            if attr.name.lower() == name:
+                return attr
+        return None
+
+    def __repr__(self) -> str:
+        return f"TemplateTag({self.name!r}, line={self.line})"
+
+
+def _balanced_end(content: str, start: int) -> int:
+    """Offset just past the brace closing the one at ``start``; -1 if unbalanced."""
+    depth = 0
+    i = start
+    n = len(content)
+    while i < n:
+        ch = content[i]
+        if ch in "'\"`":
+            close = content.find(ch, i + 1)
+            if close == -1:
+                return -1
+            i = close
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return -1
+
+
+class LwcTemplate:
+    """Parsed LWC template. Build through ``parse_template()``."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.lines = content.split("\n")
+        self.line_starts = [0]
+        for line in self.lines[:-1]:
+            self.line_starts.append(self.line_starts[-1] + len(line) + 1)
+        self.tags: List[TemplateTag] = []
+        self.expressions: List[TemplateExpression] = []
+        self._parse()
+
+    def line_of(self, pos: int) -> int:
+        """1-based line number of a character offset."""
+        return bisect_right(self.line_starts, pos)
+
+    def _parse(self) -> None:
+        content = self.content
+        n = len(content)
+        stack: List[TemplateTag] = []
+        pos = 0
+        while pos < n:
+            match = _MARKUP_RE.search(content, pos)
+            if match is None:
+                break
+            token = match.group()
+            if token == "<!--":
+                end = content.find("-->", match.end())
+                pos = n if end == -1 else end + 3
+            elif token == "{":
+                end = _balanced_end(content, match.start())
+                if end == -1:
+                    pos = match.end()
+                    continue
+                self.expressions.append(TemplateExpression(content[match.start():end], self.line_of(match.start()), None))
+                pos = end
+            elif match.group(1):
+                name = match.group(2).lower()
+                for depth in range(len(stack) - 1, -1, -1):
+                    if stack[depth].name == name:
+                        del stack[depth:]
+                        break
+                end = content.find(">", match.end())
+                pos = n if end == -1 else end + 1
+            else:
+                tag = TemplateTag(
+                    match.group(2).lower(),
+                    self.line_of(match.start()),
+                    stack[-1].index if stack else None,
+                    len(self.tags),
+                )
+                self.tags.append(tag)
+                pos = self._parse_attributes(tag, match.end())
+                if tag.name in RAW_TEXT_ELEMENTS and not tag.self_closing:
+                    end = content.lower().find(f"</{tag.name}", pos)
+                    pos = n if end == -1 else end
+                elif not tag.self_closing and tag.name not in VOID_ELEMENTS:
+                    stack.append(tag)
+
+    def _parse_attributes(self, tag: TemplateTag, pos: int) -> int:
+        content = self.content
+        n = len(content)
+        while pos < n:
+            match = _ATTRIBUTE_RE.match(content, pos)
+            if match.group(1):
+                tag.self_closing = match.group(1) == "/>"
+                return match.end()
+            name = match.group(2)
+            if name is None:
+                if match.end() >= n:
+                    break
+                pos = match.end() + 1  # Stray quote, slash or brace; skip it
+                continue
+
+            start = match.start(2)
+            value = match.group(3)
+            value_end = match.end()
+            quote = ""
+            if value is None:
+                pass  # Boolean attribute
+            elif value == "{":
+                value_start = match.start(3)
+                value_end = _balanced_end(content, value_start)
+                if value_end == -1:
+                    value_end = _UNQUOTED_RE.match(content, value_start).end()
+                value = content[value_start:value_end]
+                if value.endswith("}"):
+                    self.expressions.append(TemplateExpression(value, self.line_of(value_start), name))
+            elif value[:1] in ("\"", "'"):
+                quote = value[0]
+                closed = len(value) > 1 and value.endswith(quote)
+                value = value[1:-1] if closed else value[1:]
+                if "{" in value:
+                    self._collect_expressions(value, match.start(3) + 1, name)
+            tag.attributes.append(TemplateAttribute(name, value, content[start:value_end], self.line_of(start), quote))
+            pos = value_end
+        return n
+
+    def _collect_expressions(self, value: str, offset: int, attribute: str) -> None:
+        """Bindings written inside a quoted attribute value."""
+        pos = value.find("{")
+        while pos != -1:
+            end = _balanced_end(value, pos)
+            if end == -1:
+                break
+            self.expressions.append(TemplateExpression(value[pos:end], self.line_of(offset + pos), attribute))
+            pos = value.find("{", end)
+
+    @property
+    def class_lists(self) -> List[Tuple[int, List[str]]]:
+        """(line, classes) for every quoted ``class`` attribute."""
+        return [
+            (attr.line, attr.value.split())
+            for tag in self.tags
+            for attr in tag.attributes
+            if attr.name.lower() == "class" and attr.quote and attr.value
+        ]
+
+    def children(self, tag: TemplateTag) -> List[TemplateTag]:
+        return [child for child in self.tags[tag.index + 1:] if child.parent == tag.index]
+
+    def first_child(self, tag: TemplateTag) -> Optional[TemplateTag]:
+        for child in self.tags[tag.index + 1:]:
+            if child.parent == tag.index:
+                return child
+        return None
+
+
+_CACHE: "OrderedDict[str, LwcTemplate]" = OrderedDict()
+
+
+def parse_template(content: str) -> LwcTemplate:
+    """Parsed model for ``content``, shared by every caller in this process."""
+    digest = hashlib.sha1(content.encode("utf-8", "surrogatepass")).hexdigest()
+    template = _CACHE.get(digest)
+    if template is None:
+        template = LwcTemplate(content)
+        _CACHE[digest] = template
+        if len(_CACHE) > CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    else:
+        _CACHE.move_to_end(digest)
+    return template
@@ -7,8 +7,9 @@ validation feedback for LWC files (*.html, *.css, *.js).
 
 Integrates:
 1. Custom 140-point SLDS 2 scoring (7 categories)
-2. Official SLDS Linter (if available via npm)
-3. Salesforce Code Analyzer V5 (ESLint + retire-js engines for JS files)
+2. Cross-file component checks (lwc_bundle: template vs JS vs CSS)
+3. Official SLDS Linter (if available via npm)
+4. Salesforce Code Analyzer V5 (ESLint + retire-js engines for JS files)
 
 Hook Input (stdin): JSON with tool_input and tool_response
 Hook Output (stdout): JSON with optional output message
@@ -116,6 +117,20 @@ def validate_lwc_file(file_path: str) -> dict:
             except Exception:
                 pass  # Don't fail validation on template check errors
 
+        # ═══════════════════════════════════════════════════════════════════
+        # PHASE 1.6: Cross-file checks over the component bundle
+        # ═══════════════════════════════════════════════════════════════════
+        if '/lwc/' in Path(file_path).resolve().as_posix():
+            try:
+                from lwc_bundle import validate_bundle
+                for bundle_issue in validate_bundle(file_path).get('issues', []):
+                    # Line numbers may refer to a sibling file of the bundle
+                    if bundle_issue.get('file') not in (None, file_name):
+                        bundle_issue = dict(bundle_issue, message=f"{bundle_issue['file']}: {bundle_issue['message']}")
+                    issues.append(bundle_issue)
+            except Exception:
+                pass  # Don't fail validation on bundle check errors
+
         # ═══════════════════════════════════════════════════════════════════
         # PHASE 2: Official SLDS Linter (if available)
         # ═══════════════════════════════════════════════════════════════════
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+SLDS Catalog - Precompiled SLDS class and styling-hook lookups.
+
+validate_slds.py and template_validator.py check classes, hooks and
+deprecated SLDS 1 names against the JSON files in ``slds_data/``.
+``load_catalog()`` builds those lookups once per process:
+
+- ``classes`` / ``hooks``: frozensets of known SLDS 2 classes and hooks
+- ``class_pattern``: one compiled regex for the class families accepted
+  by naming convention (``slds-p-*``, ``slds-grid_*``, ``slds-is-*``, ...)
+- ``deprecated_tokens`` / ``deprecated_classes`` / ``deprecated_patterns``
+
+The flattened data is written to ``slds_data/slds_catalog.json`` (or
+``~/.claude/cache/`` when the skill directory is read-only) and reused
+until one of the source JSON files changes.
+
+Usage:
+    from slds_catalog import load_catalog
+
+    catalog = load_catalog()
+    if not catalog.is_known_class('slds-p-around_medium'):
+        ...
+
+    python3 slds_catalog.py    # Rebuild the compiled catalog
+"""
+
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional
+
+DATA_DIR = Path(__file__).parent / 'slds_data'
+SOURCE_FILES = ('valid_slds_classes.json', 'styling_hooks.json', 'deprecated_patterns.json')
+CATALOG_NAME = 'slds_catalog.json'
+FALLBACK_DIR = Path.home() / '.claude' / 'cache'
+CATALOG_VERSION = 1
+
+# Class families accepted by naming convention even when not listed
+SLDS_CLASS_PATTERNS = [
+    r'slds-p-(around|horizontal|vertical|left|right|top|bottom)_',
+    r'slds-m-(around|horizontal|vertical|left|right|top|bottom)_',
+    r'slds-size_\d+-of-\d+$',
+    # Responsive sizing: slds-small-size_, slds-medium-size_, slds-large-size_
+    r'slds-(small|medium|large|max-small|max-medium|max-large)-size_\d+-of-\d+$',
+    r'slds-text-(heading|body|color|align)_',
+    r'slds-grid(_|$)',
+    r'slds-col(_|$)',
+    r'slds-button(_|$)',
+    r'slds-input(_|$)',
+    r'slds-form(_|$)',
+    r'slds-card(_|$)',
+    r'slds-modal(_|$)',
+    r'slds-notify(_|$)',
+    r'slds-illustration(_|$)',
+    r'slds-table(_|$)',
+    r'slds-box(_|$)',
+    r'slds-badge(_|$)',
+    r'slds-spinner(_|$)',
+    r'slds-alert(_|$)',
+    # Utility patterns
+    r'slds-has-',
+    r'slds-no-',
+    r'slds-var-',
+    r'slds-is-',
+    r'slds-theme_',
+    r'slds-icon(_|$)',
+    r'slds-media(_|$)',
+    r'slds-list(_|$)',
+    r'slds-tile(_|$)',
+    r'slds-popover(_|$)',
+    r'slds-dropdown(_|$)',
+    r'slds-tabs_',
+    r'slds-path(_|$)',
+    r'slds-progress(_|$)',
+]
+
+
+class SldsCatalog:
+    """Frozen SLDS lookup tables. Build through ``load_catalog()``."""
+
+    def __init__(self, data: Dict):
+        self.classes: FrozenSet[str] = frozenset(data.get('classes', []))
+        self.hooks: FrozenSet[str] = frozenset(data.get('hooks', []))
+        self.deprecated_tokens: Dict[str, str] = data.get('deprecated_tokens', {})
+        self.deprecated_classes: Dict[str, str] = data.get('deprecated_classes', {})
+        self.deprecated_patterns: Dict[str, Dict] = data.get('deprecated_patterns', {})
+        self.class_pattern = re.compile('|'.join(f'(?:{p})' for p in data.get('class_patterns', [])) or r'(?!)')
+        self._known: Dict[str, bool] = {}
+
+    def matches_class_pattern(self, cls: str) -> bool:
+        """True if ``cls`` follows a recognised SLDS naming pattern."""
+        return self.class_pattern.match(cls) is not None
+
+    def is_known_class(self, cls: str) -> bool:
+        """True if ``cls`` is listed or follows a recognised SLDS pattern."""
+        known = self._known.get(cls)
+        if known is None:
+            known = self._known[cls] = cls in self.classes or self.matches_class_pattern(cls)
+        return known
+
+
+def _source_fingerprint() -> List:
+    fingerprint: List = [CATALOG_VERSION, SLDS_CLASS_PATTERNS]
+    for name in SOURCE_FILES:
+        try:
+            stat = (DATA_DIR / name).stat()
+            fingerprint.append([name, stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            fingerprint.append([name, None, None])
+    return fingerprint
+
+
+def _read_json(name: str) -> Dict:
+    try:
+        with open(DATA_DIR / name, 'r') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _flatten(data: Dict) -> List[str]:
+    values = set()
+    for entries in data.values():
+        if isinstance(entries, list):
+            values.update(entries)
+    return sorted(values)
+
+
+def build_catalog_data() -> Dict:
+    """Flatten the slds_data JSON files into one catalog document."""
+    deprecated = _read_json('deprecated_patterns.json')
+    return {
+        'fingerprint': _source_fingerprint(),
+        'classes': _flatten(_read_json('valid_slds_classes.json')),
+        'hooks': _flatten(_read_json('styling_hooks.json')),
+        'deprecated_tokens': deprecated.get('tokens', {}),
+        'deprecated_classes': deprecated.get('classes', {}),
+        'deprecated_patterns': deprecated.get('patterns', {}),
+        'class_patterns': SLDS_CLASS_PATTERNS,
+    }
+
+
+def _catalog_paths() -> List[Path]:
+    return [DATA_DIR / CATALOG_NAME, FALLBACK_DIR / CATALOG_NAME]
+
+
+def _write_catalog(data: Dict) -> Optional[Path]:
+    """Atomically write the catalog to the first writable location."""
+    for path in _catalog_paths():
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix='.slds-catalog-')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f, separators=(',', ':'))
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            return path
+        except OSError:
+            continue
+    return None
+
+
+def _read_catalog(fingerprint: List) -> Optional[Dict]:
+    for path in _catalog_paths():
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if data.get('fingerprint') == fingerprint:
+            return data
+    return None
+
+
+_CATALOG: Optional[SldsCatalog] = None
+
+
+def load_catalog() -> SldsCatalog:
+    """The process-wide catalog, rebuilt only when slds_data changes."""
+    global _CATALOG
+    if _CATALOG is None:
+        # Round-trip through JSON so the fingerprint compares like the stored one
+        data = _read_catalog(json.loads(json.dumps(_source_fingerprint())))
+        if data is None:
+            data = build_catalog_data()
+            _write_catalog(data)
+        _CATALOG = SldsCatalog(data)
+    return _CATALOG
+
+
+if __name__ == '__main__':
+    data = build_catalog_data()
+    path = _write_catalog(data)
+    print(f"SLDS catalog: {len(data['classes'])} classes, {len(data['hooks'])} hooks, "
+          f"{len(data['class_patterns'])} class patterns -> {path or 'not written'}")
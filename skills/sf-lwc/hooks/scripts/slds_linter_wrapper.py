@@ -10,14 +10,116 @@ Provides integration with SLDS Linter for:
 The SLDS Linter is optional - if not installed, validation gracefully
 degrades to custom Python-based validators.
 
+The linter has no server mode, so the wrapper amortises its start-up
+instead: files are linted in batches (one npx process per BATCH_SIZE
+files), the JSON report is parsed record by record as it streams in, and
+each file's violations are cached under ~/.claude/cache/ by content hash
+and linter version. Unchanged files are never re-linted, and the
+``--version`` probe is remembered between hook runs.
+
 Installation:
     npm install -g @salesforce-ux/slds-linter
+
+Usage:
+    python slds_linter_wrapper.py <file.html|file.css|directory> [...]
+
+Environment:
+    SF_SLDS_LINTER_CACHE_DIR    Cache directory override
 """
 
-import subprocess
+import hashlib
 import json
 import os
-from typing import Dict, List, Any, Optional
+import re
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Any, Optional
+
+LINTER_COMMAND = ['npx', '@salesforce-ux/slds-linter']
+BATCH_SIZE = 50
+BASE_TIMEOUT = 30
+PER_FILE_TIMEOUT = 2
+# ESLint-style exit codes: 0 clean, 1 violations found; anything else is a crash
+REPORT_EXIT_CODES = (0, 1)
+MAX_CACHED_RESULTS = 5000
+# How long a --version probe is trusted (seconds)
+AVAILABLE_TTL = 24 * 3600
+UNAVAILABLE_TTL = 3600
+
+
+def _cache_dir() -> str:
+    return os.environ.get('SF_SLDS_LINTER_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.claude', 'cache')
+
+
+def _read_json(path: str) -> Dict:
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path: str, data: Dict) -> None:
+    """Atomic write; the cache is an optimisation, so failures are ignored."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.slds-lint-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass
+
+
+def iter_json_records(chunks: Iterable[str]) -> Iterator[Any]:
+    """
+    Yield JSON objects from a stream as soon as each one is complete.
+
+    Accepts an ESLint-style array of per-file results, newline-delimited
+    objects, or a single object. Raises ValueError once the stream turns
+    out not to be JSON, so callers can fall back to text parsing.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    for chunk in chunks:
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        while True:
+            # Skip array brackets, separators and whitespace between records
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,[]':
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] != '{':
+                raise ValueError('not a JSON report')
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # Incomplete record; wait for more output
+            yield record
+            pos = end
+    if buffer[pos:].strip(' \t\r\n,[]'):
+        raise ValueError('truncated JSON report')
+
+
+def collect_lint_files(dir_path: str, extensions: Optional[List[str]] = None) -> List[str]:
+    """HTML/CSS files under ``dir_path``, skipping tooling directories."""
+    extensions = extensions or ['.html', '.css']
+    file_paths = []
+    for root, dirs, files in os.walk(dir_path):
+        dirs[:] = sorted(d for d in dirs if d not in ('node_modules', '.git', '.sfdx', '.sf'))
+        for file in sorted(files):
+            if any(file.endswith(ext) for ext in extensions):
+                file_paths.append(os.path.join(root, file))
+    return file_paths
 
 
 class SLDSLinterWrapper:
@@ -32,6 +134,9 @@ class SLDSLinterWrapper:
         """
         self.project_root = project_root or os.getcwd()
         self._available: Optional[bool] = None
+        self.version = ''
+        self._results_path = os.path.join(_cache_dir(), 'slds-lint-results.json')
+        self._results: Optional[Dict[str, List[Dict]]] = None
 
     def is_available(self) -> bool:
         """
@@ -43,17 +148,28 @@ class SLDSLinterWrapper:
         if self._available is not None:
             return self._available
 
+        # The npx probe costs seconds; reuse a recent answer
+        probe_path = os.path.join(_cache_dir(), 'slds-linter.json')
+        probe = _read_json(probe_path)
+        ttl = AVAILABLE_TTL if probe.get('available') else UNAVAILABLE_TTL
+        if probe and time.time() - probe.get('checked_at', 0) < ttl:
+            self._available = bool(probe.get('available'))
+            self.version = probe.get('version', '')
+            return self._available
+
         try:
             result = subprocess.run(
-                ['npx', '@salesforce-ux/slds-linter', '--version'],
+                LINTER_COMMAND + ['--version'],
                 capture_output=True,
                 text=True,
                 timeout=10
             )
             self._available = result.returncode == 0
+            self.version = result.stdout.strip() if self._available else ''
         except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
             self._available = False
 
+        _write_json(probe_path, {'available': self._available, 'version': self.version, 'checked_at': time.time()})
         return self._available
 
     def lint_file(self, file_path: str) -> Dict[str, Any]:
@@ -66,54 +182,65 @@ class SLDSLinterWrapper:
         Returns:
             dict with success status, violations list, and any errors
         """
-        if not self.is_available():
-            return {
-                'success': False,
-                'error': 'slds-linter not installed. Install with: npm i -g @salesforce-ux/slds-linter',
-                'violations': []
-            }
+        return self.lint_files([file_path])[file_path]
 
-        try:
-            # Run SLDS Linter with JSON output
-            result = subprocess.run(
-                [
-                    'npx', '@salesforce-ux/slds-linter', 'lint',
-                    file_path,
-                    '--format', 'json'
-                ],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                cwd=self.project_root
-            )
+    def lint_files(self, file_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Lint many files with as few linter processes as possible.
 
-            violations = self._parse_output(result.stdout, result.stderr)
+        Files whose content was linted before (same hash, same linter
+        version) are answered from the cache; the rest are linted in
+        batches of BATCH_SIZE.
 
-            return {
-                'success': True,
-                'violations': violations,
-                'exit_code': result.returncode
-            }
+        Args:
+            file_paths: Paths to HTML or CSS files to lint
 
-        except subprocess.TimeoutExpired:
-            return {
-                'success': False,
-                'error': 'slds-linter timed out after 30 seconds',
-                'violations': []
-            }
-        except FileNotFoundError:
-            return {
-                'success': False,
-                'error': 'npx not found - ensure Node.js is installed',
-                'violations': []
-            }
-        except Exception as e:
+        Returns:
+            dict mapping each path to a lint_file()-style result
+        """
+        if not self.is_available():
             return {
-                'success': False,
-                'error': str(e),
-                'violations': []
+                path: {
+                    'success': False,
+                    'error': 'slds-linter not installed. Install with: npm i -g @salesforce-ux/slds-linter',
+                    'violations': []
+                }
+                for path in file_paths
             }
 
+        results: Dict[str, Dict[str, Any]] = {}
+        keys: Dict[str, str] = {}
+        pending: List[str] = []
+        cache = self._load_results()
+        for path in file_paths:
+            key = self._content_key(path)
+            if key is None:
+                results[path] = {'success': False, 'error': f'Cannot read {path}', 'violations': []}
+            elif key in cache:
+                results[path] = {'success': True, 'violations': self._with_file(cache[key], path), 'cached': True}
+            else:
+                keys[path] = key
+                pending.append(path)
+
+        for start in range(0, len(pending), BATCH_SIZE):
+            batch = pending[start:start + BATCH_SIZE]
+            batch_results = self._lint_batch(batch)
+            # Only a crashed or unparseable batch leaves files uncovered;
+            # lint those on their own
+            if len(batch) > 1:
+                for path in [p for p in batch if p not in batch_results]:
+                    batch_results.update(self._lint_batch([path]))
+            for path in batch:
+                result = batch_results.get(path) or {'success': True, 'violations': [], 'exit_code': 0}
+                results[path] = result
+                if result.get('success') and result.pop('complete', False):
+                    cache[keys[path]] = [{k: v for k, v in violation.items() if k != 'file'}
+                                         for violation in result['violations']]
+
+        if pending:
+            self._save_results(cache)
+        return results
+
     def lint_directory(self, dir_path: str, extensions: List[str] = None) -> Dict[str, Any]:
         """
         Lint all matching files in a directory.
@@ -136,16 +263,8 @@ class SLDSLinterWrapper:
                 'total_violations': 0
             }
 
-        file_results = {}
-        total_violations = 0
-
-        for root, dirs, files in os.walk(dir_path):
-            for file in files:
-                if any(file.endswith(ext) for ext in extensions):
-                    file_path = os.path.join(root, file)
-                    result = self.lint_file(file_path)
-                    file_results[file_path] = result
-                    total_violations += len(result.get('violations', []))
+        file_results = self.lint_files(collect_lint_files(dir_path, extensions))
+        total_violations = sum(len(result.get('violations', [])) for result in file_results.values())
 
         return {
             'success': True,
@@ -153,56 +272,145 @@ class SLDSLinterWrapper:
             'total_violations': total_violations
         }
 
-    def _parse_output(self, stdout: str, stderr: str) -> List[Dict]:
+    def _lint_batch(self, file_paths: List[str]) -> Dict[str, Dict[str, Any]]:
         """
-        Parse SLDS Linter JSON output into structured violations.
+        Run one linter process over ``file_paths``, parsing its JSON report
+        as it streams. Results marked 'complete' are safe to cache: they came
+        from a per-file record, or the file was absent from a report that
+        parsed, finished normally and whose paths all resolved to submitted
+        files (reports may list only files with violations). If any record
+        names a path we cannot map, absent files are left out so the caller
+        lints them on their own.
+        """
+        timeout = BASE_TIMEOUT + PER_FILE_TIMEOUT * (len(file_paths) - 1)
+        # The linter runs in the project root; report paths are relative to it
+        cwd = self.project_root or os.getcwd()
+        try:
+            process = subprocess.Popen(
+                LINTER_COMMAND + ['lint'] + [os.path.abspath(path) for path in file_paths] + ['--format', 'json'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                cwd=self.project_root
+            )
+        except FileNotFoundError:
+            return {path: {'success': False, 'error': 'npx not found - ensure Node.js is installed', 'violations': []}
+                    for path in file_paths}
+        except Exception as e:
+            return {path: {'success': False, 'error': str(e), 'violations': []} for path in file_paths}
 
-        Args:
-            stdout: Standard output from linter
-            stderr: Standard error from linter
+        timed_out = threading.Event()
 
-        Returns:
-            List of violation dictionaries
-        """
-        violations = []
+        def kill():
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+        stderr_chunks: List[str] = []
+        stderr_reader = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()))
+        stderr_reader.start()
 
-        # Try to parse JSON output
+        by_path = {os.path.realpath(path): path for path in file_paths}
+        matched = unmatched = 0
+        results: Dict[str, Dict[str, Any]] = {}
+        stdout_chunks: List[str] = []
+
+        def read_stdout() -> Iterator[str]:
+            for chunk in iter(lambda: process.stdout.read(65536), ''):
+                stdout_chunks.append(chunk)
+                yield chunk
+
+        parsed = True
         try:
-            if stdout.strip():
-                data = json.loads(stdout)
-
-                # Handle ESLint-style JSON output
-                if isinstance(data, list):
-                    for file_result in data:
-                        for message in file_result.get('messages', []):
-                            violations.append({
-                                'rule': message.get('ruleId', 'unknown'),
-                                'message': message.get('message', ''),
-                                'line': message.get('line', 0),
-                                'column': message.get('column', 0),
-                                'severity': self._map_severity(message.get('severity', 1)),
-                                'source': 'slds-linter',
-                                'file': file_result.get('filePath', '')
-                            })
-
-                # Handle single object output
-                elif isinstance(data, dict):
-                    for message in data.get('messages', []):
-                        violations.append({
-                            'rule': message.get('ruleId', 'unknown'),
-                            'message': message.get('message', ''),
-                            'line': message.get('line', 0),
-                            'column': message.get('column', 0),
-                            'severity': self._map_severity(message.get('severity', 1)),
-                            'source': 'slds-linter'
-                        })
-
-        except json.JSONDecodeError:
-            # If not valid JSON, try to extract violations from text output
-            violations.extend(self._parse_text_output(stdout))
-            violations.extend(self._parse_text_output(stderr))
+            for record in iter_json_records(read_stdout()):
+                violations = self._violations_from_record(record)
+                target = record.get('filePath')
+                path = by_path.get(os.path.realpath(os.path.join(cwd, target))) if target else None
+                if path is None and len(file_paths) == 1:
+                    path = file_paths[0]  # Only one file was linted
+                if path is None:
+                    unmatched += 1
+                    continue
+                matched += 1
+                results.setdefault(path, {'success': True, 'violations': [], 'complete': True})
+                results[path]['violations'].extend(violations)
+        except ValueError:
+            parsed = False
+            stdout_chunks.append(process.stdout.read())
+        finally:
+            process.wait()
+            timer.cancel()
+            stderr_reader.join()
+
+        if timed_out.is_set():
+            return {path: {'success': False, 'error': f'slds-linter timed out after {timeout} seconds', 'violations': []}
+                    for path in file_paths}
+
+        if not parsed:
+            # Not a JSON report; fall back to "file:line:col: severity - message" text
+            text_violations = self._parse_text_output(''.join(stdout_chunks)) + \
+                self._parse_text_output(''.join(stderr_chunks))
+            for violation in text_violations:
+                path = by_path.get(os.path.realpath(os.path.join(cwd, violation['file']))) or \
+                    (file_paths[0] if len(file_paths) == 1 else None)
+                if path is not None:
+                    results.setdefault(path, {'success': True, 'violations': []})
+                    results[path]['violations'].append(violation)
+            if len(file_paths) == 1:
+                results.setdefault(file_paths[0], {'success': True, 'violations': []})
+
+        report = ''.join(stdout_chunks).lstrip()[:1] in ('[', '{')
+        # Absence means clean only when the report's paths are known to map
+        # onto ours: every record resolved, and at least one did or the
+        # linter found nothing at all
+        verified = not unmatched and (matched or process.returncode == 0)
+        if parsed and report and verified and process.returncode in REPORT_EXIT_CODES:
+            for path in file_paths:
+                results.setdefault(path, {'success': True, 'violations': [], 'complete': True})
+
+        for result in results.values():
+            result['exit_code'] = process.returncode
+        return results
+
+    def _violations_from_record(self, record: Dict) -> List[Dict]:
+        """Violations from one ESLint-style per-file record."""
+        return [
+            {
+                'rule': message.get('ruleId', 'unknown'),
+                'message': message.get('message', ''),
+                'line': message.get('line', 0),
+                'column': message.get('column', 0),
+                'severity': self._map_severity(message.get('severity', 1)),
+                'source': 'slds-linter',
+                'file': record.get('filePath', '')
+            }
+            for message in record.get('messages', [])
+        ]
 
-        return violations
+    def _content_key(self, file_path: str) -> Optional[str]:
+        try:
+            with open(file_path, 'rb') as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            return None
+        # Same content can lint differently by extension
+        return f"{self.version}:{os.path.splitext(file_path)[1].lower()}:{digest}"
+
+    def _with_file(self, violations: List[Dict], file_path: str) -> List[Dict]:
+        return [dict(violation, file=file_path) for violation in violations]
+
+    def _load_results(self) -> Dict[str, List[Dict]]:
+        if self._results is None:
+            self._results = _read_json(self._results_path)
+        return self._results
+
+    def _save_results(self, cache: Dict[str, List[Dict]]) -> None:
+        # Oldest entries first (insertion order); keep the newest
+        if len(cache) > MAX_CACHED_RESULTS:
+            for key in list(cache)[:len(cache) - MAX_CACHED_RESULTS]:
+                del cache[key]
+        _write_json(self._results_path, cache)
 
     def _parse_text_output(self, output: str) -> List[Dict]:
         """
@@ -221,7 +429,6 @@ class SLDSLinterWrapper:
 
         # Common patterns for linter output
         # Example: "filename.html:10:5: error - message"
-        import re
         pattern = r'(\S+):(\d+):(\d+):\s*(error|warning|info)\s*[-:]\s*(.+)'
 
         for line in output.splitlines():
@@ -285,10 +492,21 @@ if __name__ == "__main__":
     import sys
 
     if len(sys.argv) < 2:
-        print("Usage: python slds_linter_wrapper.py <file.html|file.css>")
+        print("Usage: python slds_linter_wrapper.py <file.html|file.css|directory> [...]")
         print("\nChecking SLDS Linter availability...")
         print(f"Available: {is_slds_linter_available()}")
         sys.exit(0)
 
-    result = lint_lwc_file(sys.argv[1])
+    if len(sys.argv) == 2 and os.path.isfile(sys.argv[1]):
+        result = lint_lwc_file(sys.argv[1])
+    else:
+        # Project audit: every file through one batched, cached pass
+        paths = []
+        for target in sys.argv[1:]:
+            paths.extend(collect_lint_files(target) if os.path.isdir(target) else [target])
+        file_results = SLDSLinterWrapper().lint_files(paths)
+        result = {
+            'file_results': file_results,
+            'total_violations': sum(len(r.get('violations', [])) for r in file_results.values())
+        }
     print(json.dumps(result, indent=2))
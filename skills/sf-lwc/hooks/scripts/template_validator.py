@@ -9,6 +9,11 @@ Detects common mistakes that LLMs make when generating LWC templates:
 4. Method calls in templates ({items.length})
 5. Comparison operators in if:true
 6. Event handlers with inline arguments
+7. Deprecated SLDS 1 classes (from the shared slds_catalog lookups)
+
+The template is tokenized once (lwc_template.parse_template); expression
+rules run against each {binding} and attribute rules against each attribute,
+so a large template costs one linear scan plus work on its bindings.
 
 This validator is ADVISORY - it provides warnings but does not block operations.
 
@@ -19,6 +24,9 @@ import re
 import os
 from typing import Dict, List, Set
 
+from lwc_template import parse_template
+from slds_catalog import load_catalog
+
 
 class LWCTemplateValidator:
     """Detects LLM-specific anti-patterns in LWC HTML templates."""
@@ -115,6 +123,33 @@ class LWCTemplateValidator:
         (r'for:each=\{[^}]+\}\s+for:item="[^"]+"\s*>', 'for:each without key', 'Add key={item.id} to the first child element'),
     ]
 
+    # Rule tables in report order: (table, category, severity, target) where
+    # target is 'expression' ({...} bindings) or 'attribute' (name=value as written)
+    RULE_TABLES = [
+        ('INLINE_EXPRESSION_PATTERNS', 'inline_expression', 'CRITICAL', 'expression'),
+        ('METHOD_CALL_PATTERNS', 'method_call', 'CRITICAL', 'expression'),
+        ('COMPARISON_PATTERNS', 'comparison', 'CRITICAL', 'attribute'),
+        ('LITERAL_PATTERNS', 'literal', 'CRITICAL', 'attribute'),
+        ('EVENT_HANDLER_PATTERNS', 'event_handler', 'WARNING', 'attribute'),
+        ('FRAMEWORK_SYNTAX_PATTERNS', 'framework_syntax', 'CRITICAL', 'attribute'),
+    ]
+
+    _compiled_rules = None
+
+    @classmethod
+    def compiled_rules(cls) -> List[tuple]:
+        """Rule tables compiled once per process."""
+        if cls._compiled_rules is None:
+            compiled = []
+            for table, category, severity, target in cls.RULE_TABLES:
+                patterns = getattr(cls, table)
+                # Any-rule prefilter: most bindings and attributes match nothing
+                any_rule = re.compile('|'.join(f'(?:{pattern})' for pattern, _, _ in patterns))
+                rules = [(re.compile(pattern), name, fix) for pattern, name, fix in patterns]
+                compiled.append((category, severity, target, any_rule, rules))
+            cls._compiled_rules = compiled
+        return cls._compiled_rules
+
     def __init__(self, file_path: str):
         """
         Initialize the validator with an LWC HTML file.
@@ -126,6 +161,7 @@ class LWCTemplateValidator:
         self.content = ""
         self.lines = []
         self.issues = []
+        self.template = None
 
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -153,14 +189,11 @@ class LWCTemplateValidator:
                 'issue_count': len(self.issues)
             }
 
-        # Run all checks
-        self._check_patterns(self.INLINE_EXPRESSION_PATTERNS, 'inline_expression', 'CRITICAL')
-        self._check_patterns(self.METHOD_CALL_PATTERNS, 'method_call', 'CRITICAL')
-        self._check_patterns(self.COMPARISON_PATTERNS, 'comparison', 'CRITICAL')
-        self._check_patterns(self.LITERAL_PATTERNS, 'literal', 'CRITICAL')
-        self._check_patterns(self.EVENT_HANDLER_PATTERNS, 'event_handler', 'WARNING')
-        self._check_patterns(self.FRAMEWORK_SYNTAX_PATTERNS, 'framework_syntax', 'CRITICAL')
+        # Run all checks against one parse of the template
+        self.template = parse_template(self.content)
+        self._check_rules()
         self._check_iteration_keys()
+        self._check_deprecated_classes()
 
         return {
             'file': os.path.basename(self.file_path),
@@ -168,67 +201,69 @@ class LWCTemplateValidator:
             'issue_count': len(self.issues)
         }
 
-    def _check_patterns(self, patterns: List, category: str, severity: str):
-        """Check for pattern matches in the template."""
-        for i, line in enumerate(self.lines, 1):
-            # Skip HTML comments
-            if '<!--' in line and '-->' in line:
-                continue
-
-            for pattern, name, fix in patterns:
-                matches = re.finditer(pattern, line)
-                for match in matches:
-                    # Avoid duplicate issues for same line/category
-                    existing = any(
-                        issue['line'] == i and
-                        issue['category'] == category and
-                        name in issue['message']
-                        for issue in self.issues
-                    )
-                    if not existing:
-                        self.issues.append({
-                            'severity': severity,
-                            'category': category,
-                            'message': f'{name} not supported in LWC templates',
-                            'line': i,
-                            'fix': fix,
-                            'source': 'template-validator'
-                        })
+    def _check_rules(self):
+        """Match each rule table against the bindings or attributes it targets."""
+        expressions = self.template.expressions
+        attributes = [attr for tag in self.template.tags for attr in tag.attributes]
+        reported: Set[tuple] = set()
+
+        for category, severity, target, any_rule, rules in self.compiled_rules():
+            segments = [(expr.line, expr.text) for expr in expressions] if target == 'expression' \
+                else [(attr.line, attr.raw) for attr in attributes]
+            matched: Dict[str, List[tuple]] = {}  # Repeated bindings/attributes are matched once
+            for line, text in sorted(segments, key=lambda segment: segment[0]):
+                if text not in matched:
+                    matched[text] = [rule for rule in rules if rule[0].search(text)] if any_rule.search(text) else []
+                for _, name, fix in matched[text]:
+                    # One issue per line, category and rule
+                    if (line, category, name) in reported:
+                        continue
+                    reported.add((line, category, name))
+                    self.issues.append({
+                        'severity': severity,
+                        'category': category,
+                        'message': f'{name} not supported in LWC templates',
+                        'line': line,
+                        'fix': fix,
+                        'source': 'template-validator'
+                    })
 
     def _check_iteration_keys(self):
-        """Check for missing key attribute in for:each iterations."""
-        in_foreach = False
-        foreach_line = 0
-        foreach_item = ""
-
-        for i, line in enumerate(self.lines, 1):
-            # Detect for:each start
-            foreach_match = re.search(r'for:each=\{([^}]+)\}\s+for:item="([^"]+)"', line)
-            if foreach_match:
-                in_foreach = True
-                foreach_line = i
-                foreach_item = foreach_match.group(2)
+        """Check for missing key attribute on the element repeated by for:each."""
+        for tag in self.template.tags:
+            if tag.attribute('for:each') is None:
+                continue
+            child = self.template.first_child(tag)
+            # A nested <template> doesn't take the key itself
+            if child is None or child.name == 'template' or child.attribute('key') is not None:
                 continue
+            item = tag.attribute('for:item')
+            foreach_item = item.value if item is not None and item.value else 'item'
+            self.issues.append({
+                'severity': 'WARNING',
+                'category': 'iteration',
+                'message': f'for:each iteration (line {tag.line}) may be missing key attribute',
+                'line': child.line,
+                'fix': f'Add key={{{foreach_item}.id}} to identify each item uniquely',
+                'source': 'template-validator'
+            })
 
-            if in_foreach:
-                # Look for key attribute in the next few lines
-                if 'key=' in line or 'key =' in line:
-                    in_foreach = False
-                    continue
-
-                # If we hit a closing tag or another element without key
-                if '>' in line and not line.strip().startswith('<!--'):
-                    # Check if it's a template tag (doesn't need key directly)
-                    if '<template' not in line:
-                        self.issues.append({
-                            'severity': 'WARNING',
-                            'category': 'iteration',
-                            'message': f'for:each iteration (line {foreach_line}) may be missing key attribute',
-                            'line': i,
-                            'fix': f'Add key={{{foreach_item}.id}} to identify each item uniquely',
-                            'source': 'template-validator'
-                        })
-                    in_foreach = False
+    def _check_deprecated_classes(self):
+        """Check static class lists for SLDS 1 classes with SLDS 2 replacements."""
+        deprecated = load_catalog().deprecated_classes
+        if not deprecated:
+            return
+        for line, classes in self.template.class_lists:
+            for cls in classes:
+                if cls in deprecated:
+                    self.issues.append({
+                        'severity': 'WARNING',
+                        'category': 'slds_migration',
+                        'message': f'Deprecated SLDS 1 class: {cls}',
+                        'line': line,
+                        'fix': deprecated[cls],
+                        'source': 'template-validator'
+                    })
 
 
 def validate_lwc_template(file_path: str) -> Dict:
@@ -329,4 +364,13 @@ if __name__ == "__main__":
     else:
         print(f"✅ No template anti-patterns detected in {results['file']}")
 
+    # Cross-file checks: template bindings against the component's JS and CSS
+    try:
+        from lwc_bundle import validate_bundle, format_output as format_bundle_output
+        bundle_output = format_bundle_output(validate_bundle(file_path))
+        if bundle_output:
+            print(bundle_output)
+    except Exception:
+        pass  # Bundle checks are advisory extras
+
     sys.exit(0)  # Advisory only - don't block
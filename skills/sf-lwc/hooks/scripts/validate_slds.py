@@ -23,6 +23,9 @@ from typing import Dict, List, Any, Optional
 # Script directory for loading data files
 SCRIPT_DIR = Path(__file__).parent
 
+from lwc_template import parse_template
+from slds_catalog import load_catalog
+
 
 class SLDSValidator:
     """SLDS 2 validation engine for LWC files."""
@@ -52,6 +55,7 @@ class SLDSValidator:
         self.ext = Path(file_path).suffix.lower()
         self.content = ""
         self.lines = []
+        self.template = None
 
         # Load file content
         try:
@@ -65,38 +69,15 @@ class SLDSValidator:
         self._load_data()
 
     def _load_data(self):
-        """Load JSON data files for validation rules."""
-        data_dir = SCRIPT_DIR / 'slds_data'
-
-        # Valid SLDS classes
-        self.valid_slds_classes = set()
-        try:
-            with open(data_dir / 'valid_slds_classes.json', 'r') as f:
-                data = json.load(f)
-                for category_classes in data.values():
-                    if isinstance(category_classes, list):
-                        self.valid_slds_classes.update(category_classes)
-        except Exception:
-            pass
-
-        # Deprecated patterns
-        self.deprecated_patterns = {}
-        try:
-            with open(data_dir / 'deprecated_patterns.json', 'r') as f:
-                self.deprecated_patterns = json.load(f)
-        except Exception:
-            pass
-
-        # Valid styling hooks
-        self.valid_hooks = set()
-        try:
-            with open(data_dir / 'styling_hooks.json', 'r') as f:
-                data = json.load(f)
-                for category_hooks in data.values():
-                    if isinstance(category_hooks, list):
-                        self.valid_hooks.update(category_hooks)
-        except Exception:
-            pass
+        """Attach the process-wide SLDS catalog built from slds_data/."""
+        self.catalog = load_catalog()
+        self.valid_slds_classes = self.catalog.classes
+        self.valid_hooks = self.catalog.hooks
+        self.deprecated_patterns = {
+            'tokens': self.catalog.deprecated_tokens,
+            'classes': self.catalog.deprecated_classes,
+            'patterns': self.catalog.deprecated_patterns,
+        }
 
     def validate(self) -> Dict[str, Any]:
         """
@@ -157,113 +138,64 @@ class SLDSValidator:
 
     def _validate_html(self, scores: Dict[str, int], issues: List[Dict]):
         """Validate HTML template file."""
+        # One tokenizer pass shared with template_validator.py
+        self.template = parse_template(self.content)
         self._check_slds_classes(scores, issues)
         self._check_accessibility(scores, issues)
         self._check_component_structure(scores, issues)
 
     def _check_slds_classes(self, scores: Dict[str, int], issues: List[Dict]):
         """Check SLDS class usage in HTML."""
-        # Find all class attributes
-        class_pattern = r'class\s*=\s*["\']([^"\']+)["\']'
-
-        for i, line in enumerate(self.lines, 1):
-            matches = re.findall(class_pattern, line)
-            for class_attr in matches:
-                classes = class_attr.split()
-                for cls in classes:
-                    if cls.startswith('slds-'):
-                        # Check if it's a valid SLDS class
-                        if self.valid_slds_classes and cls not in self.valid_slds_classes:
-                            # Allow pattern-based classes we might not have in our list
-                            if not self._is_valid_slds_pattern(cls):
-                                scores['slds_class_usage'] = max(0, scores['slds_class_usage'] - 2)
-                                issues.append({
-                                    'severity': 'WARNING',
-                                    'category': 'slds_class_usage',
-                                    'message': f"Unknown SLDS class: {cls}",
-                                    'line': i,
-                                    'fix': f"Verify '{cls}' is a valid SLDS 2 class"
-                                })
+        for i, classes in self.template.class_lists:
+            for cls in classes:
+                if cls.startswith('slds-'):
+                    # Check if it's a listed SLDS class or follows a known pattern
+                    if self.valid_slds_classes and not self.catalog.is_known_class(cls):
+                        scores['slds_class_usage'] = max(0, scores['slds_class_usage'] - 2)
+                        issues.append({
+                            'severity': 'WARNING',
+                            'category': 'slds_class_usage',
+                            'message': f"Unknown SLDS class: {cls}",
+                            'line': i,
+                            'fix': f"Verify '{cls}' is a valid SLDS 2 class"
+                        })
 
     def _is_valid_slds_pattern(self, cls: str) -> bool:
         """Check if class matches valid SLDS naming patterns."""
-        patterns = [
-            r'^slds-p-(around|horizontal|vertical|left|right|top|bottom)_',
-            r'^slds-m-(around|horizontal|vertical|left|right|top|bottom)_',
-            r'^slds-size_\d+-of-\d+$',
-            # Responsive sizing: slds-small-size_, slds-medium-size_, slds-large-size_
-            r'^slds-(small|medium|large|max-small|max-medium|max-large)-size_\d+-of-\d+$',
-            r'^slds-text-(heading|body|color|align)_',
-            r'^slds-grid(_|$)',
-            r'^slds-col(_|$)',
-            r'^slds-button(_|$)',
-            r'^slds-input(_|$)',
-            r'^slds-form(_|$)',
-            r'^slds-card(_|$)',
-            r'^slds-modal(_|$)',
-            r'^slds-notify(_|$)',
-            r'^slds-illustration(_|$)',
-            r'^slds-table(_|$)',
-            r'^slds-box(_|$)',
-            r'^slds-badge(_|$)',
-            r'^slds-spinner(_|$)',
-            r'^slds-alert(_|$)',
-            # Utility patterns
-            r'^slds-has-',
-            r'^slds-no-',
-            r'^slds-var-',
-            r'^slds-is-',
-            r'^slds-theme_',
-            r'^slds-icon(_|$)',
-            r'^slds-media(_|$)',
-            r'^slds-list(_|$)',
-            r'^slds-tile(_|$)',
-            r'^slds-popover(_|$)',
-            r'^slds-dropdown(_|$)',
-            r'^slds-tabs_',
-            r'^slds-path(_|$)',
-            r'^slds-progress(_|$)',
-        ]
-        return any(re.match(p, cls) for p in patterns)
+        return self.catalog.matches_class_pattern(cls)
 
     def _check_accessibility(self, scores: Dict[str, int], issues: List[Dict]):
         """Check accessibility requirements in HTML."""
         content = self.content
 
-        # Check lightning-icon without alternative-text
-        icon_pattern = r'<lightning-icon[^>]*>'
-        for i, line in enumerate(self.lines, 1):
-            for match in re.finditer(icon_pattern, line):
-                icon_tag = match.group(0)
-                if 'alternative-text' not in icon_tag:
-                    scores['accessibility'] = max(0, scores['accessibility'] - 3)
-                    issues.append({
-                        'severity': 'WARNING',
-                        'category': 'accessibility',
-                        'message': 'lightning-icon missing alternative-text attribute',
-                        'line': i,
-                        'fix': 'Add alternative-text="description" for screen readers'
-                    })
+        for tag in self.template.tags:
+            # Check lightning-icon without alternative-text
+            if tag.name == 'lightning-icon' and tag.attribute('alternative-text') is None:
+                scores['accessibility'] = max(0, scores['accessibility'] - 3)
+                issues.append({
+                    'severity': 'WARNING',
+                    'category': 'accessibility',
+                    'message': 'lightning-icon missing alternative-text attribute',
+                    'line': tag.line,
+                    'fix': 'Add alternative-text="description" for screen readers'
+                })
 
-        # Check lightning-button-icon without label
-        button_icon_pattern = r'<lightning-button-icon[^>]*>'
-        for i, line in enumerate(self.lines, 1):
-            for match in re.finditer(button_icon_pattern, line):
-                tag = match.group(0)
-                if 'aria-label' not in tag and 'alternative-text' not in tag:
-                    scores['accessibility'] = max(0, scores['accessibility'] - 3)
-                    issues.append({
-                        'severity': 'WARNING',
-                        'category': 'accessibility',
-                        'message': 'lightning-button-icon missing aria-label or alternative-text',
-                        'line': i,
-                        'fix': 'Add aria-label="action description" for accessibility'
-                    })
+            # Check lightning-button-icon without label
+            if tag.name == 'lightning-button-icon' and tag.attribute('aria-label') is None \
+                    and tag.attribute('alternative-text') is None:
+                scores['accessibility'] = max(0, scores['accessibility'] - 3)
+                issues.append({
+                    'severity': 'WARNING',
+                    'category': 'accessibility',
+                    'message': 'lightning-button-icon missing aria-label or alternative-text',
+                    'line': tag.line,
+                    'fix': 'Add aria-label="action description" for accessibility'
+                })
 
         # Check for slds-assistive-text usage (good practice)
         if 'slds-assistive-text' not in content and 'aria-live' not in content:
             # Only deduct if there's dynamic content indicators
-            if '{' in content and '}' in content:
+            if self.template.expressions:
                 scores['accessibility'] = max(0, scores['accessibility'] - 2)
                 issues.append({
                     'severity': 'INFO',
@@ -276,8 +208,7 @@ class SLDSValidator:
     def _check_component_structure(self, scores: Dict[str, int], issues: List[Dict]):
         """Check component structure for SLDS compliance."""
         # Check for lightning-* base components (good)
-        lightning_components = re.findall(r'<lightning-[a-z-]+', self.content)
-        if not lightning_components:
+        if not any(tag.name.startswith('lightning-') for tag in self.template.tags):
             scores['component_structure'] = max(0, scores['component_structure'] - 5)
             issues.append({
                 'severity': 'INFO',
@@ -457,16 +388,15 @@ class SLDSValidator:
                 # Extract class names from string literals
                 classes = re.findall(r'["\']([slds-][^"\']+)["\']', line)
                 for cls in classes:
-                    if cls.startswith('slds-') and self.valid_slds_classes and cls not in self.valid_slds_classes:
-                        if not self._is_valid_slds_pattern(cls):
-                            scores['slds_class_usage'] = max(0, scores['slds_class_usage'] - 2)
-                            issues.append({
-                                'severity': 'WARNING',
-                                'category': 'slds_class_usage',
-                                'message': f"Unknown SLDS class in JS: {cls}",
-                                'line': i,
-                                'fix': f"Verify '{cls}' is a valid SLDS 2 class"
-                            })
+                    if cls.startswith('slds-') and self.valid_slds_classes and not self.catalog.is_known_class(cls):
+                        scores['slds_class_usage'] = max(0, scores['slds_class_usage'] - 2)
+                        issues.append({
+                            'severity': 'WARNING',
+                            'category': 'slds_class_usage',
+                            'message': f"Unknown SLDS class in JS: {cls}",
+                            'line': i,
+                            'fix': f"Verify '{cls}' is a valid SLDS 2 class"
+                        })
 
         # Check GraphQL patterns
         self._check_graphql_patterns(scores, issues)
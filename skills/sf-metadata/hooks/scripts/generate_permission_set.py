@@ -26,6 +26,8 @@ import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import List, Dict, Tuple
 
+from metadata_index import project_metadata_index
+
 
 # XML Namespace for Salesforce metadata
 SF_NAMESPACE = "http://soap.sforce.com/2006/04/metadata"
@@ -120,6 +122,28 @@ def scan_fields(object_dir: str) -> List[Dict]:
         print(f"  ℹ️ No fields directory found at {fields_dir}")
         return fields
 
+    # Inside an SFDX project, reuse the incremental project index
+    index = project_metadata_index(fields_dir)
+    if index is not None:
+        prefix = str(Path(fields_dir).resolve()) + os.sep
+        for field in index.fields(get_object_name(object_dir)):
+            if not field['path'].startswith(prefix):
+                continue
+            if field.get('invalid'):
+                print(f"  ⚠️ Warning: Could not parse {field['path']}")
+                continue
+            fields.append({
+                'api_name': field['name'],
+                'required': field['required'],
+                'type': field['type'],
+                'is_formula': field['formula'],
+                'is_rollup': field['type'] == 'Summary',
+                'is_master_detail': field['type'] == 'MasterDetail',
+                'path': field['path'],
+                'granted_by': [grant['container'] for grant in index.field_grants(field['object'], field['name'])],
+            })
+        return fields
+
     for filename in os.listdir(fields_dir):
         if filename.endswith('.field-meta.xml'):
             field_path = os.path.join(fields_dir, filename)
@@ -266,7 +290,8 @@ def main():
         print(f"\n✅ Included fields ({len(included)}):")
         for field in included:
             field_type = "read-only" if (field['is_formula'] or field['is_rollup']) else "read/write"
-            print(f"   ✓ {field['api_name']} ({field_type})")
+            granted = f" - already in {', '.join(field['granted_by'])}" if field.get('granted_by') else ""
+            print(f"   ✓ {field['api_name']} ({field_type}){granted}")
     else:
         print("\n⚠️ No fields to include in Permission Set")
 
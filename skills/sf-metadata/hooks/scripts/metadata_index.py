@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Project Metadata Index - Objects, fields, permission sets, profiles and
+validation rules of one SFDX project.
+
+``validate_metadata.py`` sees one ``*-meta.xml`` file per run and
+``generate_permission_set.py`` re-reads an object's ``fields/`` folder every
+time, so neither can answer project-wide questions such as "is this field
+granted by any permission set?". ``project_metadata_index()`` finds the SFDX
+project around a file, walks its package directories (``force-app`` by
+default) and returns a ``MetadataIndex`` built from:
+
+- ``*.object-meta.xml``: custom objects
+- ``*.field-meta.xml``: fields with type, required/formula flags
+- ``*.permissionset-meta.xml`` / ``*.profile-meta.xml``: object and field permissions
+- ``*.validationRule-meta.xml``: rules and the custom fields their formulas read
+
+The index is incremental. Each file's mtime, size, content hash and parsed
+entry are persisted in ``~/.claude/cache/metadata-index/`` (one JSON file
+per project), so a save re-parses only files whose content changed. A cold
+build parses files in parallel worker processes. Lookups such as
+``field_grants()`` are dict lookups.
+
+Usage:
+    from metadata_index import project_metadata_index
+
+    index = project_metadata_index("force-app/main/default/objects/Invoice__c/fields/Total__c.field-meta.xml")
+    if index is not None:
+        index.has_field("Invoice__c", "Total__c")        # None if the object is not local
+        index.field_grants("Invoice__c", "Total__c")     # [{'container': ..., 'readable': ...}]
+
+    python3 metadata_index.py <project-dir>              # Build and summarise
+
+Environment:
+    SF_METADATA_INDEX        Set to 0 to disable the index
+    SF_METADATA_INDEX_DIR    Persisted index directory override
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_DIR = Path.home() / ".claude" / "cache" / "metadata-index"
+DEFAULT_PACKAGE_DIR = "force-app"
+PARALLEL_THRESHOLD = 64
+
+SKIPPED_DIRS = {"node_modules", ".sfdx", ".sf", ".git", "__pycache__"}
+
+# Indexed file suffix -> entry kind
+SUFFIXES = {
+    ".object-meta.xml": "object",
+    ".field-meta.xml": "field",
+    ".permissionset-meta.xml": "permissionset",
+    ".profile-meta.xml": "profile",
+    ".validationRule-meta.xml": "validationRule",
+}
+
+# Custom fields of the rule's own object (not Parent__r.Field__c or $Setup.X__c)
+_CUSTOM_FIELD_RE = re.compile(r"(?<![.\w$])([A-Za-z]\w*__c)\b")
+_OBJECT_PERMISSIONS = ("allowCreate", "allowRead", "allowEdit", "allowDelete", "viewAllRecords", "modifyAllRecords")
+
+
+def find_project_root(file_path: str) -> Optional[Path]:
+    """Nearest ancestor directory containing ``sfdx-project.json``."""
+    current = Path(file_path).resolve()
+    for candidate in [current, *current.parents]:
+        if (candidate / "sfdx-project.json").is_file():
+            return candidate
+    return None
+
+
+def package_directories(root: Path) -> List[Path]:
+    """Package directories declared in ``sfdx-project.json`` (``force-app`` if none)."""
+    paths: List[str] = []
+    try:
+        with (root / "sfdx-project.json").open("r", encoding="utf-8") as handle:
+            config = json.load(handle)
+        paths = [entry["path"] for entry in config.get("packageDirectories") or [] if entry.get("path")]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return [root / path for path in (paths or [DEFAULT_PACKAGE_DIR]) if (root / path).is_dir()]
+
+
+def metadata_kind(name: str) -> Optional[str]:
+    for suffix, kind in SUFFIXES.items():
+        if name.endswith(suffix):
+            return kind
+    return None
+
+
+def iter_metadata_files(root: Path) -> Iterable[Path]:
+    for package_dir in package_directories(root):
+        for dirpath, dirnames, filenames in os.walk(package_dir):
+            dirnames[:] = [name for name in dirnames if name not in SKIPPED_DIRS and not name.startswith(".")]
+            for name in filenames:
+                if metadata_kind(name):
+                    yield Path(dirpath) / name
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _children(element: ET.Element) -> Dict[str, str]:
+    """Direct child text by local tag name (first occurrence wins)."""
+    values: Dict[str, str] = {}
+    for child in element:
+        values.setdefault(_local(child.tag), (child.text or "").strip())
+    return values
+
+
+def _strip_suffix(name: str, kind: str) -> str:
+    for suffix, suffix_kind in SUFFIXES.items():
+        if suffix_kind == kind and name.endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+def parse_metadata(path: Path, data: bytes) -> Dict:
+    """Index entry for one source-format metadata file."""
+    kind = metadata_kind(path.name)
+    name = _strip_suffix(path.name, kind)
+    entry: Dict = {"kind": kind, "name": name}
+    try:
+        root = ET.fromstring(data)
+    except ET.ParseError:
+        entry["invalid"] = True
+        root = None
+
+    if kind == "object":
+        entry["object"] = name
+    elif kind in ("field", "validationRule"):
+        # objects/<Object>/fields/<Field>.field-meta.xml
+        entry["object"] = path.parent.parent.name
+
+    if root is None:
+        return entry
+
+    values = _children(root)
+    if kind == "field":
+        field_type = values.get("type", "")
+        entry.update({
+            "type": field_type or "Unknown",
+            "required": values.get("required", "").lower() == "true",
+            "formula": bool(values.get("formula")),
+        })
+    elif kind == "validationRule":
+        entry["active"] = values.get("active", "true").lower() == "true"
+        entry["fields"] = sorted(set(_CUSTOM_FIELD_RE.findall(values.get("errorConditionFormula", ""))))
+    elif kind in ("permissionset", "profile"):
+        fields: Dict[str, List[bool]] = {}
+        objects: Dict[str, List[str]] = {}
+        for child in root:
+            tag = _local(child.tag)
+            if tag == "fieldPermissions":
+                perm = _children(child)
+                if perm.get("field"):
+                    fields[perm["field"]] = [perm.get("readable") == "true", perm.get("editable") == "true"]
+            elif tag == "objectPermissions":
+                perm = _children(child)
+                if perm.get("object"):
+                    objects[perm["object"]] = [flag for flag in _OBJECT_PERMISSIONS if perm.get(flag) == "true"]
+        entry["fields"] = fields
+        entry["objects"] = objects
+    return entry
+
+
+def is_namespaced(api_name: str) -> bool:
+    """True for managed-package API names such as ``ns__Score__c``."""
+    return api_name.count("__") >= 2
+
+
+def _file_digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def parse_file(path: str) -> Tuple[str, Dict]:
+    """Index entry (stat, hash, parsed metadata) for one file. Runs in worker processes."""
+    file_path = Path(path)
+    stat = file_path.stat()
+    data = file_path.read_bytes()
+    return path, {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "hash": _file_digest(data),
+        "metadata": parse_metadata(file_path, data),
+    }
+
+
+def _parser_fingerprint() -> str:
+    digest = hashlib.sha1(str(INDEX_VERSION).encode("utf-8"))
+    try:
+        with open(__file__, "rb") as handle:
+            digest.update(handle.read())
+    except OSError:
+        pass
+    return digest.hexdigest()
+
+
+class MetadataIndex:
+    """Metadata of one SFDX project, refreshed incrementally from disk."""
+
+    def __init__(self, root: Path, index_dir: Optional[Path] = None):
+        self.root = Path(root).resolve()
+        self.index_dir = Path(os.environ.get("SF_METADATA_INDEX_DIR") or index_dir or DEFAULT_INDEX_DIR)
+        self.files: Dict[str, Dict] = {}
+        self.parsed_files = 0
+        self._objects: Dict[str, Dict] = {}
+        self._fields: Dict[str, Dict[str, Dict]] = {}
+        self._grants: Dict[str, List[Dict]] = {}
+        self._object_grants: Dict[str, List[Dict]] = {}
+        self._rules: Dict[str, List[Dict]] = {}
+        self._containers: Dict[str, List[Dict]] = {"permissionset": [], "profile": []}
+
+    @property
+    def path(self) -> Path:
+        key = hashlib.sha1(str(self.root).encode("utf-8")).hexdigest()
+        return self.index_dir / f"{key}.json"
+
+    # ── Build ──────────────────────────────────────────────────
+
+    def refresh(self, workers: Optional[int] = None) -> "MetadataIndex":
+        """Load the persisted index, re-parse changed files, and save if anything moved."""
+        fingerprint = _parser_fingerprint()
+        stored = self._load(fingerprint)
+
+        files: Dict[str, Dict] = {}
+        changed: List[str] = []
+        for file_path in iter_metadata_files(self.root):
+            key = str(file_path)
+            previous = stored.get(key)
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            if previous and previous.get("mtime_ns") == stat.st_mtime_ns and previous.get("size") == stat.st_size:
+                files[key] = previous
+                continue
+            if previous:
+                # Touched but possibly unchanged: the content hash decides
+                try:
+                    digest = _file_digest(file_path.read_bytes())
+                except OSError:
+                    continue
+                if digest == previous.get("hash"):
+                    files[key] = dict(previous, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                    continue
+            changed.append(key)
+
+        for key, entry in self._parse_all(changed, workers):
+            files[key] = entry
+
+        dirty = bool(changed) or set(files) != set(stored) or any(files[key] is not stored.get(key) for key in files)
+        self.files = files
+        self.parsed_files = len(changed)
+        self._build_lookups()
+        if dirty:
+            self._save(fingerprint)
+        return self
+
+    def _parse_all(self, paths: List[str], workers: Optional[int]) -> List[Tuple[str, Dict]]:
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(paths) >= PARALLEL_THRESHOLD:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    return list(pool.map(parse_file, paths, chunksize=max(1, len(paths) // (workers * 4))))
+            except (OSError, RuntimeError, ImportError):
+                pass  # No worker processes available; parse inline
+        results = []
+        for path in paths:
+            try:
+                results.append(parse_file(path))
+            except OSError:
+                continue
+        return results
+
+    def _load(self, fingerprint: str) -> Dict[str, Dict]:
+        try:
+            with self.path.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(payload, dict) or payload.get("fingerprint") != fingerprint:
+            return {}
+        return payload.get("files") or {}
+
+    def _save(self, fingerprint: str) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=".metadata-index-", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"fingerprint": fingerprint, "root": str(self.root), "files": self.files}, handle)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def _build_lookups(self) -> None:
+        objects: Dict[str, Dict] = {}
+        fields: Dict[str, Dict[str, Dict]] = {}
+        grants: Dict[str, List[Dict]] = {}
+        object_grants: Dict[str, List[Dict]] = {}
+        rules: Dict[str, List[Dict]] = {}
+        containers: Dict[str, List[Dict]] = {"permissionset": [], "profile": []}
+
+        for key, entry in self.files.items():
+            metadata = dict(entry.get("metadata") or {}, path=key)
+            kind = metadata.get("kind")
+            if kind == "object":
+                objects[metadata["object"].lower()] = metadata
+            elif kind == "field":
+                fields.setdefault(metadata["object"].lower(), {})[metadata["name"].lower()] = metadata
+            elif kind == "validationRule":
+                rules.setdefault(metadata["object"].lower(), []).append(metadata)
+            elif kind in containers:
+                containers[kind].append(metadata)
+                for field, (readable, editable) in (metadata.get("fields") or {}).items():
+                    grants.setdefault(field.lower(), []).append({
+                        "container": metadata["name"], "kind": kind,
+                        "readable": readable, "editable": editable,
+                    })
+                for sobject, permissions in (metadata.get("objects") or {}).items():
+                    object_grants.setdefault(sobject.lower(), []).append({
+                        "container": metadata["name"], "kind": kind, "permissions": permissions,
+                    })
+
+        # Objects known only through their fields/ folder still count as local
+        for sobject in fields:
+            objects.setdefault(sobject, {"kind": "object", "name": sobject, "object": sobject})
+
+        self._objects = objects
+        self._fields = fields
+        self._grants = grants
+        self._object_grants = object_grants
+        self._rules = rules
+        self._containers = containers
+
+    # ── Queries ────────────────────────────────────────────────
+
+    def has_object(self, name: str) -> bool:
+        return name.lower() in self._objects
+
+    def defines_object(self, name: str) -> bool:
+        """Whether ``name`` is a project-owned custom object present locally,
+        so its local fields are its complete field list.
+
+        Standard objects (usually retrieved partially) and managed-package
+        objects are never complete locally.
+        """
+        lowered = name.lower()
+        return lowered in self._objects and lowered.endswith("__c") and not is_namespaced(lowered)
+
+    def fields(self, sobject: str) -> List[Dict]:
+        """Parsed field entries defined locally for ``sobject``."""
+        return sorted(self._fields.get(sobject.lower(), {}).values(), key=lambda field: field["name"])
+
+    def get_field(self, sobject: str, field: str) -> Optional[Dict]:
+        return self._fields.get(sobject.lower(), {}).get(field.lower())
+
+    def has_field(self, sobject: str, field: str) -> Optional[bool]:
+        """Whether ``field`` is defined on ``sobject``; None if the object has no local metadata."""
+        if sobject.lower() not in self._objects:
+            return None
+        return field.lower() in self._fields.get(sobject.lower(), {})
+
+    def field_grants(self, sobject: str, field: str) -> List[Dict]:
+        """Permission sets and profiles with fieldPermissions for ``sobject.field``."""
+        return self._grants.get(f"{sobject}.{field}".lower(), [])
+
+    def object_grants(self, sobject: str) -> List[Dict]:
+        """Permission sets and profiles with objectPermissions for ``sobject``."""
+        return self._object_grants.get(sobject.lower(), [])
+
+    def validation_rules(self, sobject: str) -> List[Dict]:
+        return self._rules.get(sobject.lower(), [])
+
+    def permission_sets(self) -> List[Dict]:
+        return self._containers["permissionset"]
+
+    def profiles(self) -> List[Dict]:
+        return self._containers["profile"]
+
+    @property
+    def object_count(self) -> int:
+        return len(self._objects)
+
+    @property
+    def field_count(self) -> int:
+        return sum(len(fields) for fields in self._fields.values())
+
+
+_INDEXES: Dict[str, MetadataIndex] = {}
+
+
+def project_metadata_index(file_path: str, workers: Optional[int] = None) -> Optional[MetadataIndex]:
+    """Refreshed index of the SFDX project containing ``file_path`` (None outside a project)."""
+    if os.environ.get("SF_METADATA_INDEX", "1") == "0":
+        return None
+    root = find_project_root(file_path)
+    if root is None:
+        return None
+    index = _INDEXES.get(str(root))
+    if index is None:
+        index = _INDEXES[str(root)] = MetadataIndex(root).refresh(workers)
+    return index
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 metadata_index.py <project-dir>")
+        sys.exit(1)
+
+    project_root = find_project_root(sys.argv[1])
+    if project_root is None:
+        print(f"No sfdx-project.json found above {sys.argv[1]}")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    index = MetadataIndex(project_root).refresh()
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"Metadata index for {project_root}")
+    print(f"  {index.object_count} objects, {index.field_count} fields, "
+          f"{len(index.permission_sets())} permission sets, {len(index.profiles())} profiles")
+    print(f"  {index.parsed_files} of {len(index.files)} files parsed in {elapsed:.0f}ms")
+    print(f"  Stored at {index.path}")
@@ -38,16 +38,25 @@ Validates Salesforce metadata XML files against best practices.
    - No hardcoded IDs
    - Global Value Sets for reusable picklists
 
+Inside an SFDX project, files are also checked against the project metadata
+index (metadata_index.py): fields no permission set or profile grants,
+permissions for fields/objects that don't exist locally, and validation
+rules reading undefined fields.
+
 Usage:
     python validate_metadata.py /path/to/metadata-file.xml
+    python validate_metadata.py --project /path/to/sfdx-project
 """
 
 import os
 import re
 import sys
 import xml.etree.ElementTree as ET
+from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+from metadata_index import is_namespaced, project_metadata_index
+
 
 class MetadataValidator:
     """Validates Salesforce metadata XML files."""
@@ -82,6 +91,7 @@ class MetadataValidator:
         self.tree = None
         self.root = None
         self.metadata_type = self._detect_metadata_type()
+        self.index = None
         self.categories = {k: dict(v) for k, v in self.CATEGORIES.items()}
         for cat in self.categories.values():
             cat['issues'] = []
@@ -147,6 +157,7 @@ class MetadataValidator:
         self._validate_security()
         self._validate_documentation()
         self._validate_best_practices()
+        self._validate_project()
 
         return self._build_results()
 
@@ -397,6 +408,67 @@ class MetadataValidator:
                     'Consider adding a bypass mechanism for admin/integration users', 3
                 )
 
+    def _validate_project(self):
+        """Cross-file checks against the project metadata index."""
+        self.index = project_metadata_index(self.file_path)
+        if self.index is None:
+            return
+        path = str(Path(self.file_path).resolve())
+        parts = Path(path).parts
+
+        if self.metadata_type == 'CustomField' and len(parts) >= 3:
+            sobject = parts[-3]
+            field = self.file_name[:-len('.field-meta.xml')]
+            field_type = self._get_text(self.root, 'type')
+            required = self._get_text(self.root, 'required') == 'true'
+            # Required and Master-Detail fields can't carry field permissions
+            grantable = field.endswith('__c') and not required and field_type != 'MasterDetail'
+            has_containers = self.index.permission_sets() or self.index.profiles()
+            if grantable and has_containers and not self.index.field_grants(sobject, field):
+                self._add_issue(
+                    'security_fls', 'INFO',
+                    f'{sobject}.{field} is not granted by any permission set or profile in the project', 2
+                )
+
+        elif self.metadata_type in ['PermissionSet', 'Profile']:
+            missing = []
+            # Only project-owned objects are judged: managed-package names and
+            # standard objects whose fields were partly retrieved are undecidable
+            for perm in self.root.findall('sf:fieldPermissions', self.NAMESPACE):
+                sobject, _, field = self._get_text(perm, 'field').partition('.')
+                if (field.endswith('__c') and not is_namespaced(field)
+                        and self.index.defines_object(sobject)
+                        and self.index.has_field(sobject, field) is False):
+                    missing.append(f'{sobject}.{field}')
+            for perm in self.root.findall('sf:objectPermissions', self.NAMESPACE):
+                sobject = self._get_text(perm, 'object')
+                if (sobject.endswith('__c') and not is_namespaced(sobject)
+                        and not self.index.has_object(sobject)):
+                    missing.append(sobject)
+            if missing:
+                shown = ', '.join(missing[:5]) + (f' (+{len(missing) - 5} more)' if len(missing) > 5 else '')
+                self._add_issue(
+                    'structure_format', 'WARNING',
+                    f'Permissions reference metadata not defined in the project: {shown}', 3
+                )
+
+        elif self.metadata_type == 'ValidationRule' and len(parts) >= 3:
+            sobject = parts[-3]
+            rule = self._get_text(self.root, 'fullName') or self.file_name
+            entry = (self.index.files.get(path) or {}).get('metadata') or {}
+            # Same gates as permissions: only fields of a project-owned object are decidable
+            unknown = [
+                field for field in entry.get('fields', [])
+                if field.endswith('__c') and not is_namespaced(field)
+                and self.index.defines_object(sobject)
+                and self.index.has_field(sobject, field) is False
+            ]
+            if unknown:
+                self._add_issue(
+                    'data_integrity', 'WARNING',
+                    f'Validation rule {rule} references fields not defined on {sobject}: {", ".join(unknown[:5])}', 3
+                )
+
     def _build_results(self) -> Dict:
         """Build and return validation results."""
         total_score = sum(cat['score'] for cat in self.categories.values())
@@ -433,10 +505,39 @@ class MetadataValidator:
         }
 
 
+def validate_project(project_dir: str) -> List[Dict]:
+    """Validate every indexed metadata file of an SFDX project against one shared index."""
+    index = project_metadata_index(os.path.join(project_dir, 'sfdx-project.json'))
+    if index is None:
+        return []
+    return [MetadataValidator(path).validate() for path in sorted(index.files)]
+
+
+def print_project_summary(project_dir: str) -> int:
+    """Bulk mode: one line per file below the passing score, then totals."""
+    results = validate_project(project_dir)
+    if not results:
+        print(f"No SFDX project metadata found in {project_dir}")
+        return 1
+
+    failing = [r for r in results if r['overall_score'] < 72]
+    print(f"\n{'=' * 60}")
+    print(f"🔍 Project Metadata Validation: {len(results)} files")
+    print(f"{'=' * 60}")
+    for result in failing:
+        print(f"  🟡 {result['overall_score']}/{result['max_score']} {os.path.relpath(result['file_path'], project_dir)}")
+    average = sum(r['overall_score'] for r in results) / len(results)
+    print(f"\nAverage score: {average:.0f}/{results[0]['max_score']}, {len(failing)} below 72")
+    return 1 if failing else 0
+
+
 def main():
     """CLI entry point with dual-mode input support."""
     import json
 
+    if len(sys.argv) >= 3 and sys.argv[1] == '--project':
+        return print_project_summary(sys.argv[2])
+
     file_path = None
 
     # Mode 1: Hook mode - read from stdin JSON (PostToolUse hooks)
@@ -4,8 +4,10 @@ from __future__ import annotations
 import json
 import os
 import re
+import shutil
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 from typing import Optional
 
@@ -27,6 +29,25 @@ SHARED_DIR = ROOT / "shared"
 # The dispatcher script itself
 DISPATCHER_SCRIPT = SHARED_HOOKS_SCRIPTS / "validator-dispatcher.py"
 
+# Hooks persist caches and indexes under ~/.claude/cache by default.
+# Tests point each override at a throwaway directory instead.
+HOOK_STATE_DIR = Path(tempfile.mkdtemp(prefix="sf-skills-hook-state-"))
+HOOK_STATE_ENV = {
+    "AGENTSCRIPT_STATE_DIR": HOOK_STATE_DIR / "agentscript-blocks",
+    "AGENTSCRIPT_ORG_CACHE_PATH": HOOK_STATE_DIR / "agentscript-org-facts.json",
+    "SF_LWC_BUNDLE_CACHE_DIR": HOOK_STATE_DIR / "lwc-bundles",
+    "SF_SLDS_LINTER_CACHE_DIR": HOOK_STATE_DIR / "slds-linter",
+    "SF_APEX_SYMBOL_INDEX_DIR": HOOK_STATE_DIR / "apex-symbols",
+    "SF_METADATA_INDEX_DIR": HOOK_STATE_DIR / "metadata-index",
+}
+
+
+def _isolate_hook_state(env: dict) -> dict:
+    """Point hook cache overrides at HOOK_STATE_DIR unless a test set its own."""
+    for name, path in HOOK_STATE_ENV.items():
+        env.setdefault(name, str(path))
+    return env
+
 
 def make_hook_input(
     file_path: str,
@@ -67,7 +88,7 @@ def _build_env(validator_rel_path: str) -> dict:
     # Disable org-aware checks by default (no SF org in CI)
     env.setdefault("AGENTSCRIPT_SKIP_ORG_CHECKS", "1")
 
-    return env
+    return _isolate_hook_state(env)
 
 
 def run_validator(
@@ -125,6 +146,7 @@ def run_dispatcher(
     if existing:
         python_paths.append(existing)
     env["PYTHONPATH"] = os.pathsep.join(python_paths)
+    _isolate_hook_state(env)
 
     return subprocess.run(
         [sys.executable, str(DISPATCHER_SCRIPT)],
@@ -154,6 +176,19 @@ def parse_score(output: str) -> Optional[tuple[int, int]]:
     return None
 
 
+# ── Hook state isolation ───────────────────────────────────────
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_hook_state():
+    """Keep in-process tests and direct subprocess calls out of ~/.claude/cache."""
+    mp = pytest.MonkeyPatch()
+    for name, path in HOOK_STATE_ENV.items():
+        mp.setenv(name, str(path))
+    yield HOOK_STATE_DIR
+    mp.undo()
+    shutil.rmtree(HOOK_STATE_DIR, ignore_errors=True)
+
+
 # ── Pytest markers ─────────────────────────────────────────────
 
 def pytest_configure(config):
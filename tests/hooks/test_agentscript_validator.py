@@ -1,6 +1,9 @@
 """Tests for sf-ai-agentscript agentscript-syntax-validator.py."""
 from __future__ import annotations
 
+import json
+import subprocess
+import sys
 from pathlib import Path
 
 import pytest
@@ -75,3 +78,119 @@ class TestAgentScriptEdgeCases:
         f.write_text("# Not an agent")
         result = run_validator(VALIDATOR, str(f))
         assert result.returncode == 0
+
+
+@pytest.mark.hooks
+class TestAgentScriptAst:
+    """The shared tokenizer/AST the validator is built on."""
+
+    @pytest.fixture
+    def ast_module(self, monkeypatch):
+        monkeypatch.syspath_prepend(str(SKILLS_ROOT / "sf-ai-agentscript" / "hooks" / "scripts"))
+        import agentscript_ast
+
+        return agentscript_ast
+
+    def test_blocks_spans_and_owners(self, ast_module):
+        document = ast_module.parse(
+            "config:\n"
+            "    developer_name: \"Demo\"\n"
+            "\n"
+            "topic orders:\n"
+            "    # comment\n"
+            "    reasoning:\n"
+            "        instructions: ->\n"
+            "            if @variables.done:\n"
+            "                | Done.\n"
+        )
+        kinds = [(block.kind, block.name) for block in document.blocks()]
+        assert kinds == [("config", None), ("topic", "orders")]
+
+        topic = document.blocks("topic")[0]
+        assert (topic.start_line, topic.end_line) == (4, 9)
+        assert [node.kind for node in topic.walk()] == ["reasoning", "instructions", "if", "pipe"]
+        assert document.owner_of(9) == "orders"
+        assert document.owner_of(2) is None
+
+    def test_indented_snippet_has_no_top_level_blocks(self, ast_module):
+        document = ast_module.parse("\tactions:\n\t\tlookup:\n\t\t\ttarget: \"flow://Lookup\"\n")
+        assert document.blocks() == []
+        assert document.root.children[0].kind == "actions"
+
+
+@pytest.mark.hooks
+class TestAgentScriptOrgCache:
+    """Cross-process cache for org-aware (ASV-ORG-*) lookups."""
+
+    @pytest.fixture
+    def cache_module(self, monkeypatch):
+        monkeypatch.syspath_prepend(str(SKILLS_ROOT / "sf-ai-agentscript" / "hooks" / "scripts"))
+        monkeypatch.delenv("AGENTSCRIPT_ORG_CACHE_PATH", raising=False)
+        monkeypatch.delenv("AGENTSCRIPT_ORG_CACHE_TTL", raising=False)
+        import agentscript_org_cache
+
+        return agentscript_org_cache
+
+    def test_only_fully_positive_results_are_cacheable(self, cache_module):
+        found = {"ok": True, "records": [{"ApiName": "Refund", "ActiveVersionId": "301"}]}
+        inactive = {"ok": True, "records": [{"ApiName": "Refund", "ActiveVersionId": None}]}
+        assert cache_module.is_positive_result(found, 1)
+        assert not cache_module.is_positive_result(found, 2)
+        assert not cache_module.is_positive_result(inactive, 1)
+        assert not cache_module.is_positive_result({"ok": False, "reason": "query_failed"}, 0)
+
+    def test_entries_persist_across_instances_until_ttl(self, cache_module, tmp_path):
+        path = tmp_path / "org-facts.json"
+        writer = cache_module.OrgFactCache(path=path, ttl_seconds=60)
+        writer.put("soql\nmyorg\nSELECT Id FROM ApexClass", {"ok": True, "records": []})
+        writer.flush()
+
+        assert cache_module.OrgFactCache(path=path, ttl_seconds=60).get("soql\nmyorg\nSELECT Id FROM ApexClass") == {"ok": True, "records": []}
+        assert cache_module.OrgFactCache(path=path, ttl_seconds=0).get("soql\nmyorg\nSELECT Id FROM ApexClass") is None
+
+
+@pytest.mark.hooks
+class TestAgentScriptIncremental:
+    """Re-validation reuses stored findings for unchanged blocks."""
+
+    def test_edited_file_matches_full_validation(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("AGENTSCRIPT_STATE_DIR", str(tmp_path / "state"))
+        agent = tmp_path / "bad_agent.agent"
+        agent.write_text((AGENTS_DIR / "bad_agent.agent").read_text())
+        run_validator(VALIDATOR, str(agent))
+        assert list((tmp_path / "state").glob("*.json"))
+
+        # Grow the first topic so every later block moves down a line.
+        lines = agent.read_text().split("\n")
+        topic_index = next(i for i, line in enumerate(lines) if line.startswith("topic "))
+        lines.insert(topic_index + 1, "    # reviewed")
+        agent.write_text("\n".join(lines))
+
+        incremental = run_validator(VALIDATOR, str(agent))
+        monkeypatch.setenv("AGENTSCRIPT_INCREMENTAL", "0")
+        full = run_validator(VALIDATOR, str(agent))
+        assert incremental.stdout == full.stdout
+
+
+@pytest.mark.hooks
+class TestAgentScriptBulkCli:
+    """scripts/validate-agents.py aggregate reports."""
+
+    def test_sarif_report_covers_every_finding(self, tmp_path):
+        cli = SKILLS_ROOT / "sf-ai-agentscript" / "scripts" / "validate-agents.py"
+        report_path = tmp_path / "report.sarif"
+        proc = subprocess.run(
+            [sys.executable, str(cli), str(AGENTS_DIR), str(GOOD_AGENT), "--skip-org-checks", "--format", "sarif", "-o", str(report_path)],
+            capture_output=True,
+            text=True,
+            timeout=60,
+            check=False,
+        )
+        assert proc.returncode == 1  # bad_agent.agent has blocking findings
+
+        run = json.loads(report_path.read_text())["runs"][0]
+        levels = {result["level"] for result in run["results"]}
+        assert "error" in levels
+        assert all(result["ruleId"].startswith("ASV-") for result in run["results"])
+        uris = {result["locations"][0]["physicalLocation"]["artifactLocation"]["uri"] for result in run["results"]}
+        assert any(uri.endswith("bad_agent.agent") for uri in uris)
@@ -1,10 +1,14 @@
 """Tests for sf-apex validators: prettier, LSP, and 150-point scorer."""
 from __future__ import annotations
 
+import importlib.util
+import sys
+
 import pytest
 
 from tests.hooks.conftest import (
     FIXTURES_DIR,
+    SKILLS_ROOT,
     parse_score,
     run_validator,
 )
@@ -37,6 +41,113 @@ class TestPrettierFormat:
         assert result.returncode == 0
 
 
+# Stub prettier CLI: strips trailing whitespace and logs each invocation
+FAKE_PRETTIER_CLI = """\
+import sys
+with open(sys.argv[0] + ".log", "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+for path in [arg for arg in sys.argv[1:] if not arg.startswith("--")]:
+    with open(path) as f:
+        text = "\\n".join(line.rstrip() for line in f.read().splitlines()) + "\\n"
+    with open(path, "w") as f:
+        f.write(text)
+"""
+
+UNFORMATTED_CLS = "public class Foo {   \n    void run() {}   \n}\n"
+
+
+class StubWorker:
+    """Stands in for PrettierWorker; ``results=None`` means the worker is unreachable."""
+
+    def __init__(self, results=None):
+        self.results = results
+        self.requests = []
+
+    def format(self, paths):
+        self.requests.append(list(paths))
+        return self.results
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def prettier(tmp_path, monkeypatch):
+    """prettier-format.py loaded in-process with a stub CLI and a private cache."""
+    spec = importlib.util.spec_from_file_location("sf_apex_prettier_format", SKILLS_ROOT / PRETTIER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    runtime = tmp_path / "prettier"
+    cli = runtime / "node_modules" / ".bin" / "prettier"
+    cli.parent.mkdir(parents=True)
+    cli.write_text(f"#!{sys.executable}\n{FAKE_PRETTIER_CLI}")
+    cli.chmod(0o755)
+    monkeypatch.setattr(module, "PRETTIER_DIR", runtime)
+    monkeypatch.setattr(module, "FORMATTED_CACHE_PATH", tmp_path / "cache" / "prettier-formatted.json")
+    monkeypatch.setattr(module.PrettierWorker, "available", staticmethod(lambda: True))
+    module.cli_log = cli.with_name("prettier.log")
+    return module
+
+
+@pytest.mark.hooks
+class TestPrettierFormatBatch:
+    def test_falls_back_to_cli_when_worker_is_unavailable(self, prettier, tmp_path):
+        cls = tmp_path / "Foo.cls"
+        cls.write_text(UNFORMATTED_CLS)
+        worker = StubWorker(results=None)
+
+        results = prettier.format_files([str(cls)], worker=worker)
+
+        assert results[str(cls)] == {"formatted": True, "reason": "Auto-formatted by prettier"}
+        assert worker.requests == [[str(cls)]]
+        assert cls.read_text() == "public class Foo {\n    void run() {}\n}\n"
+        assert len(prettier.cli_log.read_text().splitlines()) == 1
+
+    def test_formatted_cache_skips_files_prettier_already_produced(self, prettier, tmp_path):
+        cls = tmp_path / "Foo.cls"
+        cls.write_text(UNFORMATTED_CLS)
+        prettier.format_files([str(cls)], worker=StubWorker(results=None))
+
+        worker = StubWorker(results=[])
+        results = prettier.format_files([str(cls)], worker=worker)
+
+        assert results[str(cls)] == {"formatted": False, "reason": "Already formatted (cached)"}
+        assert worker.requests == []
+        assert len(prettier.cli_log.read_text().splitlines()) == 1
+
+    def test_worker_results_are_cached_by_output_hash(self, prettier, tmp_path):
+        cls = tmp_path / "Foo.cls"
+        cls.write_text("public class Foo {}\n")
+        digest = prettier.content_hash(cls.read_bytes())
+        worker = StubWorker(results=[{"formatted": False, "hash": digest}])
+
+        first = prettier.format_files([str(cls)], worker=worker)
+        second = prettier.format_files([str(cls)], worker=worker)
+
+        assert first[str(cls)]["reason"] == "Already formatted"
+        assert second[str(cls)]["reason"] == "Already formatted (cached)"
+        assert len(worker.requests) == 1
+        assert not prettier.cli_log.exists()
+
+    def test_expand_walks_directories_and_keeps_explicit_files(self, prettier, tmp_path):
+        project = tmp_path / "force-app"
+        for rel in ("classes/B.cls", "classes/A.cls", "triggers/T.trigger", "classes/notes.md",
+                    "node_modules/pkg/X.cls", ".sfdx/tools/Y.cls"):
+            (project / rel).parent.mkdir(parents=True, exist_ok=True)
+            (project / rel).write_text("")
+        explicit = tmp_path / "Other.cls"
+
+        files = prettier._expand([str(project), str(explicit)])
+
+        assert files == [
+            str(project / "classes" / "A.cls"),
+            str(project / "classes" / "B.cls"),
+            str(project / "triggers" / "T.trigger"),
+            str(explicit),
+        ]
+
+
 # ── Apex LSP ────────────────────────────────────────────────────
 
 
@@ -116,3 +227,81 @@ class TestApexPostToolEdgeCases:
         score = parse_score(result.stdout)
         if score is not None:
             assert score[1] == 90  # Total should be 90
+
+
+@pytest.mark.hooks
+class TestApexPostToolPatterns:
+    def test_java_types_in_comments_are_ignored(self, tmp_path):
+        """Pattern rules scan comment-masked code, so only L5 is flagged."""
+        f = tmp_path / "Sample.cls"
+        f.write_text(
+            "public class Sample {\n"
+            "    // ArrayList<String> names = new ArrayList<String>();\n"
+            "    /* HashMap<String, Integer> counts; */\n"
+            "    public void run() {\n"
+            "        ArrayList<String> names = new ArrayList<String>();\n"
+            "    }\n"
+            "}\n"
+        )
+        result = run_validator(POST_TOOL, str(f), timeout=60)
+        assert result.returncode == 0
+        assert "L5: Java type" in result.stdout
+        assert "L2: Java type" not in result.stdout
+        assert "HashMap" not in result.stdout
+
+    def test_project_symbols_flag_unknown_methods_and_fields(self, tmp_path, monkeypatch):
+        """Inside an SFDX project, calls and custom fields resolve against local metadata."""
+        monkeypatch.setenv("SF_APEX_SYMBOL_INDEX_DIR", str(tmp_path / "index"))
+        project = tmp_path / "project"
+        classes = project / "force-app" / "main" / "default" / "classes"
+        fields = project / "force-app" / "main" / "default" / "objects" / "Invoice__c" / "fields"
+        classes.mkdir(parents=True)
+        fields.mkdir(parents=True)
+        (project / "sfdx-project.json").write_text('{"packageDirectories": [{"path": "force-app"}]}')
+        (fields.parent / "Invoice__c.object-meta.xml").write_text("<CustomObject/>")
+        (fields / "Total__c.field-meta.xml").write_text("<CustomField/>")
+        (classes / "InvoiceService.cls").write_text(
+            "public class InvoiceService {\n"
+            "    public static void post(Id invoiceId) {}\n"
+            "}\n"
+        )
+        f = classes / "InvoiceJob.cls"
+        f.write_text(
+            "public class InvoiceJob {\n"
+            "    public void run(Id invoiceId) {\n"
+            "        InvoiceService.post(invoiceId);\n"
+            "        InvoiceService.postAll(invoiceId);\n"
+            "        List<Invoice__c> rows = [SELECT Id, Total__c, Totl__c FROM Invoice__c];\n"
+            "    }\n"
+            "}\n"
+        )
+        result = run_validator(POST_TOOL, str(f), timeout=60)
+        assert result.returncode == 0
+        assert "L4: InvoiceService.postAll() is not declared" in result.stdout
+        assert "L3:" not in result.stdout
+        assert "L5: Totl__c is not defined on Invoice__c" in result.stdout
+        assert "Total__c is not defined" not in result.stdout
+
+    def test_namespaced_and_partially_retrieved_fields_are_not_critical(self, tmp_path, monkeypatch):
+        """Managed-package fields are skipped; unknown fields on standard objects only warn."""
+        monkeypatch.setenv("SF_APEX_SYMBOL_INDEX_DIR", str(tmp_path / "index"))
+        project = tmp_path / "project"
+        classes = project / "force-app" / "main" / "default" / "classes"
+        fields = project / "force-app" / "main" / "default" / "objects" / "Account" / "fields"
+        classes.mkdir(parents=True)
+        fields.mkdir(parents=True)
+        (project / "sfdx-project.json").write_text('{"packageDirectories": [{"path": "force-app"}]}')
+        (fields / "Local__c.field-meta.xml").write_text("<CustomField/>")
+        f = classes / "AccountScores.cls"
+        f.write_text(
+            "public class AccountScores {\n"
+            "    public void run() {\n"
+            "        List<Account> rows = [SELECT Id, Local__c, pkg__Score__c, Regin__c FROM Account];\n"
+            "    }\n"
+            "}\n"
+        )
+        result = run_validator(POST_TOOL, str(f), timeout=60)
+        assert result.returncode == 0
+        assert "pkg__Score__c" not in result.stdout
+        assert "Local__c is not defined" not in result.stdout
+        assert "WARNING [sf-skills] L3: Regin__c is not defined on Account" in result.stdout
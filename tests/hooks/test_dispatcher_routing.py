@@ -40,32 +40,28 @@ def matched_skills(file_path: str) -> list[str]:
 
 
 class TestApexRouting:
-    def test_cls_matches_three_validators(self):
+    def test_cls_matches_two_validators(self):
         matches = matched_skills("/path/to/AccountService.cls")
-        assert len(matches) == 3
+        assert len(matches) == 2
         skills = [m[0] for m in matches]
         assert all(s == "sf-apex" for s in skills)
 
     def test_cls_validator_order(self):
-        """Prettier must run before LSP and scoring."""
+        """Prettier must run before scoring (which runs the LSP in-process)."""
         matches = matched_skills("/path/to/AccountService.cls")
         validators = [m[1] for m in matches]
-        assert validators[0] == "prettier-format.py"
-        assert validators[1] == "apex-lsp-validate.py"
-        assert validators[2] == "post-tool-validate.py"
+        assert validators == ["prettier-format.py", "post-tool-validate.py"]
 
-    def test_trigger_matches_three_validators(self):
+    def test_trigger_matches_two_validators(self):
         matches = matched_skills("/path/to/AccountTrigger.trigger")
-        assert len(matches) == 3
+        assert len(matches) == 2
         skills = [m[0] for m in matches]
         assert all(s == "sf-apex" for s in skills)
 
     def test_trigger_validator_order(self):
         matches = matched_skills("/path/to/AccountTrigger.trigger")
         validators = [m[1] for m in matches]
-        assert validators[0] == "prettier-format.py"
-        assert validators[1] == "apex-lsp-validate.py"
-        assert validators[2] == "post-tool-validate.py"
+        assert validators == ["prettier-format.py", "post-tool-validate.py"]
 
 
 # ── SOQL routing ────────────────────────────────────────────────
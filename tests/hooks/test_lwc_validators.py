@@ -1,10 +1,14 @@
 """Tests for sf-lwc validators: template_validator, LWC LSP, and SLDS scorer."""
 from __future__ import annotations
 
+import os
+import sys
+
 import pytest
 
 from tests.hooks.conftest import (
     FIXTURES_DIR,
+    SKILLS_ROOT,
     run_validator,
 )
 
@@ -117,6 +121,199 @@ class TestTemplateValidatorEdgeCases:
         result = run_validator(TEMPLATE_VALIDATOR, str(f))
         assert result.returncode == 0
 
+    def test_multiline_comments_and_tags(self, tmp_path):
+        """Commented-out markup is ignored; bindings in multi-line tags are found."""
+        d = tmp_path / "lwc" / "multiLine"
+        d.mkdir(parents=True)
+        f = d / "multiLine.html"
+        f.write_text(
+            "<template>\n"
+            "    <!--\n"
+            "    <p>{count + 1}</p>\n"
+            "    -->\n"
+            "    <lightning-button\n"
+            "        label={labelText}\n"
+            "        onclick={handleClick(recordId)}>\n"
+            "    </lightning-button>\n"
+            "</template>\n"
+        )
+        result = run_validator(TEMPLATE_VALIDATOR, str(f))
+        assert result.returncode == 0
+        assert "L3:" not in result.stdout
+        assert "L7: Event handler with arguments" in result.stdout
+
+    def test_deprecated_slds_class(self, tmp_path):
+        """SLDS 1 classes from slds_data are reported with their replacement."""
+        d = tmp_path / "lwc" / "legacyText"
+        d.mkdir(parents=True)
+        f = d / "legacyText.html"
+        f.write_text(
+            "<template>\n"
+            "    <p class=\"slds-p-around_small slds-text-color_inverse\">{message}</p>\n"
+            "</template>\n"
+        )
+        result = run_validator(TEMPLATE_VALIDATOR, str(f))
+        assert result.returncode == 0
+        assert "L2: Deprecated SLDS 1 class: slds-text-color_inverse" in result.stdout
+        assert "slds-p-around_small" not in result.stdout
+
+
+# ── LWC Bundle (cross-file checks) ──────────────────────────────
+
+
+@pytest.mark.hooks
+class TestLwcBundle:
+    def test_template_binding_missing_from_js(self, tmp_path, monkeypatch):
+        """Bindings and handlers are checked against the component class; loop items are local."""
+        monkeypatch.setenv("SF_LWC_BUNDLE_CACHE_DIR", str(tmp_path / "cache"))
+        d = tmp_path / "lwc" / "orderList"
+        d.mkdir(parents=True)
+        (d / "orderList.html").write_text(
+            "<template>\n"
+            "    <template for:each={orders} for:item=\"order\">\n"
+            "        <p key={order.id}>{order.name}</p>\n"
+            "    </template>\n"
+            "    <p>{totalLabel}</p>\n"
+            "    <lightning-button label=\"Go\" onclick={handleGo}></lightning-button>\n"
+            "</template>\n"
+        )
+        (d / "orderList.js").write_text(
+            "import { LightningElement, api } from 'lwc';\n"
+            "export default class OrderList extends LightningElement {\n"
+            "    @api orders = [];\n"
+            "    get total() { return this.orders.length; }\n"
+            "    handleGo() {\n"
+            "        this.template.querySelector('p').classList.add('is-active');\n"
+            "    }\n"
+            "}\n"
+        )
+        (d / "orderList.css").write_text(".highlight { font-weight: bold; }\n")
+
+        result = run_validator(TEMPLATE_VALIDATOR, str(d / "orderList.html"))
+        assert result.returncode == 0
+        assert "orderList.html:L5: Binding {totalLabel} is not declared in orderList.js" in result.stdout
+        assert "{orders}" not in result.stdout
+        assert "{order}" not in result.stdout
+        assert "handleGo" not in result.stdout
+        assert "Class is-active is set from JS but not defined in orderList.css" in result.stdout
+
+    def test_folder_name_mismatch_is_reported(self, tmp_path, monkeypatch):
+        """Files not named after their lwc/ folder would otherwise skip every cross-file check."""
+        monkeypatch.setenv("SF_LWC_BUNDLE_CACHE_DIR", str(tmp_path / "cache"))
+        d = tmp_path / "lwc" / "orderList"
+        d.mkdir(parents=True)
+        (d / "orderlist.html").write_text("<template>\n    <p>{totalLabel}</p>\n</template>\n")
+        (d / "orderlist.js").write_text(
+            "import { LightningElement } from 'lwc';\n"
+            "export default class OrderList extends LightningElement {}\n"
+        )
+
+        result = run_validator(TEMPLATE_VALIDATOR, str(d / "orderlist.html"))
+        assert result.returncode == 0
+        assert (
+            "orderlist.html:L1: Bundle folder orderList has no orderList.js or orderList.html; "
+            "cross-file checks skipped" in result.stdout
+        )
+
+        # Outside an lwc/ folder there is no naming contract to check
+        other = tmp_path / "scratch" / "orderlist.html"
+        other.parent.mkdir()
+        other.write_text("<template><p>{totalLabel}</p></template>\n")
+        assert "Bundle folder" not in run_validator(TEMPLATE_VALIDATOR, str(other)).stdout
+
+
+# ── SLDS Linter wrapper (batching and cache) ────────────────────
+
+FAKE_NPX = """#!{python}
+import json, os, sys
+with open({log!r}, "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+if "--version" in sys.argv:
+    print("1.0.0")
+    sys.exit(0)
+files = [arg for arg in sys.argv[3:] if not arg.startswith("--") and arg != "json"]
+# Like the real linter, the report lists only files with violations
+report = [
+    {{"filePath": path, "messages": [{{"ruleId": "no-hardcoded-values", "message": "Hardcoded color", "line": 1, "column": 1, "severity": 2}}]}}
+    for path in files if "#ff0000" in open(path).read()
+]
+# FAKE_SLDS_PATHS=relative reports paths relative to the cwd; =foreign under another root
+mode = os.environ.get("FAKE_SLDS_PATHS")
+for record in report:
+    if mode == "relative":
+        record["filePath"] = os.path.relpath(record["filePath"])
+    elif mode == "foreign":
+        record["filePath"] = "/build/agent/workspace/" + os.path.basename(record["filePath"])
+print(json.dumps(report))
+sys.exit(1 if report else 0)
+"""
+
+
+@pytest.mark.hooks
+class TestSldsLinterWrapper:
+    @pytest.fixture
+    def wrapper_module(self, tmp_path, monkeypatch):
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        npx = bin_dir / "npx"
+        npx.write_text(FAKE_NPX.format(python=sys.executable, log=str(tmp_path / "npx.log")))
+        npx.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        monkeypatch.setenv("SF_SLDS_LINTER_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.syspath_prepend(str(SKILLS_ROOT / "sf-lwc" / "hooks" / "scripts"))
+        import slds_linter_wrapper
+
+        return slds_linter_wrapper
+
+    def test_files_missing_from_report_are_clean_and_cached(self, wrapper_module, tmp_path):
+        files = []
+        for i in range(7):
+            css = tmp_path / f"c{i}.css"
+            css.write_text(".a { color: #ff0000; }\n" if i == 3 else f".a{i} {{ margin: 0; }}\n")
+            files.append(str(css))
+
+        results = wrapper_module.SLDSLinterWrapper(str(tmp_path)).lint_files(files)
+        assert [len(results[path]["violations"]) for path in files] == [0, 0, 0, 1, 0, 0, 0]
+        assert all(results[path]["success"] for path in files)
+
+        again = wrapper_module.SLDSLinterWrapper(str(tmp_path)).lint_files(files)
+        assert all(again[path].get("cached") for path in files)
+        assert len(again[files[3]]["violations"]) == 1
+
+        runs = (tmp_path / "npx.log").read_text().splitlines()
+        assert len([run for run in runs if " lint " in f" {run} "]) == 1
+
+    @staticmethod
+    def _write_css(directory, count=4, bad=2):
+        directory.mkdir(parents=True, exist_ok=True)
+        files = []
+        for i in range(count):
+            css = directory / f"c{i}.css"
+            css.write_text(".a { color: #ff0000; }\n" if i == bad else f".a{i} {{ margin: 0; }}\n")
+            files.append(str(css))
+        return files
+
+    def test_relative_report_paths_resolve_against_the_project_root(self, wrapper_module, tmp_path, monkeypatch):
+        monkeypatch.setenv("FAKE_SLDS_PATHS", "relative")
+        files = self._write_css(tmp_path / "project" / "lwc")
+
+        results = wrapper_module.SLDSLinterWrapper(str(tmp_path / "project")).lint_files(files)
+
+        assert [len(results[path]["violations"]) for path in files] == [0, 0, 1, 0]
+        runs = (tmp_path / "npx.log").read_text().splitlines()
+        assert len([run for run in runs if " lint " in f" {run} "]) == 1
+
+    def test_unmapped_report_paths_are_not_cached_as_clean(self, wrapper_module, tmp_path, monkeypatch):
+        monkeypatch.setenv("FAKE_SLDS_PATHS", "foreign")
+        files = self._write_css(tmp_path / "project" / "lwc")
+
+        results = wrapper_module.SLDSLinterWrapper(str(tmp_path / "project")).lint_files(files)
+
+        # The batch report could not be mapped, so each file was linted alone
+        assert [len(results[path]["violations"]) for path in files] == [0, 0, 1, 0]
+        runs = (tmp_path / "npx.log").read_text().splitlines()
+        assert len([run for run in runs if " lint " in f" {run} "]) == 1 + len(files)
+
 
 # ── LWC LSP Validator (graceful degradation) ────────────────────
 
@@ -93,3 +93,94 @@ class TestMetadataEdgeCases:
         output = (result.stdout + result.stderr).lower()
         has_error = "error" in output or "invalid" in output or "xml" in output
         assert has_error or result.returncode != 0
+
+
+@pytest.mark.hooks
+class TestMetadataProjectIndex:
+    def test_cross_file_checks_in_sfdx_project(self, tmp_path, monkeypatch):
+        """Inside an SFDX project, fields and permissions are checked against each other."""
+        monkeypatch.setenv("SF_METADATA_INDEX_DIR", str(tmp_path / "index"))
+        project = tmp_path / "project"
+        default = project / "force-app" / "main" / "default"
+        fields = default / "objects" / "Invoice__c" / "fields"
+        permsets = default / "permissionsets"
+        fields.mkdir(parents=True)
+        permsets.mkdir(parents=True)
+        (project / "sfdx-project.json").write_text('{"packageDirectories": [{"path": "force-app"}]}')
+        ns = 'xmlns="http://soap.sforce.com/2006/04/metadata"'
+        for name in ("Total__c", "Notes__c"):
+            (fields / f"{name}.field-meta.xml").write_text(
+                f"<CustomField {ns}><fullName>{name}</fullName><type>Text</type></CustomField>"
+            )
+        permset = permsets / "Invoice_Access.permissionset-meta.xml"
+        permset.write_text(
+            f"<PermissionSet {ns}><label>Invoice Access</label>"
+            "<fieldPermissions><field>Invoice__c.Total__c</field><readable>true</readable></fieldPermissions>"
+            "<fieldPermissions><field>Invoice__c.Totl__c</field><readable>true</readable></fieldPermissions>"
+            "</PermissionSet>"
+        )
+
+        result = run_validator(VALIDATOR, str(permset))
+        assert "not defined in the project: Invoice__c.Totl__c" in result.stdout
+
+        granted = run_validator(VALIDATOR, str(fields / "Total__c.field-meta.xml"))
+        assert "not granted" not in granted.stdout
+        ungranted = run_validator(VALIDATOR, str(fields / "Notes__c.field-meta.xml"))
+        assert "Invoice__c.Notes__c is not granted by any permission set or profile" in ungranted.stdout
+
+    def test_managed_and_standard_object_permissions_are_not_judged(self, tmp_path, monkeypatch):
+        """Namespaced names and partially retrieved standard objects are undecidable."""
+        monkeypatch.setenv("SF_METADATA_INDEX_DIR", str(tmp_path / "index"))
+        project = tmp_path / "project"
+        default = project / "force-app" / "main" / "default"
+        fields = default / "objects" / "Account" / "fields"
+        permsets = default / "permissionsets"
+        fields.mkdir(parents=True)
+        permsets.mkdir(parents=True)
+        (project / "sfdx-project.json").write_text('{"packageDirectories": [{"path": "force-app"}]}')
+        ns = 'xmlns="http://soap.sforce.com/2006/04/metadata"'
+        (fields / "Local__c.field-meta.xml").write_text(
+            f"<CustomField {ns}><fullName>Local__c</fullName><type>Text</type></CustomField>"
+        )
+        permset = permsets / "Account_Access.permissionset-meta.xml"
+        permset.write_text(
+            f"<PermissionSet {ns}><label>Account Access</label>"
+            "<fieldPermissions><field>Account.Local__c</field><readable>true</readable></fieldPermissions>"
+            "<fieldPermissions><field>Account.Region__c</field><readable>true</readable></fieldPermissions>"
+            "<fieldPermissions><field>Account.pkg__Score__c</field><readable>true</readable></fieldPermissions>"
+            "<fieldPermissions><field>pkg__Invoice__c.pkg__Total__c</field><readable>true</readable></fieldPermissions>"
+            "<objectPermissions><object>pkg__Invoice__c</object><allowRead>true</allowRead></objectPermissions>"
+            "</PermissionSet>"
+        )
+
+        result = run_validator(VALIDATOR, str(permset))
+        assert "not defined in the project" not in result.stdout
+
+    def test_validation_rules_judge_only_project_owned_objects(self, tmp_path, monkeypatch):
+        """Rules on partially retrieved standard objects and managed fields are not flagged."""
+        monkeypatch.setenv("SF_METADATA_INDEX_DIR", str(tmp_path / "index"))
+        project = tmp_path / "project"
+        objects = project / "force-app" / "main" / "default" / "objects"
+        (project / "force-app").mkdir(parents=True)
+        (project / "sfdx-project.json").write_text('{"packageDirectories": [{"path": "force-app"}]}')
+        ns = 'xmlns="http://soap.sforce.com/2006/04/metadata"'
+        rules = {}
+        for sobject in ("Account", "Invoice__c"):
+            (objects / sobject / "fields").mkdir(parents=True)
+            (objects / sobject / "validationRules").mkdir()
+            (objects / sobject / "fields" / "Local__c.field-meta.xml").write_text(
+                f"<CustomField {ns}><fullName>Local__c</fullName><type>Text</type></CustomField>"
+            )
+            rules[sobject] = objects / sobject / "validationRules" / "Check_Fields.validationRule-meta.xml"
+            rules[sobject].write_text(
+                f"<ValidationRule {ns}><fullName>Check_Fields</fullName><active>true</active>"
+                "<errorConditionFormula>AND(ISBLANK(Local__c), ISBLANK(Region__c), pkg__Score__c &gt; 5)"
+                "</errorConditionFormula></ValidationRule>"
+            )
+
+        standard = run_validator(VALIDATOR, str(rules["Account"]))
+        assert "references fields not defined" not in standard.stdout
+
+        custom = run_validator(VALIDATOR, str(rules["Invoice__c"]))
+        assert "references fields not defined on Invoice__c: Region__c" in custom.stdout
+        assert "pkg__Score__c" not in custom.stdout
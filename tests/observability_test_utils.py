@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = ROOT / "skills" / "sf-ai-agentforce-observability" / "scripts"
+PACKAGE = "sf_observability_scripts"
+
+
+def load_scripts_package():
+    """Import the observability scripts as the ``sf_observability_scripts`` package."""
+    if PACKAGE in sys.modules:
+        return sys.modules[PACKAGE]
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE, SCRIPTS_DIR / "__init__.py", submodule_search_locations=[str(SCRIPTS_DIR)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    sys.modules[PACKAGE] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeAuth:
+    """Stands in for Data360Auth; ``force_refresh`` issues the next token."""
+
+    instance_url = "https://example.my.salesforce.com"
+
+    def __init__(self, token: str = "t0"):
+        self.token = token
+        self.calls = 0
+        self.refreshes = 0
+
+    def get_token(self, force_refresh: bool = False) -> str:
+        self.calls += 1
+        if force_refresh:
+            self.refreshes += 1
+            self.token = f"t{self.refreshes}"
+        return self.token
+
+    def get_headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.get_token()}", "Content-Type": "application/json"}
+
+
+class FakeOrg:
+    """
+    Synthetic STDM org behind the Query SQL endpoint, for httpx.MockTransport.
+
+    ``days`` x ``sessions_per_day`` sessions starting 2026-01-01, each with
+    ``turns`` interactions of two steps and one message. Answers the
+    ``IN (...)`` and start-timestamp filters the extractor issues and pages
+    results ``page`` rows at a time. ``fail`` marks queries to answer with
+    HTTP 500; ``throttle_next`` answers that many requests with 429;
+    ``latency`` delays every response. ``trace`` lists (entity, method)
+    for every answered request in order.
+    """
+
+    def __init__(
+        self,
+        days: int = 2,
+        sessions_per_day: int = 6,
+        turns: int = 2,
+        page: int = 5,
+        latency: float = 0.0,
+    ):
+        load_scripts_package()
+        from sf_observability_scripts.models import DMO_NAMES, SCHEMAS
+
+        self.schemas = SCHEMAS
+        self.entities = {dmo: entity for entity, dmo in DMO_NAMES.items()}
+        self.page = page
+        self.latency = latency
+        self.fail: Optional[Callable[[str], bool]] = None
+        self.throttle_next = 0
+        self.queries: list[str] = []
+        self.log: list[tuple[float, str, int]] = []
+        self.trace: list[tuple[str, str]] = []
+        self._query_entities: dict[str, str] = {}
+        self._cursors: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+        self.rows: dict[str, list[dict]] = {entity: [] for entity in SCHEMAS}
+        base = datetime(2026, 1, 1)
+        for day in range(days):
+            for n in range(sessions_per_day):
+                started = base + timedelta(days=day, minutes=n * (1440 // sessions_per_day))
+                session_id = f"S{day:02d}{n:03d}"
+                self.rows["sessions"].append({
+                    "ssot__Id__c": session_id,
+                    "ssot__StartTimestamp__c": started.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                })
+                self.rows["messages"].append({"ssot__Id__c": f"M{session_id}", "ssot__AiAgentSessionId__c": session_id})
+                for turn in range(turns):
+                    interaction_id = f"I{session_id}{turn}"
+                    self.rows["interactions"].append(
+                        {"ssot__Id__c": interaction_id, "ssot__AiAgentSessionId__c": session_id}
+                    )
+                    for step in range(2):
+                        self.rows["steps"].append(
+                            {"ssot__Id__c": f"T{interaction_id}{step}", "ssot__AiAgentInteractionId__c": interaction_id}
+                        )
+
+    def select(self, sql: str) -> tuple[list[str], list[list]]:
+        entity = self.entities[re.search(r"FROM\s+(\S+)", sql).group(1)]
+        rows = self.rows[entity]
+        match = re.search(r"WHERE\s+(\w+)\s+IN\s*\(([^)]*)\)", sql)
+        if match:
+            ids = set(re.findall(r"'([^']*)'", match.group(2)))
+            rows = [row for row in rows if row.get(match.group(1)) in ids]
+        for column, op, value in re.findall(r"(ssot__StartTimestamp__c)\s*(>=|<)\s*'([^']+)'", sql):
+            rows = [row for row in rows if (row[column] >= value if op == ">=" else row[column] < value)]
+        columns = [field.name for field in self.schemas[entity]]
+        return columns, [[row.get(column) for column in columns] for row in rows]
+
+    def _page(self, query_id: str, rows: list, metadata: Optional[list] = None) -> dict:
+        with self._lock:
+            self._cursors[query_id] = rows[self.page:]
+        body = {
+            "data": rows[:self.page],
+            "status": {
+                "completionStatus": "MoreChunksAvailable" if len(rows) > self.page else "Finished",
+                "queryId": query_id,
+            },
+        }
+        if metadata is not None:
+            body["metadata"] = metadata
+        return body
+
+    def handler(self, request):
+        import httpx
+
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            if self.throttle_next:
+                self.throttle_next -= 1
+                self.log.append((time.monotonic(), request.method, 429))
+                return httpx.Response(429, headers={"Retry-After": "0"})
+        if request.method == "POST":
+            sql = json.loads(request.content)["sql"]
+            if self.fail is not None and self.fail(sql):
+                with self._lock:
+                    self.log.append((time.monotonic(), request.method, 500))
+                return httpx.Response(500, json=[{"message": "Internal error"}])
+            columns, rows = self.select(sql)
+            with self._lock:
+                self.queries.append(sql)
+                self.log.append((time.monotonic(), request.method, 200))
+                query_id = f"q{len(self.queries)}"
+                self._query_entities[query_id] = self.entities[re.search(r"FROM\s+(\S+)", sql).group(1)]
+                self.trace.append((self._query_entities[query_id], request.method))
+            return httpx.Response(200, json=self._page(query_id, rows, [{"name": c} for c in columns]))
+
+        query_id = request.url.path.split("/")[-2]
+        with self._lock:
+            self.log.append((time.monotonic(), request.method, 200))
+            self.trace.append((self._query_entities[query_id], request.method))
+            rows = self._cursors[query_id]
+        return httpx.Response(200, json=self._page(query_id, rows))
+
+    def queries_for(self, entity: str) -> list[str]:
+        dmo = next(dmo for dmo, name in self.entities.items() if name == entity)
+        return [sql for sql in self.queries if re.search(rf"FROM\s+{re.escape(dmo)}\b", sql)]
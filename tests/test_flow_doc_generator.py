@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import importlib.util
+import shutil
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+FLOW_FIXTURE = ROOT / "tests" / "hooks" / "fixtures" / "flows" / "RTF_Account_Status_Update.flow-meta.xml"
+
+
+def _load_module(module_name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+DOC_GENERATOR = _load_module(
+    "sf_flow_doc_generator",
+    ROOT / "skills" / "sf-flow" / "scripts" / "doc_generator.py",
+)
+
+
+def test_compiled_template_fills_known_placeholders_only() -> None:
+    template = DOC_GENERATOR.CompiledTemplate("# {{FLOW_NAME}} ({{FLOW_TYPE}}) {{UNKNOWN}}")
+    assert template.render({"FLOW_NAME": "Orders", "FLOW_TYPE": "Screen"}) == "# Orders (Screen) {{UNKNOWN}}"
+
+
+def test_batch_renders_fixture_and_skips_unchanged_flow(tmp_path: Path) -> None:
+    source = tmp_path / "flows"
+    source.mkdir()
+    flow = source / FLOW_FIXTURE.name
+    shutil.copy(FLOW_FIXTURE, flow)
+    output = tmp_path / "docs"
+
+    first = DOC_GENERATOR.generate_directory_docs(str(source), str(output), workers=1)
+    assert first.generated == [str(flow)] and not first.failed
+
+    doc = (output / "RTF_Account_Status_Update_documentation.md").read_text()
+    assert doc.startswith("# Flow Documentation: RTF Account Status Update")
+    assert "**API Version**: 62.0" in doc
+    assert "{{FLOW_NAME}}" not in doc
+
+    second = DOC_GENERATOR.generate_directory_docs(str(source), str(output), workers=1)
+    assert second.generated == []
+    assert second.skipped == [str(flow)]
+
+    flow.write_text(flow.read_text() + "\n")
+    third = DOC_GENERATOR.generate_directory_docs(str(source), str(output), workers=1)
+    assert third.generated == [str(flow)]
+
+
+def test_batch_keeps_same_named_flows_apart(tmp_path: Path) -> None:
+    source = tmp_path / "src"
+    for package in ("sales", "service"):
+        (source / package).mkdir(parents=True)
+        shutil.copy(FLOW_FIXTURE, source / package / FLOW_FIXTURE.name)
+    output = tmp_path / "docs"
+
+    result = DOC_GENERATOR.generate_directory_docs(str(source), str(output), workers=1)
+
+    assert len(result.generated) == 2 and not result.failed
+    assert (output / "sales" / "RTF_Account_Status_Update_documentation.md").exists()
+    assert (output / "service" / "RTF_Account_Status_Update_documentation.md").exists()
+
+
+def test_batch_prunes_docs_of_deleted_and_renamed_flows(tmp_path: Path) -> None:
+    source = tmp_path / "src"
+    for package in ("sales", "service"):
+        (source / package).mkdir(parents=True)
+        shutil.copy(FLOW_FIXTURE, source / package / FLOW_FIXTURE.name)
+    output = tmp_path / "docs"
+    DOC_GENERATOR.generate_directory_docs(str(source), str(output), workers=1)
+    notes = output / "sales" / "README.md"
+    notes.write_text("Hand-written notes\n")
+
+    shutil.rmtree(source / "service")
+    (source / "sales" / FLOW_FIXTURE.name).rename(source / "sales" / "Renamed.flow-meta.xml")
+    result = DOC_GENERATOR.generate_directory_docs(str(source), str(output), workers=1)
+
+    assert result.generated == [str(source / "sales" / "Renamed.flow-meta.xml")]
+    assert sorted(result.pruned) == [
+        str(output / package / "RTF_Account_Status_Update_documentation.md") for package in ("sales", "service")
+    ]
+    assert sorted(p.relative_to(output).as_posix() for p in output.rglob("*") if p.is_file()) == [
+        ".flow-docs-manifest.json", "sales/README.md", "sales/Renamed_documentation.md",
+    ]
+    assert not (output / "service").exists()
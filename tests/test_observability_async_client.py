@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pq = pytest.importorskip("pyarrow.parquet")
+pytest.importorskip("jwt")
+pytest.importorskip("rich")
+
+from tests.observability_test_utils import FakeAuth, load_scripts_package  # noqa: E402
+
+load_scripts_package()
+from sf_observability_scripts.async_client import AsyncData360Client  # noqa: E402
+
+QUERY = "SELECT ssot__Id__c FROM ssot__AIAgentSession__dlm"
+
+
+class FakeQueryApi:
+    """Query SQL endpoint paging ``rows`` query results ``page`` rows at a time."""
+
+    def __init__(self, rows: int = 25, page: int = 10, latency: float = 0.01):
+        self.rows = rows
+        self.page = page
+        self.latency = latency
+        self.valid_tokens: set[str] | None = None
+        self.throttle_next = 0
+        self.log: list[tuple[float, str, int]] = []
+        self.inflight = 0
+        self.max_inflight = 0
+        self._cursors: dict[str, int] = {}
+
+    def _page(self, query_id: str, offset: int) -> dict:
+        data = [[f"{query_id}-{i}"] for i in range(offset, min(self.rows, offset + self.page))]
+        more = offset + self.page < self.rows
+        return {
+            "metadata": [{"name": "ssot__Id__c"}],
+            "data": data,
+            "status": {"completionStatus": "MoreChunksAvailable" if more else "Finished", "queryId": query_id},
+        }
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.inflight -= 1
+
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        if self.valid_tokens is not None and token not in self.valid_tokens:
+            self.log.append((time.monotonic(), request.method, 401))
+            return httpx.Response(401, json=[{"message": "Session expired"}])
+        if self.throttle_next:
+            self.throttle_next -= 1
+            self.log.append((time.monotonic(), request.method, 429))
+            return httpx.Response(429, headers={"Retry-After": "0.3"})
+
+        self.log.append((time.monotonic(), request.method, 200))
+        if request.method == "DELETE":
+            return httpx.Response(204)
+        if request.method == "POST":
+            query_id = f"q{len(self._cursors)}"
+            self._cursors[query_id] = self.page
+            assert json.loads(request.content)["sql"]
+            return httpx.Response(200, json=self._page(query_id, 0))
+
+        query_id = request.url.path.split("/")[-2]
+        offset = self._cursors[query_id]
+        self._cursors[query_id] = offset + self.page
+        return httpx.Response(200, json=self._page(query_id, offset))
+
+
+def _client(api: FakeQueryApi, auth: FakeAuth | None = None, **kwargs) -> AsyncData360Client:
+    return AsyncData360Client(auth or FakeAuth(), transport=httpx.MockTransport(api.handler), **kwargs)
+
+
+def test_concurrent_paging_respects_max_concurrency(tmp_path: Path) -> None:
+    api = FakeQueryApi(rows=25, page=10)
+    auth = FakeAuth()
+    client = _client(api, auth, max_concurrency=3)
+    output = tmp_path / "sessions.parquet"
+
+    async def run():
+        async with client:
+            written = await client.query_many_to_parquet([QUERY] * 8, output, show_progress=False)
+            records = await client.query_all(QUERY)
+        return written, records
+
+    written, records = asyncio.run(run())
+
+    assert written == 8 * 25
+    assert len(records) == 25
+    assert pq.read_table(output).num_rows == 8 * 25
+    assert 1 < api.max_inflight <= 3
+    # The token is held by the client, not fetched per request
+    assert auth.calls == 1
+
+
+def test_rate_limit_backoff_is_shared_across_tasks() -> None:
+    api = FakeQueryApi(rows=5, page=10, latency=0.02)
+    api.throttle_next = 1
+    client = _client(api, max_concurrency=1)
+
+    async def run():
+        async with client:
+            return await asyncio.gather(*(client.query_all(QUERY) for _ in range(6)))
+
+    results = asyncio.run(run())
+
+    assert [len(records) for records in results] == [5] * 6
+    assert client.stats.rate_limit_waits == 1
+    throttled_at = next(at for at, _, status in api.log if status == 429)
+    later = [at for at, _, status in api.log if at > throttled_at]
+    # No task sent anything until Retry-After had passed
+    assert later and min(later) - throttled_at >= 0.3
+
+
+def test_unauthorized_triggers_one_refresh_for_all_tasks() -> None:
+    api = FakeQueryApi(rows=5, page=10)
+    api.valid_tokens = {"t1"}
+    auth = FakeAuth(token="t0")
+    client = _client(api, auth, max_concurrency=10)
+
+    async def run():
+        async with client:
+            return await asyncio.gather(*(client.query_all(QUERY) for _ in range(10)))
+
+    results = asyncio.run(run())
+
+    assert [len(records) for records in results] == [5] * 10
+    assert auth.refreshes == 1
+    assert sum(1 for _, _, status in api.log if status == 401) == 10
+
+
+def test_blocking_facade_runs_sync_calls_on_the_async_client(tmp_path: Path) -> None:
+    api = FakeQueryApi(rows=25, page=10)
+    client = _client(api)
+    blocking = client.blocking()
+    try:
+        assert len(list(blocking.query(QUERY))) == 25
+        assert blocking.query_to_parquet(QUERY, tmp_path / "out.parquet", show_progress=False) == 25
+        assert blocking.cancel_query("q0") is True
+    finally:
+        blocking.close()
+    assert blocking.closed
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import os
+import stat
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+jwt = pytest.importorskip("jwt")
+pytest.importorskip("rich")
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+
+from tests.observability_test_utils import load_scripts_package  # noqa: E402
+
+load_scripts_package()
+from sf_observability_scripts.auth import TOKEN_REFRESH_BUFFER, Data360Auth, OrgInfo  # noqa: E402
+
+INSTANCE_URL = "https://example.my.salesforce.com"
+
+
+class FakeLogin:
+    """OAuth token endpoint for httpx.MockTransport; issues tok1, tok2, ..."""
+
+    def __init__(self, expires_in: int = 7200):
+        self.expires_in = expires_in
+        self.issuers: list[str] = []
+
+    def handler(self, request):
+        assert request.url.path == "/services/oauth2/token"
+        assertion = parse_qs(request.content.decode())["assertion"][0]
+        self.issuers.append(jwt.decode(assertion, options={"verify_signature": False})["iss"])
+        return httpx.Response(200, json={
+            "access_token": f"tok{len(self.issuers)}",
+            "instance_url": INSTANCE_URL,
+            "expires_in": self.expires_in,
+        })
+
+
+@pytest.fixture
+def key_path(tmp_path: Path) -> Path:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    path = tmp_path / "org.key"
+    path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    return path
+
+
+def _auth(tmp_path: Path, key_path: Path, login: FakeLogin, consumer_key: str = "key-a") -> Data360Auth:
+    auth = Data360Auth(
+        "myorg",
+        consumer_key=consumer_key,
+        key_path=key_path,
+        cache_dir=tmp_path / "cache",
+        transport=httpx.MockTransport(login.handler),
+    )
+    if auth._read_cache("org") is None:
+        # Stands in for `sf org display`
+        auth._set_org_info(OrgInfo(instance_url=INSTANCE_URL, username="user@example.com"))
+    return auth
+
+
+def test_token_cache_is_private_and_shared_by_later_processes(tmp_path: Path, key_path: Path) -> None:
+    login = FakeLogin()
+
+    assert _auth(tmp_path, key_path, login).get_token() == "tok1"
+    assert _auth(tmp_path, key_path, login).get_token() == "tok1"
+
+    assert login.issuers == ["key-a"]
+    cache_file = _auth(tmp_path, key_path, login)._cache_file("token")
+    assert stat.S_IMODE(cache_file.stat().st_mode) == 0o600
+    assert stat.S_IMODE(cache_file.parent.stat().st_mode) == 0o700
+    assert json.loads(cache_file.read_text())["access_token"] == "tok1"
+
+
+def test_cached_token_readable_by_others_is_ignored(tmp_path: Path, key_path: Path) -> None:
+    login = FakeLogin()
+    first = _auth(tmp_path, key_path, login)
+    first.get_token()
+    os.chmod(first._cache_file("token"), 0o644)
+
+    assert _auth(tmp_path, key_path, login).get_token() == "tok2"
+
+    assert len(login.issuers) == 2
+    # The fresh token replaced the exposed file with a private one
+    assert stat.S_IMODE(first._cache_file("token").stat().st_mode) == 0o600
+
+
+def test_tokens_are_cached_per_consumer_key(tmp_path: Path, key_path: Path) -> None:
+    login = FakeLogin()
+    first = _auth(tmp_path, key_path, login, consumer_key="key-a")
+    second = _auth(tmp_path, key_path, login, consumer_key="key-b")
+
+    assert (first.get_token(), second.get_token()) == ("tok1", "tok2")
+    assert _auth(tmp_path, key_path, login, consumer_key="key-b").get_token() == "tok2"
+
+    assert login.issuers == ["key-a", "key-b"]
+    assert first._cache_file("token") != second._cache_file("token")
+
+
+def test_tokens_near_expiry_are_not_reused(tmp_path: Path, key_path: Path) -> None:
+    login = FakeLogin(expires_in=TOKEN_REFRESH_BUFFER - 10)
+
+    assert _auth(tmp_path, key_path, login).get_token() == "tok1"
+    assert _auth(tmp_path, key_path, login).get_token() == "tok2"
+
+
+@pytest.mark.parametrize("content", ['{"access_token": "tok", "expires_at": "soon"}', '["tok"]', "{"])
+def test_malformed_cache_files_are_a_miss(tmp_path: Path, key_path: Path, content: str) -> None:
+    login = FakeLogin()
+    auth = _auth(tmp_path, key_path, login)
+    auth._write_cache("token", {})
+    auth._cache_file("token").write_text(content)
+
+    assert auth.get_token() == "tok1"
+
+
+def test_force_refresh_bypasses_the_disk_cache(tmp_path: Path, key_path: Path) -> None:
+    login = FakeLogin()
+    _auth(tmp_path, key_path, login).get_token()
+
+    assert _auth(tmp_path, key_path, login).get_token(force_refresh=True) == "tok2"
+    assert _auth(tmp_path, key_path, login).get_token() == "tok2"
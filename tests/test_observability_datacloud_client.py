@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("jwt")
+pytest.importorskip("rich")
+
+from tests.observability_test_utils import FakeAuth, FakeOrg, load_scripts_package  # noqa: E402
+
+load_scripts_package()
+from sf_observability_scripts import datacloud_client  # noqa: E402
+from sf_observability_scripts.datacloud_client import (  # noqa: E402
+    Data360Client,
+    ParquetStreamWriter,
+    parquet_parts,
+)
+from sf_observability_scripts.models import DMO_NAMES  # noqa: E402
+
+SCHEMA = pa.schema([("ssot__Id__c", pa.string()), ("day", pa.string()), ("n", pa.int64())])
+
+
+def _table(start: int, rows: int, day: str = "2026-01-01") -> pa.Table:
+    return pa.table(
+        {
+            "ssot__Id__c": [f"id{i}" for i in range(start, start + rows)],
+            "day": [day] * rows,
+            "n": list(range(start, start + rows)),
+        },
+        schema=SCHEMA,
+    )
+
+
+SESSIONS_SQL = f"SELECT ssot__Id__c FROM {DMO_NAMES['sessions']}"
+
+
+def _client(org: FakeOrg, auth: FakeAuth | None = None, **kwargs) -> Data360Client:
+    return Data360Client(auth or FakeAuth(), transport=httpx.MockTransport(org.handler), **kwargs)
+
+
+def _hidden(root: Path) -> list[Path]:
+    return [p for p in root.rglob("*") if any(part.startswith(".") for part in p.relative_to(root).parts)]
+
+
+def test_writer_rolls_files_and_drops_stale_parts(tmp_path: Path) -> None:
+    output = tmp_path / "data.parquet"
+    writer = ParquetStreamWriter(output, SCHEMA, row_group_size=10, max_file_bytes=1)
+    for start in range(0, 35, 7):
+        writer.write(_table(start, 7))
+    paths = writer.close()
+
+    assert paths == parquet_parts(output) and len(paths) == 4
+    assert sum(pq.read_metadata(str(p)).num_rows for p in paths) == 35
+    assert pq.read_table(str(paths[0])).column("n").to_pylist() == list(range(10))
+
+    # A smaller rewrite of the same output removes the parts it no longer needs
+    writer = ParquetStreamWriter(output, SCHEMA, row_group_size=10, max_file_bytes=1)
+    writer.write(_table(100, 15))
+    assert len(writer.close()) == 2
+    assert len(parquet_parts(output)) == 2
+    assert not _hidden(tmp_path)
+
+
+def test_abort_keeps_existing_output(tmp_path: Path) -> None:
+    output = tmp_path / "data.parquet"
+    writer = ParquetStreamWriter(output, SCHEMA, row_group_size=5)
+    writer.write(_table(0, 3))
+    writer.close()
+
+    writer = ParquetStreamWriter(output, SCHEMA, row_group_size=5)
+    writer.write(_table(10, 12))  # Two row groups already on disk in a temp file
+    writer.abort()
+
+    assert pq.read_table(str(output)).column("n").to_pylist() == [0, 1, 2]
+    assert not _hidden(tmp_path)
+
+
+def test_partitioned_output_is_published_on_close_only(tmp_path: Path) -> None:
+    dataset = tmp_path / "sessions"
+    writer = ParquetStreamWriter(dataset, SCHEMA, row_group_size=4, partition_cols=["day"])
+    writer.write(_table(0, 6, day="2026-01-01"))
+    writer.write(_table(6, 6, day="2026-01-02"))
+    assert not list(dataset.glob("day=*"))
+
+    writer.close()
+    files = sorted(dataset.glob("day=*/*.parquet"))
+    assert {f.parent.name for f in files} == {"day=2026-01-01", "day=2026-01-02"}
+    assert sum(pq.read_metadata(str(f)).num_rows for f in files) == 12
+    assert not _hidden(dataset)
+
+
+def test_aborted_partitioned_write_leaves_no_files(tmp_path: Path) -> None:
+    dataset = tmp_path / "sessions"
+    first = ParquetStreamWriter(dataset, SCHEMA, row_group_size=4, partition_cols=["day"])
+    first.write(_table(0, 4))
+    first.close()
+    existing = sorted(dataset.rglob("*.parquet"))
+
+    failed = ParquetStreamWriter(dataset, SCHEMA, row_group_size=4, partition_cols=["day"])
+    failed.write(_table(10, 9))
+    failed.abort()
+
+    assert sorted(dataset.rglob("*.parquet")) == existing
+    assert not _hidden(dataset)
+
+
+def test_queries_reuse_one_pooled_http_client() -> None:
+    org = FakeOrg(days=2, sessions_per_day=6, page=5)
+    auth = FakeAuth()
+    client = _client(org, auth)
+
+    with client:
+        assert len(client.query_all(SESSIONS_SQL)) == 12
+        pool = client._http
+        assert len(client.query_all(SESSIONS_SQL)) == 12
+        assert client._http is pool
+    assert client._http is None
+    # Three pages per query, all sent through the pool
+    assert [method for _, method, _ in org.log] == ["POST", "GET", "GET"] * 2
+
+
+def test_rate_limit_backoff_is_shared_across_threads(monkeypatch) -> None:
+    monkeypatch.setattr(datacloud_client, "INITIAL_BACKOFF", 0.3)
+    org = FakeOrg(days=1, sessions_per_day=4, page=10)
+    org.throttle_next = 1
+    client = _client(org)
+    results = {}
+
+    def run(name: str) -> None:
+        results[name] = client.query_all(SESSIONS_SQL)
+
+    throttled = threading.Thread(target=run, args=("throttled",))
+    throttled.start()
+    deadline = time.monotonic() + 5
+    while not client._backoff_until and time.monotonic() < deadline:
+        time.sleep(0.005)
+    bystander = threading.Thread(target=run, args=("bystander",))
+    bystander.start()
+    throttled.join()
+    bystander.join()
+    client.close()
+
+    assert [len(records) for records in results.values()] == [4, 4]
+    assert [status for _, _, status in org.log].count(429) == 1
+    throttled_at = next(at for at, _, status in org.log if status == 429)
+    # The other thread did not send anything until the backoff had passed
+    assert min(at for at, _, status in org.log if status == 200) - throttled_at >= 0.3
+
+
+def _records_to_table(records: list[dict], schema: pa.Schema) -> pa.Table:
+    """The row-by-row conversion _page_to_table replaced, kept as a reference."""
+    columns = {field.name: [] for field in schema}
+    for record in records:
+        for field in schema:
+            value = record.get(field.name)
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value)
+            columns[field.name].append(value)
+    return pa.Table.from_arrays([pa.array(columns[f.name], type=f.type) for f in schema], schema=schema)
+
+
+def test_page_to_table_matches_row_by_row_conversion() -> None:
+    schema = pa.schema([
+        ("ssot__Id__c", pa.string()),
+        ("ssot__AttributeText__c", pa.string()),
+        ("turns", pa.int64()),
+        ("score", pa.float64()),
+        ("ok", pa.bool_()),
+        ("missing", pa.string()),
+    ])
+    column_names = ["turns", "ssot__Id__c", "ssot__AttributeText__c", "score", "ok", "extra"]
+    rows = [
+        [3, "a", {"k": [1, 2]}, 0.5, True, "x"],
+        [None, "b", ["p", "q"], None, False, "y"],
+        [7, "c", None, 1.25, None, "z"],
+    ]
+    records = [dict(zip(column_names, row)) for row in rows]
+    client = Data360Client(FakeAuth())
+
+    table = client._page_to_table(column_names, rows, schema)
+
+    assert table.equals(_records_to_table(records, schema))
+    assert table.column("ssot__AttributeText__c").to_pylist()[:2] == ['{"k": [1, 2]}', '["p", "q"]']
+
+
+def test_page_to_table_casts_scalars_into_string_columns() -> None:
+    schema = pa.schema([("ssot__Id__c", pa.string()), ("value", pa.string())])
+    client = Data360Client(FakeAuth())
+
+    table = client._page_to_table(["ssot__Id__c", "value"], [["a", 1], ["b", 2.5], ["c", None]], schema)
+
+    assert table.column("value").to_pylist() == ["1", "2.5", None]
+
+
+def _interaction_queries(org: FakeOrg, chunk_size: int) -> list[str]:
+    session_ids = [row["ssot__Id__c"] for row in org.rows["sessions"]]
+    return [
+        f"SELECT ssot__Id__c, ssot__AiAgentSessionId__c FROM {DMO_NAMES['interactions']} "
+        f"WHERE ssot__AiAgentSessionId__c IN ({', '.join(repr(id) for id in session_ids[i:i + chunk_size])})"
+        for i in range(0, len(session_ids), chunk_size)
+    ]
+
+
+def test_query_many_to_parquet_streams_every_chunk_into_one_output(tmp_path: Path) -> None:
+    org = FakeOrg(days=2, sessions_per_day=6, turns=2, page=3)
+    output = tmp_path / "interactions" / "data.parquet"
+    schema = pa.schema([("ssot__Id__c", pa.string()), ("ssot__AiAgentSessionId__c", pa.string())])
+
+    with _client(org, row_group_size=4) as client:
+        written = client.query_many_to_parquet(
+            _interaction_queries(org, 5), output, schema=schema, show_progress=False, max_workers=3
+        )
+
+    table = pq.read_table(str(output))
+    assert written == table.num_rows == 24
+    assert sorted(table.column("ssot__Id__c").to_pylist()) == sorted(r["ssot__Id__c"] for r in org.rows["interactions"])
+    assert len(org.queries) == 3
+
+
+def test_failed_chunk_keeps_previous_output(tmp_path: Path) -> None:
+    org = FakeOrg(days=2, sessions_per_day=6, turns=2, page=3)
+    output = tmp_path / "interactions" / "data.parquet"
+    schema = pa.schema([("ssot__Id__c", pa.string()), ("ssot__AiAgentSessionId__c", pa.string())])
+    queries = _interaction_queries(org, 5)
+    with _client(org) as client:
+        client.query_many_to_parquet(queries[:1], output, schema=schema, show_progress=False)
+        before = pq.read_table(str(output))
+
+        org.fail = lambda sql: "'S01005'" in sql
+        with pytest.raises(RuntimeError, match="500"):
+            client.query_many_to_parquet(queries, output, schema=schema, show_progress=False, max_workers=3)
+
+    assert pq.read_table(str(output)).equals(before)
+    assert not _hidden(tmp_path)
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pq = pytest.importorskip("pyarrow.parquet")
+pytest.importorskip("jwt")
+pytest.importorskip("rich")
+
+from tests.observability_test_utils import FakeAuth, FakeOrg, load_scripts_package  # noqa: E402
+
+load_scripts_package()
+from sf_observability_scripts import extractor as extractor_module  # noqa: E402
+from sf_observability_scripts.datacloud_client import Data360Client  # noqa: E402
+from sf_observability_scripts.extractor import STDMExtractor, _BoundedExecutor  # noqa: E402
+
+
+def _extractor(org: FakeOrg, output_dir: Path, **kwargs) -> STDMExtractor:
+    client = Data360Client(FakeAuth(), transport=httpx.MockTransport(org.handler))
+    return STDMExtractor(client, output_dir, **kwargs)
+
+
+def _in_list_sizes(queries: list[str]) -> list[int]:
+    return [len(re.findall(r"'[^']*'", re.search(r"IN \(([^)]*)\)", sql).group(1))) for sql in queries]
+
+
+def _ids(path: Path) -> list[str]:
+    return sorted(pq.read_table(str(path)).column("ssot__Id__c").to_pylist())
+
+
+def test_session_tree_queries_children_in_parent_id_chunks(tmp_path: Path) -> None:
+    org = FakeOrg(days=2, sessions_per_day=6, turns=2, page=5)
+    extractor = _extractor(org, tmp_path / "data", chunk_size=4, max_workers=2)
+    session_ids = [row["ssot__Id__c"] for row in org.rows["sessions"]]
+
+    result = extractor.extract_session_tree(session_ids + session_ids[:3], show_progress=False)
+
+    assert not result.errors
+    assert (result.sessions_count, result.interactions_count, result.steps_count, result.messages_count) == (12, 24, 48, 12)
+    # Duplicate IDs are dropped before chunking
+    assert _in_list_sizes(org.queries_for("interactions")) == [4, 4, 4]
+    assert sorted(_in_list_sizes(org.queries_for("steps"))) == [4] * 6
+    assert _ids(tmp_path / "data" / "steps" / "data.parquet") == sorted(r["ssot__Id__c"] for r in org.rows["steps"])
+
+
+def _partition_ids(root: Path) -> list[str]:
+    return sorted(value for path in sorted(root.rglob("*.parquet")) for value in _ids(path))
+
+
+def test_sharded_extraction_resumes_only_failed_windows(tmp_path: Path) -> None:
+    org = FakeOrg(days=3, sessions_per_day=4, turns=1, page=3)
+    extractor = _extractor(org, tmp_path / "data", chunk_size=3)
+    since, until = datetime(2026, 1, 1), datetime(2026, 1, 4)
+    org.fail = lambda sql: ">= '2026-01-02T00:00:00.000Z'" in sql
+
+    first = extractor.extract_sessions_sharded(since, until, max_windows=2, show_progress=False)
+
+    assert len(first.errors) == 1 and first.errors[0].startswith("2026-01-02: ")
+    markers = tmp_path / "data" / "metadata" / "windows"
+    assert sorted(p.name for p in markers.glob("*.json")) == ["2026-01-01.json", "2026-01-03.json"]
+    assert first.sessions_count == 8
+
+    org.fail = None
+    session_queries = len(org.queries_for("sessions"))
+    second = extractor.extract_sessions_sharded(since, until, max_windows=2, show_progress=False, resume=True)
+
+    assert not second.errors
+    # Completed windows come from their markers; only 2026-01-02 is queried again
+    assert len(org.queries_for("sessions")) == session_queries + 1
+    assert (second.sessions_count, second.interactions_count, second.steps_count) == (12, 12, 24)
+    sessions = tmp_path / "data" / "sessions"
+    assert sorted(p.name for p in sessions.iterdir()) == ["date=2026-01-01", "date=2026-01-02", "date=2026-01-03"]
+    assert _partition_ids(sessions) == sorted(r["ssot__Id__c"] for r in org.rows["sessions"])
+    assert _partition_ids(tmp_path / "data" / "steps") == sorted(r["ssot__Id__c"] for r in org.rows["steps"])
+
+
+def test_resume_refetches_only_the_failed_chunk(tmp_path: Path) -> None:
+    org = FakeOrg(days=1, sessions_per_day=6, turns=2, page=4)
+    extractor = _extractor(org, tmp_path / "data", chunk_size=3, max_workers=2)
+    since, until = datetime(2026, 1, 1), datetime(2026, 1, 2)
+    org.fail = lambda sql: "ssot__AiAgentInteractionId__c IN" in sql and "'IS000000'" in sql
+
+    first = extractor.extract_sessions(since, until, show_progress=False)
+
+    assert len(first.errors) == 1 and first.errors[0].startswith("steps: ")
+    checkpoint = tmp_path / "data" / "metadata" / "checkpoints" / "data.json"
+    assert checkpoint.exists()
+    assert not (tmp_path / "data" / "steps").exists()
+
+    org.fail = None
+    before = {entity: len(org.queries_for(entity)) for entity in ("sessions", "interactions", "messages", "steps")}
+    second = extractor.extract_sessions(since, until, show_progress=False, resume=True)
+
+    assert not second.errors
+    after = {entity: len(org.queries_for(entity)) for entity in before}
+    assert {entity: after[entity] - before[entity] for entity in before} == {
+        "sessions": 0, "interactions": 0, "messages": 0, "steps": 1,
+    }
+    assert (second.sessions_count, second.interactions_count, second.steps_count, second.messages_count) == (6, 12, 24, 6)
+    assert _ids(tmp_path / "data" / "steps" / "data.parquet") == sorted(r["ssot__Id__c"] for r in org.rows["steps"])
+    assert not checkpoint.exists()
+    assert not list((tmp_path / "data" / "metadata" / "staging").rglob("*.parquet"))
+
+
+def test_watermark_advances_past_completed_windows_only(tmp_path: Path, monkeypatch) -> None:
+    class FixedClock(datetime):
+        @classmethod
+        def utcnow(cls):
+            return cls(2026, 1, 4)
+
+    monkeypatch.setattr(extractor_module, "datetime", FixedClock)
+    org = FakeOrg(days=3, sessions_per_day=2, turns=1, page=4)
+    extractor = _extractor(org, tmp_path / "data")
+    watermark = tmp_path / "data" / "metadata" / "watermark.json"
+    extractor._update_watermark(datetime(2026, 1, 1))
+    org.fail = lambda sql: ">= '2026-01-02T00:00:00.000Z'" in sql
+
+    first = extractor.extract_incremental(show_progress=False)
+
+    assert first.errors
+    assert json.loads(watermark.read_text())["last_extraction"] == "2026-01-02T00:00:00"
+
+    org.fail = None
+    second = extractor.extract_incremental(show_progress=False)
+
+    assert not second.errors
+    assert json.loads(watermark.read_text())["last_extraction"] == "2026-01-04T00:00:00"
+    assert _partition_ids(tmp_path / "data" / "sessions") == sorted(r["ssot__Id__c"] for r in org.rows["sessions"])
+
+
+def test_child_stages_start_while_sessions_are_still_paging(tmp_path: Path) -> None:
+    org = FakeOrg(days=1, sessions_per_day=12, turns=1, page=2, latency=0.01)
+    extractor = _extractor(org, tmp_path / "data", chunk_size=2, max_workers=2)
+
+    result = extractor.extract_sessions(datetime(2026, 1, 1), datetime(2026, 1, 2), show_progress=False)
+
+    assert not result.errors
+    assert (result.sessions_count, result.interactions_count, result.steps_count, result.messages_count) == (12, 12, 24, 12)
+    last_session_page = max(i for i, (entity, _) in enumerate(org.trace) if entity == "sessions")
+    first_interactions = org.trace.index(("interactions", "POST"))
+    first_steps = org.trace.index(("steps", "POST"))
+    assert first_interactions < first_steps < last_session_page
+
+
+def test_failed_interactions_skip_steps_but_keep_messages(tmp_path: Path) -> None:
+    org = FakeOrg(days=1, sessions_per_day=4, turns=1, page=4)
+    extractor = _extractor(org, tmp_path / "data", chunk_size=2)
+    org.fail = lambda sql: "ssot__AIAgentInteraction__dlm" in sql and "'S00003'" in sql
+
+    result = extractor.extract_sessions(datetime(2026, 1, 1), datetime(2026, 1, 2), show_progress=False)
+
+    assert [error.split(":")[0] for error in result.errors] == ["interactions"]
+    assert (result.sessions_count, result.interactions_count, result.steps_count, result.messages_count) == (4, 0, 0, 4)
+    assert not (tmp_path / "data" / "interactions").exists()
+    assert not (tmp_path / "data" / "steps").exists()
+    assert len(_ids(tmp_path / "data" / "messages" / "data.parquet")) == 4
+
+
+def test_bounded_executor_holds_back_submits_beyond_its_backlog() -> None:
+    executor = _BoundedExecutor(max_workers=1)
+    release = threading.Event()
+    executor.submit(release.wait)
+    executor.submit(release.wait)
+    submitted = threading.Event()
+
+    def third():
+        executor.submit(lambda: 1 / 0)
+        submitted.set()
+
+    producer = threading.Thread(target=third)
+    producer.start()
+    # One task running and one waiting fill the backlog
+    assert not submitted.wait(0.1)
+    release.set()
+    assert submitted.wait(5)
+    producer.join()
+
+    failures = executor.drain()
+    assert [type(error) for error in failures] == [ZeroDivisionError]
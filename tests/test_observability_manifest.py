@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+pytest.importorskip("polars")
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("jwt")
+pytest.importorskip("rich")
+
+from tests.observability_test_utils import FakeAuth, FakeOrg, load_scripts_package  # noqa: E402
+
+load_scripts_package()
+from sf_observability_scripts.datacloud_client import Data360Client  # noqa: E402
+from sf_observability_scripts.extractor import STDMExtractor  # noqa: E402
+from sf_observability_scripts.manifest import DatasetManifest, dataset_files  # noqa: E402
+
+
+def _write(path: Path, rows: dict[str, str]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(pa.table({"ssot__Id__c": list(rows), "status": list(rows.values())}), str(path))
+    return path
+
+
+def _latest(manifest: DatasetManifest, entity: str = "sessions") -> dict[str, str]:
+    frame = manifest.scan_latest(entity).collect()
+    return dict(zip(frame["ssot__Id__c"].to_list(), frame["status"].to_list()))
+
+
+def test_scan_latest_prefers_the_newest_run(tmp_path: Path) -> None:
+    manifest = DatasetManifest.load(tmp_path)
+    day1 = tmp_path / "sessions" / "date=2026-01-01"
+    _write(day1 / "data.parquet", {"a": "unregistered", "b": "unregistered"})
+    manifest.register([_write(day1 / "run-000002.parquet", {"a": "run2", "c": "run2"})], 2)
+    manifest.register([_write(day1 / "run-000001.parquet", {"a": "run1", "b": "run1"})], 1)
+    manifest.register([_write(tmp_path / "sessions" / "date=2026-01-02" / "run-000001.parquet", {"d": "run1"})], 1)
+
+    assert _latest(DatasetManifest.load(tmp_path)) == {"a": "run2", "b": "run1", "c": "run2", "d": "run1"}
+    with pytest.raises(FileNotFoundError):
+        manifest.scan_latest("steps")
+
+
+def test_compaction_keeps_the_newest_sequence_per_key(tmp_path: Path) -> None:
+    manifest = DatasetManifest.load(tmp_path)
+    day1 = tmp_path / "sessions" / "date=2026-01-01"
+    day2 = tmp_path / "sessions" / "date=2026-01-02"
+    manifest.register([_write(day1 / "run-000003.parquet", {"a": "run3"})], 3)
+    manifest.register([_write(day1 / "run-000001.parquet", {"a": "run1", "b": "run1"})], 1)
+    manifest.register([_write(day2 / "run-000001.parquet", {"c": "run1"})], 1)
+    manifest.register([_write(day2 / "run-000002.parquet", {"c": "run2"})], 2)
+
+    assert manifest.compact(["sessions", "steps"], partitions={"date=2026-01-01"}) == 1
+
+    assert [p.name for p in dataset_files(day1)] == ["compacted-000003.parquet"]
+    assert len(dataset_files(day2)) == 2  # Not touched by this run
+    reloaded = DatasetManifest.load(tmp_path)
+    assert reloaded.files["sessions/date=2026-01-01/compacted-000003.parquet"]["seq"] == 3
+    assert reloaded.files["sessions/date=2026-01-01/compacted-000003.parquet"]["rows"] == 2
+    assert _latest(reloaded) == {"a": "run3", "b": "run1", "c": "run2"}
+
+    # A later run still overrides the compacted file
+    reloaded.register([_write(day1 / "run-000004.parquet", {"b": "run4"})], 4)
+    reloaded.compact(["sessions"])
+    assert [p.name for p in dataset_files(day1)] == ["compacted-000004.parquet"]
+    assert [p.name for p in dataset_files(day2)] == ["compacted-000002.parquet"]
+    assert _latest(DatasetManifest.load(tmp_path)) == {"a": "run3", "b": "run4", "c": "run2"}
+
+
+def test_append_runs_register_files_and_compact_touched_partitions(tmp_path: Path) -> None:
+    org = FakeOrg(days=2, sessions_per_day=3, turns=1, page=2)
+    client = Data360Client(FakeAuth(), transport=httpx.MockTransport(org.handler))
+    extractor = STDMExtractor(client, tmp_path / "data", chunk_size=2)
+    since = datetime(2026, 1, 1)
+
+    extractor.extract_sessions_sharded(since, datetime(2026, 1, 3), append=True, show_progress=False)
+    org.rows["sessions"][4]["ssot__AiAgentSessionEndType__c"] = "Escalated"
+    result = extractor.extract_sessions_sharded(
+        datetime(2026, 1, 2), datetime(2026, 1, 3), append=True, show_progress=False
+    )
+
+    assert not result.errors
+    manifest = DatasetManifest.load(tmp_path / "data")
+    assert manifest.last_seq == 2
+    sessions = tmp_path / "data" / "sessions"
+    assert [p.name for p in dataset_files(sessions / "date=2026-01-01")] == ["run-000001.parquet"]
+    assert [p.name for p in dataset_files(sessions / "date=2026-01-02")] == ["compacted-000002.parquet"]
+    frame = manifest.scan_latest("sessions").collect()
+    end_types = dict(zip(frame["ssot__Id__c"].to_list(), frame["ssot__AiAgentSessionEndType__c"].to_list()))
+    assert len(end_types) == 6 and end_types["S01001"] == "Escalated"